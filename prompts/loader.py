@@ -17,6 +17,7 @@ Usage:
 
 import os
 import re
+import threading
 import yaml
 import httpx
 from pathlib import Path
@@ -64,6 +65,10 @@ class PromptLoader:
         self.supabase_url: Optional[str] = None
         self.supabase_key: Optional[str] = None
         self._cache: Dict[str, PromptDefinition] = {}
+        # Per-ID locks while a load is in flight: threads missing the cache
+        # for one ID load it once
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._load_locks_guard = threading.Lock()
     
     def with_supabase(self, url: str, key: str) -> "PromptLoader":
         """Configure Supabase connection."""
@@ -88,6 +93,25 @@ class PromptLoader:
         if id in self._cache:
             return self._cache[id]
         
+        # Threads missing the cache for the same ID wait for the first
+        # load, then find its result cached
+        with self._load_locks_guard:
+            lock = self._load_locks.setdefault(id, threading.Lock())
+        with lock:
+            try:
+                return self._load(id)
+            finally:
+                # Later callers hit the cache; threads already waiting
+                # hold their own reference to the lock
+                with self._load_locks_guard:
+                    if self._load_locks.get(id) is lock:
+                        del self._load_locks[id]
+    
+    def _load(self, id: str) -> Optional[PromptDefinition]:
+        """Load a prompt (Supabase → YAML) and cache it."""
+        if id in self._cache:
+            return self._cache[id]
+        
         # Try Supabase
         if self.supabase_url and self.supabase_key:
             prompt = self._load_from_supabase(id)
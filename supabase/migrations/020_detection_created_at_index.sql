@@ -0,0 +1,6 @@
+-- Detection created_at index
+-- Incremental consolidation (run_consolidation.py --incremental) reads only
+-- detections created since its high-water mark
+
+CREATE INDEX IF NOT EXISTS idx_detections_created_at
+ON nko_detections(created_at);
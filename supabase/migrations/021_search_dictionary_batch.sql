@@ -0,0 +1,61 @@
+-- Batched dictionary search
+-- DictionaryClient.lookup_many resolves exact matches with one
+-- word_normalized=in.(...) query, then sends every miss through this
+-- function in a single RPC instead of one search_dictionary call per word
+
+CREATE OR REPLACE FUNCTION search_dictionary_batch(
+    search_terms TEXT[],
+    limit_per_term INT DEFAULT 5
+)
+RETURNS TABLE (
+    search_term TEXT,
+    id UUID,
+    word TEXT,
+    word_normalized TEXT,
+    word_class TEXT,
+    definitions_en JSONB,
+    definitions_fr JSONB,
+    examples JSONB,
+    variants JSONB,
+    synonyms JSONB,
+    has_tone_marks BOOLEAN,
+    similarity REAL
+) AS $$
+    SELECT
+        t.term,
+        m.id,
+        m.word,
+        m.word_normalized,
+        m.word_class,
+        m.definitions_en,
+        m.definitions_fr,
+        m.examples,
+        m.variants,
+        m.synonyms,
+        m.has_tone_marks,
+        m.similarity
+    FROM unnest(search_terms) AS t(term)
+    CROSS JOIN LATERAL (
+        -- Same matching and ordering as search_dictionary
+        SELECT
+            d.id,
+            d.word,
+            d.word_normalized,
+            d.word_class,
+            d.definitions_en,
+            d.definitions_fr,
+            d.examples,
+            d.variants,
+            d.synonyms,
+            d.has_tone_marks,
+            similarity(d.word_normalized, lower(t.term)) AS similarity
+        FROM dictionary_entries d
+        WHERE d.word_normalized % lower(t.term)
+           OR d.word ILIKE '%' || t.term || '%'
+        ORDER BY similarity DESC, d.word
+        LIMIT limit_per_term
+    ) m
+    ORDER BY t.term, m.similarity DESC, m.word;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION search_dictionary_batch IS 'Fuzzy search dictionary entries for many words in one call';
@@ -0,0 +1,57 @@
+-- Dictionary Misses
+-- Words found neither in dictionary_entries nor on Ankataa. DictionaryClient
+-- checks this table before the rate-limited Ankataa scrape, so a word one
+-- worker failed to find is not scraped again by every other worker
+
+CREATE TABLE IF NOT EXISTS dictionary_misses (
+    word_normalized TEXT PRIMARY KEY,
+    miss_count INT NOT NULL DEFAULT 1,
+    first_missed_at TIMESTAMPTZ DEFAULT now(),
+    last_checked_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Clients only trust misses checked recently
+CREATE INDEX IF NOT EXISTS idx_dict_misses_checked ON dictionary_misses(last_checked_at);
+
+COMMENT ON TABLE dictionary_misses IS 'Words absent from both the dictionary cache and Ankataa (negative cache)';
+COMMENT ON COLUMN dictionary_misses.miss_count IS 'Times a lookup reached Ankataa and found nothing';
+
+-- RLS Policies
+ALTER TABLE dictionary_misses ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Public can read dictionary misses"
+ON dictionary_misses FOR SELECT
+TO public
+USING (true);
+
+CREATE POLICY "Service role can manage dictionary misses"
+ON dictionary_misses FOR ALL
+TO service_role
+USING (true)
+WITH CHECK (true);
+
+-- Record a batch of misses: insert new words, bump the rest
+CREATE OR REPLACE FUNCTION record_dictionary_misses(words TEXT[])
+RETURNS VOID AS $$
+    INSERT INTO dictionary_misses (word_normalized)
+    SELECT DISTINCT unnest(words)
+    ON CONFLICT (word_normalized) DO UPDATE
+    SET miss_count = dictionary_misses.miss_count + 1,
+        last_checked_at = now();
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION record_dictionary_misses IS 'Upsert dictionary misses, incrementing miss_count';
+
+-- A word that gets cached later is no longer a miss
+CREATE OR REPLACE FUNCTION clear_dictionary_miss()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM dictionary_misses WHERE word_normalized = NEW.word_normalized;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER dictionary_entries_clear_miss
+    AFTER INSERT ON dictionary_entries
+    FOR EACH ROW
+    EXECUTE FUNCTION clear_dictionary_miss();
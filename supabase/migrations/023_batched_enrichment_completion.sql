@@ -0,0 +1,92 @@
+-- Batched Enrichment Completion
+-- ExpansionEngine.process_queue_batch runs many workers concurrently and
+-- reports results in batches: one RPC per batch of completed items and
+-- one per batch of failed items, instead of one call per item.
+-- Semantics match complete_enrichment / fail_enrichment (015).
+
+-- Mark many enrichments complete
+-- p_items: [{"queue_id": uuid, "vocabulary_id": uuid|null, "sources": [...]}]
+CREATE OR REPLACE FUNCTION complete_enrichments(
+    p_items JSONB
+)
+RETURNS INT AS $$
+DECLARE
+    v_completed INT;
+BEGIN
+    UPDATE vocabulary_expansion_queue q
+    SET
+        status = 'completed',
+        vocabulary_entry_id = i.vocabulary_id,
+        enrichment_sources = i.sources,
+        processed_at = now()
+    FROM (
+        SELECT
+            (e->>'queue_id')::uuid AS queue_id,
+            NULLIF(e->>'vocabulary_id', '')::uuid AS vocabulary_id,
+            COALESCE(e->'sources', '[]'::jsonb) AS sources
+        FROM jsonb_array_elements(p_items) e
+    ) i
+    WHERE q.id = i.queue_id;
+
+    GET DIAGNOSTICS v_completed = ROW_COUNT;
+
+    -- Update daily stats
+    IF v_completed > 0 THEN
+        INSERT INTO learning_stats (stat_date, queue_items_completed, words_enriched)
+        VALUES (CURRENT_DATE, v_completed, v_completed)
+        ON CONFLICT (stat_date)
+        DO UPDATE SET
+            queue_items_completed = learning_stats.queue_items_completed + v_completed,
+            words_enriched = learning_stats.words_enriched + v_completed,
+            updated_at = now();
+    END IF;
+
+    RETURN v_completed;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION complete_enrichments IS 'Mark a batch of queue items completed';
+
+-- Mark many enrichments failed; items with retries left go back to pending
+-- p_items: [{"queue_id": uuid, "error": text}]
+CREATE OR REPLACE FUNCTION fail_enrichments(
+    p_items JSONB
+)
+RETURNS INT AS $$
+DECLARE
+    v_failed INT;
+BEGIN
+    WITH updated AS (
+        UPDATE vocabulary_expansion_queue q
+        SET
+            status = CASE WHEN q.retry_count + 1 >= q.max_retries THEN 'failed' ELSE 'pending' END,
+            error_message = i.error,
+            retry_count = q.retry_count + 1,
+            processed_at = CASE WHEN q.retry_count + 1 >= q.max_retries THEN now() ELSE q.processed_at END,
+            processing_started_at = CASE WHEN q.retry_count + 1 >= q.max_retries THEN q.processing_started_at ELSE NULL END
+        FROM (
+            SELECT
+                (e->>'queue_id')::uuid AS queue_id,
+                e->>'error' AS error
+            FROM jsonb_array_elements(p_items) e
+        ) i
+        WHERE q.id = i.queue_id
+        RETURNING q.status
+    )
+    SELECT count(*) INTO v_failed FROM updated WHERE status = 'failed';
+
+    -- Update stats
+    IF v_failed > 0 THEN
+        INSERT INTO learning_stats (stat_date, queue_items_failed)
+        VALUES (CURRENT_DATE, v_failed)
+        ON CONFLICT (stat_date)
+        DO UPDATE SET
+            queue_items_failed = learning_stats.queue_items_failed + v_failed,
+            updated_at = now();
+    END IF;
+
+    RETURN v_failed;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION fail_enrichments IS 'Fail a batch of queue items, re-queueing those with retries left';
@@ -0,0 +1,39 @@
+-- Atomic learning_stats increments
+-- ExpansionEngine counts enrichments in memory and flushes them here
+-- periodically, instead of reading today's row and writing back the sum
+-- (which lost counts when workers ran concurrently).
+
+-- Add counts to daily stats, creating the rows as needed
+-- p_stats: [{"stat_date": "YYYY-MM-DD", "words_enriched": n, ...}]
+-- Omitted counters add 0
+CREATE OR REPLACE FUNCTION increment_learning_stats(
+    p_stats JSONB
+)
+RETURNS VOID AS $$
+    INSERT INTO learning_stats AS s (
+        stat_date,
+        words_detected,
+        words_enriched,
+        dictionary_matches,
+        ai_enrichments,
+        api_calls_made
+    )
+    SELECT
+        COALESCE((e->>'stat_date')::date, CURRENT_DATE),
+        COALESCE((e->>'words_detected')::int, 0),
+        COALESCE((e->>'words_enriched')::int, 0),
+        COALESCE((e->>'dictionary_matches')::int, 0),
+        COALESCE((e->>'ai_enrichments')::int, 0),
+        COALESCE((e->>'api_calls_made')::int, 0)
+    FROM jsonb_array_elements(p_stats) e
+    ON CONFLICT (stat_date)
+    DO UPDATE SET
+        words_detected = COALESCE(s.words_detected, 0) + EXCLUDED.words_detected,
+        words_enriched = COALESCE(s.words_enriched, 0) + EXCLUDED.words_enriched,
+        dictionary_matches = COALESCE(s.dictionary_matches, 0) + EXCLUDED.dictionary_matches,
+        ai_enrichments = COALESCE(s.ai_enrichments, 0) + EXCLUDED.ai_enrichments,
+        api_calls_made = COALESCE(s.api_calls_made, 0) + EXCLUDED.api_calls_made,
+        updated_at = now();
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION increment_learning_stats IS 'Atomically add batched counts to daily learning stats';
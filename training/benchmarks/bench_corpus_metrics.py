@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Corpus Metrics Benchmark.
+
+Times the shared CorpusMetrics engine against the previous per-pair
+implementations on the nicolingua-0005 corpus and checks that every
+score is identical.
+
+Predictions are deterministic perturbations of the references (dropped,
+swapped and misspelled words, some exact copies), so all branches of the
+scores are exercised. Each scorer runs over the corpus `--models` times,
+as the benchmark does when several models are scored against the same
+references.
+
+Usage:
+    python -m benchmarks.bench_corpus_metrics
+    python -m benchmarks.bench_corpus_metrics --limit 20000 --models 3
+    python -m benchmarks.bench_corpus_metrics --synthetic 50000  # no corpus needed
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from .data.manding_loader import MandingDataLoader
+from .metrics.corpus_metrics import CorpusMetrics, char_coverage, char_jaccard, char_set, text_profile
+
+
+# ==================== Previous implementations ====================
+
+def legacy_partial_match(predictions: List[str], references: List[str]) -> float:
+    if not predictions or not references:
+        return 0.0
+    if len(predictions) != len(references):
+        min_len = min(len(predictions), len(references))
+        predictions = predictions[:min_len]
+        references = references[:min_len]
+    matches = 0
+    for pred, ref in zip(predictions, references):
+        pred_lower = pred.lower()
+        ref_lower = ref.lower()
+        if ref_lower in pred_lower:
+            matches += 1
+        elif any(word in pred_lower for word in ref_lower.split() if len(word) > 2):
+            matches += 0.5
+    return matches / len(predictions)
+
+
+def legacy_word_overlap(predictions: List[str], references: List[str]) -> float:
+    if not predictions or not references:
+        return 0.0
+    if len(predictions) != len(references):
+        min_len = min(len(predictions), len(references))
+        predictions = predictions[:min_len]
+        references = references[:min_len]
+    total_overlap = 0.0
+    for pred, ref in zip(predictions, references):
+        pred_words = set(re.findall(r'\w+', pred.lower()))
+        ref_words = set(re.findall(r'\w+', ref.lower()))
+        if not pred_words or not ref_words:
+            continue
+        total_overlap += len(pred_words & ref_words) / len(pred_words | ref_words)
+    return total_overlap / len(predictions)
+
+
+def legacy_fuzzy_match(predictions: List[str], references: List[str], threshold: float = 0.8) -> float:
+    if not predictions or not references:
+        return 0.0
+
+    def char_overlap(s1: str, s2: str) -> float:
+        set1 = set(s1.lower())
+        set2 = set(s2.lower())
+        if not set1 or not set2:
+            return 0.0
+        return len(set1 & set2) / len(set1 | set2)
+
+    matches = sum(
+        1 for pred, ref in zip(predictions, references)
+        if char_overlap(pred, ref) >= threshold
+    )
+    return matches / len(predictions)
+
+
+def legacy_calculate_similarity(pred: str, ref: str) -> float:
+    if not pred or not ref:
+        return 0.0
+    pred_chars = set(pred.lower())
+    ref_chars = set(ref.lower())
+    if not ref_chars:
+        return 0.0
+    return len(pred_chars & ref_chars) / len(ref_chars)
+
+
+def legacy_word_similarity(pred: str, ref: str) -> float:
+    if not pred or not ref:
+        return 0.0
+    pred_chars = set(pred)
+    ref_chars = set(ref)
+    if not ref_chars:
+        return 0.0
+    union = len(pred_chars | ref_chars)
+    return len(pred_chars & ref_chars) / union if union > 0 else 0.0
+
+
+# ==================== Corpus ====================
+
+def perturb(text: str, rng: random.Random) -> str:
+    """A plausible model output for `text`."""
+    roll = rng.random()
+    if roll < 0.15:
+        return text
+    if roll < 0.25:
+        return f"The translation is: {text}"
+    words = text.split()
+    if roll < 0.35 or not words:
+        return ""
+    out = []
+    for word in words:
+        r = rng.random()
+        if r < 0.15:
+            continue
+        if r < 0.25 and len(word) > 3:
+            i = rng.randrange(len(word) - 1)
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        out.append(word.upper() if rng.random() < 0.05 else word)
+    if len(out) > 2 and rng.random() < 0.3:
+        i = rng.randrange(len(out) - 1)
+        out[i], out[i + 1] = out[i + 1], out[i]
+    return " ".join(out)
+
+
+def load_corpus(limit: int, synthetic: int, seed: int) -> Tuple[List[str], str]:
+    if synthetic:
+        rng = random.Random(seed)
+        alphabet = "abcdefghijklmnopqrstuvwxyzɛɔɲŋ" + "".join(chr(c) for c in range(0x07CA, 0x07EA))
+        refs = [
+            " ".join(
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 9)))
+                for _ in range(rng.randint(1, 14))
+            )
+            for _ in range(synthetic)
+        ]
+        return refs, f"synthetic ({synthetic:,} sentences)"
+
+    pairs = MandingDataLoader().load_nicolingua_translations(limit=limit or None)
+    refs = []
+    for pair in pairs:
+        refs.extend(t for t in (pair.nko_text, pair.english_text, pair.french_text) if t)
+    return refs, f"nicolingua-0005 ({len(pairs):,} pairs, {len(refs):,} sentences)"
+
+
+# ==================== Benchmark ====================
+
+def run_scorers(
+    predictions: List[str],
+    references: List[str],
+    models: int,
+    scorers: Dict[str, Callable],
+) -> Tuple[Dict[str, object], float]:
+    start = time.perf_counter()
+    scores: Dict[str, object] = {}
+    for _ in range(models):
+        for name, scorer in scorers.items():
+            scores[name] = scorer(predictions, references)
+    return scores, time.perf_counter() - start
+
+
+def per_pair(scorer: Callable) -> Callable:
+    return lambda predictions, references: [scorer(p, r) for p, r in zip(predictions, references)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the corpus metrics engine")
+    parser.add_argument("--limit", type=int, default=0, help="Max nicolingua pairs (0 = all)")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Use N synthetic sentences instead of the corpus")
+    parser.add_argument("--models", type=int, default=3,
+                        help="Times each scorer runs over the corpus")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    references, label = load_corpus(args.limit, args.synthetic, args.seed)
+    if not references:
+        print("No nicolingua data found. Run scripts/download_nicolingua.py, "
+              "or pass --synthetic N.")
+        sys.exit(1)
+
+    rng = random.Random(args.seed)
+    predictions = [perturb(ref, rng) for ref in references]
+
+    print(f"Corpus: {label}")
+    print(f"Scoring {len(references):,} pairs x {args.models} models\n")
+
+    legacy_scores, legacy_seconds = run_scorers(
+        predictions, references, args.models,
+        scorers={
+            "partial_match": legacy_partial_match,
+            "word_overlap": legacy_word_overlap,
+            "fuzzy_match": legacy_fuzzy_match,
+            "char_coverage": per_pair(legacy_calculate_similarity),
+            "char_jaccard": per_pair(legacy_word_similarity),
+        },
+    )
+
+    text_profile.cache_clear()
+    char_set.cache_clear()
+
+    # Each model's outputs are scored as one corpus, sharing its profiles
+    engine_scores: Dict[str, object] = {}
+    start = time.perf_counter()
+    for _ in range(args.models):
+        corpus = CorpusMetrics(predictions, references)
+        engine_scores["partial_match"] = corpus.partial_match()
+        engine_scores["word_overlap"] = corpus.word_overlap()
+        engine_scores["fuzzy_match"] = corpus.fuzzy_match()
+        engine_scores["char_coverage"] = corpus.char_coverage_scores()
+        engine_scores["char_jaccard"] = corpus.char_jaccard_scores()
+    engine_seconds = time.perf_counter() - start
+
+    # The per-sample helpers used by the tasks must agree too
+    pair_scores, _ = run_scorers(
+        predictions, references, 1,
+        scorers={
+            "char_coverage": per_pair(char_coverage),
+            "char_jaccard": per_pair(char_jaccard),
+        },
+    )
+    for name, scores in pair_scores.items():
+        if scores != legacy_scores[name]:
+            engine_scores[name] = None
+
+    mismatches = [name for name in legacy_scores if legacy_scores[name] != engine_scores[name]]
+
+    print(f"{'Score':<16} {'Value':>10}  Identical")
+    for name, value in legacy_scores.items():
+        shown = value if not isinstance(value, list) else sum(value) / max(1, len(value))
+        print(f"{name:<16} {shown:>10.6f}  {'yes' if name not in mismatches else 'NO'}")
+
+    print(f"\nPrevious per-pair functions: {legacy_seconds:8.2f}s")
+    print(f"CorpusMetrics engine:        {engine_seconds:8.2f}s")
+    print(f"Speedup:                     {legacy_seconds / max(engine_seconds, 1e-9):8.2f}x")
+    print(f"Profiles cached:             {text_profile.cache_info().currsize:,}")
+
+    if mismatches:
+        print(f"\nScore mismatch: {', '.join(mismatches)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
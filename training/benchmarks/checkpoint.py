@@ -0,0 +1,181 @@
+"""
+Per-Sample Checkpointing for Manding Benchmark Runs.
+
+Every completed sample is appended to a JSONL log as soon as it finishes,
+keyed by (model, task, direction, sample_id). A run started with
+resume=True skips samples already in the log and rebuilds task results
+(and hence aggregate metrics) from the logged records plus whatever it
+still had to run.
+
+Each record also stores a fingerprint of the test item, so a sample whose
+content changed between runs (e.g. a re-sampled curriculum item reusing
+an ID) is re-run rather than matched to a stale answer. Samples that
+ended in an error (rate limits, timeouts) are logged but not treated as
+done, so a resumed run retries them.
+
+Usage:
+    checkpoint = SampleCheckpoint("data/cache/manding_checkpoint.jsonl", resume=True)
+    if not checkpoint.is_done(model, "translation", "nko_english", pair.id, fp):
+        ...
+    checkpoint.record(model, "translation", "nko_english", pair.id, fp, result)
+"""
+
+import hashlib
+import json
+import os
+import typing
+from dataclasses import asdict, fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+
+T = TypeVar("T")
+
+CheckpointKey = Tuple[str, str, str, str]
+
+
+def item_fingerprint(item: Any) -> str:
+    """Stable content hash of a test item (dataclass repr)."""
+    return hashlib.sha1(repr(item).encode("utf-8")).hexdigest()[:16]
+
+
+def result_to_dict(result: Any) -> Dict[str, Any]:
+    """Serialize a result dataclass, storing enums by value."""
+    data = asdict(result)
+    for key, value in data.items():
+        if isinstance(value, Enum):
+            data[key] = value.value
+    return data
+
+
+def result_from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+    """Rebuild a result dataclass, restoring enum fields from their values."""
+    hints = typing.get_type_hints(cls)
+    kwargs = {}
+    for f in fields(cls):
+        if f.name not in data:
+            continue
+        value = data[f.name]
+        hint = hints.get(f.name)
+        if isinstance(hint, type) and issubclass(hint, Enum) and value is not None:
+            value = hint(value)
+        kwargs[f.name] = value
+    return cls(**kwargs)
+
+
+class SampleCheckpoint:
+    """
+    Append-only JSONL log of completed benchmark samples.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        """
+        Open the checkpoint log.
+
+        Args:
+            path: JSONL file
+            resume: Load existing records; otherwise an existing log is
+                    moved aside (to *.prev.jsonl) and a fresh one started
+                    when the first sample is recorded
+        """
+        self.path = Path(path)
+        self.resume = resume
+        self._records: Dict[CheckpointKey, Dict[str, Any]] = {}
+        self.stats = {"loaded": 0, "skipped": 0, "recorded": 0}
+
+        if resume and self.path.exists():
+            self._load()
+
+        # Opened on the first record, so a run that never writes leaves
+        # the previous log where it is
+        self._file = None
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.resume and self.path.exists():
+            os.replace(self.path, self.path.with_suffix(".prev.jsonl"))
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a torn last line
+                    continue
+                key = (record["model"], record["task"], record["direction"], record["sample_id"])
+                # Later records supersede earlier ones (e.g. a retried error)
+                self._records[key] = record
+        self.stats["loaded"] = len(self._records)
+
+    @staticmethod
+    def _key(model: str, task: str, direction: str, sample_id: Any) -> CheckpointKey:
+        return (model, task, direction or "", str(sample_id))
+
+    def get(
+        self,
+        model: str,
+        task: str,
+        direction: str,
+        sample_id: Any,
+        fingerprint: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Logged result for a completed sample, or None if it must be run.
+
+        Records with an error, or whose fingerprint doesn't match, don't count.
+        """
+        record = self._records.get(self._key(model, task, direction, sample_id))
+        if record is None:
+            return None
+        if fingerprint is not None and record.get("fingerprint") != fingerprint:
+            return None
+        if record["result"].get("error"):
+            return None
+        return record["result"]
+
+    def is_done(self, *args, **kwargs) -> bool:
+        """Whether a sample already has a usable logged result."""
+        return self.get(*args, **kwargs) is not None
+
+    def record(
+        self,
+        model: str,
+        task: str,
+        direction: str,
+        sample_id: Any,
+        fingerprint: Optional[str],
+        result: Any,
+    ) -> None:
+        """Append one completed sample (flushed immediately)."""
+        key = self._key(model, task, direction, sample_id)
+        record = {
+            "model": key[0],
+            "task": key[1],
+            "direction": key[2],
+            "sample_id": key[3],
+            "fingerprint": fingerprint,
+            "result": result_to_dict(result) if is_dataclass(result) else result,
+            "recorded_at": datetime.now().isoformat(),
+        }
+        self._records[key] = record
+        if self._file is None:
+            self._open()
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.stats["recorded"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get checkpoint statistics."""
+        return {**self.stats, "path": str(self.path)}
+
+    def close(self) -> None:
+        """Close the log file."""
+        if self._file and not self._file.closed:
+            self._file.close()
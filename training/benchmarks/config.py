@@ -69,6 +69,32 @@ class BenchmarkConfig:
     
     # Concurrent requests per provider
     max_concurrent_requests: int = 5
+    provider_max_concurrency: Dict[str, int] = field(default_factory=dict)  # Overrides by provider name
+    
+    # Requests-per-minute budget by provider name (unlisted providers
+    # fall back to 60 / rate_limit_delay; 0 = unlimited)
+    provider_requests_per_minute: Dict[str, float] = field(default_factory=lambda: {
+        "anthropic": 50,
+        "openai": 500,
+        "google": 150,
+    })
+    
+    # Response cache: "off", "on" (read + write) or "only" (never call APIs)
+    response_cache_mode: str = "off"
+    response_cache_path: Path = field(default_factory=lambda: Path("data/cache/benchmark_responses.sqlite"))
+    response_cache_ttl_hours: float = 24 * 30
+    response_cache_max_entries: int = 200_000
+    
+    # Batch API mode (Anthropic / OpenAI / Gemini):
+    # requests are collected into one asynchronous batch job per burst
+    batch_mode: bool = False
+    batch_max_requests: int = 10000       # Submit once this many are queued
+    batch_collect_seconds: float = 2.0    # ...or once none arrived for this long
+    batch_poll_seconds: float = 30.0
+    batch_cost_discount: float = 0.5      # Batch price relative to direct calls
+    
+    # Per-sample checkpoint log (MandingBenchmark, see --resume)
+    checkpoint_path: Path = field(default_factory=lambda: Path("data/cache/manding_checkpoint.jsonl"))
     
     # Multilingual benchmark settings
     enable_multilingual: bool = True
@@ -29,7 +29,7 @@ import asyncio
 import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable
 
 from .config import (
     MODELS,
@@ -57,17 +57,22 @@ from .providers.base import BaseProvider
 from .providers.anthropic_provider import AnthropicProvider
 from .providers.openai_provider import OpenAIProvider
 from .providers.google_provider import GoogleProvider
+from .providers.concurrency import configure_from_benchmark_config, get_limiter_stats
+from .providers.response_cache import ResponseCache
+from .checkpoint import SampleCheckpoint, item_fingerprint, result_from_dict
 from .tasks.translation import TranslationTask
 from .tasks.cross_language import (
     CrossMandingTranslationTask,
     ScriptTransliterationTask,
     DialectIdentificationTask,
     CognateRecognitionTask,
+    CrossLanguageResult,
     calculate_cross_language_metrics,
 )
 from .tasks.curriculum import (
     CurriculumTask,
     CurriculumTestGenerator,
+    CurriculumResult,
     CEFRLevel,
     calculate_curriculum_metrics,
 )
@@ -90,9 +95,26 @@ class MandingBenchmark:
     - Report generation with language pair breakdowns
     """
     
-    def __init__(self, config: Optional[BenchmarkConfig] = None):
+    def __init__(self, config: Optional[BenchmarkConfig] = None, resume: bool = False):
+        """
+        Args:
+            config: Benchmark configuration (defaults to the multilingual preset)
+            resume: Skip samples already in the checkpoint log from an
+                    earlier, interrupted run
+        """
         self.config = config or get_multilingual_config()
         self.scorer = CompositeScorer()
+        configure_from_benchmark_config(self.config)
+        
+        # Shared response cache (attached to every provider)
+        self.response_cache: Optional[ResponseCache] = None
+        if self.config.response_cache_mode != "off":
+            self.response_cache = ResponseCache(
+                path=str(self.config.response_cache_path),
+                mode=self.config.response_cache_mode,
+                ttl_hours=self.config.response_cache_ttl_hours,
+                max_entries=self.config.response_cache_max_entries,
+            )
         self.report_generator = MandingReportGenerator()
         self.data_loader = MandingDataLoader()
         
@@ -100,6 +122,19 @@ class MandingBenchmark:
         self.results: Dict[str, Dict[str, Any]] = {}
         self.testset: Optional[MandingTestSet] = None
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Per-sample checkpoint log (append-only JSONL)
+        self.checkpoint = SampleCheckpoint(self.config.checkpoint_path, resume=resume)
+    
+    def _enable_batch_mode(self, provider: BaseProvider) -> None:
+        """Route a provider's requests through its batch API, if available."""
+        enabled = provider.enable_batch_mode(
+            max_requests=self.config.batch_max_requests,
+            collect_seconds=self.config.batch_collect_seconds,
+            poll_seconds=self.config.batch_poll_seconds,
+        )
+        if not enabled:
+            print(f"  Note: {provider.provider_name} batch API unavailable, using direct calls")
     
     def _create_provider(self, model_key: str) -> Optional[BaseProvider]:
         """Create provider instance for a model."""
@@ -124,11 +159,70 @@ class MandingBenchmark:
                 print(f"  Warning: {model_key} not available (check API key)")
                 return None
             
+            provider.response_cache = self.response_cache
+            if self.config.batch_mode:
+                self._enable_batch_mode(provider)
             return provider
         except Exception as e:
             print(f"  Warning: Failed to create provider for {model_key}: {e}")
             return None
     
+    async def _run_checkpointed(
+        self,
+        model_key: str,
+        task_name: str,
+        direction: str,
+        items: List[Any],
+        result_cls: type,
+        run_task: Callable[[List[Any], Callable], Awaitable[List[Any]]],
+    ) -> List[Any]:
+        """
+        Run a task over `items`, skipping samples already in the checkpoint.
+        
+        Args:
+            model_key: Model identifier
+            task_name: Checkpoint task name
+            direction: Language pair / level / variant ("" if none)
+            items: Test items (anything with an `id`)
+            result_cls: Result dataclass to rebuild logged samples into
+            run_task: Coroutine function (pending_items, result_callback)
+                      running the task on the samples still to do
+            
+        Returns:
+            Results for all items in their original order: logged results
+            for skipped samples, fresh ones for the rest
+        """
+        fingerprints = {item.id: item_fingerprint(item) for item in items}
+        logged = {}
+        pending = []
+        for item in items:
+            record = self.checkpoint.get(model_key, task_name, direction, item.id, fingerprints[item.id])
+            if record is not None:
+                logged[item.id] = result_from_dict(result_cls, record)
+            else:
+                pending.append(item)
+        
+        if logged:
+            self.checkpoint.stats["skipped"] += len(logged)
+            print(f"      Resuming: {len(logged)} samples from checkpoint, {len(pending)} to run")
+        
+        fresh = {}
+        
+        def on_result(item, result):
+            fresh[item.id] = result
+            self.checkpoint.record(model_key, task_name, direction, item.id, fingerprints[item.id], result)
+        
+        if pending:
+            await run_task(pending, on_result)
+        
+        merged = []
+        for item in items:
+            if item.id in fresh:
+                merged.append(fresh[item.id])
+            elif item.id in logged:
+                merged.append(logged[item.id])
+        return merged
+    
     def _progress_callback(self, current: int, total: int, task: str = ""):
         """Print progress updates."""
         if total > 0:
@@ -221,12 +315,16 @@ class MandingBenchmark:
                     continue
                 
                 # Run cross-language translation task
-                task_results = await cross_task.run(
-                    provider=provider,
-                    translation_pairs=test_pairs,
-                    source_lang=source_lang,
-                    target_lang=target_lang,
-                    progress_callback=self._progress_callback,
+                task_results = await self._run_checkpointed(
+                    model_key, "translation", pair_key, test_pairs, CrossLanguageResult,
+                    lambda items, on_result: cross_task.run(
+                        provider=provider,
+                        translation_pairs=items,
+                        source_lang=source_lang,
+                        target_lang=target_lang,
+                        progress_callback=self._progress_callback,
+                        result_callback=on_result,
+                    ),
                 )
                 
                 metrics = calculate_cross_language_metrics(task_results)
@@ -280,11 +378,15 @@ class MandingBenchmark:
         
         if vocab_with_latin:
             try:
-                script_results = await script_task.run(
-                    provider=provider,
-                    vocabulary=vocab_with_latin,
-                    direction="nko_to_latin",
-                    progress_callback=self._progress_callback,
+                script_results = await self._run_checkpointed(
+                    model_key, "script_transliteration", "nko_to_latin", vocab_with_latin, CrossLanguageResult,
+                    lambda items, on_result: script_task.run(
+                        provider=provider,
+                        vocabulary=items,
+                        direction="nko_to_latin",
+                        progress_callback=self._progress_callback,
+                        result_callback=on_result,
+                    ),
                 )
                 results["script_transliteration"] = calculate_cross_language_metrics(script_results)
                 print(f"      Script: {results['script_transliteration']['accuracy']:.1f}%")
@@ -295,10 +397,14 @@ class MandingBenchmark:
         print("    Testing dialect identification...")
         dialect_task = DialectIdentificationTask()
         try:
-            dialect_results = await dialect_task.run(
-                provider=provider,
-                pairs=self.testset.bambara_french_pairs[:50],
-                progress_callback=self._progress_callback,
+            dialect_results = await self._run_checkpointed(
+                model_key, "dialect_identification", "", self.testset.bambara_french_pairs[:50], CrossLanguageResult,
+                lambda items, on_result: dialect_task.run(
+                    provider=provider,
+                    pairs=items,
+                    progress_callback=self._progress_callback,
+                    result_callback=on_result,
+                ),
             )
             results["dialect_identification"] = calculate_cross_language_metrics(dialect_results)
             print(f"      Dialect ID: {results['dialect_identification']['accuracy']:.1f}%")
@@ -310,10 +416,14 @@ class MandingBenchmark:
             print("    Testing cognate recognition...")
             cognate_task = CognateRecognitionTask()
             try:
-                cognate_results = await cognate_task.run(
-                    provider=provider,
-                    cognates=self.testset.nko_bambara_cognates[:50],
-                    progress_callback=self._progress_callback,
+                cognate_results = await self._run_checkpointed(
+                    model_key, "cognate_recognition", "", self.testset.nko_bambara_cognates[:50], CrossLanguageResult,
+                    lambda items, on_result: cognate_task.run(
+                        provider=provider,
+                        cognates=items,
+                        progress_callback=self._progress_callback,
+                        result_callback=on_result,
+                    ),
                 )
                 results["cognate_recognition"] = calculate_cross_language_metrics(cognate_results)
                 print(f"      Cognates: {results['cognate_recognition']['accuracy']:.1f}%")
@@ -351,10 +461,14 @@ class MandingBenchmark:
                     print(f"      No tests generated for {level}")
                     continue
                 
-                level_results = await curriculum_task.run(
-                    provider=provider,
-                    test_items=test_items,
-                    progress_callback=self._progress_callback,
+                level_results = await self._run_checkpointed(
+                    model_key, "curriculum", level, test_items, CurriculumResult,
+                    lambda items, on_result: curriculum_task.run(
+                        provider=provider,
+                        test_items=items,
+                        progress_callback=self._progress_callback,
+                        result_callback=on_result,
+                    ),
                 )
                 
                 metrics = calculate_curriculum_metrics(level_results)
@@ -438,6 +552,20 @@ class MandingBenchmark:
         )
         results["avg_latency_ms"] = stats.get("avg_latency_ms", 0)
         
+        if stats.get("batch"):
+            results["estimated_cost"] *= self.config.batch_cost_discount
+            results["batch"] = stats["batch"]
+            print(f"  📦 Batch API: {stats['batch']['requests']} requests in "
+                  f"{stats['batch']['batches']} batches ({stats['batch']['failed']} failed)")
+        
+        if self.response_cache:
+            results["response_cache"] = {
+                "hits": stats.get("cache_hits", 0),
+                "misses": stats.get("cache_misses", 0),
+            }
+            print(f"  💾 Response cache: {results['response_cache']['hits']} hits, "
+                  f"{results['response_cache']['misses']} misses")
+        
         return results
     
     async def run(
@@ -506,6 +634,20 @@ class MandingBenchmark:
                 print(f"  ❌ Error benchmarking {model_key}: {e}")
                 self.results[model_key] = {"error": str(e)}
         
+        self.checkpoint.close()
+        ckpt = self.checkpoint.get_stats()
+        print(f"\n📌 Checkpoint: {ckpt['recorded']} samples recorded, "
+              f"{ckpt['skipped']} resumed from {ckpt['path']}")
+        
+        print(f"\n⏱️  Provider request limits:")
+        for name, stats in get_limiter_stats().items():
+            print(
+                f"   {name}: {stats['requests']} requests, "
+                f"peak {stats['peak_in_flight']}/{stats['max_concurrency']} in flight, "
+                f"{stats['requests_per_minute']:.0f} rpm budget "
+                f"(waited {stats['rate_wait_seconds']:.1f}s)"
+            )
+        
         return self.results
     
     def save_results(self, output_dir: Optional[Path] = None) -> Dict[str, Path]:
@@ -721,6 +863,39 @@ Examples:
         help="Output directory for reports",
     )
     
+    # Response cache
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--cache", dest="cache_mode", action="store_const", const="on",
+        help="Reuse cached provider responses and cache new ones",
+    )
+    cache_group.add_argument(
+        "--no-cache", dest="cache_mode", action="store_const", const="off",
+        help="Always call the provider APIs (default)",
+    )
+    cache_group.add_argument(
+        "--cache-only", dest="cache_mode", action="store_const", const="only",
+        help="Only use cached responses; uncached requests fail without an API call",
+    )
+    parser.add_argument(
+        "--cache-path", type=str,
+        help="Response cache SQLite file",
+    )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Send Anthropic/OpenAI/Gemini requests through their batch APIs (cheaper, slower)",
+    )
+    
+    # Checkpointing
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Resume an interrupted run: skip samples already in the checkpoint log",
+    )
+    parser.add_argument(
+        "--checkpoint", type=str,
+        help="Per-sample checkpoint JSONL file",
+    )
+    
     args = parser.parse_args()
     
     # Determine config
@@ -739,6 +914,15 @@ Examples:
     else:
         config = get_full_config()
     
+    if args.cache_mode:
+        config.response_cache_mode = args.cache_mode
+    if args.cache_path:
+        config.response_cache_path = Path(args.cache_path)
+    if args.batch:
+        config.batch_mode = True
+    if args.checkpoint:
+        config.checkpoint_path = Path(args.checkpoint)
+    
     # Determine models
     model_keys = None
     if args.models:
@@ -764,7 +948,7 @@ Examples:
                 language_pairs.append((parts[0], parts[1]))
     
     # Run benchmark
-    benchmark = MandingBenchmark(config)
+    benchmark = MandingBenchmark(config, resume=args.resume)
     
     await benchmark.run(
         model_keys=model_keys,
@@ -5,10 +5,13 @@ Evaluation metrics for N'Ko benchmarks.
 from .translation_metrics import TranslationMetrics
 from .accuracy_metrics import AccuracyMetrics
 from .composite_scorer import CompositeScorer
+from .corpus_metrics import CorpusMetrics, text_profile
 
 __all__ = [
     "TranslationMetrics",
     "AccuracyMetrics",
     "CompositeScorer",
+    "CorpusMetrics",
+    "text_profile",
 ]
 
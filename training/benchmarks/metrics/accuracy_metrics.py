@@ -8,6 +8,8 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 import re
 
+from .corpus_metrics import CorpusMetrics
+
 
 @dataclass
 class AccuracyScores:
@@ -83,24 +85,8 @@ class AccuracyMetrics:
         if not predictions or not references:
             return 0.0
         
-        if len(predictions) != len(references):
-            min_len = min(len(predictions), len(references))
-            predictions = predictions[:min_len]
-            references = references[:min_len]
-        
-        matches = 0
-        for pred, ref in zip(predictions, references):
-            pred_lower = pred.lower()
-            ref_lower = ref.lower()
-            
-            # Check if reference content appears in prediction
-            if ref_lower in pred_lower:
-                matches += 1
-            # Also check words
-            elif any(word in pred_lower for word in ref_lower.split() if len(word) > 2):
-                matches += 0.5  # Partial credit
-        
-        return matches / len(predictions)
+        # Reference contained in prediction = 1, any reference word = 0.5
+        return CorpusMetrics(predictions, references).partial_match()
     
     def calculate_word_overlap(
         self,
@@ -120,24 +106,7 @@ class AccuracyMetrics:
         if not predictions or not references:
             return 0.0
         
-        if len(predictions) != len(references):
-            min_len = min(len(predictions), len(references))
-            predictions = predictions[:min_len]
-            references = references[:min_len]
-        
-        total_overlap = 0.0
-        
-        for pred, ref in zip(predictions, references):
-            pred_words = set(re.findall(r'\w+', pred.lower()))
-            ref_words = set(re.findall(r'\w+', ref.lower()))
-            
-            if not pred_words or not ref_words:
-                continue
-            
-            overlap = len(pred_words & ref_words) / len(pred_words | ref_words)
-            total_overlap += overlap
-        
-        return total_overlap / len(predictions)
+        return CorpusMetrics(predictions, references).word_overlap()
     
     def calculate_response_rate(
         self,
@@ -174,10 +143,12 @@ class AccuracyMetrics:
         Returns:
             AccuracyScores with all metrics
         """
+        # Tokenize the corpus once for both overlap scores
+        corpus = CorpusMetrics(predictions, references)
         return AccuracyScores(
             exact_match=self.calculate_exact_match(predictions, references),
-            partial_match=self.calculate_partial_match(predictions, references),
-            content_overlap=self.calculate_word_overlap(predictions, references),
+            partial_match=corpus.partial_match(),
+            content_overlap=corpus.word_overlap(),
             response_rate=self.calculate_response_rate(successes) if successes else 1.0,
         )
 
@@ -0,0 +1,293 @@
+"""
+Corpus Metrics Engine for N'Ko Benchmark.
+
+One implementation of the overlap / Jaccard / partial-match scores used
+across the benchmark (AccuracyMetrics, calculate_fuzzy_match and the
+cross-language tasks), computed for a whole prediction/reference corpus
+at once:
+
+- Character scores: the corpus is encoded once into a code-point array
+  and turned into a (texts x alphabet) presence matrix with numpy; set
+  sizes and intersections for every pair are row-wise counts
+- Word scores: each distinct text is tokenized once (\\w+ word set and
+  the partial-credit words) and the profile is cached by string, so a
+  reference scored against several models is tokenized only once
+
+Every score equals the original per-pair function's result exactly
+(same integer counts, same division, same left-to-right accumulation):
+
+    char_jaccard   set(p) vs set(r) Jaccard      (_word_similarity; lowercase=True
+                                                  gives calculate_fuzzy_match)
+    char_coverage  |set(p) & set(r)| / |set(r)|  (_calculate_similarity)
+    word_jaccard   \\w+ word-set Jaccard          (calculate_word_overlap)
+    partial_match  1 / 0.5 / 0 credit            (calculate_partial_match)
+
+Without numpy the character scores fall back to cached per-text sets.
+
+Usage:
+    metrics = CorpusMetrics(predictions, references)
+    metrics.partial_match()
+    metrics.word_overlap()
+    metrics.fuzzy_match(threshold=0.8)
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+_WORD_RE = re.compile(r'\w+')
+
+PROFILE_CACHE_SIZE = 200_000
+
+# Rows per presence matrix, bounding memory on large corpora
+CHAR_MATRIX_CHUNK = 50_000
+
+
+class TextProfile(NamedTuple):
+    """Word-level tokenization of one text, computed once and cached."""
+    text: str
+    lower: str
+    words: FrozenSet[str]          # \w+ tokens of the lowercased text
+    partial_words: Tuple[str, ...] # Whitespace tokens (len > 2) of the lowercased text
+
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def text_profile(text: str) -> TextProfile:
+    """Get the (cached) word profile of a text."""
+    lower = text.lower()
+    return TextProfile(
+        text=text,
+        lower=lower,
+        words=frozenset(_WORD_RE.findall(lower)),
+        partial_words=tuple(word for word in lower.split() if len(word) > 2),
+    )
+
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def char_set(text: str, lowercase: bool = False) -> FrozenSet[str]:
+    """Get the (cached) character set of a text."""
+    return frozenset(text.lower() if lowercase else text)
+
+
+# ==================== Per-pair scores ====================
+
+def char_jaccard(pred: str, ref: str, lowercase: bool = False) -> float:
+    """
+    Character-set Jaccard similarity.
+
+    Args:
+        pred: Prediction
+        ref: Reference
+        lowercase: Compare the lowercased texts
+    """
+    a, b = char_set(pred, lowercase), char_set(ref, lowercase)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def char_coverage(pred: str, ref: str) -> float:
+    """Fraction of the reference's (lowercased) characters present in the prediction."""
+    if not pred or not ref:
+        return 0.0
+    a, b = char_set(pred, True), char_set(ref, True)
+    return len(a & b) / len(b)
+
+
+def word_jaccard(pred: str, ref: str) -> float:
+    """Jaccard similarity of the lowercased \\w+ word sets."""
+    return _word_jaccard(text_profile(pred), text_profile(ref))
+
+
+def partial_match(pred: str, ref: str) -> float:
+    """1.0 if the reference appears in the prediction, 0.5 if one of its words does."""
+    return _partial_match(text_profile(pred), text_profile(ref))
+
+
+def _word_jaccard(p: TextProfile, r: TextProfile) -> float:
+    if not p.words or not r.words:
+        return 0.0
+    overlap = len(p.words & r.words)
+    return overlap / (len(p.words) + len(r.words) - overlap)
+
+
+def _partial_match(p: TextProfile, r: TextProfile) -> float:
+    if r.lower in p.lower:
+        return 1.0
+    if any(word in p.lower for word in r.partial_words):
+        return 0.5
+    return 0.0
+
+
+def _char_counts(
+    predictions: Sequence[str],
+    references: Sequence[str],
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Distinct-character counts for every pair, vectorized.
+
+    Returns:
+        (|set(pred)|, |set(ref)|, |set(pred) & set(ref)|) as int arrays
+    """
+    n = len(predictions)
+    pred_counts = np.zeros(n, dtype=np.int64)
+    ref_counts = np.zeros(n, dtype=np.int64)
+    overlap = np.zeros(n, dtype=np.int64)
+
+    for start in range(0, n, CHAR_MATRIX_CHUNK):
+        texts = list(predictions[start:start + CHAR_MATRIX_CHUNK])
+        texts += references[start:start + CHAR_MATRIX_CHUNK]
+        size = len(texts) // 2
+
+        # One code point per character (UTF-32), tagged with its text's row
+        codes = np.frombuffer(
+            "".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+        )
+        rows = np.repeat(
+            np.arange(len(texts)), np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        )
+        # Dense column per distinct code point (a lookup table, no sort)
+        used = np.zeros(0x110000, dtype=bool)
+        used[codes] = True
+        column_of = np.cumsum(used, dtype=np.int32) - 1
+        columns = column_of[codes]
+
+        present = np.zeros((len(texts), int(column_of[-1]) + 1), dtype=bool)
+        present[rows, columns] = True
+        pred_rows, ref_rows = present[:size], present[size:]
+
+        chunk = slice(start, start + size)
+        pred_counts[chunk] = np.count_nonzero(pred_rows, axis=1)
+        ref_counts[chunk] = np.count_nonzero(ref_rows, axis=1)
+        overlap[chunk] = np.count_nonzero(pred_rows & ref_rows, axis=1)
+
+    return pred_counts, ref_counts, overlap
+
+
+# ==================== Corpus ====================
+
+class CorpusMetrics:
+    """
+    Scores for a whole prediction/reference corpus.
+
+    Texts are profiled once; character counts are computed for the whole
+    corpus on first use and shared by every score. Mismatched lengths are
+    truncated to the shorter list (as AccuracyMetrics does).
+    """
+
+    def __init__(self, predictions: Sequence[str], references: Sequence[str]):
+        """
+        Args:
+            predictions: Model outputs
+            references: Expected values
+        """
+        n = min(len(predictions), len(references))
+        self.predictions = list(predictions[:n])
+        self.references = list(references[:n])
+        self._profiles: Optional[Tuple[List[TextProfile], List[TextProfile]]] = None
+        self._char_stats: Dict[bool, Tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self.predictions)
+
+    def _profile_pairs(self):
+        if self._profiles is None:
+            self._profiles = (
+                [text_profile(p) for p in self.predictions],
+                [text_profile(r) for r in self.references],
+            )
+        return zip(*self._profiles)
+
+    def _counts(self, lowercase: bool):
+        """Cached (pred, ref, overlap) character counts."""
+        if lowercase not in self._char_stats:
+            if lowercase:
+                self._char_stats[True] = _char_counts(
+                    [p.lower() for p in self.predictions], [r.lower() for r in self.references]
+                )
+            else:
+                self._char_stats[False] = _char_counts(self.predictions, self.references)
+        return self._char_stats[lowercase]
+
+    @staticmethod
+    def _mean(scores: List[float], count: int) -> float:
+        # Accumulate left to right, exactly like the original loops
+        total = 0.0
+        for score in scores:
+            total += score
+        return total / count if count else 0.0
+
+    # Per-pair score lists
+
+    def exact_match_scores(self) -> List[float]:
+        return [
+            1.0 if p.strip().lower() == r.strip().lower() else 0.0
+            for p, r in zip(self.predictions, self.references)
+        ]
+
+    def partial_match_scores(self) -> List[float]:
+        return [_partial_match(p, r) for p, r in self._profile_pairs()]
+
+    def word_jaccard_scores(self) -> List[float]:
+        return [_word_jaccard(p, r) for p, r in self._profile_pairs()]
+
+    def char_jaccard_scores(self, lowercase: bool = False) -> List[float]:
+        if not HAS_NUMPY or not len(self):
+            return [char_jaccard(p, r, lowercase) for p, r in zip(self.predictions, self.references)]
+        pred_counts, ref_counts, overlap = self._counts(lowercase)
+        union = pred_counts + ref_counts - overlap
+        valid = (pred_counts > 0) & (ref_counts > 0)
+        scores = np.divide(overlap, union, out=np.zeros(len(self)), where=valid)
+        return scores.tolist()
+
+    def char_coverage_scores(self) -> List[float]:
+        if not HAS_NUMPY or not len(self):
+            return [char_coverage(p, r) for p, r in zip(self.predictions, self.references)]
+        _, ref_counts, overlap = self._counts(True)
+        # Empty originals score 0 (lowercasing never empties a text)
+        valid = np.fromiter(
+            (bool(p) and bool(r) for p, r in zip(self.predictions, self.references)),
+            dtype=bool, count=len(self),
+        )
+        scores = np.divide(overlap, ref_counts, out=np.zeros(len(self)), where=valid)
+        return scores.tolist()
+
+    # Aggregates
+
+    def exact_match(self) -> float:
+        """Case-insensitive exact match accuracy."""
+        return self._mean(self.exact_match_scores(), len(self))
+
+    def partial_match(self) -> float:
+        """Mean partial-match credit."""
+        return self._mean(self.partial_match_scores(), len(self))
+
+    def word_overlap(self) -> float:
+        """Mean word-set Jaccard overlap."""
+        return self._mean(self.word_jaccard_scores(), len(self))
+
+    def fuzzy_matches(self, threshold: float = 0.8) -> int:
+        """Number of pairs whose lowercased character Jaccard reaches `threshold`."""
+        return sum(1 for score in self.char_jaccard_scores(lowercase=True) if score >= threshold)
+
+    def fuzzy_match(self, threshold: float = 0.8) -> float:
+        """Fraction of pairs whose lowercased character Jaccard reaches `threshold`."""
+        return self.fuzzy_matches(threshold) / len(self) if len(self) else 0.0
+
+    def summary(self, fuzzy_threshold: float = 0.8) -> Dict[str, float]:
+        """All corpus-level scores."""
+        return {
+            "exact_match": self.exact_match(),
+            "partial_match": self.partial_match(),
+            "word_overlap": self.word_overlap(),
+            "fuzzy_match": self.fuzzy_match(fuzzy_threshold),
+            "char_jaccard": self._mean(self.char_jaccard_scores(), len(self)),
+            "char_coverage": self._mean(self.char_coverage_scores(), len(self)),
+        }
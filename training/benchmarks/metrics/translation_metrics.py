@@ -7,6 +7,8 @@ Calculates BLEU, chrF++, and other translation quality metrics.
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+from .corpus_metrics import CorpusMetrics
+
 try:
     import sacrebleu
     HAS_SACREBLEU = True
@@ -185,22 +187,11 @@ def calculate_fuzzy_match(
     """
     Calculate fuzzy match accuracy.
     
-    Uses simple character overlap for fuzzy matching.
+    Uses character-level Jaccard similarity (case-insensitive).
     """
     if not predictions or not references:
         return 0.0
     
-    def char_overlap(s1: str, s2: str) -> float:
-        """Calculate character-level Jaccard similarity."""
-        set1 = set(s1.lower())
-        set2 = set(s2.lower())
-        if not set1 or not set2:
-            return 0.0
-        return len(set1 & set2) / len(set1 | set2)
-    
-    matches = sum(
-        1 for pred, ref in zip(predictions, references)
-        if char_overlap(pred, ref) >= threshold
-    )
+    matches = CorpusMetrics(predictions, references).fuzzy_matches(threshold)
     return matches / len(predictions)
 
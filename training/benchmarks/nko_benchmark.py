@@ -36,6 +36,8 @@ from .providers.base import BaseProvider
 from .providers.anthropic_provider import AnthropicProvider
 from .providers.openai_provider import OpenAIProvider
 from .providers.google_provider import GoogleProvider
+from .providers.concurrency import configure_from_benchmark_config, get_limiter_stats
+from .providers.response_cache import ResponseCache
 from .tasks.translation import TranslationTask
 from .tasks.script_knowledge import ScriptKnowledgeTask
 from .tasks.vocabulary import VocabularyTask
@@ -60,6 +62,17 @@ class NkoBenchmark:
     def __init__(self, config: Optional[BenchmarkConfig] = None):
         self.config = config or BenchmarkConfig()
         self.scorer = CompositeScorer()
+        configure_from_benchmark_config(self.config)
+        
+        # Shared response cache (attached to every provider)
+        self.response_cache: Optional[ResponseCache] = None
+        if self.config.response_cache_mode != "off":
+            self.response_cache = ResponseCache(
+                path=str(self.config.response_cache_path),
+                mode=self.config.response_cache_mode,
+                ttl_hours=self.config.response_cache_ttl_hours,
+                max_entries=self.config.response_cache_max_entries,
+            )
         self.report_generator = ReportGenerator()
         
         # Results storage
@@ -99,8 +112,21 @@ class NkoBenchmark:
             print(f"  Warning: {model_key} not available (check API key)")
             return None
         
+        provider.response_cache = self.response_cache
+        if self.config.batch_mode:
+            self._enable_batch_mode(provider)
         return provider
     
+    def _enable_batch_mode(self, provider: BaseProvider) -> None:
+        """Route a provider's requests through its batch API, if available."""
+        enabled = provider.enable_batch_mode(
+            max_requests=self.config.batch_max_requests,
+            collect_seconds=self.config.batch_collect_seconds,
+            poll_seconds=self.config.batch_poll_seconds,
+        )
+        if not enabled:
+            print(f"  Note: {provider.provider_name} batch API unavailable, using direct calls")
+    
     def _progress_callback(self, **kwargs):
         """Print progress updates."""
         task = kwargs.get("task", "")
@@ -260,6 +286,11 @@ class NkoBenchmark:
             (stats["total_tokens_input"] / 1000) * model_config.cost_per_1k_input +
             (stats["total_tokens_output"] / 1000) * model_config.cost_per_1k_output
         )
+        if stats.get("batch"):
+            cost *= self.config.batch_cost_discount
+            batch = stats["batch"]
+            print(f"    Batch: {batch['requests']} requests in {batch['batches']} batches "
+                  f"({batch['failed']} failed)")
         
         model_score = self.scorer.create_model_score(
             model_id=model_key,
@@ -327,6 +358,13 @@ class NkoBenchmark:
             except Exception as e:
                 print(f"  Error benchmarking {model_key}: {e}")
         
+        self.results["provider_limits"] = get_limiter_stats()
+        if self.response_cache:
+            self.results["response_cache"] = self.response_cache.get_stats()
+            cache_stats = self.results["response_cache"]
+            print(f"\nResponse cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate'] * 100:.1f}% hit rate)")
+        
         # Generate rankings and recommendation
         if model_scores:
             recommendation = self.scorer.get_recommendation(model_scores)
@@ -411,6 +449,38 @@ async def main():
         type=str,
         help="Output file path",
     )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--cache",
+        dest="cache_mode",
+        action="store_const",
+        const="on",
+        help="Reuse cached provider responses and cache new ones",
+    )
+    cache_group.add_argument(
+        "--no-cache",
+        dest="cache_mode",
+        action="store_const",
+        const="off",
+        help="Always call the provider APIs (default)",
+    )
+    cache_group.add_argument(
+        "--cache-only",
+        dest="cache_mode",
+        action="store_const",
+        const="only",
+        help="Only use cached responses; uncached requests fail without an API call",
+    )
+    parser.add_argument(
+        "--cache-path",
+        type=str,
+        help="Response cache SQLite file",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Send Anthropic/OpenAI/Gemini requests through their batch APIs (cheaper, slower)",
+    )
     
     args = parser.parse_args()
     
@@ -422,6 +492,13 @@ async def main():
     else:
         config = get_full_config()
     
+    if args.cache_mode:
+        config.response_cache_mode = args.cache_mode
+    if args.cache_path:
+        config.response_cache_path = Path(args.cache_path)
+    if args.batch:
+        config.batch_mode = True
+    
     # Determine models to test
     model_keys = None
     if args.models:
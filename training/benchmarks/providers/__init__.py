@@ -6,6 +6,16 @@ from .base import BaseProvider, ProviderResult
 from .anthropic_provider import AnthropicProvider
 from .openai_provider import OpenAIProvider
 from .google_provider import GoogleProvider
+from .concurrency import (
+    ProviderLimiter,
+    configure_provider_limits,
+    configure_from_benchmark_config,
+    get_provider_limiter,
+    get_limiter_stats,
+    map_ordered,
+)
+from .response_cache import ResponseCache, CacheMissError
+from .batch import BatchCollector, BatchError, BATCH_PROVIDERS
 
 __all__ = [
     "BaseProvider",
@@ -13,5 +23,16 @@ __all__ = [
     "AnthropicProvider",
     "OpenAIProvider",
     "GoogleProvider",
+    "ProviderLimiter",
+    "configure_provider_limits",
+    "configure_from_benchmark_config",
+    "get_provider_limiter",
+    "get_limiter_stats",
+    "map_ordered",
+    "ResponseCache",
+    "CacheMissError",
+    "BatchCollector",
+    "BatchError",
+    "BATCH_PROVIDERS",
 ]
 
@@ -6,7 +6,7 @@ Implements Claude 4.5 Sonnet and Claude Opus 4.1 for benchmarking.
 
 import os
 import time
-from typing import Optional
+from typing import Dict, List, Optional
 
 from .base import (
     BaseProvider,
@@ -16,6 +16,7 @@ from .base import (
     create_translation_prompt,
     create_explanation_prompt,
 )
+from .batch import BatchError, BatchOutcome, BatchRequest, HAS_AIOHTTP, batch_http, iter_jsonl
 from ..config import get_api_key, MODELS
 
 try:
@@ -48,7 +49,12 @@ class AnthropicProvider(BaseProvider):
         self._client = None
         
         if HAS_ANTHROPIC and self._api_key:
-            self._client = anthropic.Anthropic(api_key=self._api_key)
+            # Async client so many requests can be in flight per event loop
+            self._client = anthropic.AsyncAnthropic(api_key=self._api_key)
+        
+        # Message Batches endpoint (ANTHROPIC_BASE_URL can point at a stub)
+        self._base_url = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com").rstrip("/")
+        self._batch_results_urls: Dict[str, str] = {}
     
     @property
     def provider_name(self) -> str:
@@ -58,7 +64,31 @@ class AnthropicProvider(BaseProvider):
     def is_available(self) -> bool:
         return HAS_ANTHROPIC and self._client is not None
     
-    def _call_api(
+    @property
+    def supports_batch(self) -> bool:
+        return self.is_available and HAS_AIOHTTP
+    
+    def _build_request(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system: Optional[str],
+    ) -> dict:
+        """Messages API parameters, shared by direct and batch calls."""
+        kwargs = {
+            "model": self.actual_model_id,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        
+        if system:
+            kwargs["system"] = system
+        
+        return kwargs
+    
+    async def _call_api(
         self,
         prompt: str,
         max_tokens: int = 2048,
@@ -76,19 +106,8 @@ class AnthropicProvider(BaseProvider):
         
         start_time = time.time()
         
-        messages = [{"role": "user", "content": prompt}]
-        
-        kwargs = {
-            "model": self.actual_model_id,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "messages": messages,
-        }
-        
-        if system:
-            kwargs["system"] = system
-        
-        response = self._client.messages.create(**kwargs)
+        kwargs = self._build_request(prompt, max_tokens, temperature, system)
+        response = await self._client.messages.create(**kwargs)
         
         latency_ms = (time.time() - start_time) * 1000
         
@@ -105,6 +124,68 @@ class AnthropicProvider(BaseProvider):
         
         return response_text, input_tokens, output_tokens, latency_ms
     
+    # ==================== Message Batches ====================
+    
+    def _batch_headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self._api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json",
+        }
+    
+    async def _submit_batch(self, requests: List[BatchRequest]) -> str:
+        body = {
+            "requests": [
+                {
+                    "custom_id": r.custom_id,
+                    "params": self._build_request(r.prompt, r.max_tokens, r.temperature, r.system),
+                }
+                for r in requests
+            ]
+        }
+        batch = await batch_http(
+            "POST", f"{self._base_url}/v1/messages/batches", self._batch_headers(), json_body=body,
+        )
+        return batch["id"]
+    
+    async def _poll_batch(self, batch_id: str) -> bool:
+        batch = await batch_http(
+            "GET", f"{self._base_url}/v1/messages/batches/{batch_id}", self._batch_headers(),
+        )
+        if batch.get("processing_status") != "ended":
+            return False
+        self._batch_results_urls[batch_id] = (
+            batch.get("results_url") or f"{self._base_url}/v1/messages/batches/{batch_id}/results"
+        )
+        return True
+    
+    async def _fetch_batch_results(self, batch_id: str) -> Dict[str, BatchOutcome]:
+        text = await batch_http(
+            "GET", self._batch_results_urls.pop(batch_id), self._batch_headers(), as_text=True,
+        )
+        
+        outcomes: Dict[str, BatchOutcome] = {}
+        for line in iter_jsonl(text):
+            result = line.get("result", {})
+            if result.get("type") != "succeeded":
+                # errored / canceled / expired
+                outcomes[line["custom_id"]] = BatchError(
+                    f"Batch request {result.get('type')}: {result.get('error')}"
+                )
+                continue
+            
+            message = result.get("message", {})
+            response_text = "".join(
+                block.get("text", "") for block in message.get("content", []) if block.get("type") == "text"
+            )
+            usage = message.get("usage") or {}
+            outcomes[line["custom_id"]] = (
+                response_text,
+                usage.get("input_tokens", 0),
+                usage.get("output_tokens", 0),
+            )
+        return outcomes
+    
     async def translate(
         self,
         text: str,
@@ -128,7 +209,7 @@ class AnthropicProvider(BaseProvider):
         system = "You are an expert N'Ko language translator. Provide accurate, natural translations."
         
         try:
-            response_text, input_tokens, output_tokens, latency_ms = self._call_api(
+            response_text, input_tokens, output_tokens, latency_ms = await self._cached_call_api(
                 prompt=prompt,
                 max_tokens=1024,
                 temperature=0.3,
@@ -180,7 +261,7 @@ class AnthropicProvider(BaseProvider):
         system = "You are an expert in N'Ko language and Manding linguistics. Provide accurate, educational explanations."
         
         try:
-            response_text, input_tokens, output_tokens, latency_ms = self._call_api(
+            response_text, input_tokens, output_tokens, latency_ms = await self._cached_call_api(
                 prompt=prompt,
                 max_tokens=1024,
                 temperature=0.3,
@@ -226,7 +307,7 @@ class AnthropicProvider(BaseProvider):
             )
         
         try:
-            response_text, input_tokens, output_tokens, latency_ms = self._call_api(
+            response_text, input_tokens, output_tokens, latency_ms = await self._cached_call_api(
                 prompt=prompt,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -4,12 +4,24 @@ Base Provider Interface for N'Ko Benchmark.
 Abstract interface that all AI providers must implement.
 """
 
+import asyncio
+import functools
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from enum import Enum
 
+from .response_cache import CacheMissError
+from .batch import BatchCollector, BatchRequest, BatchOutcome
+
+
+# Worker threads shared by all providers for SDK calls that only exist in
+# blocking form; bounds the number of threads however many requests queue.
+BLOCKING_CALL_WORKERS = 16
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
 
 class TaskType(Enum):
     """Types of benchmark tasks."""
@@ -79,6 +91,125 @@ class BaseProvider(ABC):
         self._total_tokens_output = 0
         self._total_calls = 0
         self._total_latency_ms = 0.0
+        
+        # Optional ResponseCache consulted by _cached_call_api
+        self.response_cache = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
+        # Optional BatchCollector (batch API mode), see enable_batch_mode
+        self.batch_collector: Optional[BatchCollector] = None
+    
+    @property
+    def supports_batch(self) -> bool:
+        """Whether this provider's batch API can be used (client and aiohttp available)."""
+        return False
+    
+    def enable_batch_mode(self, **collector_kwargs) -> bool:
+        """
+        Route requests through a batch job instead of one call each.
+        
+        Args:
+            **collector_kwargs: BatchCollector settings (max_requests,
+                                collect_seconds, poll_seconds, ...)
+            
+        Returns:
+            False if the batch API is unavailable (requests stay direct)
+        """
+        if not self.supports_batch:
+            return False
+        self.batch_collector = BatchCollector(self, **collector_kwargs)
+        return True
+    
+    async def _dispatch_call(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system: Optional[str],
+    ) -> tuple:
+        """Send one request directly, or queue it for a batch in batch mode."""
+        if self.batch_collector is not None:
+            return await self.batch_collector.call(
+                prompt=prompt, max_tokens=max_tokens, temperature=temperature, system=system,
+            )
+        return await self._call_api(
+            prompt=prompt, max_tokens=max_tokens, temperature=temperature, system=system,
+        )
+    
+    @abstractmethod
+    async def _submit_batch(self, requests: List[BatchRequest]) -> str:
+        """Submit a batch job; returns its ID."""
+        pass
+    
+    @abstractmethod
+    async def _poll_batch(self, batch_id: str) -> bool:
+        """Whether a batch job has finished processing."""
+        pass
+    
+    @abstractmethod
+    async def _fetch_batch_results(self, batch_id: str) -> Dict[str, BatchOutcome]:
+        """
+        Results of a finished batch job.
+        
+        Returns:
+            custom_id -> (response_text, input_tokens, output_tokens), or an
+            Exception for requests that failed
+        """
+        pass
+    
+    async def _cached_call_api(
+        self,
+        prompt: str,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+        system: Optional[str] = None,
+    ) -> tuple:
+        """
+        Call `_call_api` through the response cache, if one is attached.
+        
+        Every request (translate, explain_nko, complete and hence run_task)
+        funnels through here, so the cache key sees the final prompt and
+        system prompt.
+        
+        Returns:
+            Tuple of (response_text, input_tokens, output_tokens, latency_ms)
+        """
+        cache = self.response_cache
+        if cache is None or not cache.enabled:
+            return await self._dispatch_call(prompt, max_tokens, temperature, system)
+        
+        model = getattr(self, "actual_model_id", self.model_id)
+        key = cache.make_key(self.provider_name, model, prompt, system, temperature, max_tokens)
+        cached = cache.get(key)
+        if cached is not None:
+            self._cache_hits += 1
+            return cached
+        
+        self._cache_misses += 1
+        if cache.read_only:
+            raise CacheMissError(f"No cached response for {self.provider_name}/{model} (cache-only mode)")
+        
+        value = await self._dispatch_call(prompt, max_tokens, temperature, system)
+        cache.put(key, self.provider_name, model, value)
+        return value
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """
+        Run a blocking SDK call on the shared bounded thread pool.
+        
+        Keeps the event loop free while the request is in flight.
+        """
+        global _blocking_executor
+        if _blocking_executor is None:
+            _blocking_executor = ThreadPoolExecutor(
+                max_workers=BLOCKING_CALL_WORKERS,
+                thread_name_prefix="provider-call",
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _blocking_executor, functools.partial(func, *args, **kwargs)
+        )
     
     @property
     @abstractmethod
@@ -236,6 +367,9 @@ class BaseProvider(ABC):
             "total_tokens_output": self._total_tokens_output,
             "total_latency_ms": self._total_latency_ms,
             "avg_latency_ms": self._total_latency_ms / max(1, self._total_calls),
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+            "batch": self.batch_collector.get_stats() if self.batch_collector else None,
         }
     
     def reset_statistics(self):
@@ -244,6 +378,8 @@ class BaseProvider(ABC):
         self._total_tokens_output = 0
         self._total_calls = 0
         self._total_latency_ms = 0.0
+        self._cache_hits = 0
+        self._cache_misses = 0
 
 
 def create_translation_prompt(text: str, source_lang: str, target_lang: str) -> str:
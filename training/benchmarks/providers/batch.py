@@ -0,0 +1,240 @@
+"""
+Batch API Mode for N'Ko Benchmark Providers.
+
+Anthropic (Message Batches), OpenAI (Batch API) and Gemini (Batch Mode)
+accept many requests in one asynchronous job at a lower price and with higher throughput than
+one HTTP request per sample. Benchmark evaluation is offline, so latency
+doesn't matter.
+
+BatchCollector sits below the response cache in BaseProvider: every
+request a task makes is queued instead of sent. Once no new request has
+arrived for `collect_seconds` (or `max_requests` are queued), the queue
+is submitted as one batch. The batch is polled until it ends and each
+caller gets back the same (text, input_tokens, output_tokens,
+latency_ms) tuple that _call_api returns. Tasks therefore run unchanged:
+map_ordered keeps a whole task's samples in flight, and they become one
+batch.
+
+Providers implement _submit_batch, _poll_batch and _fetch_batch_results.
+A provider whose client is unavailable keeps making direct calls.
+
+Set ANTHROPIC_BASE_URL / OPENAI_BASE_URL / GEMINI_BASE_URL to point the
+batch endpoints at batch_stub_server.py for local runs.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# Providers that implement the batch hooks
+BATCH_PROVIDERS = ("anthropic", "openai", "google")
+
+BatchOutcome = Union[Tuple[str, int, int], Exception]
+
+
+@dataclass
+class BatchRequest:
+    """One queued request waiting for its batch."""
+    custom_id: str
+    prompt: str
+    max_tokens: int
+    temperature: float
+    system: Optional[str] = None
+    queued_at: float = field(default_factory=time.time)
+    future: Optional[asyncio.Future] = None
+
+
+class BatchError(RuntimeError):
+    """A batch job failed, expired or was cancelled."""
+    pass
+
+
+async def batch_http(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    json_body: Optional[Any] = None,
+    data: Optional[Any] = None,
+    as_text: bool = False,
+) -> Any:
+    """
+    One HTTP call to a batch endpoint.
+
+    Batch jobs make a handful of calls each, so a short-lived session is fine.
+
+    Returns:
+        Parsed JSON body, or the raw text if as_text
+    """
+    if not HAS_AIOHTTP:
+        raise BatchError("aiohttp required for batch mode: pip install aiohttp")
+
+    async with aiohttp.ClientSession() as session:
+        async with session.request(method, url, headers=headers, json=json_body, data=data) as response:
+            body = await response.text()
+            if response.status >= 400:
+                raise BatchError(f"{method} {url} -> HTTP {response.status}: {body[:300]}")
+            return body if as_text else json.loads(body)
+
+
+def jsonl_upload_form(records: List[Dict[str, Any]], purpose: str, filename: str = "batch.jsonl") -> Any:
+    """Multipart form uploading `records` as a JSONL file (OpenAI Files API)."""
+    form = aiohttp.FormData()
+    form.add_field("purpose", purpose)
+    form.add_field(
+        "file",
+        "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8"),
+        filename=filename,
+        content_type="application/jsonl",
+    )
+    return form
+
+
+def iter_jsonl(text: str):
+    """Parse a JSONL results file."""
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class BatchCollector:
+    """
+    Collects a provider's requests into batch jobs.
+    """
+
+    def __init__(
+        self,
+        provider: Any,
+        max_requests: int = 10000,
+        collect_seconds: float = 2.0,
+        poll_seconds: float = 30.0,
+        timeout_seconds: float = 24 * 3600,
+    ):
+        """
+        Args:
+            provider: BaseProvider implementing the batch hooks
+            max_requests: Submit as soon as this many requests are queued
+            collect_seconds: Submit once no request arrived for this long
+            poll_seconds: Delay between batch status checks
+            timeout_seconds: Give up on a batch after this long
+        """
+        self.provider = provider
+        self.max_requests = max(1, max_requests)
+        self.collect_seconds = collect_seconds
+        self.poll_seconds = poll_seconds
+        self.timeout_seconds = timeout_seconds
+
+        self._pending: List[BatchRequest] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._jobs: List[asyncio.Task] = []
+
+        self.stats = {
+            "batches": 0,
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "batch_seconds_total": 0.0,
+        }
+
+    async def call(
+        self,
+        prompt: str,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+        system: Optional[str] = None,
+    ) -> Tuple[str, int, int, float]:
+        """
+        Queue a request and wait for its batch to finish.
+
+        Returns:
+            Tuple of (response_text, input_tokens, output_tokens, latency_ms)
+        """
+        request = BatchRequest(
+            custom_id=f"req-{uuid.uuid4().hex[:16]}",
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._pending.append(request)
+
+        if len(self._pending) >= self.max_requests:
+            self._flush()
+        else:
+            # Restart the idle timer: submit once requests stop arriving
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = asyncio.create_task(self._flush_after_idle())
+
+        return await request.future
+
+    async def _flush_after_idle(self) -> None:
+        await asyncio.sleep(self.collect_seconds)
+        self._timer = None
+        self._flush()
+
+    def _flush(self) -> None:
+        """Hand the queued requests to a new batch job."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        requests, self._pending = self._pending, []
+        if requests:
+            self._jobs.append(asyncio.create_task(self._run_batch(requests)))
+
+    async def _run_batch(self, requests: List[BatchRequest]) -> None:
+        start = time.time()
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(requests)
+        name = self.provider.provider_name
+
+        try:
+            batch_id = await self.provider._submit_batch(requests)
+            print(f"    [batch] {name}: submitted {len(requests)} requests as {batch_id}")
+
+            while not await self.provider._poll_batch(batch_id):
+                if time.time() - start > self.timeout_seconds:
+                    raise BatchError(f"Batch {batch_id} timed out after {self.timeout_seconds:.0f}s")
+                await asyncio.sleep(self.poll_seconds)
+
+            outcomes = await self.provider._fetch_batch_results(batch_id)
+        except Exception as e:
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            self.stats["failed"] += len(requests)
+            return
+        finally:
+            self.stats["batch_seconds_total"] += time.time() - start
+
+        now = time.time()
+        for request in requests:
+            if request.future.done():
+                continue
+            outcome = outcomes.get(request.custom_id)
+            if outcome is None:
+                outcome = BatchError(f"No result for {request.custom_id} in batch {batch_id}")
+            if isinstance(outcome, Exception):
+                self.stats["failed"] += 1
+                request.future.set_exception(outcome)
+            else:
+                text, input_tokens, output_tokens = outcome
+                self.stats["succeeded"] += 1
+                latency_ms = (now - request.queued_at) * 1000
+                request.future.set_result((text, input_tokens, output_tokens, latency_ms))
+
+        print(f"    [batch] {name}: {batch_id} done in {now - start:.0f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch statistics."""
+        return {**self.stats, "batch_seconds_total": round(self.stats["batch_seconds_total"], 1)}
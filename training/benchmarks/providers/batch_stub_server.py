@@ -0,0 +1,315 @@
+"""
+Local Stub Server for the Batch APIs.
+
+Implements just enough of Anthropic Message Batches, the OpenAI
+Files + Batch APIs and Gemini Batch Mode (inline requests) to run a benchmark in batch mode without network
+access or API spend. Each request is answered with a deterministic echo
+of the last line of its prompt; batches end `complete_after` seconds
+after submission.
+
+Usage:
+    python -m benchmarks.providers.batch_stub_server --port 8765 --complete-after 2
+
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 \\
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 \\
+    GEMINI_BASE_URL=http://127.0.0.1:8765/v1beta \\
+    python -m benchmarks.nko_benchmark --batch ...
+
+`--fail-every N` makes every Nth request in a batch fail, to exercise
+per-request error handling.
+"""
+
+import argparse
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+
+def _echo(messages: List[Dict[str, Any]]) -> Tuple[str, int, int]:
+    """Deterministic response for a request: (text, input_tokens, output_tokens)."""
+    prompt = ""
+    for message in messages:
+        if message.get("role") == "user":
+            content = message.get("content")
+            prompt = content if isinstance(content, str) else json.dumps(content)
+    lines = [line.strip() for line in prompt.splitlines() if line.strip()]
+    text = f"[stub] {lines[-1] if lines else ''}"
+    return text, max(1, len(prompt) // 4), max(1, len(text) // 4)
+
+
+class BatchStubState:
+    """In-memory batches and files."""
+
+    def __init__(self, complete_after: float = 1.0, fail_every: int = 0):
+        self.complete_after = complete_after
+        self.fail_every = fail_every
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, str] = {}
+
+    def is_done(self, batch: Dict[str, Any]) -> bool:
+        return time.time() - batch["created"] >= self.complete_after
+
+    def should_fail(self, index: int) -> bool:
+        return bool(self.fail_every) and (index + 1) % self.fail_every == 0
+
+
+# ==================== Anthropic ====================
+
+async def anthropic_create(request: web.Request) -> web.Response:
+    state: BatchStubState = request.app["state"]
+    body = await request.json()
+    batch_id = f"msgbatch_{uuid.uuid4().hex[:20]}"
+    state.batches[batch_id] = {"created": time.time(), "requests": body["requests"]}
+    return web.json_response({
+        "id": batch_id,
+        "type": "message_batch",
+        "processing_status": "in_progress",
+        "request_counts": {"processing": len(body["requests"])},
+    })
+
+
+async def anthropic_get(request: web.Request) -> web.Response:
+    state: BatchStubState = request.app["state"]
+    batch_id = request.match_info["batch_id"]
+    batch = state.batches.get(batch_id)
+    if batch is None:
+        return web.json_response({"error": {"message": "not found"}}, status=404)
+    done = state.is_done(batch)
+    return web.json_response({
+        "id": batch_id,
+        "type": "message_batch",
+        "processing_status": "ended" if done else "in_progress",
+        "results_url": str(request.url.with_path(f"/v1/messages/batches/{batch_id}/results")) if done else None,
+    })
+
+
+async def anthropic_results(request: web.Request) -> web.Response:
+    state: BatchStubState = request.app["state"]
+    batch = state.batches.get(request.match_info["batch_id"])
+    if batch is None or not state.is_done(batch):
+        return web.json_response({"error": {"message": "not ready"}}, status=404)
+
+    lines = []
+    for i, item in enumerate(batch["requests"]):
+        if state.should_fail(i):
+            result = {"type": "errored", "error": {"type": "api_error", "message": "stub failure"}}
+        else:
+            text, input_tokens, output_tokens = _echo(item["params"]["messages"])
+            result = {
+                "type": "succeeded",
+                "message": {
+                    "type": "message",
+                    "role": "assistant",
+                    "model": item["params"].get("model"),
+                    "content": [{"type": "text", "text": text}],
+                    "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+                },
+            }
+        lines.append(json.dumps({"custom_id": item["custom_id"], "result": result}, ensure_ascii=False))
+    return web.Response(text="\n".join(lines) + "\n", content_type="application/x-jsonl")
+
+
+# ==================== OpenAI ====================
+
+async def openai_upload(request: web.Request) -> web.Response:
+    state: BatchStubState = request.app["state"]
+    form = await request.post()
+    upload = form["file"]
+    file_id = f"file-{uuid.uuid4().hex[:20]}"
+    state.files[file_id] = upload.file.read().decode("utf-8")
+    return web.json_response({"id": file_id, "object": "file", "purpose": form.get("purpose")})
+
+
+async def openai_create(request: web.Request) -> web.Response:
+    state: BatchStubState = request.app["state"]
+    body = await request.json()
+    content = state.files.get(body["input_file_id"])
+    if content is None:
+        return web.json_response({"error": {"message": "input file not found"}}, status=400)
+    batch_id = f"batch_{uuid.uuid4().hex[:20]}"
+    requests = [json.loads(line) for line in content.splitlines() if line.strip()]
+    state.batches[batch_id] = {"created": time.time(), "requests": requests}
+    return web.json_response({"id": batch_id, "object": "batch", "status": "validating"})
+
+
+async def openai_get(request: web.Request) -> web.Response:
+    state: BatchStubState = request.app["state"]
+    batch_id = request.match_info["batch_id"]
+    batch = state.batches.get(batch_id)
+    if batch is None:
+        return web.json_response({"error": {"message": "not found"}}, status=404)
+
+    if not state.is_done(batch):
+        return web.json_response({"id": batch_id, "object": "batch", "status": "in_progress"})
+
+    if "output_file_id" not in batch:
+        output, errors = [], []
+        for i, item in enumerate(batch["requests"]):
+            if state.should_fail(i):
+                errors.append({
+                    "custom_id": item["custom_id"],
+                    "response": {"status_code": 500, "body": {"error": {"message": "stub failure"}}},
+                    "error": None,
+                })
+                continue
+            text, input_tokens, output_tokens = _echo(item["body"]["messages"])
+            output.append({
+                "custom_id": item["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "model": item["body"].get("model"),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}}],
+                        "usage": {"prompt_tokens": input_tokens, "completion_tokens": output_tokens},
+                    },
+                },
+                "error": None,
+            })
+        batch["output_file_id"] = _store_jsonl(state, output)
+        batch["error_file_id"] = _store_jsonl(state, errors) if errors else None
+
+    return web.json_response({
+        "id": batch_id,
+        "object": "batch",
+        "status": "completed",
+        "output_file_id": batch["output_file_id"],
+        "error_file_id": batch["error_file_id"],
+    })
+
+
+def _store_jsonl(state: BatchStubState, records: List[Dict[str, Any]]) -> str:
+    file_id = f"file-{uuid.uuid4().hex[:20]}"
+    state.files[file_id] = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    return file_id
+
+
+async def openai_file_content(request: web.Request) -> web.Response:
+    state: BatchStubState = request.app["state"]
+    content = state.files.get(request.match_info["file_id"])
+    if content is None:
+        return web.json_response({"error": {"message": "not found"}}, status=404)
+    return web.Response(text=content, content_type="application/jsonl")
+
+
+# ==================== Gemini ====================
+
+async def gemini_create(request: web.Request) -> web.Response:
+    state: BatchStubState = request.app["state"]
+    body = await request.json()
+    batch_name = f"batches/{uuid.uuid4().hex[:20]}"
+    requests = body["batch"]["input_config"]["requests"]["requests"]
+    state.batches[batch_name] = {"created": time.time(), "requests": requests}
+    return web.json_response({
+        "name": batch_name,
+        "metadata": {"name": batch_name, "state": "BATCH_STATE_PENDING"},
+    })
+
+
+async def gemini_get(request: web.Request) -> web.Response:
+    state: BatchStubState = request.app["state"]
+    batch_name = f"batches/{request.match_info['batch_id']}"
+    batch = state.batches.get(batch_name)
+    if batch is None:
+        return web.json_response({"error": {"code": 404, "message": "not found"}}, status=404)
+
+    if not state.is_done(batch):
+        return web.json_response({
+            "name": batch_name,
+            "metadata": {"name": batch_name, "state": "BATCH_STATE_RUNNING"},
+            "done": False,
+        })
+
+    inlined = []
+    for i, item in enumerate(batch["requests"]):
+        if state.should_fail(i):
+            inlined.append({
+                "error": {"code": 500, "message": "stub failure"},
+                "metadata": item.get("metadata"),
+            })
+            continue
+        messages = [
+            {"role": "user", "content": "".join(part.get("text", "") for part in content.get("parts", []))}
+            for content in item["request"]["contents"]
+        ]
+        text, input_tokens, output_tokens = _echo(messages)
+        inlined.append({
+            "response": {
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+                "usageMetadata": {"promptTokenCount": input_tokens, "candidatesTokenCount": output_tokens},
+            },
+            "metadata": item.get("metadata"),
+        })
+    return web.json_response({
+        "name": batch_name,
+        "metadata": {"name": batch_name, "state": "BATCH_STATE_SUCCEEDED"},
+        "done": True,
+        "response": {
+            "@type": "type.googleapis.com/google.ai.generativelanguage.v1main.GenerateContentBatchOutput",
+            "inlinedResponses": {"inlinedResponses": inlined},
+        },
+    })
+
+
+# ==================== App ====================
+
+def create_app(complete_after: float = 1.0, fail_every: int = 0) -> web.Application:
+    """Build the stub application."""
+    app = web.Application(client_max_size=256 * 1024 * 1024)
+    app["state"] = BatchStubState(complete_after=complete_after, fail_every=fail_every)
+    app.router.add_post("/v1/messages/batches", anthropic_create)
+    app.router.add_get("/v1/messages/batches/{batch_id}", anthropic_get)
+    app.router.add_get("/v1/messages/batches/{batch_id}/results", anthropic_results)
+    app.router.add_post("/v1/files", openai_upload)
+    app.router.add_post("/v1/batches", openai_create)
+    app.router.add_get("/v1/batches/{batch_id}", openai_get)
+    app.router.add_get("/v1/files/{file_id}/content", openai_file_content)
+    app.router.add_post("/v1beta/models/{model}:batchGenerateContent", gemini_create)
+    app.router.add_get("/v1beta/batches/{batch_id}", gemini_get)
+    return app
+
+
+async def start_stub_server(
+    port: int = 8765,
+    host: str = "127.0.0.1",
+    complete_after: float = 1.0,
+    fail_every: int = 0,
+) -> web.AppRunner:
+    """
+    Start the stub inside the running event loop.
+
+    Returns:
+        The runner; call `await runner.cleanup()` to stop it
+    """
+    runner = web.AppRunner(create_app(complete_after=complete_after, fail_every=fail_every))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Stub Anthropic/OpenAI/Gemini batch API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--complete-after", type=float, default=1.0,
+                        help="Seconds before a submitted batch ends")
+    parser.add_argument("--fail-every", type=int, default=0,
+                        help="Fail every Nth request in a batch (0 = never)")
+    args = parser.parse_args(argv)
+
+    print(f"Batch stub listening on http://{args.host}:{args.port}")
+    print(f"  ANTHROPIC_BASE_URL=http://{args.host}:{args.port}")
+    print(f"  OPENAI_BASE_URL=http://{args.host}:{args.port}/v1")
+    print(f"  GEMINI_BASE_URL=http://{args.host}:{args.port}/v1beta")
+    web.run_app(
+        create_app(complete_after=args.complete_after, fail_every=args.fail_every),
+        host=args.host,
+        port=args.port,
+        print=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Concurrent Sample Dispatch for N'Ko Benchmark.
+
+Benchmark tasks are dominated by provider round-trips. This module lets a
+task keep several samples in flight at once while staying inside each
+provider's limits:
+
+- ProviderLimiter: per-provider cap on in-flight requests plus a
+  requests-per-minute budget (token bucket), shared by every task and
+  model that talks to the same provider
+- map_ordered: runs a per-sample coroutine on a bounded worker pool and
+  yields results strictly in input order, so aggregation, sample IDs and
+  progress callbacks are identical to a serial run
+
+Usage:
+    configure_provider_limits(max_concurrency=5, requests_per_minute={"anthropic": 50})
+
+    async for i, sample, result in map_ordered(provider, samples, call):
+        ...  # consume in order, exactly like the old for-loop body
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Sequence, Tuple, Union,
+)
+
+from .batch import BATCH_PROVIDERS
+
+
+class RequestBudget:
+    """
+    Token bucket holding a requests-per-minute budget.
+
+    Allows bursts up to `burst` requests, then refills continuously.
+    A budget of 0 disables limiting.
+    """
+
+    def __init__(self, requests_per_minute: float = 0.0, burst: Optional[float] = None):
+        self.rate = max(0.0, requests_per_minute) / 60.0
+        self.capacity = burst if burst is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.wait_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` requests fit in the budget, then spend them."""
+        if not self.enabled:
+            return
+        # A cost above the burst size could never be satisfied in one go
+        tokens = min(tokens, self.capacity)
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                delay = (tokens - self._tokens) / self.rate
+                self.wait_seconds += delay
+                await asyncio.sleep(delay)
+
+
+class ProviderLimiter:
+    """
+    Concurrency and rate limits for one provider.
+
+    `slot()` holds one of `max_concurrency` in-flight slots and charges
+    the request budget before the caller's requests go out.
+    """
+
+    def __init__(self, max_concurrency: int = 5, requests_per_minute: float = 0.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.budget = RequestBudget(requests_per_minute)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.stats = {"requests": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    @property
+    def requests_per_minute(self) -> float:
+        return self.budget.rate * 60.0
+
+    @asynccontextmanager
+    async def slot(self, requests: int = 1):
+        """Hold an in-flight slot for a unit of work making `requests` API calls."""
+        async with self._semaphore:
+            await self.budget.acquire(requests)
+            self.stats["requests"] += requests
+            self.stats["in_flight"] += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+            try:
+                yield
+            finally:
+                self.stats["in_flight"] -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "requests_per_minute": self.requests_per_minute,
+            "requests": self.stats["requests"],
+            "peak_in_flight": self.stats["peak_in_flight"],
+            "rate_wait_seconds": round(self.budget.wait_seconds, 3),
+        }
+
+
+# Limiters are keyed by provider name so every model of a provider shares
+# the account-level budget.
+_LIMITERS: Dict[str, ProviderLimiter] = {}
+_DEFAULT_CONCURRENCY: Dict[str, int] = {}
+_DEFAULT_RPM: Dict[str, float] = {}
+
+
+def configure_provider_limits(
+    max_concurrency: Union[int, Dict[str, int]] = 5,
+    requests_per_minute: Optional[Dict[str, float]] = None,
+) -> None:
+    """
+    Set per-provider limits (replaces any existing limiters).
+
+    Args:
+        max_concurrency: In-flight requests per provider, either one value
+                         for all providers or a dict keyed by provider
+                         name ("default" applies to unlisted providers)
+        requests_per_minute: Budget per provider name ("default" applies
+                             to unlisted providers; missing or 0 = unlimited)
+    """
+    global _DEFAULT_CONCURRENCY, _DEFAULT_RPM
+    if isinstance(max_concurrency, int):
+        _DEFAULT_CONCURRENCY = {"default": max_concurrency}
+    else:
+        _DEFAULT_CONCURRENCY = dict(max_concurrency)
+    _DEFAULT_RPM = dict(requests_per_minute or {})
+    _LIMITERS.clear()
+
+
+def configure_from_benchmark_config(config: Any) -> None:
+    """Apply the concurrency settings of a BenchmarkConfig."""
+    concurrency = {"default": config.max_concurrent_requests, **config.provider_max_concurrency}
+    # rate_limit_delay (seconds between requests) is the fallback budget
+    rpm = {"default": 60.0 / config.rate_limit_delay if config.rate_limit_delay > 0 else 0.0}
+    rpm.update(config.provider_requests_per_minute)
+    if getattr(config, "batch_mode", False):
+        # Requests only queue up locally; let a whole task into the batch
+        for name in BATCH_PROVIDERS:
+            concurrency[name] = config.batch_max_requests
+            rpm[name] = 0.0
+    configure_provider_limits(concurrency, rpm)
+
+
+def get_provider_limiter(provider: Union[str, Any]) -> ProviderLimiter:
+    """Get (or create) the shared limiter for a provider or provider name."""
+    name = provider if isinstance(provider, str) else provider.provider_name
+    limiter = _LIMITERS.get(name)
+    if limiter is None:
+        limiter = ProviderLimiter(
+            max_concurrency=_DEFAULT_CONCURRENCY.get(name, _DEFAULT_CONCURRENCY.get("default", 5)),
+            requests_per_minute=_DEFAULT_RPM.get(name, _DEFAULT_RPM.get("default", 0.0)),
+        )
+        _LIMITERS[name] = limiter
+    return limiter
+
+
+def get_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics for every provider limiter created so far."""
+    return {name: limiter.get_stats() for name, limiter in _LIMITERS.items()}
+
+
+async def map_ordered(
+    provider: Any,
+    items: Sequence[Any],
+    worker: Callable[[int, Any], Awaitable[Any]],
+    requests_per_item: int = 1,
+) -> AsyncIterator[Tuple[int, Any, Any]]:
+    """
+    Run `worker(i, item)` concurrently and yield `(i, item, result)` in order.
+
+    At most the provider's max_concurrency items are in flight; each one
+    is charged `requests_per_item` against the provider's request budget.
+    If a worker raises, the exception is re-raised when its item is
+    reached, as it would have been in a serial loop.
+
+    Args:
+        provider: Provider (or provider name) whose limiter applies
+        items: Samples to process
+        worker: Coroutine function doing the provider call(s) for one item
+        requests_per_item: API calls made by one worker invocation
+    """
+    items = list(items)
+    if not items:
+        return
+
+    limiter = get_provider_limiter(provider)
+    loop = asyncio.get_running_loop()
+    futures = [loop.create_future() for _ in items]
+    indices = iter(range(len(items)))
+
+    async def run_worker():
+        # Workers pull indices in order, so results complete roughly in order
+        for i in indices:
+            async with limiter.slot(requests_per_item):
+                try:
+                    futures[i].set_result(await worker(i, items[i]))
+                except asyncio.CancelledError:
+                    raise
+                except BaseException as e:
+                    # Includes KeyboardInterrupt etc.; an unset future would
+                    # leave the consumer waiting forever
+                    futures[i].set_exception(e)
+
+    workers = [
+        asyncio.create_task(run_worker())
+        for _ in range(min(limiter.max_concurrency, len(items)))
+    ]
+    try:
+        for i, future in enumerate(futures):
+            yield i, items[i], await future
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        # Don't leave "exception never retrieved" warnings behind on early exit
+        for future in futures:
+            if future.done() and not future.cancelled():
+                future.exception()
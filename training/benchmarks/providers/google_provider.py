@@ -6,7 +6,7 @@ Implements Gemini 3 Pro and Gemini 3 Flash for benchmarking.
 
 import os
 import time
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from .base import (
     BaseProvider,
@@ -16,6 +16,7 @@ from .base import (
     create_translation_prompt,
     create_explanation_prompt,
 )
+from .batch import BatchError, BatchOutcome, BatchRequest, HAS_AIOHTTP, batch_http
 from ..config import get_api_key, MODELS
 
 try:
@@ -50,6 +51,12 @@ class GoogleProvider(BaseProvider):
         if HAS_GENAI and self._api_key:
             genai.configure(api_key=self._api_key)
             self._model = genai.GenerativeModel(self.actual_model_id)
+        
+        # Batch Mode endpoint (GEMINI_BASE_URL can point at a stub)
+        self._base_url = os.getenv(
+            "GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta"
+        ).rstrip("/")
+        self._batch_outputs: Dict[str, Dict[str, Any]] = {}
     
     @property
     def provider_name(self) -> str:
@@ -59,7 +66,16 @@ class GoogleProvider(BaseProvider):
     def is_available(self) -> bool:
         return HAS_GENAI and self._model is not None
     
-    def _call_api(
+    @property
+    def supports_batch(self) -> bool:
+        return self.is_available and HAS_AIOHTTP
+    
+    @staticmethod
+    def _full_prompt(prompt: str, system: Optional[str]) -> str:
+        """Combine system and user prompts, shared by direct and batch calls."""
+        return f"{system}\n\n{prompt}" if system else prompt
+    
+    async def _call_api(
         self,
         prompt: str,
         max_tokens: int = 2048,
@@ -77,20 +93,25 @@ class GoogleProvider(BaseProvider):
         
         start_time = time.time()
         
-        # Combine system and user prompts
-        full_prompt = prompt
-        if system:
-            full_prompt = f"{system}\n\n{prompt}"
+        full_prompt = self._full_prompt(prompt, system)
         
         generation_config = genai.GenerationConfig(
             max_output_tokens=max_tokens,
             temperature=temperature,
         )
         
-        response = self._model.generate_content(
-            full_prompt,
-            generation_config=generation_config,
-        )
+        if hasattr(self._model, "generate_content_async"):
+            response = await self._model.generate_content_async(
+                full_prompt,
+                generation_config=generation_config,
+            )
+        else:
+            # Older SDKs only have the blocking call
+            response = await self._run_blocking(
+                self._model.generate_content,
+                full_prompt,
+                generation_config=generation_config,
+            )
         
         latency_ms = (time.time() - start_time) * 1000
         
@@ -112,6 +133,87 @@ class GoogleProvider(BaseProvider):
         
         return response_text, input_tokens, output_tokens, latency_ms
     
+    # ==================== Batch Mode ====================
+    
+    def _batch_headers(self) -> Dict[str, str]:
+        return {"x-goog-api-key": self._api_key, "content-type": "application/json"}
+    
+    async def _submit_batch(self, requests: List[BatchRequest]) -> str:
+        # Inline requests; each carries its custom_id as metadata.key
+        body = {
+            "batch": {
+                "display_name": f"nko-benchmark-{requests[0].custom_id}",
+                "input_config": {
+                    "requests": {
+                        "requests": [
+                            {
+                                "request": {
+                                    "contents": [{
+                                        "role": "user",
+                                        "parts": [{"text": self._full_prompt(r.prompt, r.system)}],
+                                    }],
+                                    "generationConfig": {
+                                        "maxOutputTokens": r.max_tokens,
+                                        "temperature": r.temperature,
+                                    },
+                                },
+                                "metadata": {"key": r.custom_id},
+                            }
+                            for r in requests
+                        ]
+                    }
+                },
+            }
+        }
+        model = self.actual_model_id
+        if not model.startswith("models/"):
+            model = f"models/{model}"
+        operation = await batch_http(
+            "POST",
+            f"{self._base_url}/{model}:batchGenerateContent",
+            self._batch_headers(),
+            json_body=body,
+        )
+        return operation["name"]  # "batches/<id>"
+    
+    async def _poll_batch(self, batch_id: str) -> bool:
+        operation = await batch_http("GET", f"{self._base_url}/{batch_id}", self._batch_headers())
+        state = (operation.get("metadata") or {}).get("state", "")
+        if operation.get("error") or state.endswith(("_FAILED", "_CANCELLED", "_EXPIRED")):
+            raise BatchError(f"Batch {batch_id} {state or 'failed'}: {operation.get('error')}")
+        if not operation.get("done"):
+            return False
+        self._batch_outputs[batch_id] = operation.get("response") or {}
+        return True
+    
+    async def _fetch_batch_results(self, batch_id: str) -> Dict[str, BatchOutcome]:
+        # Inline results come back with the finished operation
+        output = self._batch_outputs.pop(batch_id, {})
+        inlined = output.get("inlinedResponses") or {}
+        if isinstance(inlined, dict):
+            inlined = inlined.get("inlinedResponses") or []
+        
+        outcomes: Dict[str, BatchOutcome] = {}
+        for item in inlined:
+            custom_id = (item.get("metadata") or {}).get("key")
+            if custom_id is None:
+                continue
+            if item.get("error") or "response" not in item:
+                outcomes[custom_id] = BatchError(f"Batch request failed: {item.get('error')}")
+                continue
+            
+            response = item["response"]
+            candidates = response.get("candidates") or []
+            parts = (candidates[0].get("content") or {}).get("parts", []) if candidates else []
+            response_text = "".join(part.get("text", "") for part in parts)
+            usage = response.get("usageMetadata") or {}
+            outcomes[custom_id] = (
+                response_text,
+                usage.get("promptTokenCount", 0),
+                usage.get("candidatesTokenCount", 0),
+            )
+        return outcomes
+    
     async def translate(
         self,
         text: str,
@@ -135,7 +237,7 @@ class GoogleProvider(BaseProvider):
         system = "You are an expert N'Ko language translator. Provide accurate, natural translations."
         
         try:
-            response_text, input_tokens, output_tokens, latency_ms = self._call_api(
+            response_text, input_tokens, output_tokens, latency_ms = await self._cached_call_api(
                 prompt=prompt,
                 max_tokens=1024,
                 temperature=0.3,
@@ -187,7 +289,7 @@ class GoogleProvider(BaseProvider):
         system = "You are an expert in N'Ko language and Manding linguistics. Provide accurate, educational explanations."
         
         try:
-            response_text, input_tokens, output_tokens, latency_ms = self._call_api(
+            response_text, input_tokens, output_tokens, latency_ms = await self._cached_call_api(
                 prompt=prompt,
                 max_tokens=1024,
                 temperature=0.3,
@@ -233,7 +335,7 @@ class GoogleProvider(BaseProvider):
             )
         
         try:
-            response_text, input_tokens, output_tokens, latency_ms = self._call_api(
+            response_text, input_tokens, output_tokens, latency_ms = await self._cached_call_api(
                 prompt=prompt,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -6,7 +6,7 @@ Implements GPT-5.2 and GPT-5-mini for benchmarking.
 
 import os
 import time
-from typing import Optional
+from typing import Dict, List, Optional
 
 from .base import (
     BaseProvider,
@@ -16,10 +16,13 @@ from .base import (
     create_translation_prompt,
     create_explanation_prompt,
 )
+from .batch import (
+    BatchError, BatchOutcome, BatchRequest, HAS_AIOHTTP, batch_http, iter_jsonl, jsonl_upload_form,
+)
 from ..config import get_api_key, MODELS
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI
     HAS_OPENAI = True
 except ImportError:
     HAS_OPENAI = False
@@ -48,7 +51,12 @@ class OpenAIProvider(BaseProvider):
         self._client = None
         
         if HAS_OPENAI and self._api_key:
-            self._client = OpenAI(api_key=self._api_key)
+            # Async client so many requests can be in flight per event loop
+            self._client = AsyncOpenAI(api_key=self._api_key)
+        
+        # Batch API endpoint (OPENAI_BASE_URL can point at a stub)
+        self._base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+        self._batch_output_files: Dict[str, List[str]] = {}
     
     @property
     def provider_name(self) -> str:
@@ -58,24 +66,18 @@ class OpenAIProvider(BaseProvider):
     def is_available(self) -> bool:
         return HAS_OPENAI and self._client is not None
     
-    def _call_api(
+    @property
+    def supports_batch(self) -> bool:
+        return self.is_available and HAS_AIOHTTP
+    
+    def _build_request(
         self,
         prompt: str,
-        max_tokens: int = 2048,
-        temperature: float = 0.3,
-        system: Optional[str] = None,
-    ) -> tuple[str, int, int, float]:
-        """
-        Call the OpenAI API.
-        
-        Returns:
-            Tuple of (response_text, input_tokens, output_tokens, latency_ms)
-        """
-        if not self.is_available:
-            raise RuntimeError("OpenAI client not available")
-        
-        start_time = time.time()
-        
+        max_tokens: int,
+        temperature: float,
+        system: Optional[str],
+    ) -> dict:
+        """Chat Completions parameters, shared by direct and batch calls."""
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
@@ -92,8 +94,29 @@ class OpenAIProvider(BaseProvider):
             create_kwargs["max_completion_tokens"] = max_tokens
         else:
             create_kwargs["max_tokens"] = max_tokens
-
-        response = self._client.chat.completions.create(**create_kwargs)
+        
+        return create_kwargs
+    
+    async def _call_api(
+        self,
+        prompt: str,
+        max_tokens: int = 2048,
+        temperature: float = 0.3,
+        system: Optional[str] = None,
+    ) -> tuple[str, int, int, float]:
+        """
+        Call the OpenAI API.
+        
+        Returns:
+            Tuple of (response_text, input_tokens, output_tokens, latency_ms)
+        """
+        if not self.is_available:
+            raise RuntimeError("OpenAI client not available")
+        
+        start_time = time.time()
+        
+        create_kwargs = self._build_request(prompt, max_tokens, temperature, system)
+        response = await self._client.chat.completions.create(**create_kwargs)
         
         latency_ms = (time.time() - start_time) * 1000
         
@@ -108,6 +131,73 @@ class OpenAIProvider(BaseProvider):
         
         return response_text, input_tokens, output_tokens, latency_ms
     
+    # ==================== Batch API ====================
+    
+    def _batch_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self._api_key}"}
+    
+    async def _submit_batch(self, requests: List[BatchRequest]) -> str:
+        # Upload the requests as a JSONL input file, then create the batch
+        records = [
+            {
+                "custom_id": r.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_request(r.prompt, r.max_tokens, r.temperature, r.system),
+            }
+            for r in requests
+        ]
+        form = jsonl_upload_form(records, purpose="batch", filename="benchmark_batch.jsonl")
+        uploaded = await batch_http("POST", f"{self._base_url}/files", self._batch_headers(), data=form)
+        
+        batch = await batch_http(
+            "POST",
+            f"{self._base_url}/batches",
+            self._batch_headers(),
+            json_body={
+                "input_file_id": uploaded["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        )
+        return batch["id"]
+    
+    async def _poll_batch(self, batch_id: str) -> bool:
+        batch = await batch_http("GET", f"{self._base_url}/batches/{batch_id}", self._batch_headers())
+        status = batch.get("status")
+        if status in ("failed", "expired", "cancelled"):
+            raise BatchError(f"Batch {batch_id} {status}: {batch.get('errors')}")
+        if status != "completed":
+            return False
+        self._batch_output_files[batch_id] = [
+            file_id for file_id in (batch.get("output_file_id"), batch.get("error_file_id")) if file_id
+        ]
+        return True
+    
+    async def _fetch_batch_results(self, batch_id: str) -> Dict[str, BatchOutcome]:
+        outcomes: Dict[str, BatchOutcome] = {}
+        for file_id in self._batch_output_files.pop(batch_id, []):
+            text = await batch_http(
+                "GET", f"{self._base_url}/files/{file_id}/content", self._batch_headers(), as_text=True,
+            )
+            for line in iter_jsonl(text):
+                response = line.get("response") or {}
+                body = response.get("body") or {}
+                if line.get("error") or response.get("status_code", 200) >= 400:
+                    error = line.get("error") or body.get("error")
+                    outcomes[line["custom_id"]] = BatchError(f"Batch request failed: {error}")
+                    continue
+                
+                choices = body.get("choices") or []
+                response_text = (choices[0].get("message", {}).get("content") or "") if choices else ""
+                usage = body.get("usage") or {}
+                outcomes[line["custom_id"]] = (
+                    response_text,
+                    usage.get("prompt_tokens", 0),
+                    usage.get("completion_tokens", 0),
+                )
+        return outcomes
+    
     async def translate(
         self,
         text: str,
@@ -131,7 +221,7 @@ class OpenAIProvider(BaseProvider):
         system = "You are an expert N'Ko language translator. Provide accurate, natural translations."
         
         try:
-            response_text, input_tokens, output_tokens, latency_ms = self._call_api(
+            response_text, input_tokens, output_tokens, latency_ms = await self._cached_call_api(
                 prompt=prompt,
                 max_tokens=1024,
                 temperature=0.3,
@@ -183,7 +273,7 @@ class OpenAIProvider(BaseProvider):
         system = "You are an expert in N'Ko language and Manding linguistics. Provide accurate, educational explanations."
         
         try:
-            response_text, input_tokens, output_tokens, latency_ms = self._call_api(
+            response_text, input_tokens, output_tokens, latency_ms = await self._cached_call_api(
                 prompt=prompt,
                 max_tokens=1024,
                 temperature=0.3,
@@ -229,7 +319,7 @@ class OpenAIProvider(BaseProvider):
             )
         
         try:
-            response_text, input_tokens, output_tokens, latency_ms = self._call_api(
+            response_text, input_tokens, output_tokens, latency_ms = await self._cached_call_api(
                 prompt=prompt,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -0,0 +1,217 @@
+"""
+Response Cache for N'Ko Benchmark Providers.
+
+Benchmark prompts are deterministic (create_translation_prompt,
+create_explanation_prompt, task templates), so re-running a benchmark
+after a scoring change would re-pay for identical API calls. This
+SQLite-backed cache stores provider responses keyed by a content hash of
+(provider, model, system prompt, prompt, temperature, max_tokens).
+
+Features:
+- TTL: entries older than ttl_hours are treated as misses and replaced
+- Size-bounded LRU eviction (by last use)
+- Three modes: "on" (read + write), "only" (read, never call the API),
+  "off" (no cache)
+- Hit/miss counters for the benchmark report
+
+Usage:
+    cache = ResponseCache("./data/cache/benchmark_responses.sqlite")
+    provider.response_cache = cache
+    ...
+    print(cache.get_stats())
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+DEFAULT_CACHE_PATH = "./data/cache/benchmark_responses.sqlite"
+
+CACHE_MODES = ("off", "on", "only")
+
+
+class CacheMissError(RuntimeError):
+    """Raised in cache-only mode when a request is not cached."""
+    pass
+
+
+class ResponseCache:
+    """
+    Persistent content-addressed cache of provider responses.
+
+    Values are the (response_text, input_tokens, output_tokens,
+    latency_ms) tuples returned by a provider's _call_api.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        mode: str = "on",
+        ttl_hours: float = 24 * 30,
+        max_entries: int = 200_000,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            mode: "on", "only" (never call the API) or "off"
+            ttl_hours: Entries older than this are ignored (0 = never expire)
+            max_entries: Evict least-recently-used entries beyond this size
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}' (expected one of {CACHE_MODES})")
+
+        self.path = path
+        self.mode = mode
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                response_text TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                latency_ms REAL NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses(last_used_at)"
+        )
+        self._conn.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @property
+    def read_only(self) -> bool:
+        """Whether misses must fail instead of calling the API."""
+        return self.mode == "only"
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        prompt: str,
+        system: Optional[str],
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Content hash identifying one request."""
+        payload = json.dumps(
+            [provider, model, system or "", prompt, float(temperature), int(max_tokens)],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, int, int, float]]:
+        """Look up a cached response, or None on a miss."""
+        self.stats["lookups"] += 1
+        row = self._conn.execute(
+            "SELECT response_text, input_tokens, output_tokens, latency_ms, created_at "
+            "FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+        now = time.time()
+        if row is not None and self.ttl_seconds and now - row[4] > self.ttl_seconds:
+            self.stats["expired"] += 1
+            row = None
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        self._conn.execute(
+            "UPDATE responses SET last_used_at = ? WHERE key = ?", (now, key)
+        )
+        self._conn.commit()
+        return row[0], row[1], row[2], row[3]
+
+    def put(
+        self,
+        key: str,
+        provider: str,
+        model: str,
+        value: Tuple[str, int, int, float],
+    ) -> None:
+        """Store a response tuple from _call_api."""
+        if self.read_only:
+            return
+        response_text, input_tokens, output_tokens, latency_ms = value
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, provider, model, response_text, "
+            "input_tokens, output_tokens, latency_ms, created_at, last_used_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, provider, model, response_text, input_tokens, output_tokens,
+             latency_ms, now, now),
+        )
+        self._conn.commit()
+        self.stats["stores"] += 1
+        self._evict_if_needed()
+
+    def _evict_if_needed(self) -> None:
+        """Drop least-recently-used entries once the cache exceeds max_entries."""
+        if not self.max_entries:
+            return
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # Evict down to 90% so we don't evict on every insert at the limit
+        excess = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_used_at ASC LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+        self.stats["evictions"] += excess
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["lookups"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "mode": self.mode,
+            **self.stats,
+            "entries": len(self),
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
@@ -178,6 +178,17 @@ class ReportGenerator:
             lines.append("```")
             lines.append("")
         
+        # Response cache effectiveness
+        cache = results.get("response_cache")
+        if cache:
+            lines.append("## Response Cache")
+            lines.append("")
+            lines.append(f"- Mode: {cache.get('mode', 'on')}")
+            lines.append(f"- Hits: {cache.get('hits', 0)} / Misses: {cache.get('misses', 0)} "
+                         f"(hit rate {cache.get('hit_rate', 0) * 100:.1f}%)")
+            lines.append(f"- Entries: {cache.get('entries', 0)}")
+            lines.append("")
+        
         # Footer
         lines.append("---")
         lines.append("")
@@ -517,6 +517,17 @@ class MandingReportGenerator:
                 lines.append("")
         
         # Footer
+        if comparison.get("response_cache"):
+            lines.append("## Response Cache")
+            lines.append("")
+            lines.append("| Model | Hits | Misses | Hit Rate |")
+            lines.append("|-------|------|--------|----------|")
+            for model_key, cache in comparison["response_cache"].items():
+                lookups = cache.get("hits", 0) + cache.get("misses", 0)
+                rate = cache.get("hits", 0) / lookups * 100 if lookups else 0.0
+                lines.append(f"| {model_key} | {cache.get('hits', 0)} | {cache.get('misses', 0)} | {rate:.1f}% |")
+            lines.append("")
+        
         lines.append("---")
         lines.append("")
         lines.append("*Report generated by LearnN'Ko Manding Language Benchmark Pipeline*")
@@ -603,6 +614,15 @@ class MandingReportGenerator:
         # Generate comparison
         comparison = self.generate_comparison_report(model_scores)
         
+        # Response cache hit/miss counts (present when the cache was enabled)
+        cache_stats = {
+            model_key: model_results["response_cache"]
+            for model_key, model_results in results.items()
+            if isinstance(model_results, dict) and "response_cache" in model_results
+        }
+        if cache_stats:
+            comparison["response_cache"] = cache_stats
+        
         # Generate all reports
         reports = {}
         reports["json"] = self.generate_json_report(comparison)
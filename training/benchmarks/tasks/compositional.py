@@ -11,7 +11,8 @@ Tests AI models on deep language understanding through:
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 
-from ..providers.base import BaseProvider, TaskType
+from ..providers.base import BaseProvider, ProviderResult, TaskType
+from ..providers.concurrency import map_ordered
 
 
 @dataclass
@@ -80,7 +81,7 @@ class CompositionalTask:
         
         total_latency = 0.0
         
-        for i, sample in enumerate(compositional_samples):
+        async def call(i: int, sample: Dict[str, Any]) -> ProviderResult:
             test_type = sample.get("type", "novel_word")
             prompt = sample.get("prompt", "")
             expected = sample.get("expected", "")
@@ -130,10 +131,17 @@ Provide:
             else:
                 full_prompt = prompt
             
-            result = await provider.run_task(
+            return await provider.run_task(
                 TaskType.COMPOSITIONAL,
                 {"prompt": full_prompt}
             )
+        
+        # Samples run concurrently but are consumed in order
+        async for i, sample, result in map_ordered(provider, compositional_samples, call):
+            test_type = sample.get("type", "novel_word")
+            prompt = sample.get("prompt", "")
+            expected = sample.get("expected", "")
+            difficulty = sample.get("difficulty", "medium")
             
             task_result = CompositionalResult(
                 sample_id=i,
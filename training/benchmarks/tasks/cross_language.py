@@ -21,7 +21,9 @@ from ..data.manding_loader import (
     CognatePair,
     VocabEntry,
 )
+from ..metrics.corpus_metrics import char_coverage, char_jaccard
 from ..providers.base import BaseProvider
+from ..providers.concurrency import map_ordered
 
 
 class CrossLanguageTaskType(Enum):
@@ -72,6 +74,7 @@ class CrossMandingTranslationTask:
         source_lang: Language,
         target_lang: Language,
         progress_callback: Optional[callable] = None,
+        result_callback: Optional[callable] = None,
     ) -> List[CrossLanguageResult]:
         """
         Run cross-language translation tests.
@@ -82,6 +85,8 @@ class CrossMandingTranslationTask:
             source_lang: Source language
             target_lang: Target language
             progress_callback: Optional callback for progress updates
+            result_callback: Optional callback(pair, result) for each
+                             completed result, in order
             
         Returns:
             List of CrossLanguageResult objects
@@ -93,15 +98,12 @@ class CrossMandingTranslationTask:
             translation_pairs, source_lang, target_lang
         )
         
-        for i, pair in enumerate(valid_pairs):
-            if progress_callback:
-                progress_callback(i, len(valid_pairs), "cross_translation")
-            
+        async def evaluate(i: int, pair: TranslationPair) -> Optional[CrossLanguageResult]:
             source_text = self._get_text_for_lang(pair, source_lang)
             reference_text = self._get_text_for_lang(pair, target_lang)
             
             if not source_text or not reference_text:
-                continue
+                return None
             
             # Build translation prompt
             try:
@@ -163,7 +165,16 @@ class CrossMandingTranslationTask:
                     error=str(e),
                 )
             
-            results.append(result)
+            return result
+        
+        # Items run concurrently but are consumed in order
+        async for i, item, result in map_ordered(provider, valid_pairs, evaluate):
+            if progress_callback:
+                progress_callback(i, len(valid_pairs), "cross_translation")
+            if result is not None:
+                results.append(result)
+                if result_callback:
+                    result_callback(item, result)
         
         return results
     
@@ -275,6 +286,7 @@ class ScriptTransliterationTask:
         vocabulary: List[VocabEntry],
         direction: str = "nko_to_latin",  # or "latin_to_nko"
         progress_callback: Optional[callable] = None,
+        result_callback: Optional[callable] = None,
     ) -> List[CrossLanguageResult]:
         """Run script transliteration tests."""
         results = []
@@ -285,10 +297,7 @@ class ScriptTransliterationTask:
             if v.word and v.latin_transcription
         ]
         
-        for i, entry in enumerate(valid_vocab):
-            if progress_callback:
-                progress_callback(i, len(valid_vocab), "script_conversion")
-            
+        async def evaluate(i: int, entry: VocabEntry) -> Optional[CrossLanguageResult]:
             if direction == "nko_to_latin":
                 source_text = entry.word
                 reference_text = entry.latin_transcription
@@ -348,27 +357,22 @@ N'Ko:"""
                     error=str(e),
                 )
             
-            results.append(result)
+            return result
+        
+        # Items run concurrently but are consumed in order
+        async for i, item, result in map_ordered(provider, valid_vocab, evaluate):
+            if progress_callback:
+                progress_callback(i, len(valid_vocab), "script_conversion")
+            if result is not None:
+                results.append(result)
+                if result_callback:
+                    result_callback(item, result)
         
         return results
     
     def _calculate_similarity(self, pred: str, ref: str) -> float:
-        """Calculate character-level similarity."""
-        if not pred or not ref:
-            return 0.0
-        
-        pred = pred.lower()
-        ref = ref.lower()
-        
-        # Simple character overlap
-        pred_chars = set(pred)
-        ref_chars = set(ref)
-        
-        if not ref_chars:
-            return 0.0
-        
-        overlap = len(pred_chars & ref_chars)
-        return overlap / len(ref_chars)
+        """Calculate character-level similarity (share of reference characters predicted)."""
+        return char_coverage(pred, ref)
 
 
 class DialectIdentificationTask:
@@ -406,6 +410,7 @@ class DialectIdentificationTask:
         provider: BaseProvider,
         pairs: List[TranslationPair],
         progress_callback: Optional[callable] = None,
+        result_callback: Optional[callable] = None,
     ) -> List[CrossLanguageResult]:
         """Run dialect identification tests."""
         results = []
@@ -413,10 +418,7 @@ class DialectIdentificationTask:
         # Filter Bambara pairs (we know their dialect)
         bambara_pairs = [p for p in pairs if p.source_lang == Language.BAMBARA]
         
-        for i, pair in enumerate(bambara_pairs[:50]):  # Limit for this task
-            if progress_callback:
-                progress_callback(i, min(50, len(bambara_pairs)), "dialect_id")
-            
+        async def evaluate(i: int, pair: TranslationPair) -> Optional[CrossLanguageResult]:
             prompt = f"""Identify the Manding dialect/variant of the following text.
 The options are: Bambara, Malinke (Maninka), or Jula (Dioula).
 
@@ -460,7 +462,16 @@ Respond with only the dialect name (Bambara, Malinke, or Jula):"""
                     error=str(e),
                 )
             
-            results.append(result)
+            return result
+        
+        # Items run concurrently but are consumed in order
+        async for i, item, result in map_ordered(provider, bambara_pairs[:50], evaluate):  # Limit for this task
+            if progress_callback:
+                progress_callback(i, min(50, len(bambara_pairs)), "dialect_id")
+            if result is not None:
+                results.append(result)
+                if result_callback:
+                    result_callback(item, result)
         
         return results
 
@@ -483,16 +494,14 @@ class CognateRecognitionTask:
         provider: BaseProvider,
         cognates: List[CognatePair],
         progress_callback: Optional[callable] = None,
+        result_callback: Optional[callable] = None,
     ) -> List[CrossLanguageResult]:
         """Run cognate recognition tests."""
         results = []
         
-        for i, cognate in enumerate(cognates):
-            if progress_callback:
-                progress_callback(i, len(cognates), "cognate_recognition")
-            
+        async def evaluate(i: int, cognate: CognatePair) -> Optional[CrossLanguageResult]:
             if not cognate.nko_form or not cognate.bambara_form:
-                continue
+                return None
             
             prompt = f"""Given this N'Ko word and its meaning, identify the equivalent Bambara word.
 
@@ -539,25 +548,22 @@ What is the Bambara (Latin script) equivalent? Provide only the word:"""
                     error=str(e),
                 )
             
-            results.append(result)
+            return result
+        
+        # Items run concurrently but are consumed in order
+        async for i, item, result in map_ordered(provider, cognates, evaluate):
+            if progress_callback:
+                progress_callback(i, len(cognates), "cognate_recognition")
+            if result is not None:
+                results.append(result)
+                if result_callback:
+                    result_callback(item, result)
         
         return results
     
     def _word_similarity(self, pred: str, ref: str) -> float:
-        """Calculate word similarity using character overlap."""
-        if not pred or not ref:
-            return 0.0
-        
-        pred_chars = set(pred)
-        ref_chars = set(ref)
-        
-        if not ref_chars:
-            return 0.0
-        
-        intersection = len(pred_chars & ref_chars)
-        union = len(pred_chars | ref_chars)
-        
-        return intersection / union if union > 0 else 0.0
+        """Calculate word similarity using character overlap (Jaccard)."""
+        return char_jaccard(pred, ref)
 
 
 class BackTranslationTask:
@@ -578,6 +584,7 @@ class BackTranslationTask:
         source_lang: Language,
         pivot_lang: Language,
         progress_callback: Optional[callable] = None,
+        result_callback: Optional[callable] = None,
     ) -> List[CrossLanguageResult]:
         """
         Run back-translation tests.
@@ -587,10 +594,7 @@ class BackTranslationTask:
         """
         results = []
         
-        for i, pair in enumerate(pairs):
-            if progress_callback:
-                progress_callback(i, len(pairs), "back_translation")
-            
+        async def evaluate(i: int, pair: TranslationPair) -> Optional[CrossLanguageResult]:
             source_text = pair.source_text
             
             # Step 1: Translate to pivot
@@ -651,7 +655,16 @@ Translation:"""
                     error=str(e),
                 )
             
-            results.append(result)
+            return result
+        
+        # Items run concurrently but are consumed in order
+        async for i, item, result in map_ordered(provider, pairs, evaluate, requests_per_item=2):
+            if progress_callback:
+                progress_callback(i, len(pairs), "back_translation")
+            if result is not None:
+                results.append(result)
+                if result_callback:
+                    result_callback(item, result)
         
         return results
     
@@ -7,7 +7,8 @@ Tests AI models on cultural context, proverbs, idioms, and appropriate register.
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 
-from ..providers.base import BaseProvider, TaskType
+from ..providers.base import BaseProvider, ProviderResult, TaskType
+from ..providers.concurrency import map_ordered
 
 
 @dataclass
@@ -69,7 +70,7 @@ class CulturalTask:
         
         total_latency = 0.0
         
-        for i, sample in enumerate(cultural_samples):
+        async def call(i: int, sample: Dict[str, Any]) -> ProviderResult:
             nko_text = sample.get("nko_text", "")
             cultural_type = sample.get("type", "proverb_candidate")
             
@@ -109,10 +110,15 @@ Provide:
 3. Context of usage
 4. Any related expressions"""
             
-            result = await provider.run_task(
+            return await provider.run_task(
                 TaskType.CULTURAL,
                 {"prompt": prompt, "nko_text": nko_text}
             )
+        
+        # Samples run concurrently but are consumed in order
+        async for i, sample, result in map_ordered(provider, cultural_samples, call):
+            nko_text = sample.get("nko_text", "")
+            cultural_type = sample.get("type", "proverb_candidate")
             
             task_result = CulturalResult(
                 sample_id=i,
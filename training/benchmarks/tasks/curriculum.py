@@ -25,6 +25,7 @@ from ..data.manding_loader import (
     MandingTestSet,
 )
 from ..providers.base import BaseProvider
+from ..providers.concurrency import map_ordered
 
 
 class CEFRLevel(Enum):
@@ -622,6 +623,7 @@ class CurriculumTask:
         provider: BaseProvider,
         test_items: List[CurriculumTestItem],
         progress_callback: Optional[callable] = None,
+        result_callback: Optional[callable] = None,
     ) -> List[CurriculumResult]:
         """
         Run curriculum tests on a provider.
@@ -630,16 +632,15 @@ class CurriculumTask:
             provider: LLM provider to test
             test_items: List of curriculum test items
             progress_callback: Optional callback for progress updates
+            result_callback: Optional callback(item, result) for each
+                             completed result, in order
             
         Returns:
             List of CurriculumResult objects
         """
         results = []
         
-        for i, item in enumerate(test_items):
-            if progress_callback:
-                progress_callback(i, len(test_items), f"curriculum_{item.level.value}")
-            
+        async def evaluate(i: int, item: CurriculumTestItem) -> CurriculumResult:
             prompt = self._build_prompt(item)
             
             try:
@@ -677,7 +678,15 @@ class CurriculumTask:
                     error=str(e),
                 )
             
+            return result
+        
+        # Items run concurrently but are consumed in order
+        async for i, item, result in map_ordered(provider, test_items, evaluate):
+            if progress_callback:
+                progress_callback(i, len(test_items), f"curriculum_{item.level.value}")
             results.append(result)
+            if result_callback:
+                result_callback(item, result)
         
         return results
     
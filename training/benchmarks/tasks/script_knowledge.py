@@ -7,7 +7,8 @@ Tests AI models on N'Ko script recognition, transliteration, and character knowl
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 
-from ..providers.base import BaseProvider, TaskType
+from ..providers.base import BaseProvider, ProviderResult, TaskType
+from ..providers.concurrency import map_ordered
 from ..config import NKO_ALPHABET
 
 
@@ -71,7 +72,7 @@ class ScriptKnowledgeTask:
         
         total_latency = 0.0
         
-        for i, sample in enumerate(script_samples):
+        async def call(i: int, sample: Dict[str, Any]) -> ProviderResult:
             nko_text = sample.get("nko_text", "")
             task_type = sample.get("task", "recognize")
             
@@ -97,10 +98,15 @@ Provide:
 2. Its Latin equivalent
 3. Common usage"""
             
-            result = await provider.run_task(
+            return await provider.run_task(
                 TaskType.SCRIPT_KNOWLEDGE,
                 {"nko_text": nko_text, "prompt": prompt}
             )
+        
+        # Samples run concurrently but are consumed in order
+        async for i, sample, result in map_ordered(provider, script_samples, call):
+            nko_text = sample.get("nko_text", "")
+            task_type = sample.get("task", "recognize")
             
             task_result = ScriptKnowledgeResult(
                 sample_id=i,
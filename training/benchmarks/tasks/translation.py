@@ -7,7 +7,8 @@ Tests translation quality between N'Ko, English, and French.
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 
-from ..providers.base import BaseProvider, TaskType
+from ..providers.base import BaseProvider, ProviderResult, TaskType
+from ..providers.concurrency import map_ordered
 from ..data.sampler import TranslationSample
 
 
@@ -91,56 +92,72 @@ class TranslationTask:
         
         total_latency = 0.0
         
-        for source_lang, target_lang, samples, results_list in directions:
-            for i, sample in enumerate(samples):
-                # Get source and expected text based on direction
-                if source_lang == "nko":
-                    source_text = sample.nko_text
-                    expected = sample.english if target_lang == "en" else sample.french
-                elif source_lang == "en":
-                    source_text = sample.english
-                    expected = sample.nko_text
-                else:  # fr
-                    source_text = sample.french
-                    expected = sample.nko_text
-                
-                # Run translation
-                result = await provider.run_task(
-                    TaskType.TRANSLATION,
-                    {
-                        "text": source_text,
-                        "source_lang": source_lang,
-                        "target_lang": target_lang,
-                    }
-                )
-                
-                task_result = TranslationTaskResult(
-                    sample_id=i,
-                    source_text=source_text,
-                    source_lang=source_lang,
-                    target_lang=target_lang,
-                    expected=expected,
-                    predicted=result.response,
-                    success=result.success,
-                    latency_ms=result.latency_ms,
-                    error=result.error,
+        # Flatten all directions into one ordered work list so the worker
+        # pool stays busy across direction boundaries
+        work = [
+            (source_lang, target_lang, samples, results_list, i, sample)
+            for source_lang, target_lang, samples, results_list in directions
+            for i, sample in enumerate(samples)
+        ]
+        
+        def source_and_expected(source_lang: str, target_lang: str, sample: TranslationSample):
+            # Get source and expected text based on direction
+            if source_lang == "nko":
+                source_text = sample.nko_text
+                expected = sample.english if target_lang == "en" else sample.french
+            elif source_lang == "en":
+                source_text = sample.english
+                expected = sample.nko_text
+            else:  # fr
+                source_text = sample.french
+                expected = sample.nko_text
+            return source_text, expected
+        
+        async def call(_, item) -> ProviderResult:
+            source_lang, target_lang, _, _, _, sample = item
+            source_text, _ = source_and_expected(source_lang, target_lang, sample)
+            
+            # Run translation
+            return await provider.run_task(
+                TaskType.TRANSLATION,
+                {
+                    "text": source_text,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                }
+            )
+        
+        async for _, item, result in map_ordered(provider, work, call):
+            source_lang, target_lang, samples, results_list, i, sample = item
+            source_text, expected = source_and_expected(source_lang, target_lang, sample)
+            
+            task_result = TranslationTaskResult(
+                sample_id=i,
+                source_text=source_text,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                expected=expected,
+                predicted=result.response,
+                success=result.success,
+                latency_ms=result.latency_ms,
+                error=result.error,
+            )
+            
+            results_list.append(task_result)
+            self.results.results.append(task_result)
+            self.results.total_tests += 1
+            
+            if result.success:
+                self.results.successful_tests += 1
+                total_latency += result.latency_ms
+            
+            if progress_callback:
+                progress_callback(
+                    task="translation",
+                    direction=f"{source_lang}_to_{target_lang}",
+                    current=i + 1,
+                    total=len(samples),
                 )
-                
-                results_list.append(task_result)
-                self.results.results.append(task_result)
-                self.results.total_tests += 1
-                
-                if result.success:
-                    self.results.successful_tests += 1
-                    total_latency += result.latency_ms
-                
-                if progress_callback:
-                    progress_callback(
-                        task="translation",
-                        direction=f"{source_lang}_to_{target_lang}",
-                        current=i + 1,
-                        total=len(samples),
-                    )
         
         # Calculate average latency
         if self.results.successful_tests > 0:
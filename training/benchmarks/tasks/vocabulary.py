@@ -7,7 +7,8 @@ Tests AI models on N'Ko vocabulary definitions, word classes, and morphology.
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 
-from ..providers.base import BaseProvider, TaskType
+from ..providers.base import BaseProvider, ProviderResult, TaskType
+from ..providers.concurrency import map_ordered
 from ..data.sampler import VocabularySample
 
 
@@ -71,7 +72,7 @@ class VocabularyTask:
         
         total_latency = 0.0
         
-        for i, sample in enumerate(vocabulary_samples):
+        async def call(i: int, sample: VocabularySample) -> ProviderResult:
             # Build prompt
             prompt = f"""Define this N'Ko/Bambara word: {sample.word}
 
@@ -83,11 +84,13 @@ Provide:
 
 Be concise and accurate."""
             
-            result = await provider.run_task(
+            return await provider.run_task(
                 TaskType.VOCABULARY,
                 {"word": sample.word, "prompt": prompt}
             )
-            
+        
+        # Samples run concurrently but are consumed in order
+        async for i, sample, result in map_ordered(provider, vocabulary_samples, call):
             # Extract expected values
             expected_meaning = None
             if sample.definitions_en:
@@ -6,21 +6,39 @@ Core modules for the N'Ko video analysis and training pipeline.
 Modules:
 - analyzer: NkoAnalyzer for video analysis, OCR, and world generation
 - dictionary_client: DictionaryClient for Ankataa dictionary lookups
+- dictionary_index: In-process exact + fuzzy index of dictionary entries
 - expansion_engine: ExpansionEngine for continuous vocabulary learning
 - retry_utils: Retry utilities with exponential backoff
+- rate_limiter: Async token-bucket rate limiter for shared API budgets
+- single_flight: Request coalescing for concurrent identical lookups
 - supabase_client: Supabase database client
 - world_generator: World variant generator
 - frame_filter: Smart frame extraction and filtering
+- ocr_cache: Persistent perceptual-hash cache for frame OCR results
+- write_buffer: Write-behind buffered sink for bulk Supabase upserts
+
+Exports are imported on first use, so importing a dependency-free module
+such as training.lib.single_flight does not pull in bs4 or aiohttp.
 """
 
-from .dictionary_client import DictionaryClient, DictionaryLookupResult, normalize_word
-from .expansion_engine import ExpansionEngine, EnrichmentResult, QueueItem
-
-__all__ = [
-    "DictionaryClient",
-    "DictionaryLookupResult",
-    "normalize_word",
-    "ExpansionEngine",
-    "EnrichmentResult",
-    "QueueItem",
-]
+import importlib
+
+_EXPORTS = {
+    "DictionaryClient": "dictionary_client",
+    "DictionaryLookupResult": "dictionary_client",
+    "normalize_word": "dictionary_client",
+    "ExpansionEngine": "expansion_engine",
+    "EnrichmentResult": "expansion_engine",
+    "QueueItem": "expansion_engine",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
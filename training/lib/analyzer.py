@@ -30,10 +30,11 @@ import json
 import os
 import sys
 import base64
+import hashlib
 import yaml
 import logging
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterable, Union
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 import re
@@ -49,13 +50,13 @@ from world_generator import WorldGenerator, WorldVariant, WorldGenerationResult,
 from supabase_client import (
     SupabaseClient,
     SourceData,
-    FrameData,
-    DetectionData,
     TrajectoryData,
     TrajectoryNodeData,
 )
 from frame_filter import SmartFrameExtractor, FrameInfo
 from retry_utils import retry_with_backoff, RetryConfig, RetryError
+from rate_limiter import TokenBucket
+from ocr_cache import OcrCache
 
 # Optional: Dictionary client for enrichment
 try:
@@ -88,6 +89,28 @@ CHANNEL_URL = "https://www.youtube.com/@babamamadidiane"
 GEMINI_MODEL = "gemini-2.0-flash"
 GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
 
+# Frame OCR prompt; OCR_PROMPT_VERSION keys the OCR cache, so editing the
+# prompt or switching models invalidates cached results automatically
+FRAME_OCR_PROMPT = """Analyze this video frame for N'Ko script (ߒߞߏ) text.
+
+If you find N'Ko text:
+1. Extract all N'Ko text exactly as written
+2. Provide Latin transliteration  
+3. Provide English translation
+
+Respond in this exact JSON format:
+{
+    "has_nko_text": true/false,
+    "nko_text": "extracted N'Ko text or null",
+    "latin_transliteration": "transliteration or null", 
+    "english_translation": "translation or null",
+    "confidence": 0.0-1.0,
+    "notes": "any additional observations"
+}
+
+Focus on clear, visible text. Ignore blurry or partial text."""
+OCR_PROMPT_VERSION = hashlib.sha256(f"{GEMINI_MODEL}\n{FRAME_OCR_PROMPT}".encode("utf-8")).hexdigest()[:12]
+
 # Default worlds to generate
 DEFAULT_WORLDS = ["world_everyday", "world_formal", "world_storytelling", "world_proverbs", "world_educational"]
 
@@ -108,12 +131,22 @@ DEFAULT_CONFIG = {
             "retry_base_delay": 2.0,
             "retry_max_delay": 60.0,
             "rate_limit_delay": 0.5,
+            "max_concurrent_frames": 4,
+            "rate_limit_burst": 4,
         }
     },
     "storage": {
         "supabase": {"enabled": True},
         "local": {"temp_dir": "./data/temp", "keep_frames": False},
     },
+    "cache": {
+        "ocr": {
+            "enabled": False,
+            "path": "./data/cache/ocr_cache.sqlite",
+            "hamming_radius": 4,
+            "max_entries": 100000,
+        },
+    },
     "worlds": {
         "enabled": True,
         "selected": DEFAULT_WORLDS,
@@ -194,6 +227,8 @@ class FrameAnalysis:
     verified_french: Optional[str] = None
     variants: List[str] = field(default_factory=list)
     dictionary_match_score: float = 0.0
+    # True if OCR fields came from the persistent OCR cache
+    ocr_cache_hit: bool = False
 
 
 @dataclass
@@ -232,6 +267,7 @@ class NkoAnalyzer:
         worlds: Optional[List[str]] = None,
         config: Optional[Dict[str, Any]] = None,
         config_path: Optional[str] = None,
+        max_concurrent_frames: Optional[int] = None,
     ):
         """
         Initialize the analyzer.
@@ -243,6 +279,7 @@ class NkoAnalyzer:
             worlds: Which worlds to generate (defaults to all 5)
             config: Configuration dictionary (overrides config_path)
             config_path: Path to YAML config file
+            max_concurrent_frames: Max in-flight OCR requests (overrides config)
         """
         # Load configuration
         if config is not None:
@@ -256,6 +293,16 @@ class NkoAnalyzer:
         self.api_timeout = api_config.get("timeout_seconds", 90)
         self.rate_limit_delay = api_config.get("rate_limit_delay", 0.5)
         
+        # Concurrent OCR: bounded in-flight requests sharing one token bucket.
+        # rate_limit_delay is kept as the long-run budget (1 / delay req/s).
+        self.max_concurrent_frames = max(
+            1, max_concurrent_frames or api_config.get("max_concurrent_frames", 4)
+        )
+        self.rate_limiter = TokenBucket.from_interval(
+            self.rate_limit_delay,
+            capacity=api_config.get("rate_limit_burst", self.max_concurrent_frames),
+        )
+        
         # Retry configuration
         self.retry_config = RetryConfig(
             max_retries=api_config.get("max_retries", 3),
@@ -268,6 +315,20 @@ class NkoAnalyzer:
         self.generate_worlds = generate_worlds if generate_worlds is not None else self.config.get("worlds", {}).get("enabled", True)
         self.worlds = worlds or self.config.get("worlds", {}).get("selected", DEFAULT_WORLDS)
         
+        # Persistent OCR cache keyed by perceptual hash + prompt version
+        self.ocr_cache: Optional[OcrCache] = None
+        ocr_cache_config = self.config.get("cache", {}).get("ocr", {})
+        if ocr_cache_config.get("enabled", False):
+            try:
+                self.ocr_cache = OcrCache(
+                    path=ocr_cache_config.get("path", "./data/cache/ocr_cache.sqlite"),
+                    hamming_radius=ocr_cache_config.get("hamming_radius", 4),
+                    max_entries=ocr_cache_config.get("max_entries", 100000),
+                    hash_algorithm=self.config.get("extraction", {}).get("hash_algorithm", "dhash"),
+                )
+            except Exception as e:
+                logger.warning(f"OCR cache unavailable: {e}")
+        
         # Session for connection reuse (initialized in __aenter__)
         self._session: Optional[aiohttp.ClientSession] = None
         self._owns_session: bool = False
@@ -313,10 +374,21 @@ class NkoAnalyzer:
         # Initialize dictionary client for enrichment
         if self.enable_enrichment and HAS_DICTIONARY:
             try:
-                self.dictionary = DictionaryClient()
+                dictionary_config = self.config.get("cache", {}).get("dictionary", {})
+                self.dictionary = DictionaryClient(
+                    index_refresh_seconds=dictionary_config.get("refresh_seconds", 3600),
+                )
             except Exception as e:
                 logger.warning(f"Dictionary client unavailable: {e}")
                 self.enable_enrichment = False
+            
+            # In-process index: lookups per detected word skip the network
+            if self.dictionary and dictionary_config.get("index", False):
+                try:
+                    count = await self.dictionary.load_index(dictionary_config.get("index_path"))
+                    logger.info(f"Dictionary index loaded: {count} entries")
+                except Exception as e:
+                    logger.warning(f"Dictionary index unavailable, using Supabase: {e}")
         
         return self
     
@@ -325,6 +397,17 @@ class NkoAnalyzer:
         if self._session and self._owns_session:
             await self._session.close()
             self._session = None
+        if self.supabase:
+            await self.supabase.close()
+        if self.dictionary:
+            logger.info(f"Dictionary lookup stats: {self.dictionary.get_stats()}")
+            await self.dictionary.close()
+        if self.expansion_engine:
+            await self.expansion_engine.close()
+        if self.ocr_cache is not None:
+            logger.info(f"OCR cache stats: {self.ocr_cache.get_stats()}")
+            self.ocr_cache.close()
+            self.ocr_cache = None
         return False
     
     def _get_session(self) -> aiohttp.ClientSession:
@@ -341,6 +424,8 @@ class NkoAnalyzer:
         frame_path: str,
         frame_index: int,
         timestamp: Optional[float] = None,
+        frame_data: Optional[bytes] = None,
+        phash: Optional[int] = None,
     ) -> FrameAnalysis:
         """
         Analyze a single frame with Gemini multimodal API.
@@ -352,6 +437,9 @@ class NkoAnalyzer:
             frame_path: Path to the frame image
             frame_index: Index of the frame
             timestamp: Frame timestamp in seconds (optional)
+            frame_data: In-memory JPEG bytes (skips reading frame_path)
+            phash: Hash the frame filter already computed (same
+                   extraction.hash_algorithm), reused as the OCR cache key
             
         Returns:
             FrameAnalysis with OCR results
@@ -362,43 +450,64 @@ class NkoAnalyzer:
         analysis = FrameAnalysis(
             frame_index=frame_index,
             timestamp=timestamp,
-            frame_path=frame_path,
+            frame_path=frame_path or None,
         )
         
-        # Read frame data
-        try:
-            with open(frame_path, "rb") as f:
-                frame_data = f.read()
-        except IOError as e:
-            analysis.raw_response = f"File read error: {e}"
-            return analysis
+        # Read frame data (unless streamed in memory)
+        if frame_data is None:
+            try:
+                with open(frame_path, "rb") as f:
+                    frame_data = f.read()
+            except IOError as e:
+                analysis.raw_response = f"File read error: {e}"
+                return analysis
+        
+        # OCR cache: frames seen before (within the Hamming radius) skip Gemini
+        cache_hash = None
+        if self.ocr_cache is not None:
+            cache_hash = phash if phash is not None else self.ocr_cache.compute_hash(frame_data)
+            cached = self.ocr_cache.get(cache_hash, OCR_PROMPT_VERSION)
+            if cached:
+                for key, value in cached.items():
+                    setattr(analysis, key, value)
+                analysis.ocr_cache_hit = True
+        
+        if not analysis.ocr_cache_hit:
+            parsed = await self._ocr_with_gemini(analysis, frame_data)
+            if parsed and cache_hash is not None:
+                self.ocr_cache.put(cache_hash, OCR_PROMPT_VERSION, {
+                    "has_nko": analysis.has_nko,
+                    "nko_text": analysis.nko_text,
+                    "latin_transliteration": analysis.latin_transliteration,
+                    "english_translation": analysis.english_translation,
+                    "confidence": analysis.confidence,
+                    "raw_response": analysis.raw_response,
+                })
+        
+        # Dictionary enrichment - cross-reference with Ankataa dictionary
+        if analysis.has_nko and analysis.latin_transliteration and self.enable_enrichment:
+            analysis = await self._enrich_with_dictionary(analysis)
+        
+        # Queue detected word for continuous learning (async, non-blocking)
+        if analysis.has_nko and analysis.latin_transliteration and self.enable_queue:
+            await self._queue_for_expansion(analysis)
+        
+        return analysis
+    
+    async def _ocr_with_gemini(self, analysis: FrameAnalysis, frame_data: bytes) -> bool:
+        """
+        Run Gemini OCR on encoded frame bytes and fill in `analysis`.
         
+        Returns:
+            True if a well-formed OCR result was parsed
+        """
         # Encode as base64
         image_b64 = base64.b64encode(frame_data).decode("utf-8")
         
-        prompt = """Analyze this video frame for N'Ko script (ߒߞߏ) text.
-
-If you find N'Ko text:
-1. Extract all N'Ko text exactly as written
-2. Provide Latin transliteration  
-3. Provide English translation
-
-Respond in this exact JSON format:
-{
-    "has_nko_text": true/false,
-    "nko_text": "extracted N'Ko text or null",
-    "latin_transliteration": "transliteration or null", 
-    "english_translation": "translation or null",
-    "confidence": 0.0-1.0,
-    "notes": "any additional observations"
-}
-
-Focus on clear, visible text. Ignore blurry or partial text."""
-
         payload = {
             "contents": [{
                 "parts": [
-                    {"text": prompt},
+                    {"text": FRAME_OCR_PROMPT},
                     {
                         "inline_data": {
                             "mime_type": "image/jpeg",
@@ -418,6 +527,8 @@ Focus on clear, visible text. Ignore blurry or partial text."""
         
         async def _call_gemini_api():
             """Inner function for retry logic."""
+            # Every attempt (including retries) draws from the shared bucket
+            await self.rate_limiter.acquire()
             async with session.post(
                 f"{GEMINI_API_URL}?key={self.api_key}",
                 json=payload,
@@ -465,26 +576,139 @@ Focus on clear, visible text. Ignore blurry or partial text."""
                     analysis.english_translation = result.get("english_translation")
                     analysis.confidence = result.get("confidence", 0.0)
                     analysis.raw_response = json.dumps(result)
+                    return True
                     
                 except (KeyError, IndexError, json.JSONDecodeError) as e:
                     analysis.raw_response = f"Parse error: {e}"
                     
         except RetryError as e:
-            logger.error(f"Frame {frame_index} failed after {e.attempts} attempts: {e.last_exception}")
+            logger.error(f"Frame {analysis.frame_index} failed after {e.attempts} attempts: {e.last_exception}")
             analysis.raw_response = f"Retry exhausted: {e.last_exception}"
         except Exception as e:
-            logger.error(f"Frame {frame_index} unexpected error: {e}")
+            logger.error(f"Frame {analysis.frame_index} unexpected error: {e}")
             analysis.raw_response = f"Unexpected error: {e}"
         
-        # Dictionary enrichment - cross-reference with Ankataa dictionary
-        if analysis.has_nko and analysis.latin_transliteration and self.enable_enrichment:
-            analysis = await self._enrich_with_dictionary(analysis)
+        return False
+    
+    async def analyze_frames(
+        self,
+        frames: List[FrameInfo],
+        max_concurrent: Optional[int] = None,
+    ) -> List[FrameAnalysis]:
+        """
+        Analyze many frames concurrently with a bounded worker pool.
         
-        # Queue detected word for continuous learning (async, non-blocking)
-        if analysis.has_nko and analysis.latin_transliteration and self.enable_queue:
-            await self._queue_for_expansion(analysis)
+        Up to `max_concurrent` OCR requests are in flight at once; all of
+        them draw from the shared token bucket, so the request rate stays
+        within the configured Gemini budget. Results are returned in the
+        same order as `frames`, regardless of completion order.
         
-        return analysis
+        Args:
+            frames: Frames to analyze (path, index, timestamp)
+            max_concurrent: Override for max in-flight requests
+            
+        Returns:
+            List of FrameAnalysis, one per input frame, in input order
+        """
+        return [
+            frame_analysis
+            async for frame_analysis in self.analyze_stream(frames, max_concurrent)
+        ]
+    
+    async def analyze_stream(
+        self,
+        frames: Union[Iterable[FrameInfo], AsyncIterator[FrameInfo]],
+        max_concurrent: Optional[int] = None,
+    ) -> AsyncIterator[FrameAnalysis]:
+        """
+        Concurrently OCR a (possibly streaming) frame source.
+        
+        Frames are pulled from `frames` as workers free up, so an async
+        generator such as SmartFrameExtractor.stream_frames() is only
+        advanced as fast as OCR can keep up. Frames carrying in-memory
+        `data` are sent without touching disk. Results are yielded in
+        input order as soon as each one's predecessors are done.
+        
+        Args:
+            frames: List/iterable or async iterator of FrameInfo
+            max_concurrent: Override for max in-flight requests
+            
+        Yields:
+            FrameAnalysis per input frame, in input order
+        """
+        workers = max(1, max_concurrent or self.max_concurrent_frames)
+        pending_frames: asyncio.Queue = asyncio.Queue(maxsize=workers)
+        finished: asyncio.Queue = asyncio.Queue()
+        done_marker = object()
+        
+        async def _produce():
+            position = 0
+            try:
+                if hasattr(frames, "__aiter__"):
+                    async for frame_info in frames:
+                        await pending_frames.put((position, frame_info))
+                        position += 1
+                else:
+                    for frame_info in frames:
+                        await pending_frames.put((position, frame_info))
+                        position += 1
+            finally:
+                for _ in range(workers):
+                    await pending_frames.put(None)
+        
+        async def _worker():
+            while True:
+                item = await pending_frames.get()
+                if item is None:
+                    break
+                position, frame_info = item
+                try:
+                    frame_analysis = await self.analyze_frame(
+                        frame_path=frame_info.path,
+                        frame_index=frame_info.index,
+                        timestamp=frame_info.timestamp,
+                        frame_data=frame_info.data,
+                        phash=frame_info.phash,
+                    )
+                except Exception as e:
+                    logger.error(f"Frame {frame_info.index} worker error: {e}")
+                    frame_analysis = FrameAnalysis(
+                        frame_index=frame_info.index,
+                        timestamp=frame_info.timestamp,
+                        frame_path=frame_info.path or None,
+                        raw_response=f"Unexpected error: {e}",
+                    )
+                # Drop the in-memory frame once it has been sent
+                frame_info.data = None
+                await finished.put((position, frame_analysis))
+            await finished.put(done_marker)
+        
+        # Share the session across workers (created before tasks start)
+        self._get_session()
+        producer = asyncio.create_task(_produce())
+        worker_tasks = [asyncio.create_task(_worker()) for _ in range(workers)]
+        
+        completed: Dict[int, FrameAnalysis] = {}
+        next_position = 0
+        workers_done = 0
+        try:
+            while workers_done < workers:
+                item = await finished.get()
+                if item is done_marker:
+                    workers_done += 1
+                    continue
+                position, frame_analysis = item
+                completed[position] = frame_analysis
+                while next_position in completed:
+                    yield completed.pop(next_position)
+                    next_position += 1
+            # Surface producer errors (e.g. the frame source failed)
+            await producer
+        finally:
+            for task in [producer, *worker_tasks]:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(producer, *worker_tasks, return_exceptions=True)
     
     async def _enrich_with_dictionary(self, analysis: FrameAnalysis) -> FrameAnalysis:
         """
@@ -603,6 +827,7 @@ Focus on clear, visible text. Ignore blurry or partial text."""
         use_smart_extraction: bool = True,
         use_scene_detection: bool = True,
         channel_name: Optional[str] = None,
+        streaming: Optional[bool] = None,
     ) -> VideoAnalysis:
         """
         Full analysis pipeline for a single video.
@@ -616,6 +841,8 @@ Focus on clear, visible text. Ignore blurry or partial text."""
             use_smart_extraction: Use SmartFrameExtractor with dedup
             use_scene_detection: Use scene detection for slides
             channel_name: YouTube channel name
+            streaming: Stream frames from an FFmpeg pipe through filters
+                       and OCR in memory (defaults to extraction.streaming)
             
         Returns:
             VideoAnalysis with all results
@@ -648,52 +875,54 @@ Focus on clear, visible text. Ignore blurry or partial text."""
         
         if use_smart_extraction:
             # Use SmartFrameExtractor for perceptual hash dedup + scene detection
+            extraction_config = self.config.get("extraction", {})
             extractor = SmartFrameExtractor(
                 target_frames=target_frames,
                 use_scene_detection=use_scene_detection,
                 use_deduplication=True,
                 skip_intro=True,
                 skip_credits=True,
+                hash_algorithm=extraction_config.get("hash_algorithm", "dhash"),
+                hash_similarity_threshold=extraction_config.get("hash_similarity_threshold", 8),
+                single_pass_scenes=extraction_config.get("single_pass_scenes", True),
             )
             
-            frame_infos = extractor.extract_frames(video_path, frames_dir)
-            
-            # Print filter stats
-            stats = extractor.get_stats()
-            print(f"  Filter stats: {stats['total_frames']} total → {stats['unique_frames']} unique")
-            print(f"    Duplicates removed: {stats['duplicates_removed']}")
-            print(f"    Intro/credits skipped: {stats['intro_skipped'] + stats['credits_skipped']}")
-            print(f"    Reduction: {stats['reduction']}")
+            if streaming is None:
+                streaming = extraction_config.get("streaming", False)
             
-            if not frame_infos:
-                analysis.status = "extraction_failed"
-                analysis.error = "Failed to extract frames"
-                return analysis
-            
-            print(f"  Processing {len(frame_infos)} unique frames...")
-            
-            # Step 3: Analyze frames with Gemini (OCR)
-            print("  Analyzing with Gemini OCR...")
-            for frame_info in frame_infos:
-                frame_analysis = await self.analyze_frame(
-                    frame_path=frame_info.path,
-                    frame_index=frame_info.index,
-                    timestamp=frame_info.timestamp,
+            if streaming:
+                # Decode → filter → OCR in memory; frames hit disk only if kept
+                keep_frames = self.config.get("storage", {}).get("local", {}).get("keep_frames", False)
+                frame_stream = extractor.stream_frames(
+                    video_path,
+                    output_dir=frames_dir if keep_frames else None,
                 )
                 
-                analysis.frames.append(frame_analysis)
-                analysis.frames_analyzed += 1
+                print(f"  Streaming frames to Gemini OCR ({self.max_concurrent_frames} concurrent)...")
+                async for frame_analysis in self.analyze_stream(frame_stream):
+                    self._record_frame_analysis(analysis, frame_analysis)
                 
-                if frame_analysis.has_nko:
-                    analysis.frames_with_nko += 1
-                    nko = frame_analysis.nko_text[:30] if frame_analysis.nko_text else ""
-                    print(f"    Frame {frame_info.index} @{frame_info.timestamp:.0f}s: ✓ N'Ko: {nko}...")
-                else:
-                    if frame_info.index % 10 == 0:  # Only log every 10th frame
-                        print(f"    Frame {frame_info.index} @{frame_info.timestamp:.0f}s: No N'Ko text")
+                self._print_filter_stats(extractor.get_stats())
+                
+                if not analysis.frames:
+                    analysis.status = "extraction_failed"
+                    analysis.error = "Failed to extract frames"
+                    return analysis
+            else:
+                frame_infos = extractor.extract_frames(video_path, frames_dir)
+                self._print_filter_stats(extractor.get_stats())
+                
+                if not frame_infos:
+                    analysis.status = "extraction_failed"
+                    analysis.error = "Failed to extract frames"
+                    return analysis
                 
-                # Rate limiting
-                await asyncio.sleep(0.5)
+                print(f"  Processing {len(frame_infos)} unique frames...")
+                
+                # Step 3: Analyze frames with Gemini (OCR)
+                print(f"  Analyzing with Gemini OCR ({self.max_concurrent_frames} concurrent)...")
+                async for frame_analysis in self.analyze_stream(frame_infos):
+                    self._record_frame_analysis(analysis, frame_analysis)
         else:
             # Legacy extraction (for backwards compatibility)
             frame_paths = self._extract_frames(video_path, frames_dir, target_frames=target_frames)
@@ -706,13 +935,13 @@ Focus on clear, visible text. Ignore blurry or partial text."""
             print(f"  Extracted {len(frame_paths)} frames")
             
             # Step 3: Analyze frames with Gemini (OCR)
-            print("  Analyzing with Gemini OCR...")
-            for i, frame_path in enumerate(frame_paths):
-                frame_analysis = await self.analyze_frame(
-                    frame_path=frame_path,
-                    frame_index=i,
-                )
-                
+            print(f"  Analyzing with Gemini OCR ({self.max_concurrent_frames} concurrent)...")
+            frame_analyses = await self.analyze_frames([
+                FrameInfo(path=frame_path, index=i, timestamp=float(i))
+                for i, frame_path in enumerate(frame_paths)
+            ])
+            
+            for i, frame_analysis in enumerate(frame_analyses):
                 analysis.frames.append(frame_analysis)
                 analysis.frames_analyzed += 1
                 
@@ -722,9 +951,6 @@ Focus on clear, visible text. Ignore blurry or partial text."""
                     print(f"    Frame {i}: ✓ N'Ko: {nko}...")
                 else:
                     print(f"    Frame {i}: No N'Ko text")
-                
-                # Rate limiting
-                await asyncio.sleep(0.5)
         
         # Step 4: Generate worlds for frames with N'Ko text
         if self.generate_worlds:
@@ -748,9 +974,33 @@ Focus on clear, visible text. Ignore blurry or partial text."""
         
         print(f"  ✓ Completed in {analysis.processing_time_ms}ms")
         print(f"    Frames: {analysis.frames_analyzed}, N'Ko: {analysis.frames_with_nko}, Variants: {analysis.total_world_variants}")
+        if self.ocr_cache is not None:
+            cache_hits = sum(1 for f in analysis.frames if f.ocr_cache_hit)
+            print(f"    OCR cache: {cache_hits}/{analysis.frames_analyzed} frames reused (overall hit rate {self.ocr_cache.hit_rate * 100:.1f}%)")
         
         return analysis
     
+    def _record_frame_analysis(self, analysis: VideoAnalysis, frame_analysis: FrameAnalysis) -> None:
+        """Append a frame result to the video analysis and log it."""
+        analysis.frames.append(frame_analysis)
+        analysis.frames_analyzed += 1
+        
+        if frame_analysis.has_nko:
+            analysis.frames_with_nko += 1
+            nko = frame_analysis.nko_text[:30] if frame_analysis.nko_text else ""
+            print(f"    Frame {frame_analysis.frame_index} @{frame_analysis.timestamp:.0f}s: ✓ N'Ko: {nko}...")
+        else:
+            if frame_analysis.frame_index % 10 == 0:  # Only log every 10th frame
+                print(f"    Frame {frame_analysis.frame_index} @{frame_analysis.timestamp:.0f}s: No N'Ko text")
+    
+    @staticmethod
+    def _print_filter_stats(stats: Dict[str, Any]) -> None:
+        """Print SmartFrameExtractor filter statistics."""
+        print(f"  Filter stats: {stats['total_frames']} total → {stats['unique_frames']} unique")
+        print(f"    Duplicates removed: {stats['duplicates_removed']}")
+        print(f"    Intro/credits skipped: {stats['intro_skipped'] + stats['credits_skipped']}")
+        print(f"    Reduction: {stats['reduction']}")
+    
     def _download_video(self, youtube_url: str, output_path: str) -> Optional[str]:
         """
         Download video using yt-dlp with multiple fallback strategies.
@@ -990,82 +1240,78 @@ Focus on clear, visible text. Ignore blurry or partial text."""
         if not self.supabase:
             return
         
-        async with aiohttp.ClientSession() as session:
-            # 1. Check if source already exists
-            existing = await self.supabase.get_source_by_external_id(
-                analysis.video_id, session=session
-            )
-            if existing:
-                analysis.source_id = existing["id"]
-                print(f"    Source already exists: {analysis.source_id}")
-                return
-            
-            # 2. Insert source
-            source_id = await self.supabase.insert_source(
-                SourceData(
-                    source_type="youtube",
-                    url=analysis.youtube_url,
-                    external_id=analysis.video_id,
-                    title=analysis.title,
-                    channel_name=analysis.channel_name,
-                    status="completed",
-                    metadata={
-                        "frames_analyzed": analysis.frames_analyzed,
-                        "frames_with_nko": analysis.frames_with_nko,
-                        "total_world_variants": analysis.total_world_variants,
-                    },
-                ),
-                session=session,
-            )
-            analysis.source_id = source_id
+        # 1. Check if source already exists
+        existing = await self.supabase.get_source_by_external_id(
+            analysis.video_id
+        )
+        if existing:
+            analysis.source_id = existing["id"]
+            print(f"    Source already exists: {analysis.source_id}")
+            return
+        
+        # 2. Insert source
+        source_id = await self.supabase.insert_source(
+            SourceData(
+                source_type="youtube",
+                url=analysis.youtube_url,
+                external_id=analysis.video_id,
+                title=analysis.title,
+                channel_name=analysis.channel_name,
+                status="completed",
+                metadata={
+                    "frames_analyzed": analysis.frames_analyzed,
+                    "frames_with_nko": analysis.frames_with_nko,
+                    "total_world_variants": analysis.total_world_variants,
+                },
+            ),
+        )
+        analysis.source_id = source_id
+        
+        # 3. Bulk-insert frames and detections
+        stored = await self.supabase.store_frames_with_detections(
+            source_id,
+            [
+                {
+                    "frame_index": frame.frame_index,
+                    "timestamp": frame.timestamp,
+                    "has_nko": frame.has_nko,
+                    "confidence": frame.confidence,
+                    "nko_text": frame.nko_text,
+                    "latin_transliteration": frame.latin_transliteration,
+                    "english_translation": frame.english_translation,
+                    "raw_response": frame.raw_response,
+                }
+                for frame in analysis.frames
+            ],
+            gemini_model=GEMINI_MODEL,
+        )
+        for error in stored["errors"]:
+            print(f"    Supabase insert error ({error['table']}, rows "
+                  f"{error['start']}-{error['start'] + error['count'] - 1}): {error['error']}")
+        
+        for frame in analysis.frames:
+            frame.frame_id = stored["frame_ids"].get(frame.frame_index)
+            frame.detection_id = stored["detection_ids"].get(frame.frame_index)
             
-            # 3. Insert frames and detections
-            for frame in analysis.frames:
-                frame_id = await self.supabase.insert_frame(
-                    FrameData(
-                        source_id=source_id,
-                        frame_index=frame.frame_index,
-                        timestamp_ms=int(frame.timestamp * 1000),
-                        has_nko=frame.has_nko,
-                        confidence=frame.confidence,
-                    ),
-                    session=session,
+            # Insert trajectories for worlds
+            if frame.detection_id and frame.worlds:
+                await self.supabase.store_world_trajectories(
+                    detection_id=frame.detection_id,
+                    worlds=[asdict(w) for w in frame.worlds],
                 )
-                frame.frame_id = frame_id
-                
-                # Insert detection if N'Ko text found
-                if frame.nko_text:
-                    detection_id = await self.supabase.insert_detection(
-                        DetectionData(
-                            frame_id=frame_id,
-                            nko_text=frame.nko_text,
-                            latin_text=frame.latin_transliteration,
-                            english_text=frame.english_translation,
-                            confidence=frame.confidence,
-                            gemini_model=GEMINI_MODEL,
-                            raw_response={"raw": frame.raw_response} if frame.raw_response else None,
-                        ),
-                        session=session,
-                    )
-                    frame.detection_id = detection_id
-                    
-                    # Insert trajectories for worlds
-                    if frame.worlds:
-                        await self.supabase.store_world_trajectories(
-                            detection_id=detection_id,
-                            worlds=[asdict(w) for w in frame.worlds],
-                            session=session,
-                        )
-            
-            # 4. Update source status
-            await self.supabase.update_source_status(
-                source_id,
-                status="completed",
-                frame_count=analysis.frames_analyzed,
-                nko_frame_count=analysis.frames_with_nko,
-                total_detections=analysis.frames_with_nko,
-                session=session,
-            )
+        
+        # 4. Update source status
+        await self.supabase.update_source_status(
+            source_id,
+            status="completed",
+            error_message=(
+                f"Partial insert: {len(stored['failed_frames'])} frames, "
+                f"{len(stored['failed_detections'])} detections failed"
+            ) if stored["errors"] else None,
+            frame_count=stored["frame_count"],
+            nko_frame_count=stored["nko_frame_count"],
+            total_detections=stored["detection_count"],
+        )
 
 
 def get_channel_videos(limit: Optional[int] = None) -> List[Dict[str, str]]:
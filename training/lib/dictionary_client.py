@@ -2,14 +2,19 @@
 Dictionary Client with Caching and Real-Time Lookup
 
 Provides access to the Ankataa Bambara/Dioula dictionary with:
-- Local cache lookup first (Supabase)
+- In-process index lookup first (see dictionary_index.py), when loaded
+- Local cache lookup (Supabase)
 - Real-time API lookup for cache misses
+- Process-local LRU of results, with misses cached too
 - Fuzzy matching for partial matches
 - Batch enrichment for vocabulary
 
 Usage:
     client = DictionaryClient()
     
+    # Optional: answer lookups from memory
+    await client.load_index()
+
     # Single lookup
     entry = await client.lookup("dɔgɔ")
     
@@ -21,11 +26,24 @@ import asyncio
 import aiohttp
 import os
 import re
+import time
 import unicodedata
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
 
+try:
+    from .dictionary_index import DictionaryIndex, DEFAULT_MIN_SIMILARITY
+    from .single_flight import SingleFlight
+    from .rate_limiter import TokenBucket
+except ImportError:
+    from dictionary_index import DictionaryIndex, DEFAULT_MIN_SIMILARITY
+    from single_flight import SingleFlight
+    from rate_limiter import TokenBucket
+
 # Supabase config
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY") or os.getenv("SUPABASE_SERVICE_KEY")
@@ -36,6 +54,23 @@ ANKATAA_SEARCH_URL = "https://dictionary.ankataa.com/search.php"
 # Rate limiting for API calls
 REQUEST_DELAY = 1.0
 
+# Words per word_normalized=in.(...) query in batch lookups
+BATCH_LOOKUP_CHUNK = 100
+
+# Reload the in-process index after this many seconds
+INDEX_REFRESH_SECONDS = 3600.0
+
+# Process-local LRU of lookup results
+MEMORY_CACHE_SIZE = 20000
+POSITIVE_TTL_SECONDS = 6 * 3600.0
+NEGATIVE_TTL_SECONDS = 15 * 60.0
+
+# Misses shared through dictionary_misses are trusted this long
+PERSISTED_MISS_TTL_SECONDS = 7 * 24 * 3600.0
+
+# Marks "no answer" (distinct from None, a known miss)
+_MISSING = object()
+
 
 @dataclass
 class DictionaryLookupResult:
@@ -49,7 +84,7 @@ class DictionaryLookupResult:
     variants: List[str] = field(default_factory=list)
     synonyms: List[str] = field(default_factory=list)
     has_tone_marks: bool = False
-    source: str = "cache"  # "cache" or "api"
+    source: str = "cache"  # "index", "cache" or "api"
     match_score: float = 1.0  # Similarity score for fuzzy matches
     
     @property
@@ -76,14 +111,64 @@ def normalize_word(word: str) -> str:
     return unicodedata.normalize('NFC', result)
 
 
+def _quote_in_value(value: str) -> str:
+    """Quote a value for a PostgREST in.(...) filter."""
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+class LookupCache:
+    """
+    Process-local LRU of lookup results with a TTL per entry.
+    
+    A stored None is a negative result (the word is known to be absent);
+    get() returns _MISSING for keys that are absent or expired.
+    """
+    
+    def __init__(self, max_entries: int, positive_ttl: float, negative_ttl: float):
+        self.max_entries = max_entries
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return entry[1]
+    
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        ttl = self.positive_ttl if value is not None else self.negative_ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        self._entries.clear()
+
+
 class DictionaryClient:
     """
     Client for looking up words in the Ankataa dictionary.
     
     Uses a hybrid approach:
-    1. Check local Supabase cache first
-    2. If not found, query the Ankataa API
-    3. Cache new results for future lookups
+    1. Check the in-process index, if one is loaded
+    2. Check local Supabase cache
+    3. If not found, query the Ankataa API
+    4. Cache new results for future lookups
+    
+    Results, misses included, are also kept in a process-local LRU, and
+    Ankataa misses are shared with other workers through dictionary_misses.
     """
     
     def __init__(
@@ -92,13 +177,63 @@ class DictionaryClient:
         supabase_key: Optional[str] = None,
         enable_api_fallback: bool = True,
         cache_api_results: bool = True,
+        index: Optional[DictionaryIndex] = None,
+        index_refresh_seconds: float = INDEX_REFRESH_SECONDS,
+        memory_cache_size: int = MEMORY_CACHE_SIZE,
+        positive_ttl: float = POSITIVE_TTL_SECONDS,
+        negative_ttl: float = NEGATIVE_TTL_SECONDS,
+        persist_misses: bool = True,
+        persisted_miss_ttl: float = PERSISTED_MISS_TTL_SECONDS,
+        api_limiter: Optional[TokenBucket] = None,
+        supabase_limiter: Optional[TokenBucket] = None,
     ):
+        """
+        Args:
+            supabase_url: Supabase project URL
+            supabase_key: Supabase API key
+            enable_api_fallback: Query Ankataa on cache misses
+            cache_api_results: Store API results in Supabase
+            index: Preloaded in-process index (see load_index)
+            index_refresh_seconds: Reload the index once it is this old (0 = never)
+            memory_cache_size: Max results kept in the process-local LRU (0 = off)
+            positive_ttl: Seconds a found entry stays in the LRU
+            negative_ttl: Seconds a miss stays in the LRU
+            persist_misses: Share Ankataa misses through dictionary_misses
+            persisted_miss_ttl: Seconds a shared miss is trusted before Ankataa is asked again
+            api_limiter: Shared rate limit for Ankataa requests (defaults to
+                         one request per REQUEST_DELAY)
+            supabase_limiter: Shared rate limit for Supabase requests (default: none)
+        """
         self.supabase_url = supabase_url or SUPABASE_URL
         self.supabase_key = supabase_key or SUPABASE_KEY
         self.enable_api_fallback = enable_api_fallback
         self.cache_api_results = cache_api_results
+        self.index = index
+        self.index_refresh_seconds = index_refresh_seconds
+        self._index_json_path: Optional[Path] = None
+        self._index_fell_back = False  # Supabase snapshot failed, export loaded
+        self._refresh_task: Optional[asyncio.Task] = None
         self._session: Optional[aiohttp.ClientSession] = None
         
+        # Lookup results, misses included (stored as None)
+        self._memory = LookupCache(memory_cache_size, positive_ttl, negative_ttl)
+        self._inflight = SingleFlight()
+        self.api_limiter = api_limiter or TokenBucket.from_interval(REQUEST_DELAY)
+        self.supabase_limiter = supabase_limiter
+        self.persist_misses = persist_misses
+        self.persisted_miss_ttl = persisted_miss_ttl
+        self.stats = {
+            "lookups": 0,
+            "memory_hits": 0,
+            "memory_negative_hits": 0,
+            "index_hits": 0,
+            "cache_hits": 0,
+            "known_misses": 0,
+            "api_hits": 0,
+            "api_misses": 0,
+            "api_errors": 0,
+        }
+        
         if not self.supabase_url or not self.supabase_key:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY required")
     
@@ -107,14 +242,112 @@ class DictionaryClient:
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def close(self):
+        """Stop any index refresh and close the HTTP session."""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
         if self._session:
             await self._session.close()
+            self._session = None
     
     def _get_session(self) -> aiohttp.ClientSession:
         if not self._session:
             self._session = aiohttp.ClientSession()
         return self._session
     
+    async def _throttle_supabase(self):
+        if self.supabase_limiter is not None:
+            await self.supabase_limiter.acquire()
+    
+    # ==================== In-process index ====================
+    
+    async def load_index(self, json_path: Optional[Path] = None) -> int:
+        """
+        Load the in-process dictionary index.
+        
+        Reads a snapshot of dictionary_entries from Supabase, or the given
+        Ankataa JSON export. If the snapshot fails, the latest export in
+        data/dictionary is used instead.
+        
+        Args:
+            json_path: Ankataa JSON export to load instead of Supabase
+            
+        Returns:
+            Number of entries indexed
+        """
+        if json_path:
+            self._index_json_path = Path(json_path)
+
+        min_similarity = self.index.min_similarity if self.index is not None else DEFAULT_MIN_SIMILARITY
+        fell_back = False
+        if self._index_json_path:
+            index = DictionaryIndex.from_json(self._index_json_path, min_similarity=min_similarity)
+        else:
+            index = DictionaryIndex(min_similarity=min_similarity)
+            try:
+                await index.load_from_supabase(
+                    self._get_session(), self.supabase_url, self.supabase_key
+                )
+            except Exception as e:
+                export = DictionaryIndex.latest_export()
+                if not export:
+                    raise
+                print(f"  ⚠️ Dictionary snapshot failed ({e}), using {export.name}")
+                index = DictionaryIndex.from_json(export, min_similarity=min_similarity)
+                fell_back = True
+        self._index_fell_back = fell_back
+
+        # Swap in the finished index; lookups never see a partial one
+        self.index = index
+        return len(index)
+
+    def _maybe_refresh_index(self):
+        """Reload a stale index in the background; lookups keep using the old one."""
+        if (
+            not self.index_refresh_seconds
+            or self.index.age() < self.index_refresh_seconds
+            or (self._refresh_task and not self._refresh_task.done())
+        ):
+            return
+        self._refresh_task = asyncio.create_task(self.refresh_index())
+
+    async def refresh_index(self) -> int:
+        """
+        Reload the index from its source: the JSON export it was read
+        from, or Supabase (also after a failed snapshot fell back to an
+        export). An index built from in-memory rows is not reloaded.
+
+        Returns:
+            Number of entries indexed (0 if the reload failed)
+        """
+        source = self.index.source if self.index is not None else None
+        try:
+            if source == "rows":
+                raise ValueError("index was built from rows and cannot be reloaded")
+            json_path = None
+            if source not in (None, "supabase") and not self._index_fell_back:
+                json_path = Path(source)
+            return await self.load_index(json_path)
+        except Exception as e:
+            print(f"  ⚠️ Dictionary index refresh failed: {e}")
+            # Don't retry on every lookup; wait another interval
+            if self.index is not None:
+                self.index.loaded_at = time.monotonic()
+            return 0
+
+    def _lookup_index(
+        self,
+        normalized_word: str,
+        fuzzy: bool,
+        limit: int,
+    ) -> List[DictionaryLookupResult]:
+        """Look up word in the in-process index."""
+        self._maybe_refresh_index()
+        rows = self.index.search(normalized_word, limit=limit, fuzzy=fuzzy, exact_first=True)
+        return [self._row_to_result(row, "index") for row in rows]
+    
     async def lookup(
         self,
         word: str,
@@ -134,44 +367,305 @@ class DictionaryClient:
         """
         normalized = normalize_word(word)
         
-        # 1. Check local cache first
-        cached = await self._lookup_cache(normalized, fuzzy, limit)
-        if cached:
-            return cached[0] if len(cached) == 1 else max(cached, key=lambda x: x.match_score)
+        # 0. Process-local LRU (positive and negative results)
+        remembered = self._memory_get(normalized, fuzzy)
+        if remembered is not _MISSING:
+            return remembered
+        
+        # Concurrent lookups of the same word share one resolution
+        result = await self._inflight.do(
+            (normalized, fuzzy),
+            lambda: self._resolve_and_remember(word, normalized, fuzzy, limit),
+        )
+        return None if result is _MISSING else result
+    
+    async def _resolve_and_remember(self, word: str, normalized: str, fuzzy: bool, limit: int):
+        result = await self._resolve(word, normalized, fuzzy, limit)
+        if result is not _MISSING:  # API unreachable: nothing worth remembering
+            self._memory.put((normalized, fuzzy), result)
+        return result
+    
+    async def _resolve(self, word: str, normalized: str, fuzzy: bool, limit: int):
+        """Resolve a word past the LRU; _MISSING if the API could not answer."""
+        # 1. In-process index: no network round trip
+        if self.index is not None:
+            indexed = self._lookup_index(normalized, fuzzy, limit)
+            if indexed:
+                self.stats["index_hits"] += 1
+                return max(indexed, key=lambda x: x.match_score)
+        
+        # 2. Check local cache. A Supabase snapshot already holds every
+        #    cached entry, so only an index built from an export can miss
+        #    rows that Supabase has.
+        if self._should_query_cache():
+            cached = await self._lookup_cache(normalized, fuzzy, limit)
+            if cached:
+                self.stats["cache_hits"] += 1
+                return self._best_match(cached)
         
-        # 2. Fall back to API if enabled
+        # 3. Fall back to API if enabled, unless another worker already
+        #    found nothing there
         if self.enable_api_fallback:
-            api_results = await self._lookup_api(word)
-            if api_results:
-                # Cache the results
-                if self.cache_api_results:
-                    await self._cache_results(api_results)
-                return api_results[0]
+            if normalized in await self._known_misses([normalized]):
+                self.stats["known_misses"] += 1
+                return None
+            result = await self._lookup_and_cache_api(word)
+            if result is None:
+                await self._record_misses([normalized])
+            return result
         
         return None
     
+    def _memory_get(self, normalized: str, fuzzy: bool):
+        """Remembered result (None for a known miss) or _MISSING, with counters."""
+        self.stats["lookups"] += 1
+        remembered = self._memory.get((normalized, fuzzy))
+        if remembered is not _MISSING:
+            self.stats["memory_hits" if remembered is not None else "memory_negative_hits"] += 1
+        return remembered
+    
+    def _should_query_cache(self) -> bool:
+        """Whether an index miss can still be a Supabase hit."""
+        return self.index is None or self.index.source != "supabase"
+    
+    @staticmethod
+    def _best_match(results: List[DictionaryLookupResult]) -> DictionaryLookupResult:
+        return results[0] if len(results) == 1 else max(results, key=lambda x: x.match_score)
+    
+    async def _lookup_and_cache_api(self, word: str):
+        """
+        Query the Ankataa API and cache what it finds.
+        
+        Returns:
+            Best result, None if Ankataa has no entry, _MISSING if the
+            request failed
+        """
+        api_results = await self._lookup_api(word)
+        if api_results is None:
+            self.stats["api_errors"] += 1
+            return _MISSING
+        if not api_results:
+            self.stats["api_misses"] += 1
+            return None
+        self.stats["api_hits"] += 1
+        if self.cache_api_results:
+            await self._cache_results(api_results)
+        if self.index is not None:
+            self.index.add_rows(self._result_to_row(r) for r in api_results)
+        return api_results[0]
+    
+    async def _known_misses(self, normalized_words: List[str]) -> set:
+        """Words recently recorded in dictionary_misses by any worker."""
+        if not self.persist_misses or not normalized_words:
+            return set()
+        
+        session = self._get_session()
+        headers = {
+            "apikey": self.supabase_key,
+            "Authorization": f"Bearer {self.supabase_key}",
+        }
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.persisted_miss_ttl)
+        url = f"{self.supabase_url}/rest/v1/dictionary_misses"
+        known = set()
+        for start in range(0, len(normalized_words), BATCH_LOOKUP_CHUNK):
+            chunk = normalized_words[start:start + BATCH_LOOKUP_CHUNK]
+            params = {
+                "select": "word_normalized",
+                "word_normalized": f"in.({','.join(_quote_in_value(w) for w in chunk)})",
+                "last_checked_at": f"gt.{cutoff.isoformat()}",
+            }
+            try:
+                await self._throttle_supabase()
+                async with session.get(url, headers=headers, params=params) as resp:
+                    if resp.status == 200:
+                        known.update(row["word_normalized"] for row in await resp.json())
+            except Exception:
+                pass  # Unknown is safe: the API is asked instead
+        return known
+    
+    async def _record_misses(self, normalized_words: List[str]):
+        """Persist words Ankataa has no entry for, so other workers skip them."""
+        if not self.persist_misses or not normalized_words:
+            return
+        
+        session = self._get_session()
+        headers = {
+            "apikey": self.supabase_key,
+            "Authorization": f"Bearer {self.supabase_key}",
+            "Content-Type": "application/json",
+        }
+        url = f"{self.supabase_url}/rest/v1/rpc/record_dictionary_misses"
+        try:
+            await self._throttle_supabase()
+            async with session.post(url, headers=headers, json={"words": normalized_words}):
+                pass  # Ignore errors, like _cache_results
+        except Exception:
+            pass
+    
     async def lookup_many(
         self,
         words: List[str],
         fuzzy: bool = True,
+        limit: int = 5,
     ) -> Dict[str, Optional[DictionaryLookupResult]]:
         """
-        Look up multiple words in parallel.
+        Look up multiple words with batched requests.
+        
+        Words are resolved from the process-local LRU and the in-process
+        index first. The rest go to Supabase together: one exact-match
+        query for all of them, then one batched fuzzy RPC for the misses.
+        Only words still missing after that (and not recorded as misses
+        by another worker) hit the API, one request each.
         
         Args:
             words: List of words to look up
             fuzzy: Allow fuzzy matching
+            limit: Max fuzzy matches considered per word
             
         Returns:
             Dict mapping word -> result (None if not found)
         """
-        tasks = [self.lookup(word, fuzzy) for word in words]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results: Dict[str, Optional[DictionaryLookupResult]] = {}
         
-        return {
-            word: result if not isinstance(result, Exception) else None
-            for word, result in zip(words, results)
+        # Words that normalize the same way share one lookup
+        pending: Dict[str, List[str]] = {}
+        for word in dict.fromkeys(words):
+            pending.setdefault(normalize_word(word), []).append(word)
+        
+        def resolve(normalized: str, result, remember: bool = True):
+            if remember:
+                self._memory.put((normalized, fuzzy), result)
+            for word in pending.pop(normalized):
+                results[word] = result
+        
+        # 0. Process-local LRU
+        for normalized in list(pending):
+            remembered = self._memory_get(normalized, fuzzy)
+            if remembered is not _MISSING:
+                resolve(normalized, remembered, remember=False)
+        
+        # 1. In-process index
+        if self.index is not None:
+            for normalized in list(pending):
+                indexed = self._lookup_index(normalized, fuzzy, limit)
+                if indexed:
+                    self.stats["index_hits"] += 1
+                    resolve(normalized, max(indexed, key=lambda x: x.match_score))
+        
+        # 2. Supabase cache, batched
+        if pending and self._should_query_cache():
+            try:
+                cached = await self._lookup_cache_many(list(pending), fuzzy, limit)
+            except Exception:
+                cached = {}
+            for normalized, matches in cached.items():
+                if matches and normalized in pending:
+                    self.stats["cache_hits"] += 1
+                    resolve(normalized, self._best_match(matches))
+        
+        # 3. API fallback for the remaining misses
+        if pending and self.enable_api_fallback:
+            for normalized in await self._known_misses(list(pending)):
+                self.stats["known_misses"] += 1
+                resolve(normalized, None)
+            
+            misses = list(pending)
+            api_results = await asyncio.gather(
+                *(self._lookup_and_cache_api(pending[n][0]) for n in misses),
+                return_exceptions=True,
+            )
+            confirmed_misses = []
+            for normalized, result in zip(misses, api_results):
+                if isinstance(result, Exception) or result is _MISSING:
+                    resolve(normalized, None, remember=False)
+                else:
+                    if result is None:
+                        confirmed_misses.append(normalized)
+                    resolve(normalized, result)
+            await self._record_misses(confirmed_misses)
+        
+        for normalized in list(pending):
+            resolve(normalized, None)
+        
+        return {word: results.get(word) for word in words}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lookup statistics, including cache effectiveness."""
+        lookups = self.stats["lookups"]
+        memory_hits = self.stats["memory_hits"] + self.stats["memory_negative_hits"]
+        network_avoided = (
+            memory_hits + self.stats["index_hits"] + self.stats["known_misses"]
+            + self._inflight.stats["coalesced"]
+        )
+        stats = {
+            **self.stats,
+            "coalesced": self._inflight.stats["coalesced"],
+            "memory_entries": len(self._memory),
+            "memory_hit_rate": memory_hits / lookups if lookups else 0.0,
+            "api_avoided_rate": network_avoided / lookups if lookups else 0.0,
         }
+        if self.index is not None:
+            stats["index"] = self.index.get_stats()
+        return stats
+    
+    async def _lookup_cache_many(
+        self,
+        normalized_words: List[str],
+        fuzzy: bool,
+        limit: int,
+    ) -> Dict[str, List[DictionaryLookupResult]]:
+        """
+        Look up many normalized words in Supabase cache.
+        
+        Returns:
+            Dict mapping normalized word -> matches (missing if none)
+        """
+        session = self._get_session()
+        headers = {
+            "apikey": self.supabase_key,
+            "Authorization": f"Bearer {self.supabase_key}",
+            "Content-Type": "application/json",
+        }
+        found: Dict[str, List[DictionaryLookupResult]] = {}
+        
+        # Exact matches: word_normalized=in.(...), chunked to keep URLs short
+        url = f"{self.supabase_url}/rest/v1/dictionary_entries"
+        for start in range(0, len(normalized_words), BATCH_LOOKUP_CHUNK):
+            chunk = normalized_words[start:start + BATCH_LOOKUP_CHUNK]
+            params = {"word_normalized": f"in.({','.join(_quote_in_value(w) for w in chunk)})"}
+            await self._throttle_supabase()
+            async with session.get(url, headers=headers, params=params) as resp:
+                if resp.status == 200:
+                    for row in await resp.json():
+                        found.setdefault(row.get("word_normalized", ""), []).append(
+                            self._row_to_result(row, "cache")
+                        )
+        
+        misses = [w for w in normalized_words if w not in found]
+        if not fuzzy or not misses:
+            return found
+        
+        # Fuzzy matches for the misses: one search_dictionary_batch RPC
+        url = f"{self.supabase_url}/rest/v1/rpc/search_dictionary_batch"
+        payload = {"search_terms": misses, "limit_per_term": limit}
+        await self._throttle_supabase()
+        async with session.post(url, headers=headers, json=payload) as resp:
+            if resp.status == 200:
+                for row in await resp.json():
+                    found.setdefault(row.get("search_term", ""), []).append(
+                        self._row_to_result(row, "cache")
+                    )
+                return found
+        
+        # Batch RPC unavailable (migration 021 not applied): per-word RPCs
+        per_word = await asyncio.gather(
+            *(self._lookup_cache(w, fuzzy, limit) for w in misses),
+            return_exceptions=True,
+        )
+        for word, matches in zip(misses, per_word):
+            if matches and not isinstance(matches, Exception):
+                found[word] = matches
+        return found
     
     async def _lookup_cache(
         self,
@@ -197,6 +691,7 @@ class DictionaryClient:
             }
             
             try:
+                await self._throttle_supabase()
                 async with session.post(url, headers=headers, json=payload) as resp:
                     if resp.status == 200:
                         data = await resp.json()
@@ -209,6 +704,7 @@ class DictionaryClient:
         params = {"word_normalized": f"eq.{normalized_word}"}
         
         try:
+            await self._throttle_supabase()
             async with session.get(url, headers=headers, params=params) as resp:
                 if resp.status == 200:
                     data = await resp.json()
@@ -218,24 +714,24 @@ class DictionaryClient:
         
         return []
     
-    async def _lookup_api(self, word: str) -> List[DictionaryLookupResult]:
-        """Look up word via Ankataa API (scraping)."""
+    async def _lookup_api(self, word: str) -> Optional[List[DictionaryLookupResult]]:
+        """Look up word via Ankataa API (scraping). None if the request failed."""
         session = self._get_session()
         
         url = f"{ANKATAA_SEARCH_URL}?input={word}&search=lexicon"
         
         try:
-            await asyncio.sleep(REQUEST_DELAY)  # Rate limiting
+            await self.api_limiter.acquire()  # Rate limiting
             
             async with session.get(url) as resp:
                 if resp.status != 200:
-                    return []
+                    return None
                 
                 html = await resp.text()
                 return self._parse_search_results(html, url)
                 
         except Exception:
-            return []
+            return None
     
     def _parse_search_results(self, html: str, source_url: str) -> List[DictionaryLookupResult]:
         """Parse search results from Ankataa HTML."""
@@ -310,11 +806,27 @@ class DictionaryClient:
             }
             
             try:
+                await self._throttle_supabase()
                 async with session.post(url, headers=headers, json=data) as resp:
                     pass  # Ignore errors for caching
             except Exception:
                 pass
     
+    @staticmethod
+    def _result_to_row(result: DictionaryLookupResult) -> Dict[str, Any]:
+        """Convert a lookup result to a dictionary_entries row."""
+        return {
+            "word": result.word,
+            "word_normalized": result.word_normalized,
+            "word_class": result.word_class,
+            "definitions_en": result.definitions_en,
+            "definitions_fr": result.definitions_fr,
+            "examples": result.examples,
+            "variants": result.variants,
+            "synonyms": result.synonyms,
+            "has_tone_marks": result.has_tone_marks,
+        }
+    
     def _row_to_result(self, row: Dict, source: str) -> DictionaryLookupResult:
         """Convert a database row to a lookup result."""
         return DictionaryLookupResult(
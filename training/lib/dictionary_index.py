@@ -0,0 +1,385 @@
+"""
+In-Process Dictionary Index
+
+Holds the whole dictionary_entries cache in memory so DictionaryClient
+can answer lookups without a Supabase round trip:
+
+- Exact lookups: a hash map from word_normalized to entry numbers
+- Fuzzy lookups: a trigram inverted index scored like pg_trgm
+  similarity() (what the search_dictionary RPC uses), plus a
+  deletion-neighbourhood map for one-typo matches on short words (4+
+  characters), where trigram overlap is too small to reach the threshold
+- Substring matches (the RPC's ILIKE '%term%'), verified against
+  trigram candidates
+
+Entries are kept as compact tuples and postings as int arrays. The index
+can be loaded from the Ankataa JSON export (ankataa_scraper.py) or from
+a keyset-paginated snapshot of dictionary_entries, and refreshed in
+place: a new index is built off to the side and swapped in.
+
+Usage:
+    index = DictionaryIndex.from_json("data/dictionary/ankataa_dictionary_20260101.json")
+    # or: await index.load_from_supabase(session, url, key)
+
+    rows = index.search("dɔgɔ", limit=5)   # [(row, similarity), ...]
+"""
+
+import json
+import re
+import time
+from array import array
+from collections import Counter, defaultdict
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+
+# pg_trgm's default similarity threshold for the % operator
+DEFAULT_MIN_SIMILARITY = 0.3
+
+# Shortest term given one-edit typo matches; below this one edit changes
+# too much of the word (e.g. OCR fragment "kx" is not "ka")
+MIN_TYPO_LENGTH = 4
+
+# Columns loaded from dictionary_entries
+SNAPSHOT_COLUMNS = (
+    "id,word,word_normalized,word_class,definitions_en,definitions_fr,"
+    "examples,variants,synonyms,has_tone_marks"
+)
+SNAPSHOT_PAGE_SIZE = 1000
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class IndexedEntry(NamedTuple):
+    """One dictionary entry, stored compactly."""
+    id: Optional[str]
+    word: str
+    word_normalized: str
+    word_class: Optional[str]
+    definitions_en: Tuple[str, ...]
+    definitions_fr: Tuple[str, ...]
+    examples: Tuple[Any, ...]
+    variants: Tuple[str, ...]
+    synonyms: Tuple[str, ...]
+    has_tone_marks: bool
+
+    def to_row(self, similarity: float = 1.0) -> Dict[str, Any]:
+        """The entry as a dictionary_entries row (plus similarity)."""
+        return {
+            "id": self.id,
+            "word": self.word,
+            "word_normalized": self.word_normalized,
+            "word_class": self.word_class,
+            "definitions_en": list(self.definitions_en),
+            "definitions_fr": list(self.definitions_fr),
+            "examples": list(self.examples),
+            "variants": list(self.variants),
+            "synonyms": list(self.synonyms),
+            "has_tone_marks": self.has_tone_marks,
+            "similarity": similarity,
+        }
+
+
+def trigrams(text: str) -> frozenset:
+    """
+    pg_trgm trigrams of a text.
+
+    Each word is lowercased and padded with two spaces in front and one
+    behind, then cut into every 3-character window.
+    """
+    grams = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Levenshtein edit distance."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def deletions(word: str) -> set:
+    """Every string one character deletion away from `word`."""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class DictionaryIndex:
+    """
+    In-memory exact + fuzzy index of dictionary entries.
+
+    Results are dictionary_entries rows with a `similarity`, in the
+    order the search_dictionary RPC would return them.
+    """
+
+    def __init__(self, min_similarity: float = DEFAULT_MIN_SIMILARITY):
+        """
+        Args:
+            min_similarity: Lowest trigram similarity counted as a fuzzy match
+        """
+        self.min_similarity = min_similarity
+        self.source: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.stats = {"lookups": 0, "exact_hits": 0, "fuzzy_hits": 0, "misses": 0}
+        self._set_entries([])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def age(self) -> float:
+        """Seconds since the index was (re)loaded (infinite if never)."""
+        return time.monotonic() - self.loaded_at if self.loaded_at else float("inf")
+
+    # ==================== Building ====================
+
+    @staticmethod
+    def _entry_from_row(row: Dict[str, Any]) -> IndexedEntry:
+        word = row.get("word") or ""
+        return IndexedEntry(
+            id=row.get("id"),
+            word=word,
+            word_normalized=row.get("word_normalized") or word.lower(),
+            word_class=row.get("word_class"),
+            definitions_en=tuple(row.get("definitions_en") or ()),
+            definitions_fr=tuple(row.get("definitions_fr") or ()),
+            examples=tuple(row.get("examples") or ()),
+            variants=tuple(row.get("variants") or ()),
+            synonyms=tuple(row.get("synonyms") or ()),
+            has_tone_marks=bool(row.get("has_tone_marks", False)),
+        )
+
+    def _set_entries(self, entries: List[IndexedEntry]):
+        """Build every structure for `entries` and swap them in at once."""
+        exact: Dict[str, List[int]] = defaultdict(list)
+        postings: Dict[str, List[int]] = defaultdict(list)
+        gram_counts = array("H")
+        for number, entry in enumerate(entries):
+            exact[entry.word_normalized].append(number)
+            grams = trigrams(entry.word_normalized)
+            gram_counts.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                postings[gram].append(number)
+
+        self._entries = entries
+        self._exact = {word: tuple(numbers) for word, numbers in exact.items()}
+        self._postings = {gram: array("i", numbers) for gram, numbers in postings.items()}
+        self._gram_counts = gram_counts
+
+        # Deletion neighbourhood: word and its 1-deletions -> words. Two
+        # words within one edit always share a key.
+        typo_keys: Dict[str, List[str]] = defaultdict(list)
+        for word in self._exact:
+            for key in deletions(word) | {word}:
+                typo_keys[key].append(word)
+        self._typo_keys = dict(typo_keys)
+
+    def load_rows(self, rows: Iterable[Dict[str, Any]], source: str = "rows") -> int:
+        """
+        Replace the index contents with dictionary rows.
+
+        Returns:
+            Number of entries indexed
+        """
+        entries = [self._entry_from_row(row) for row in rows if row.get("word")]
+        self._set_entries(entries)
+        self.source = source
+        self.loaded_at = time.monotonic()
+        return len(entries)
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]):
+        """Add entries (e.g. fresh API results) without a full reload."""
+        for row in rows:
+            if not row.get("word"):
+                continue
+            entry = self._entry_from_row(row)
+            number = len(self._entries)
+            self._entries.append(entry)
+            if entry.word_normalized not in self._exact:
+                for key in deletions(entry.word_normalized) | {entry.word_normalized}:
+                    self._typo_keys.setdefault(key, []).append(entry.word_normalized)
+            self._exact[entry.word_normalized] = self._exact.get(entry.word_normalized, ()) + (number,)
+            grams = trigrams(entry.word_normalized)
+            self._gram_counts.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                self._postings.setdefault(gram, array("i")).append(number)
+
+    @classmethod
+    def from_json(cls, path: Path, min_similarity: float = DEFAULT_MIN_SIMILARITY) -> "DictionaryIndex":
+        """Build an index from an Ankataa JSON export (a list of entry dicts)."""
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+        index = cls(min_similarity=min_similarity)
+        index.load_rows(rows, source=str(path))
+        return index
+
+    @staticmethod
+    def latest_export(data_dir: Optional[Path] = None) -> Optional[Path]:
+        """Most recent ankataa_dictionary_*.json export, if any."""
+        data_dir = data_dir or Path(__file__).parent.parent / "data" / "dictionary"
+        files = sorted(Path(data_dir).glob("ankataa_dictionary_*.json"), reverse=True)
+        return files[0] if files else None
+
+    async def load_from_supabase(
+        self,
+        session: aiohttp.ClientSession,
+        supabase_url: str,
+        supabase_key: str,
+        page_size: int = SNAPSHOT_PAGE_SIZE,
+    ) -> int:
+        """
+        Replace the index contents with a snapshot of dictionary_entries.
+
+        Pages are read with keyset pagination on id. The current index
+        keeps serving lookups until the snapshot is complete.
+
+        Returns:
+            Number of entries indexed
+        """
+        headers = {
+            "apikey": supabase_key,
+            "Authorization": f"Bearer {supabase_key}",
+        }
+        url = f"{supabase_url}/rest/v1/dictionary_entries"
+        rows: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            params = [
+                ("select", SNAPSHOT_COLUMNS),
+                ("order", "id.asc"),
+                ("limit", str(page_size)),
+            ]
+            if cursor:
+                params.append(("id", f"gt.{cursor}"))
+            async with session.get(url, headers=headers, params=params) as resp:
+                if resp.status != 200:
+                    error = await resp.text()
+                    raise Exception(f"Supabase error: {error[:200]}")
+                page = await resp.json()
+            rows.extend(page)
+            if len(page) < page_size:
+                break
+            cursor = page[-1]["id"]
+
+        return self.load_rows(rows, source="supabase")
+
+    # ==================== Lookup ====================
+
+    def lookup_exact(self, normalized_word: str) -> List[Dict[str, Any]]:
+        """Rows whose word_normalized equals the (already normalized) word."""
+        return [self._entries[n].to_row(1.0) for n in self._exact.get(normalized_word, ())]
+
+    def _trigram_scores(self, term: str) -> Dict[int, float]:
+        """pg_trgm similarity of `term` to every entry sharing a trigram with it."""
+        grams = trigrams(term)
+        if not grams:
+            return {}
+        shared = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in grams))
+        size = len(grams)
+        gram_counts = self._gram_counts
+        return {
+            number: count / (size + gram_counts[number] - count)
+            for number, count in shared.items()
+        }
+
+    def _typo_candidates(self, term: str) -> set:
+        """Distinct words exactly one edit away from `term`."""
+        candidates = set()
+        for key in deletions(term) | {term}:
+            candidates.update(self._typo_keys.get(key, ()))
+        candidates.discard(term)
+        return {word for word in candidates if levenshtein(term, word) == 1}
+
+    def search(
+        self,
+        normalized_word: str,
+        limit: int = 20,
+        fuzzy: bool = True,
+        exact_first: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Look up a normalized word.
+
+        Args:
+            normalized_word: Word already passed through normalize_word
+            limit: Max rows returned
+            fuzzy: Include trigram, typo and substring matches
+            exact_first: Return only the exact matches when there are any
+                (they always rank first), skipping the fuzzy search
+
+        Returns:
+            Rows with `similarity`, best first (exact matches score 1.0)
+        """
+        self.stats["lookups"] += 1
+        if not fuzzy or exact_first:
+            rows = self.lookup_exact(normalized_word)[:limit]
+            if rows or not fuzzy:
+                self.stats["exact_hits" if rows else "misses"] += 1
+                return rows
+
+        term = normalized_word.lower()
+        scores = self._trigram_scores(term)
+        matched = {n: s for n, s in scores.items() if s >= self.min_similarity}
+
+        for n in self._exact.get(term, ()):
+            matched[n] = 1.0
+
+        # Substring matches (ILIKE '%term%'). Any word containing the term
+        # has the term's first trigram when that is three word characters;
+        # otherwise scan, but only when short of rows (these rank last).
+        if len(term) >= 3 and _WORD_RE.fullmatch(term[:3]):
+            for n in self._postings.get(term[:3], ()):
+                if n not in matched and term in self._entries[n].word.lower():
+                    matched[n] = scores.get(n, 0.0)
+        elif term and len(matched) < limit:
+            for n, entry in enumerate(self._entries):
+                if n not in matched and term in entry.word.lower():
+                    matched[n] = scores.get(n, 0.0)
+
+        # Short words with a typo share too few trigrams; catch one-edit matches
+        typos = self._typo_candidates(term) if len(term) >= MIN_TYPO_LENGTH else ()
+        for word in typos:
+            edit_score = 1.0 - 1 / max(len(word), len(term))
+            if edit_score < self.min_similarity:
+                continue
+            for n in self._exact[word]:
+                if edit_score > matched.get(n, 0.0):
+                    matched[n] = edit_score
+
+        if not matched:
+            self.stats["misses"] += 1
+            return []
+        self.stats["exact_hits" if term in self._exact else "fuzzy_hits"] += 1
+
+        best = sorted(matched.items(), key=lambda item: (-item[1], self._entries[item[0]].word))
+        return [self._entries[n].to_row(round(score, 4)) for n, score in best[:limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            "entries": len(self._entries),
+            "distinct_words": len(self._exact),
+            "trigrams": len(self._postings),
+            "typo_keys": len(self._typo_keys),
+            "source": self.source,
+            "age_seconds": round(self.age(), 1) if self.loaded else None,
+            **self.stats,
+        }
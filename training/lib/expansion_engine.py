@@ -12,19 +12,25 @@ Enriches words through:
 Usage:
     from expansion_engine import ExpansionEngine
     
-    engine = ExpansionEngine()
-    
-    # Enrich a single word
-    result = await engine.enrich_word("dɔgɔ", context={"source": "video"})
-    
-    # Process queue batch
-    processed = await engine.process_queue_batch(limit=10)
+    async with ExpansionEngine() as engine:
+        # Enrich a single word
+        result = await engine.enrich_word("dɔgɔ", context={"source": "video"})
+        
+        # Process queue batch
+        processed = await engine.process_queue_batch(limit=10)
+        
+        # Drain a large queue with concurrent workers
+        processed = await engine.process_queue_batch(limit=500, delay_seconds=0, workers=8)
+    # close() flushes learning stats still held in memory
 """
 
 import asyncio
 import aiohttp
 import os
+import time
 import unicodedata
+import uuid
+from collections import Counter
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
@@ -34,15 +40,34 @@ try:
     from .dictionary_client import DictionaryClient, DictionaryLookupResult, normalize_word
     from .world_generator import WorldGenerator, WorldGenerationResult
     from .supabase_client import SupabaseClient
+    from .write_buffer import SupabaseWriteBuffer
+    from .single_flight import SingleFlight
+    from .rate_limiter import TokenBucket
 except ImportError:
     from dictionary_client import DictionaryClient, DictionaryLookupResult, normalize_word
     from world_generator import WorldGenerator, WorldGenerationResult
     from supabase_client import SupabaseClient
+    from write_buffer import SupabaseWriteBuffer
+    from single_flight import SingleFlight
+    from rate_limiter import TokenBucket
 
 # Configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY") or os.getenv("SUPABASE_ANON_KEY")
 
+# Request budgets (requests/second) per upstream, shared by all queue workers
+DEFAULT_RATE_LIMITS = {
+    "supabase": 20.0,
+    "ankataa": 1.0,
+    "gemini": 5.0,
+}
+
+# Queue processing
+ITEM_TIMEOUT_SECONDS = 120.0   # Per queue item; a stuck item is failed, not waited on
+QUEUE_FETCH_SIZE = 50          # Items claimed per get_pending_enrichments call
+COMPLETION_BATCH_SIZE = 50     # Completions/failures sent per batched RPC
+STATS_FLUSH_SECONDS = 30.0     # Max age of unflushed learning_stats counts
+
 
 @dataclass
 class EnrichmentResult:
@@ -107,6 +132,8 @@ class ExpansionEngine:
         enable_queue_expansion: bool = True,
         max_related_words: int = 5,
         min_confidence_to_skip: float = 0.8,
+        write_buffer: Optional[SupabaseWriteBuffer] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
     ):
         """
         Initialize the expansion engine.
@@ -118,6 +145,10 @@ class ExpansionEngine:
             enable_queue_expansion: Queue related words for expansion
             max_related_words: Max related words to queue per enrichment
             min_confidence_to_skip: Skip enrichment if existing confidence >= this
+            write_buffer: Optional write-behind buffer for vocabulary upserts
+                          (the caller owns its start/close lifecycle)
+            rate_limits: Requests/second per upstream ("supabase", "ankataa",
+                         "gemini"), overriding DEFAULT_RATE_LIMITS; 0 = unlimited
         """
         self.supabase_url = supabase_url or SUPABASE_URL
         self.supabase_key = supabase_key or SUPABASE_KEY
@@ -130,10 +161,31 @@ class ExpansionEngine:
         self.max_related_words = max_related_words
         self.min_confidence_to_skip = min_confidence_to_skip
         
+        # One token bucket per upstream, shared by every concurrent worker
+        self.limiters: Dict[str, TokenBucket] = {
+            name: TokenBucket(rate=rate)
+            for name, rate in {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}.items()
+        }
+        
         # Initialize clients
         self.supabase = SupabaseClient(self.supabase_url, self.supabase_key)
-        self.dictionary = DictionaryClient(self.supabase_url, self.supabase_key)
-        self.world_generator = WorldGenerator() if enable_ai_enrichment else None
+        self.dictionary = DictionaryClient(
+            self.supabase_url,
+            self.supabase_key,
+            api_limiter=self.limiters["ankataa"],
+            supabase_limiter=self.limiters["supabase"],
+        )
+        self.world_generator = (
+            WorldGenerator(limiter=self.limiters["gemini"]) if enable_ai_enrichment else None
+        )
+        self.write_buffer = write_buffer
+        
+        # Concurrent checks for the same word share one request
+        self._vocabulary_flights = SingleFlight()
+        
+        # learning_stats increments not yet sent, per stat_date
+        self._pending_stats: Dict[str, Counter] = {}
+        self._stats_flushed_at = time.monotonic()
         
         self._headers = {
             "apikey": self.supabase_key,
@@ -141,6 +193,19 @@ class ExpansionEngine:
             "Content-Type": "application/json",
         }
     
+    async def __aenter__(self) -> 'ExpansionEngine':
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+    
+    async def close(self) -> None:
+        """Flush pending learning stats and close the engine's clients."""
+        await self.flush_stats()
+        await self.supabase.close()
+        await self.dictionary.close()
+    
     async def enrich_word(
         self,
         word: str,
@@ -262,8 +327,10 @@ class ExpansionEngine:
             else:
                 result.status = "new"
             
-            # Step 5: Update stats
-            await self._update_stats(result, session)
+            # Step 5: Update stats (sent in batches by flush_stats)
+            self._record_stats(result)
+            if time.monotonic() - self._stats_flushed_at >= STATS_FLUSH_SECONDS:
+                await self.flush_stats(session)
             
         except Exception as e:
             result.status = "failed"
@@ -314,6 +381,7 @@ class ExpansionEngine:
                 "p_context": context or {},
             }
             
+            await self._throttle("supabase")
             async with session.post(url, headers=self._headers, json=payload) as resp:
                 if resp.status == 200:
                     result = await resp.json()
@@ -347,6 +415,7 @@ class ExpansionEngine:
             url = f"{self.supabase_url}/rest/v1/rpc/get_pending_enrichments"
             payload = {"p_limit": limit}
             
+            await self._throttle("supabase")
             async with session.post(url, headers=self._headers, json=payload) as resp:
                 if resp.status == 200:
                     data = await resp.json()
@@ -388,6 +457,7 @@ class ExpansionEngine:
                 "p_sources": sources,
             }
             
+            await self._throttle("supabase")
             async with session.post(url, headers=self._headers, json=payload) as resp:
                 pass  # Ignore result
         finally:
@@ -413,84 +483,239 @@ class ExpansionEngine:
                 "p_error": error[:500],  # Truncate long errors
             }
             
+            await self._throttle("supabase")
             async with session.post(url, headers=self._headers, json=payload) as resp:
                 pass  # Ignore result
         finally:
             if close_session:
                 await session.close()
     
+    async def complete_queue_items(
+        self,
+        completions: List[Tuple[str, Optional[str], List[str]]],
+        session: aiohttp.ClientSession,
+    ) -> None:
+        """
+        Mark many queue items completed with one RPC.
+        
+        Args:
+            completions: (queue_id, vocabulary_id, sources) per item
+        """
+        if not completions:
+            return
+        
+        url = f"{self.supabase_url}/rest/v1/rpc/complete_enrichments"
+        payload = {
+            "p_items": [
+                {"queue_id": queue_id, "vocabulary_id": vocabulary_id, "sources": sources}
+                for queue_id, vocabulary_id, sources in completions
+            ]
+        }
+        
+        try:
+            await self._throttle("supabase")
+            async with session.post(url, headers=self._headers, json=payload) as resp:
+                if resp.status in (200, 204):
+                    return
+        except Exception:
+            pass
+        
+        # Batch RPC unavailable (migration 023 not applied) or failed:
+        # one call per item
+        for queue_id, vocabulary_id, sources in completions:
+            await self.complete_queue_item(queue_id, vocabulary_id, sources, session)
+    
+    async def fail_queue_items(
+        self,
+        failures: List[Tuple[str, str]],
+        session: aiohttp.ClientSession,
+    ) -> None:
+        """
+        Mark many queue items failed (or back to pending for retry) with one RPC.
+        
+        Args:
+            failures: (queue_id, error) per item
+        """
+        if not failures:
+            return
+        
+        url = f"{self.supabase_url}/rest/v1/rpc/fail_enrichments"
+        payload = {
+            "p_items": [
+                {"queue_id": queue_id, "error": error[:500]}  # Truncate long errors
+                for queue_id, error in failures
+            ]
+        }
+        
+        try:
+            await self._throttle("supabase")
+            async with session.post(url, headers=self._headers, json=payload) as resp:
+                if resp.status in (200, 204):
+                    return
+        except Exception:
+            pass
+        
+        for queue_id, error in failures:
+            await self.fail_queue_item(queue_id, error, session)
+    
     async def process_queue_batch(
         self,
         limit: int = 10,
         delay_seconds: float = 1.0,
+        workers: int = 1,
+        item_timeout: Optional[float] = ITEM_TIMEOUT_SECONDS,
     ) -> Dict[str, Any]:
         """
         Process a batch of queue items.
         
+        Items are claimed from get_pending_items in chunks and handed to
+        `workers` concurrent workers. Upstream request rates are held by
+        the shared token buckets in self.limiters, however many workers
+        run. Completions and failures are reported in batched RPCs.
+        
         Args:
             limit: Max items to process
-            delay_seconds: Delay between items (rate limiting)
+            delay_seconds: Delay before each item, per worker (0 to rely
+                           on the token buckets alone)
+            workers: Concurrent workers
+            item_timeout: Seconds before an item is failed (None = no limit)
             
         Returns:
             Summary of processing results
         """
         start_time = datetime.now()
+        workers = max(1, workers)
+        
+        summary = {
+            "processed": 0,
+            "enriched": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "queued_words": 0,
+        }
+        completions: List[Tuple[QueueItem, EnrichmentResult]] = []
+        failures: List[Tuple[str, str]] = []
+        flush_lock = asyncio.Lock()
         
         async with aiohttp.ClientSession() as session:
-            # Get pending items
-            items = await self.get_pending_items(limit, session)
+            items: asyncio.Queue = asyncio.Queue(maxsize=max(workers, QUEUE_FETCH_SIZE))
             
-            if not items:
-                return {
-                    "processed": 0,
-                    "enriched": 0,
-                    "failed": 0,
-                    "message": "Queue empty",
-                }
+            async def feed():
+                claimed = 0
+                try:
+                    while claimed < limit:
+                        batch = await self.get_pending_items(
+                            min(limit - claimed, QUEUE_FETCH_SIZE), session
+                        )
+                        if not batch:
+                            break
+                        claimed += len(batch)
+                        for item in batch:
+                            await items.put(item)
+                finally:
+                    for _ in range(workers):
+                        await items.put(None)  # One stop signal per worker
             
-            enriched = 0
-            failed = 0
-            queued_words = 0
+            async def flush():
+                # Items are only dropped from the lists once reported (workers
+                # may append while this runs); on an error they are kept for
+                # the next flush
+                async with flush_lock:
+                    done, failed = completions[:], failures[:]
+                    
+                    if done:
+                        try:
+                            unwritten = set()
+                            if self.write_buffer is not None:
+                                # Queue items reference nko_vocabulary, so the
+                                # rows must land first. Items whose row was
+                                # spilled or rejected complete without the link
+                                # rather than stay stuck.
+                                await self.write_buffer.flush()
+                                unwritten = self.write_buffer.unwritten_ids("nko_vocabulary")
+                            await self.complete_queue_items(
+                                [
+                                    (
+                                        item.id,
+                                        None if result.vocabulary_id in unwritten else result.vocabulary_id,
+                                        result.sources,
+                                    )
+                                    for item, result in done
+                                ],
+                                session,
+                            )
+                            del completions[:len(done)]
+                        except Exception as e:
+                            print(f"  ⚠️ Could not report {len(done)} completed queue items: {e}")
+                    
+                    if failed:
+                        try:
+                            await self.fail_queue_items(failed, session)
+                            del failures[:len(failed)]
+                        except Exception as e:
+                            print(f"  ⚠️ Could not report {len(failed)} failed queue items: {e}")
             
-            for item in items:
-                try:
+            async def work():
+                while True:
+                    item = await items.get()
+                    if item is None:
+                        return
+                    
                     # Rate limiting
                     if delay_seconds > 0:
                         await asyncio.sleep(delay_seconds)
                     
-                    # Enrich the word
-                    result = await self.enrich_word(
-                        word=item.word,
-                        context=item.context,
-                        session=session,
-                    )
+                    result, error = None, None
+                    try:
+                        result = await asyncio.wait_for(
+                            self.enrich_word(word=item.word, context=item.context, session=session),
+                            timeout=item_timeout,
+                        )
+                    except asyncio.TimeoutError:
+                        error = f"Timed out after {item_timeout:.0f}s"
+                        summary["timed_out"] += 1
+                    except Exception as e:
+                        error = str(e)
                     
-                    if result.status == "failed":
-                        await self.fail_queue_item(item.id, result.error or "Unknown error", session)
-                        failed += 1
+                    summary["processed"] += 1
+                    if result is None or result.status == "failed":
+                        failures.append((item.id, error or result.error or "Unknown error"))
+                        summary["failed"] += 1
                     else:
-                        await self.complete_queue_item(
-                            queue_id=item.id,
-                            vocabulary_id=result.vocabulary_id,
-                            sources=result.sources,
-                            session=session,
-                        )
-                        enriched += 1
-                        queued_words += len(result.queued_words)
-                        
-                except Exception as e:
-                    await self.fail_queue_item(item.id, str(e), session)
-                    failed += 1
-        
-        elapsed_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        
-        return {
-            "processed": len(items),
-            "enriched": enriched,
-            "failed": failed,
-            "queued_words": queued_words,
-            "elapsed_ms": elapsed_ms,
-        }
+                        completions.append((item, result))
+                        summary["enriched"] += 1
+                        summary["queued_words"] += len(result.queued_words)
+                    
+                    if len(completions) + len(failures) >= COMPLETION_BATCH_SIZE:
+                        await flush()
+            
+            tasks = [asyncio.create_task(feed())]
+            tasks += [asyncio.create_task(work()) for _ in range(workers)]
+            try:
+                # One worker's error must not stop the others (or the final flush)
+                for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+                    if isinstance(outcome, Exception):
+                        print(f"  ⚠️ Queue worker failed: {outcome}")
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await flush()
+                await self.flush_stats(session)
+        
+        if not summary["processed"]:
+            return {
+                "processed": 0,
+                "enriched": 0,
+                "failed": 0,
+                "message": "Queue empty",
+            }
+        
+        summary["elapsed_ms"] = int((datetime.now() - start_time).total_seconds() * 1000)
+        return summary
+    
+    async def _throttle(self, upstream: str):
+        """Wait for a request slot on an upstream's shared token bucket."""
+        await self.limiters[upstream].acquire()
     
     async def get_queue_status(
         self,
@@ -505,6 +730,7 @@ class ExpansionEngine:
         try:
             url = f"{self.supabase_url}/rest/v1/queue_status"
             
+            await self._throttle("supabase")
             async with session.get(url, headers=self._headers) as resp:
                 if resp.status == 200:
                     data = await resp.json()
@@ -550,6 +776,7 @@ class ExpansionEngine:
                 "limit": str(days),
             }
             
+            await self._throttle("supabase")
             async with session.get(url, headers=self._headers, params=params) as resp:
                 if resp.status == 200:
                     return await resp.json()
@@ -566,6 +793,16 @@ class ExpansionEngine:
         session: aiohttp.ClientSession,
     ) -> Optional[Dict]:
         """Check if word exists in vocabulary."""
+        return await self._vocabulary_flights.do(
+            normalized,
+            lambda: self._fetch_existing_vocabulary(normalized, session),
+        )
+    
+    async def _fetch_existing_vocabulary(
+        self,
+        normalized: str,
+        session: aiohttp.ClientSession,
+    ) -> Optional[Dict]:
         url = f"{self.supabase_url}/rest/v1/nko_vocabulary"
         params = {
             "latin_text": f"eq.{normalized}",
@@ -573,6 +810,7 @@ class ExpansionEngine:
         }
         
         try:
+            await self._throttle("supabase")
             async with session.get(url, headers=self._headers, params=params) as resp:
                 if resp.status == 200:
                     data = await resp.json()
@@ -587,9 +825,9 @@ class ExpansionEngine:
         session: aiohttp.ClientSession,
     ) -> Optional[DictionaryLookupResult]:
         """Look up word in Ankataa dictionary."""
+        # Shared client, so a loaded dictionary index is reused across lookups
         try:
-            async with DictionaryClient(self.supabase_url, self.supabase_key) as client:
-                return await client.lookup(word, fuzzy=True)
+            return await self.dictionary.lookup(word, fuzzy=True)
         except Exception:
             return None
     
@@ -689,6 +927,17 @@ class ExpansionEngine:
         # Remove None values
         data = {k: v for k, v in data.items() if v is not None}
         
+        if existing_id is None:
+            data.update({"word": word, "word_normalized": normalized})
+        
+        if self.write_buffer is not None and existing_id is None:
+            # Write-behind for new rows: pick the ID now so the queue item
+            # can reference it. Updates stay a PATCH below, since a buffered
+            # upsert would reset the columns this enrichment left out.
+            vocab_id = str(uuid.uuid4())
+            await self.write_buffer.add("nko_vocabulary", {"id": vocab_id, **data})
+            return vocab_id
+        
         url = f"{self.supabase_url}/rest/v1/nko_vocabulary"
         headers = {
             **self._headers,
@@ -698,6 +947,7 @@ class ExpansionEngine:
         try:
             if existing_id:
                 # Update existing
+                await self._throttle("supabase")
                 async with session.patch(
                     url,
                     headers=headers,
@@ -709,6 +959,7 @@ class ExpansionEngine:
                         return result_data[0]["id"] if result_data else existing_id
             else:
                 # Insert new
+                await self._throttle("supabase")
                 async with session.post(url, headers=headers, json=data) as resp:
                     if resp.status in (200, 201):
                         result_data = await resp.json()
@@ -718,59 +969,58 @@ class ExpansionEngine:
         
         return existing_id
     
-    async def _update_stats(
+    def _record_stats(self, result: EnrichmentResult) -> None:
+        """Count an enrichment towards today's learning statistics (memory only)."""
+        counts = self._pending_stats.setdefault(datetime.now().date().isoformat(), Counter())
+        if result.status == "enriched":
+            counts["words_enriched"] += 1
+        if result.dictionary_match:
+            counts["dictionary_matches"] += 1
+        if result.ai_enriched:
+            counts["ai_enrichments"] += 1
+    
+    async def flush_stats(
         self,
-        result: EnrichmentResult,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession] = None,
     ) -> None:
-        """Update daily learning statistics."""
-        url = f"{self.supabase_url}/rest/v1/learning_stats"
-        today = datetime.now().date().isoformat()
+        """
+        Send accumulated learning statistics as one atomic increment.
         
-        # Check if today's stats exist
-        params = {"stat_date": f"eq.{today}"}
+        Counts are added server-side by increment_learning_stats, so
+        concurrent workers and processes never overwrite each other.
+        If the call fails or is cancelled they are kept for the next flush.
+        """
+        pending, self._pending_stats = self._pending_stats, {}
+        self._stats_flushed_at = time.monotonic()
+        rows = [
+            {"stat_date": stat_date, **counts}
+            for stat_date, counts in pending.items()
+            if counts
+        ]
+        if not rows:
+            return
+        
+        close_session = False
+        if session is None:
+            session = aiohttp.ClientSession()
+            close_session = True
         
+        sent = False
         try:
-            async with session.get(url, headers=self._headers, params=params) as resp:
-                if resp.status == 200:
-                    existing = await resp.json()
-                    
-                    if existing:
-                        # Update existing
-                        stats_id = existing[0]["id"]
-                        updates = {"updated_at": datetime.utcnow().isoformat()}
-                        
-                        if result.status == "enriched":
-                            updates["words_enriched"] = existing[0].get("words_enriched", 0) + 1
-                        if result.dictionary_match:
-                            updates["dictionary_matches"] = existing[0].get("dictionary_matches", 0) + 1
-                        if result.ai_enriched:
-                            updates["ai_enrichments"] = existing[0].get("ai_enrichments", 0) + 1
-                        
-                        async with session.patch(
-                            url,
-                            headers=self._headers,
-                            params={"id": f"eq.{stats_id}"},
-                            json=updates,
-                        ) as patch_resp:
-                            pass  # Ignore result
-                    else:
-                        # Create new
-                        new_stats = {
-                            "stat_date": today,
-                            "words_enriched": 1 if result.status == "enriched" else 0,
-                            "dictionary_matches": 1 if result.dictionary_match else 0,
-                            "ai_enrichments": 1 if result.ai_enriched else 0,
-                        }
-                        
-                        async with session.post(
-                            url,
-                            headers=self._headers,
-                            json=new_stats,
-                        ) as post_resp:
-                            pass  # Ignore result
+            url = f"{self.supabase_url}/rest/v1/rpc/increment_learning_stats"
+            await self._throttle("supabase")
+            async with session.post(url, headers=self._headers, json={"p_stats": rows}) as resp:
+                sent = resp.status in (200, 204)
         except Exception:
             pass  # Stats update is best-effort
+        finally:
+            # Also when cancelled (enrich_word flushes from inside a timed
+            # queue item), so the swapped-out counts are never lost
+            if not sent:
+                for stat_date, counts in pending.items():
+                    self._pending_stats.setdefault(stat_date, Counter()).update(counts)
+            if close_session:
+                await session.close()
 
 
 async def test_expansion_engine():
@@ -780,28 +1030,31 @@ async def test_expansion_engine():
     print("=" * 60)
     
     try:
-        engine = ExpansionEngine(enable_ai_enrichment=False)  # Disable AI for quick test
-        
-        # Test word enrichment
-        print("\n1. Testing word enrichment...")
-        result = await engine.enrich_word("dɔgɔ")
-        print(f"   Word: {result.word}")
-        print(f"   Status: {result.status}")
-        print(f"   Dictionary match: {result.dictionary_match}")
-        print(f"   English: {result.verified_english}")
-        print(f"   Time: {result.processing_time_ms}ms")
-        
-        # Test queue status
-        print("\n2. Testing queue status...")
-        status = await engine.get_queue_status()
-        print(f"   Pending: {status.get('total_pending', 0)}")
-        print(f"   Completed: {status.get('total_completed', 0)}")
-        
-        # Test learning stats
-        print("\n3. Testing learning stats...")
-        stats = await engine.get_learning_stats(days=3)
-        for stat in stats:
-            print(f"   {stat.get('stat_date')}: {stat.get('words_enriched', 0)} enriched")
+        # Disable AI for quick test
+        async with ExpansionEngine(enable_ai_enrichment=False) as engine:
+            # Test word enrichment
+            print("\n1. Testing word enrichment...")
+            result = await engine.enrich_word("dɔgɔ")
+            print(f"   Word: {result.word}")
+            print(f"   Status: {result.status}")
+            print(f"   Dictionary match: {result.dictionary_match}")
+            print(f"   English: {result.verified_english}")
+            print(f"   Time: {result.processing_time_ms}ms")
+            
+            # Test queue status
+            print("\n2. Testing queue status...")
+            status = await engine.get_queue_status()
+            print(f"   Pending: {status.get('total_pending', 0)}")
+            print(f"   Completed: {status.get('total_completed', 0)}")
+            
+            # Flush the word's stats before reading them back
+            await engine.flush_stats()
+            
+            # Test learning stats
+            print("\n3. Testing learning stats...")
+            stats = await engine.get_learning_stats(days=3)
+            for stat in stats:
+                print(f"   {stat.get('stat_date')}: {stat.get('words_enriched', 0)} enriched")
         
         print("\n✓ All tests passed!")
         
@@ -6,20 +6,35 @@ Ports the cc-stream filter logic to Python for smart frame deduplication:
 - PerceptualHash: Deduplicates similar frames using Hamming distance
 - SceneDetection: Detects slide changes for educational content  
 - ContentClassifier: Skips intros, credits, speaker-only frames
+- FFmpegFrameStream: Streams JPEG frames from an FFmpeg pipe (no temp files)
 
 This can reduce frames by 60-70% while keeping all educational content.
 
 Matches cc-stream::filter::FilterPipeline::default_nko()
 """
 
+import asyncio
 import hashlib
+import io
+import os
+import re
 import subprocess
 from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Union, AsyncIterator
 import json
 
+# Optional: NumPy + Pillow for real perceptual hashing on decoded pixels
+try:
+    import numpy as np
+    from PIL import Image
+    HAS_IMAGING = True
+except ImportError:
+    np = None
+    Image = None
+    HAS_IMAGING = False
+
 
 @dataclass
 class FrameInfo:
@@ -30,6 +45,7 @@ class FrameInfo:
     phash: Optional[int] = None
     is_duplicate: bool = False
     content_type: str = "content"  # intro, credits, content, speaker, slide
+    data: Optional[bytes] = field(default=None, repr=False)  # In-memory JPEG (streaming mode)
 
 
 @dataclass
@@ -47,29 +63,114 @@ class PerceptualHashFilter:
     """
     Perceptual hash filter for frame deduplication.
     
-    Uses a simplified perceptual hash based on sampling bytes at regular
-    intervals. Two frames are considered duplicates if their Hamming
-    distance is below the similarity threshold.
+    Decodes each frame, downscales it to a small grayscale thumbnail and
+    derives a 64-bit hash from the pixel structure, so two renders of the
+    same slide hash alike even when their JPEG bytes differ. Two frames
+    are considered duplicates if their Hamming distance is below the
+    similarity threshold.
+    
+    Algorithms:
+    - dhash: sign of horizontal gradients on a 9x8 thumbnail (fast)
+    - phash: sign of low-frequency DCT coefficients vs. their median
+      on a 32x32 thumbnail (more robust to brightness/contrast shifts)
+    - sampled: legacy MD5 of sampled encoded bytes (exact duplicates only)
+    
+    Falls back to "sampled" if NumPy/Pillow are not installed.
     
     Matches cc-stream::filter::PerceptualHashFilter
     """
     
+    ALGORITHMS = ("dhash", "phash", "sampled")
+    
     def __init__(
         self,
         similarity_threshold: int = 8,  # ~87.5% similar (64-bit hash)
         history_size: int = 20,          # Keep more history for educational videos
+        algorithm: str = "dhash",
+        hash_size: int = 8,              # hash_size^2 bits (8 -> 64-bit hash)
     ):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown hash algorithm: {algorithm} (expected one of {self.ALGORITHMS})")
+        
         self.similarity_threshold = similarity_threshold
         self.history_size = history_size
+        self.algorithm = algorithm if HAS_IMAGING else "sampled"
+        self.hash_size = hash_size
         self.recent_hashes: deque = deque(maxlen=history_size)
         self.stats = {"total": 0, "passed": 0, "filtered": 0}
+        
+        if not HAS_IMAGING and algorithm != "sampled":
+            print("  Warning: numpy/Pillow not installed, using byte-sampled frame hashes")
+        
+        # Precompute the DCT-II basis for pHash (N x N, orthonormal)
+        self._dct_matrix = None
+        if HAS_IMAGING and algorithm == "phash":
+            n = hash_size * 4
+            k = np.arange(n)[:, None]
+            x = np.arange(n)[None, :]
+            basis = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+            basis[0, :] /= np.sqrt(2.0)
+            self._dct_matrix = basis
+    
+    def compute_hash(self, data: Union[bytes, "np.ndarray"]) -> int:
+        """
+        Compute a perceptual hash from image data.
+        
+        Args:
+            data: Encoded image bytes (JPEG/PNG) or a decoded pixel
+                  array (HxW grayscale or HxWx3 RGB)
+        
+        Returns:
+            64-bit perceptual hash (0 if the image cannot be decoded)
+        """
+        if self.algorithm == "sampled":
+            return self._compute_sampled_hash(data)
+        
+        try:
+            if isinstance(data, np.ndarray):
+                image = Image.fromarray(data)
+            else:
+                image = Image.open(io.BytesIO(data))
+                image.draft("L", (self.hash_size * 8, self.hash_size * 8))  # Fast JPEG downscale on decode
+            gray = image.convert("L")
+        except Exception:
+            return 0
+        
+        if self.algorithm == "phash":
+            return self._phash(gray)
+        return self._dhash(gray)
+    
+    def _dhash(self, gray: "Image.Image") -> int:
+        """Difference hash: is each pixel brighter than its right neighbor?"""
+        size = self.hash_size
+        pixels = np.asarray(
+            gray.resize((size + 1, size), Image.BILINEAR), dtype=np.int16
+        )
+        bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+        return self._bits_to_int(bits)
+    
+    def _phash(self, gray: "Image.Image") -> int:
+        """DCT hash: low-frequency coefficients above/below their median."""
+        size = self.hash_size
+        n = size * 4
+        pixels = np.asarray(gray.resize((n, n), Image.BILINEAR), dtype=np.float64)
+        dct = self._dct_matrix @ pixels @ self._dct_matrix.T
+        low = dct[:size, :size].ravel()
+        median = np.median(low[1:])  # Exclude the DC term
+        return self._bits_to_int(low > median)
     
-    def compute_hash(self, data: bytes) -> int:
+    @staticmethod
+    def _bits_to_int(bits: "np.ndarray") -> int:
+        """Pack a boolean bit vector (MSB first) into an int."""
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+    
+    @staticmethod
+    def _compute_sampled_hash(data: bytes) -> int:
         """
-        Compute a simple perceptual hash from image data.
+        Legacy fingerprint from raw encoded bytes (no decoding).
         
-        This is a simplified implementation. Uses xxhash-style sampling
-        to create a 64-bit fingerprint.
+        Only catches byte-identical frames; used when NumPy/Pillow
+        are unavailable.
         """
         if len(data) < 100:
             return 0
@@ -93,13 +194,23 @@ class PerceptualHashFilter:
     
     def is_similar_to_recent(self, phash: int) -> bool:
         """Check if hash is similar to any recent hash."""
+        if not self.recent_hashes:
+            return False
+        
+        if HAS_IMAGING and self.hash_size == 8:
+            # Vectorized popcount over the whole history window
+            recent = np.fromiter(self.recent_hashes, dtype=np.uint64, count=len(self.recent_hashes))
+            xor = recent ^ np.uint64(phash)
+            distances = np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+            return bool((distances <= self.similarity_threshold).any())
+        
         for recent in self.recent_hashes:
             distance = self.hamming_distance(phash, recent)
             if distance <= self.similarity_threshold:
                 return True
         return False
     
-    def process(self, frame_data: bytes) -> Tuple[bool, int]:
+    def process(self, frame_data: Union[bytes, "np.ndarray"]) -> Tuple[bool, int]:
         """
         Process a frame and return (is_unique, hash).
         
@@ -194,6 +305,198 @@ class SceneChangeDetector:
         except Exception as e:
             print(f"  Scene detection error: {e}")
             return []
+    
+    # showinfo prints one line per output frame: "... n:  12 pts: 4096 pts_time:4.096 ..."
+    _SHOWINFO_RE = re.compile(r"\bn:\s*(\d+)\b.*?\bpts_time:\s*([-\d.]+)")
+    
+    def select_filter(self) -> str:
+        """
+        Build the FFmpeg select expression for scene changes.
+        
+        Applies the minimum scene duration inside the filter graph
+        (prev_selected_t is NaN until the first frame is selected), so
+        the frames FFmpeg emits are exactly the detected scenes.
+        """
+        expr = f"gt(scene,{self.threshold})"
+        if self.min_scene_duration > 0:
+            expr += f"*(isnan(prev_selected_t)+gte(t-prev_selected_t,{self.min_scene_duration}))"
+        return f"select='{expr}'"
+    
+    def extract_scene_frames(
+        self,
+        video_path: str,
+        output_dir: str,
+        max_frames: int = 100,
+        scale_filter: str = "scale='min(720,iw)':-1",
+        timeout: int = 600,
+    ) -> List[Tuple[str, float]]:
+        """
+        Detect scene changes and write their frames in one decode pass.
+        
+        Runs a single FFmpeg process whose select filter keeps only
+        scene-change frames; showinfo reports each kept frame's
+        timestamp on stderr while the encoder writes it to disk.
+        
+        Returns:
+            List of (frame_path, timestamp_seconds) in video order
+        """
+        pattern = os.path.join(output_dir, "frame_%04d.jpg")
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-i", video_path,
+            "-vf", f"{self.select_filter()},showinfo,{scale_filter}",
+            "-vsync", "vfr",
+            "-frames:v", str(max_frames),
+            "-q:v", "2",
+            pattern,
+        ]
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            print("  Scene extraction timed out")
+            return []
+        except Exception as e:
+            print(f"  Scene extraction error: {e}")
+            return []
+        
+        if result.returncode != 0:
+            print(f"  Scene extraction warning: {result.stderr[-200:]}")
+        
+        # Output frame n (0-based) is written as frame_{n+1:04d}.jpg
+        frames = []
+        for line in result.stderr.split('\n'):
+            if 'pts_time:' not in line:
+                continue
+            match = self._SHOWINFO_RE.search(line)
+            if not match:
+                continue
+            n = int(match.group(1))
+            if n >= max_frames:
+                break
+            frame_path = pattern % (n + 1)
+            if Path(frame_path).exists():
+                frames.append((frame_path, float(match.group(2))))
+        
+        return frames
+
+
+class FFmpegFrameStream:
+    """
+    Stream encoded frames straight out of an FFmpeg pipe.
+    
+    FFmpeg decodes the video once, applies the given filter graph and
+    writes each selected frame as a JPEG to stdout (image2pipe); a
+    trailing showinfo filter reports each frame's timestamp on stderr.
+    Frames are yielded as in-memory buffers, so nothing touches disk.
+    
+    The pipe provides natural backpressure: FFmpeg blocks while the
+    consumer is busy (e.g. waiting on OCR).
+    """
+    
+    JPEG_SOI = b"\xff\xd8"
+    JPEG_EOI = b"\xff\xd9"
+    
+    def __init__(
+        self,
+        video_path: str,
+        video_filter: str,
+        max_frames: int,
+        quality: int = 2,
+        chunk_size: int = 1 << 16,
+    ):
+        self.video_path = video_path
+        self.video_filter = video_filter
+        self.max_frames = max_frames
+        self.quality = quality
+        self.chunk_size = chunk_size
+    
+    def build_command(self) -> List[str]:
+        """FFmpeg command writing JPEG frames to stdout."""
+        return [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostdin",
+            "-i", self.video_path,
+            "-vf", f"{self.video_filter},showinfo",
+            "-vsync", "vfr",
+            "-frames:v", str(self.max_frames),
+            "-f", "image2pipe",
+            "-vcodec", "mjpeg",
+            "-q:v", str(self.quality),
+            "pipe:1",
+        ]
+    
+    async def frames(self) -> AsyncIterator[Tuple[bytes, float]]:
+        """
+        Yield (jpeg_bytes, timestamp_seconds) in video order.
+        """
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *self.build_command(),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except Exception as e:
+            print(f"  Frame stream error: {e}")
+            return
+        
+        timestamps: asyncio.Queue = asyncio.Queue()
+        
+        async def _read_timestamps():
+            """Parse showinfo lines from stderr (also keeps the pipe drained)."""
+            async for raw in proc.stderr:
+                line = raw.decode("utf-8", errors="replace")
+                if "pts_time:" not in line:
+                    continue
+                match = SceneChangeDetector._SHOWINFO_RE.search(line)
+                if match:
+                    timestamps.put_nowait(float(match.group(2)))
+            timestamps.put_nowait(None)
+        
+        stderr_task = asyncio.create_task(_read_timestamps())
+        buffer = bytearray()
+        scan_from = 0
+        last_ts = 0.0
+        timestamps_done = False
+        
+        try:
+            while True:
+                chunk = await proc.stdout.read(self.chunk_size)
+                if not chunk:
+                    break
+                buffer += chunk
+                
+                while True:
+                    end = buffer.find(self.JPEG_EOI, scan_from)
+                    if end == -1:
+                        scan_from = max(0, len(buffer) - 1)
+                        break
+                    start = buffer.find(self.JPEG_SOI)
+                    frame = bytes(buffer[max(0, start):end + 2])
+                    del buffer[:end + 2]
+                    scan_from = 0
+                    
+                    if not timestamps_done:
+                        ts = await timestamps.get()
+                        if ts is None:
+                            timestamps_done = True
+                        else:
+                            last_ts = ts
+                    yield frame, last_ts
+        finally:
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+            await proc.wait()
+            stderr_task.cancel()
+            try:
+                await stderr_task
+            except (asyncio.CancelledError, Exception):
+                pass
 
 
 class ContentClassifier:
@@ -270,13 +573,20 @@ class SmartFrameExtractor:
         skip_credits: bool = True,
         intro_duration: float = 10.0,
         credits_duration: float = 30.0,
+        hash_algorithm: str = "dhash",
+        hash_similarity_threshold: int = 8,
+        single_pass_scenes: bool = True,
     ):
         self.target_frames = target_frames
         self.use_scene_detection = use_scene_detection
         self.use_deduplication = use_deduplication
+        self.single_pass_scenes = single_pass_scenes
         
         # Initialize filters
-        self.phash_filter = PerceptualHashFilter() if use_deduplication else None
+        self.phash_filter = PerceptualHashFilter(
+            similarity_threshold=hash_similarity_threshold,
+            algorithm=hash_algorithm,
+        ) if use_deduplication else None
         self.scene_detector = SceneChangeDetector() if use_scene_detection else None
         self.content_classifier = ContentClassifier(intro_duration, credits_duration) if (skip_intro or skip_credits) else None
         
@@ -310,7 +620,6 @@ class SmartFrameExtractor:
         Returns:
             List of FrameInfo for unique, non-duplicate frames
         """
-        import os
         os.makedirs(output_dir, exist_ok=True)
         
         # Get video duration
@@ -337,7 +646,6 @@ class SmartFrameExtractor:
         duration: float,
     ) -> List[FrameInfo]:
         """Extract frames evenly distributed across video."""
-        import os
         
         # Calculate sampling interval
         interval = duration / self.target_frames
@@ -377,10 +685,11 @@ class SmartFrameExtractor:
         duration: float,
     ) -> List[FrameInfo]:
         """Extract frames at scene changes."""
-        import os
-        
         print("  Using scene detection for slide content...")
         
+        if self.single_pass_scenes:
+            return self._extract_scenes_single_pass(video_path, output_dir, duration)
+        
         # Detect scene changes
         scene_timestamps = self.scene_detector.detect_scenes(
             video_path, 
@@ -426,6 +735,173 @@ class SmartFrameExtractor:
         # Apply content classifier and deduplication
         return self._apply_filters_to_list(frames)
     
+    def _extract_scenes_single_pass(
+        self,
+        video_path: str,
+        output_dir: str,
+        duration: float,
+    ) -> List[FrameInfo]:
+        """
+        Detect scenes and write their frames in a single decode.
+        
+        Replaces detect_scenes() + one `ffmpeg -ss` per timestamp
+        (N+1 decodes) with one FFmpeg run.
+        """
+        scene_frames = self.scene_detector.extract_scene_frames(
+            video_path,
+            output_dir,
+            max_frames=self.target_frames,
+        )
+        
+        if len(scene_frames) < 10:
+            print(f"  Only {len(scene_frames)} scenes detected, using even sampling...")
+            for frame_path in Path(output_dir).glob("frame_*.jpg"):
+                frame_path.unlink()
+            return self._extract_evenly_sampled(video_path, output_dir, duration)
+        
+        print(f"  Detected and extracted {len(scene_frames)} scene changes in one pass")
+        
+        frames = [
+            FrameInfo(path=frame_path, index=i, timestamp=ts)
+            for i, (frame_path, ts) in enumerate(scene_frames)
+        ]
+        self.stats.total_frames = len(frames)
+        
+        # Apply content classifier and deduplication
+        return self._apply_filters_to_list(frames)
+    
+    async def stream_frames(
+        self,
+        video_path: str,
+        output_dir: Optional[str] = None,
+    ) -> AsyncIterator[FrameInfo]:
+        """
+        Stream unique frames without writing every JPEG to disk first.
+        
+        Frames come from an FFmpeg pipe and pass through content
+        classification and deduplication in memory. Each yielded
+        FrameInfo carries its JPEG bytes in `data`; it is only written
+        to `output_dir` (and `path` set) if an output_dir is given, and
+        only after it survives the filters.
+        
+        Yields:
+            FrameInfo for unique, non-duplicate frames, in video order
+        """
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        duration = await asyncio.to_thread(self.get_video_duration, video_path)
+        if not duration:
+            print("  Warning: Could not determine video duration")
+            duration = 600  # Assume 10 minutes
+        
+        print(f"  Video duration: {int(duration)}s ({int(duration/60)}m {int(duration%60)}s)")
+        
+        if self.content_classifier:
+            self.content_classifier.set_duration(duration)
+        
+        scale_filter = "scale='min(720,iw)':-1"
+        
+        if self.use_scene_detection and duration > 120:  # > 2 minutes
+            print("  Streaming scene-change frames...")
+            source = FFmpegFrameStream(
+                video_path,
+                f"{self.scene_detector.select_filter()},{scale_filter}",
+                max_frames=self.target_frames,
+            )
+            
+            # Hold back the first few scenes: with fewer than 10 we fall
+            # back to even sampling, and nothing may have been emitted yet.
+            pending: Optional[List[Tuple[bytes, float]]] = []
+            async for data, ts in source.frames():
+                if pending is not None:
+                    pending.append((data, ts))
+                    if len(pending) < 10:
+                        continue
+                    held, pending = pending, None
+                    for held_data, held_ts in held:
+                        frame = self._filter_streamed_frame(held_data, held_ts, output_dir)
+                        if frame:
+                            yield frame
+                    continue
+                
+                frame = self._filter_streamed_frame(data, ts, output_dir)
+                if frame:
+                    yield frame
+            
+            if pending is None:
+                return
+            print(f"  Only {len(pending)} scenes detected, using even sampling...")
+        
+        interval = duration / self.target_frames
+        fps = 1.0 / interval if interval > 0 else 0.1
+        print(f"  Streaming: 1 frame every {interval:.1f}s ({self.target_frames} target frames)")
+        
+        source = FFmpegFrameStream(
+            video_path,
+            f"fps={fps:.6f},{scale_filter}",
+            max_frames=self.target_frames + 20,  # Extract a few extra
+        )
+        async for data, ts in source.frames():
+            frame = self._filter_streamed_frame(data, ts, output_dir)
+            if frame:
+                yield frame
+    
+    def _filter_streamed_frame(
+        self,
+        data: bytes,
+        timestamp: float,
+        output_dir: Optional[str],
+    ) -> Optional[FrameInfo]:
+        """Apply filters to one in-memory frame; returns None if dropped."""
+        self.stats.total_frames += 1
+        frame = self._classify_and_dedup(data, timestamp, output_dir)
+        self.stats.pass_rate = self.stats.unique_frames / self.stats.total_frames * 100
+        return frame
+    
+    def _classify_and_dedup(
+        self,
+        data: bytes,
+        timestamp: float,
+        output_dir: Optional[str],
+    ) -> Optional[FrameInfo]:
+        """Content classification + perceptual dedup for a streamed frame."""
+        # Content classification
+        if self.content_classifier:
+            content_type = self.content_classifier.classify(timestamp)
+            if content_type == "intro":
+                self.stats.intro_skipped += 1
+                return None
+            elif content_type == "credits":
+                self.stats.credits_skipped += 1
+                return None
+        
+        # Perceptual hash deduplication
+        phash = None
+        if self.phash_filter:
+            is_unique, phash = self.phash_filter.process(data)
+            if not is_unique:
+                self.stats.duplicates_removed += 1
+                return None
+        
+        index = self.stats.unique_frames
+        frame_path = ""
+        if output_dir:
+            frame_path = os.path.join(output_dir, f"frame_{index + 1:04d}.jpg")
+            with open(frame_path, "wb") as f:
+                f.write(data)
+        
+        self.stats.unique_frames += 1
+        
+        return FrameInfo(
+            path=frame_path,
+            index=index,
+            timestamp=timestamp,
+            phash=phash,
+            content_type="content",
+            data=data,
+        )
+    
     def _apply_filters(
         self,
         frame_paths: List[Path],
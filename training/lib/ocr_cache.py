@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Persistent OCR Result Cache for N'Ko Video Analyzer
+
+SQLite-backed cache of Gemini frame OCR results, keyed by the frame's
+perceptual hash and the OCR prompt version. The same slide (title
+cards, alphabet charts) recurs across many videos of a channel; a
+cache hit skips the multimodal API call entirely.
+
+Features:
+- Near-match lookup: any cached hash within a Hamming radius is a hit
+- Multi-index hashing: the 64-bit hash is split into 8 byte-bands, so
+  by pigeonhole any hash within radius <= 7 shares at least one band,
+  and only band-matching rows are compared
+- Size-bounded LRU eviction (by last use)
+- Hit/miss counters for cache effectiveness
+
+Hash 0 is what PerceptualHashFilter returns for a frame it cannot
+decode, so it is never looked up or stored: undecodable frames would
+otherwise all share one key and get each other's OCR results.
+
+Usage:
+    from ocr_cache import OcrCache
+
+    cache = OcrCache("./data/cache/ocr_cache.sqlite", hamming_radius=4)
+    phash = cache.compute_hash(jpeg_bytes)
+    result = cache.get(phash, prompt_version)
+    if result is None:
+        result = await call_gemini(...)
+        cache.put(phash, prompt_version, result)
+"""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+from frame_filter import PerceptualHashFilter
+
+logger = logging.getLogger(__name__)
+
+# Number of 8-bit bands the 64-bit hash is split into for candidate lookup
+NUM_BANDS = 8
+
+# FrameAnalysis fields stored per entry
+CACHED_FIELDS = (
+    "has_nko",
+    "nko_text",
+    "latin_transliteration",
+    "english_translation",
+    "confidence",
+    "raw_response",
+)
+
+
+def _to_signed(value: int) -> int:
+    """Map an unsigned 64-bit hash into SQLite's signed INTEGER range."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _to_unsigned(value: int) -> int:
+    """Inverse of _to_signed."""
+    return value + (1 << 64) if value < 0 else value
+
+
+def _bands(phash: int) -> List[int]:
+    """Split a 64-bit hash into NUM_BANDS byte values (MSB first)."""
+    return [(phash >> (8 * (NUM_BANDS - 1 - i))) & 0xFF for i in range(NUM_BANDS)]
+
+
+class OcrCache:
+    """
+    Persistent perceptual-hash cache for frame OCR results.
+
+    Keys are (perceptual hash, prompt version). The hash algorithm is
+    folded into the stored version so hashes from different algorithms
+    never match each other.
+    """
+
+    def __init__(
+        self,
+        path: str = "./data/cache/ocr_cache.sqlite",
+        hamming_radius: int = 4,
+        max_entries: int = 100_000,
+        hash_algorithm: str = "dhash",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            hamming_radius: Max Hamming distance counted as a hit (0 = exact)
+            max_entries: Evict least-recently-used entries beyond this size
+            hash_algorithm: PerceptualHashFilter algorithm for cache keys
+        """
+        self.path = path
+        self.hamming_radius = max(0, hamming_radius)
+        self.max_entries = max_entries
+        self.hasher = PerceptualHashFilter(algorithm=hash_algorithm)
+        self.hash_algorithm = self.hasher.algorithm
+
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "exact_hits": 0,
+            "near_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "uncacheable": 0,
+        }
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        band_columns = ", ".join(f"b{i} INTEGER NOT NULL" for i in range(NUM_BANDS))
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS ocr_cache (
+                phash INTEGER NOT NULL,
+                version TEXT NOT NULL,
+                {band_columns},
+                has_nko INTEGER NOT NULL,
+                nko_text TEXT,
+                latin_transliteration TEXT,
+                english_translation TEXT,
+                confidence REAL,
+                raw_response TEXT,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (phash, version)
+            )
+        """)
+        for i in range(NUM_BANDS):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_ocr_cache_b{i} ON ocr_cache(version, b{i})"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ocr_cache_lru ON ocr_cache(last_used_at)"
+        )
+        self._conn.commit()
+
+    def _version_key(self, prompt_version: str) -> str:
+        return f"{prompt_version}:{self.hash_algorithm}"
+
+    def compute_hash(self, frame_data: bytes) -> int:
+        """Compute the cache key hash for encoded frame bytes."""
+        return self.hasher.compute_hash(frame_data)
+
+    def get(self, phash: int, prompt_version: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached OCR result.
+
+        Returns the closest entry within hamming_radius (exact match
+        first), or None on a miss or an uncacheable (0) hash.
+        """
+        if not phash:
+            self.stats["uncacheable"] += 1
+            return None
+        self.stats["lookups"] += 1
+        version = self._version_key(prompt_version)
+        columns = ", ".join(CACHED_FIELDS)
+
+        row = self._conn.execute(
+            f"SELECT phash, {columns} FROM ocr_cache WHERE phash = ? AND version = ?",
+            (_to_signed(phash), version),
+        ).fetchone()
+        if row is not None:
+            self.stats["exact_hits"] += 1
+            return self._hit(row, version)
+
+        if self.hamming_radius > 0:
+            row = self._find_near(phash, version, columns)
+            if row is not None:
+                self.stats["near_hits"] += 1
+                return self._hit(row, version)
+
+        self.stats["misses"] += 1
+        return None
+
+    def _find_near(self, phash: int, version: str, columns: str) -> Optional[tuple]:
+        """Closest entry within hamming_radius, or None."""
+        if self.hamming_radius < NUM_BANDS:
+            # Pigeonhole: a hash within radius r < NUM_BANDS differs in at
+            # most r bands, so it matches this hash exactly in at least one.
+            band_clause = " OR ".join(f"b{i} = ?" for i in range(NUM_BANDS))
+            rows = self._conn.execute(
+                f"SELECT phash, {columns} FROM ocr_cache WHERE version = ? AND ({band_clause})",
+                (version, *_bands(phash)),
+            ).fetchall()
+        else:
+            rows = self._conn.execute(
+                f"SELECT phash, {columns} FROM ocr_cache WHERE version = ?",
+                (version,),
+            ).fetchall()
+
+        best_row, best_distance = None, self.hamming_radius + 1
+        for row in rows:
+            distance = PerceptualHashFilter.hamming_distance(phash, _to_unsigned(row[0]))
+            if distance < best_distance:
+                best_row, best_distance = row, distance
+        return best_row
+
+    def _hit(self, row: tuple, version: str) -> Dict[str, Any]:
+        self.stats["hits"] += 1
+        self._conn.execute(
+            "UPDATE ocr_cache SET last_used_at = ?, hit_count = hit_count + 1 "
+            "WHERE phash = ? AND version = ?",
+            (time.time(), row[0], version),
+        )
+        self._conn.commit()
+        result = dict(zip(CACHED_FIELDS, row[1:]))
+        result["has_nko"] = bool(result["has_nko"])
+        return result
+
+    def put(self, phash: int, prompt_version: str, result: Dict[str, Any]) -> None:
+        """Store an OCR result (fields as in CACHED_FIELDS); 0 hashes are skipped."""
+        if not phash:
+            return
+        now = time.time()
+        self._conn.execute(
+            f"""
+            INSERT OR REPLACE INTO ocr_cache (
+                phash, version, {", ".join(f"b{i}" for i in range(NUM_BANDS))},
+                {", ".join(CACHED_FIELDS)}, created_at, last_used_at
+            ) VALUES ({", ".join("?" * (2 + NUM_BANDS + len(CACHED_FIELDS) + 2))})
+            """,
+            (
+                _to_signed(phash),
+                self._version_key(prompt_version),
+                *_bands(phash),
+                int(bool(result.get("has_nko"))),
+                result.get("nko_text"),
+                result.get("latin_transliteration"),
+                result.get("english_translation"),
+                result.get("confidence"),
+                result.get("raw_response"),
+                now,
+                now,
+            ),
+        )
+        self._conn.commit()
+        self.stats["stores"] += 1
+        self._evict_if_needed()
+
+    def _evict_if_needed(self) -> None:
+        """Drop least-recently-used entries once the cache exceeds max_entries."""
+        if not self.max_entries:
+            return
+        count = self._conn.execute("SELECT COUNT(*) FROM ocr_cache").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # Evict down to 90% so we don't evict on every insert at the limit
+        excess = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM ocr_cache WHERE rowid IN ("
+            "SELECT rowid FROM ocr_cache ORDER BY last_used_at ASC LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+        self.stats["evictions"] += excess
+        logger.info(f"OCR cache evicted {excess} entries (limit {self.max_entries})")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM ocr_cache").fetchone()[0]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["lookups"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            **self.stats,
+            "entries": len(self),
+            "hit_rate": f"{self.hit_rate * 100:.1f}%",
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+
+# Test
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python ocr_cache.py <cache.sqlite>")
+        sys.exit(1)
+
+    cache = OcrCache(sys.argv[1])
+    for key, value in cache.get_stats().items():
+        print(f"  {key}: {value}")
+    cache.close()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Request Coalescing (Single-Flight) for N'Ko Pipeline
+
+When many callers ask for the same key at the same moment (the same
+normalized word during concurrent frame enrichment, the same RAG query,
+the same dictionary lookup), only the first one does the work; the
+others await its result. Nothing is cached: once the call finishes, the
+next caller for that key starts a fresh one.
+
+Used by DictionaryClient, ExpansionEngine and RagClient.
+
+Results are shared between all callers of one flight, so callers must
+not mutate them. An exception is raised to every caller of that flight.
+
+Usage:
+    from single_flight import SingleFlight
+
+    flights = SingleFlight()
+
+    async def lookup(word):
+        return await flights.do(word, lambda: fetch(word))
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async calls that share a key.
+
+    The work runs as its own task, so a caller that is cancelled does not
+    cancel the call for the other callers waiting on it.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    def __len__(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn()` for `key`, or join the call already in flight for it.
+
+        Args:
+            key: Identity of the request (must be hashable)
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        self.stats["calls"] += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            self.stats["executions"] += 1
+            flight = asyncio.ensure_future(fn())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _, key=key, flight=flight: self._forget(key, flight))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(flight)
+
+    def _forget(self, key: Hashable, flight: asyncio.Future):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Nobody may be left awaiting a failed flight; mark its error retrieved
+        if not flight.cancelled():
+            flight.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        calls = self.stats["calls"]
+        return {
+            **self.stats,
+            "in_flight": len(self._flights),
+            "coalesced_rate": self.stats["coalesced"] / calls if calls else 0.0,
+        }
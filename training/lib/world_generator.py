@@ -21,12 +21,17 @@ Usage:
         latin_text="N'Ko",
         translation="I declare"
     )
+
+Combined mode (combined=True) asks for all selected worlds in one JSON
+request instead of one request per world; worlds missing or malformed
+in the combined answer are regenerated individually.
 """
 
 import asyncio
 import aiohttp
 import json
 import os
+import re
 import sys
 from pathlib import Path
 from dataclasses import dataclass, field
@@ -42,10 +47,27 @@ except ImportError:
     # Fallback if prompts module not in path
     PromptLoader = None
 
+try:
+    from .rate_limiter import TokenBucket
+except ImportError:
+    from rate_limiter import TokenBucket
+
 # Configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = "gemini-2.0-flash"
-GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
+# GEMINI_BASE_URL points the generator at another server (e.g. gemini_stub_server.py)
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com").rstrip("/")
+GEMINI_API_URL = f"{GEMINI_BASE_URL}/v1beta/models/{GEMINI_MODEL}:generateContent"
+
+# Output budget per world (combined requests get one per selected world)
+WORLD_MAX_OUTPUT_TOKENS = 2048
+COMBINED_MAX_OUTPUT_TOKENS = 8192
+
+# The phrase context each world template repeats; combined prompts state it once
+_CONTEXT_BLOCK = re.compile(
+    r"^[^\n]*Given the following N'Ko text[^\n]*\n(?:\s*(?:N'Ko|Latin|English):[^\n]*\n)+",
+    re.MULTILINE,
+)
 
 # World definitions
 WORLDS = [
@@ -87,9 +109,13 @@ class WorldGenerator:
     
     Features:
     - Loads prompts from YAML or Supabase via PromptLoader
-    - Rate limiting (configurable requests/second)
+    - Rate limiting (token bucket, configurable requests/second)
     - Retry logic with exponential backoff
     - Concurrent generation with semaphore
+    
+    The rate limiter and semaphore belong to the generator, so one
+    instance shared by many concurrent phrases keeps a single global
+    request budget.
     """
     
     def __init__(
@@ -98,6 +124,9 @@ class WorldGenerator:
         max_concurrent: int = 5,
         requests_per_second: float = 10.0,
         max_retries: int = 3,
+        burst: Optional[float] = None,
+        combined: bool = False,
+        limiter: Optional[TokenBucket] = None,
     ):
         """
         Initialize the WorldGenerator.
@@ -107,15 +136,28 @@ class WorldGenerator:
             max_concurrent: Max concurrent API calls
             requests_per_second: Rate limit
             max_retries: Max retry attempts per request
+            burst: Max requests sent back to back (defaults to
+                   max(1, requests_per_second))
+            combined: Generate all worlds of a phrase in one request
+                      (falls back per world on parse failure)
+            limiter: Token bucket shared with other Gemini callers
+                     (overrides requests_per_second and burst)
         """
         self.api_key = api_key or GEMINI_API_KEY
         self.max_concurrent = max_concurrent
-        self.min_interval = 1.0 / requests_per_second
         self.max_retries = max_retries
         
         self._semaphore = asyncio.Semaphore(max_concurrent)
-        self._last_request_time = 0.0
-        self._lock = asyncio.Lock()
+        self._limiter = limiter or TokenBucket(rate=requests_per_second, capacity=burst)
+        self.combined = combined
+        self.stats = {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "output_tokens": 0,
+            "combined_requests": 0,
+            "combined_worlds": 0,
+            "fallback_worlds": 0,
+        }
         
         # Load prompts
         self._prompts: Dict[str, str] = {}
@@ -205,17 +247,14 @@ Generate 2-3 variants."""
     
     async def _rate_limit(self):
         """Enforce rate limiting."""
-        async with self._lock:
-            now = asyncio.get_event_loop().time()
-            elapsed = now - self._last_request_time
-            if elapsed < self.min_interval:
-                await asyncio.sleep(self.min_interval - elapsed)
-            self._last_request_time = asyncio.get_event_loop().time()
+        await self._limiter.acquire()
     
     async def _call_gemini(
         self,
         prompt: str,
         session: aiohttp.ClientSession,
+        max_output_tokens: int = WORLD_MAX_OUTPUT_TOKENS,
+        json_mode: bool = False,
     ) -> Dict[str, Any]:
         """
         Call Gemini text-only API with retry logic.
@@ -223,6 +262,8 @@ Generate 2-3 variants."""
         Args:
             prompt: The prompt to send
             session: aiohttp session
+            max_output_tokens: Output token budget
+            json_mode: Request structured JSON output (responseMimeType)
             
         Returns:
             Parsed JSON response or error dict
@@ -233,9 +274,11 @@ Generate 2-3 variants."""
             }],
             "generationConfig": {
                 "temperature": 0.7,  # More creative for world generation
-                "maxOutputTokens": 2048,
+                "maxOutputTokens": max_output_tokens,
             }
         }
+        if json_mode:
+            payload["generationConfig"]["responseMimeType"] = "application/json"
         
         for attempt in range(self.max_retries):
             try:
@@ -250,6 +293,10 @@ Generate 2-3 variants."""
                     ) as response:
                         if response.status == 200:
                             data = await response.json()
+                            usage = data.get("usageMetadata", {})
+                            self.stats["requests"] += 1
+                            self.stats["prompt_tokens"] += usage.get("promptTokenCount", 0)
+                            self.stats["output_tokens"] += usage.get("candidatesTokenCount", 0)
                             try:
                                 text = data["candidates"][0]["content"]["parts"][0]["text"]
                                 # Parse JSON from response
@@ -318,9 +365,7 @@ Generate 2-3 variants."""
             )
         
         # Fill template
-        prompt = template.replace("{nko_text}", nko_text or "")
-        prompt = prompt.replace("{latin_text}", latin_text or "N/A")
-        prompt = prompt.replace("{translation}", translation or "N/A")
+        prompt = self._fill_template(template, nko_text, latin_text, translation)
         
         # Call API
         result = await self._call_gemini(prompt, session)
@@ -335,16 +380,22 @@ Generate 2-3 variants."""
                 generation_time_ms=elapsed_ms,
             )
         
+        return self._world_from_result(world_name, result, elapsed_ms)
+    
+    @staticmethod
+    def _world_from_result(world_name: str, result: Dict[str, Any], elapsed_ms: int) -> WorldVariant:
+        """Build a WorldVariant from one world's parsed JSON."""
         # Extract variants
         variants = result.get("variants", [])
         if not variants and "related_proverbs" in result:
             variants = result["related_proverbs"]  # Proverbs world uses different key
         
         # Extract cultural notes
+        cultural_context = result.get("cultural_context")
         cultural_note = (
             result.get("cultural_note") or 
             result.get("cultural_significance") or
-            result.get("cultural_context", {}).get("origin")
+            (cultural_context.get("origin") if isinstance(cultural_context, dict) else None)
         )
         
         return WorldVariant(
@@ -355,12 +406,133 @@ Generate 2-3 variants."""
             generation_time_ms=elapsed_ms,
         )
     
+    @staticmethod
+    def _fill_template(template: str, nko_text: str, latin_text: Optional[str], translation: Optional[str]) -> str:
+        prompt = template.replace("{nko_text}", nko_text or "")
+        prompt = prompt.replace("{latin_text}", latin_text or "N/A")
+        return prompt.replace("{translation}", translation or "N/A")
+    
+    def _build_combined_prompt(
+        self,
+        world_ids: List[str],
+        nko_text: str,
+        latin_text: Optional[str],
+        translation: Optional[str],
+    ) -> str:
+        """One prompt for several worlds: the phrase context once, then each world's task."""
+        sections = []
+        for world_id in world_ids:
+            # Drop the context block every template repeats
+            task = _CONTEXT_BLOCK.sub("", self._prompts[world_id], count=1).strip()
+            task = re.sub(r"\n{3,}", "\n\n", task)
+            task = self._fill_template(task, nko_text, latin_text, translation)
+            sections.append(f"### {world_id}\n{task}")
+        
+        keys = ", ".join(f'"{world_id}": {{...}}' for world_id in world_ids)
+        return (
+            "You are generating N'Ko language learning content for several worlds "
+            "(usage contexts) at once.\n\n"
+            "Given the following N'Ko text and translation:\n"
+            f"N'Ko: {nko_text or ''}\n"
+            f"Latin: {latin_text or 'N/A'}\n"
+            f"English: {translation or 'N/A'}\n\n"
+            "Complete each task below for this text. Respond with ONE JSON object "
+            "whose keys are the world IDs, each holding exactly the JSON object "
+            f"that world's task asks for:\n{{{keys}}}\n\n"
+            + "\n\n".join(sections)
+        )
+    
+    @staticmethod
+    def _split_combined(result: Dict[str, Any], world_id: str) -> Optional[Dict[str, Any]]:
+        """One world's object from a combined answer, or None if missing or malformed."""
+        world = result.get(world_id)
+        if world is None:
+            world = result.get(world_id.replace("world_", ""))
+        if not isinstance(world, dict) or "error" in world:
+            return None
+        variants = world.get("variants") or world.get("related_proverbs")
+        if not isinstance(variants, list) or not variants:
+            return None
+        if not all(isinstance(v, dict) for v in variants):
+            return None
+        return world
+    
+    async def generate_combined_worlds(
+        self,
+        world_ids: List[str],
+        nko_text: str,
+        latin_text: Optional[str],
+        translation: Optional[str],
+        session: aiohttp.ClientSession,
+    ) -> List[WorldVariant]:
+        """
+        Generate several worlds with one request.
+        
+        The answer is validated world by world; worlds missing or
+        malformed in it are generated individually instead.
+        
+        Args:
+            world_ids: World prompt IDs
+            nko_text: The N'Ko text to expand
+            latin_text: Latin transliteration
+            translation: English translation
+            session: aiohttp session
+            
+        Returns:
+            One WorldVariant per world ID, in order
+        """
+        start_time = datetime.now()
+        known = [world_id for world_id in world_ids if self._prompts.get(world_id)]
+        
+        result: Dict[str, Any] = {}
+        if known:
+            prompt = self._build_combined_prompt(known, nko_text, latin_text, translation)
+            result = await self._call_gemini(
+                prompt,
+                session,
+                max_output_tokens=min(COMBINED_MAX_OUTPUT_TOKENS, WORLD_MAX_OUTPUT_TOKENS * len(known)),
+                json_mode=True,
+            )
+            self.stats["combined_requests"] += 1
+            if "error" in result:
+                print(f"Combined generation failed ({result['error'][:80]}), falling back per world")
+                result = {}
+        elapsed_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+        
+        worlds: Dict[str, WorldVariant] = {}
+        fallback = []
+        for world_id in world_ids:
+            world = self._split_combined(result, world_id) if world_id in known else None
+            if world is None:
+                fallback.append(world_id)
+                continue
+            worlds[world_id] = self._world_from_result(world_id.replace("world_", ""), world, elapsed_ms)
+        
+        self.stats["combined_worlds"] += len(worlds)
+        self.stats["fallback_worlds"] += len(fallback)
+        if fallback:
+            retried = await asyncio.gather(*(
+                self.generate_single_world(
+                    world_id=world_id,
+                    nko_text=nko_text,
+                    latin_text=latin_text,
+                    translation=translation,
+                    session=session,
+                )
+                for world_id in fallback
+            ))
+            worlds.update(zip(fallback, retried))
+        
+        return [worlds[world_id] for world_id in world_ids]
+    
     async def generate_worlds(
         self,
         nko_text: str,
         latin_text: Optional[str] = None,
         translation: Optional[str] = None,
         worlds: Optional[List[str]] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        combined: Optional[bool] = None,
     ) -> WorldGenerationResult:
         """
         Generate all world variants for N'Ko text.
@@ -370,6 +542,10 @@ Generate 2-3 variants."""
             latin_text: Latin transliteration
             translation: English translation
             worlds: List of world IDs to generate (defaults to all 5)
+            session: aiohttp session to reuse (one is opened for this
+                     call if not given)
+            combined: One request for all worlds (defaults to the
+                      generator's setting)
             
         Returns:
             WorldGenerationResult with all variants
@@ -386,7 +562,13 @@ Generate 2-3 variants."""
         worlds_to_generate = worlds or WORLDS
         start_time = datetime.now()
         
-        async with aiohttp.ClientSession() as session:
+        use_combined = self.combined if combined is None else combined
+        
+        async def generate_all(session: aiohttp.ClientSession) -> List[WorldVariant]:
+            if use_combined and len(worlds_to_generate) > 1:
+                return await self.generate_combined_worlds(
+                    list(worlds_to_generate), nko_text, latin_text, translation, session,
+                )
             tasks = [
                 self.generate_single_world(
                     world_id=world_id,
@@ -397,8 +579,13 @@ Generate 2-3 variants."""
                 )
                 for world_id in worlds_to_generate
             ]
-            
-            results = await asyncio.gather(*tasks)
+            return await asyncio.gather(*tasks)
+        
+        if session is not None:
+            results = await generate_all(session)
+        else:
+            async with aiohttp.ClientSession() as own_session:
+                results = await generate_all(own_session)
         
         # Compile results
         total_variants = sum(len(r.variants) for r in results)
@@ -417,6 +604,16 @@ Generate 2-3 variants."""
             total_time_ms=elapsed_ms,
         )
 
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, token and rate limiter statistics."""
+        return {
+            **self.stats,
+            "combined": self.combined,
+            "max_concurrent": self.max_concurrent,
+            "rate_limiter": self._limiter.get_stats(),
+        }
+
 
 async def test_world_generator():
     """Test the world generator with sample N'Ko text."""
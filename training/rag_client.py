@@ -26,6 +26,8 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 import httpx
 
+from training.lib.single_flight import SingleFlight
+
 
 @dataclass
 class TrajectoryCoords:
@@ -121,6 +123,9 @@ class RagClient:
         self.project_name = project_name
         self._client: Optional[httpx.AsyncClient] = None
         
+        # Identical concurrent searches share one request
+        self._search_flights = SingleFlight()
+        
         # Session tracking
         self._session_id: Optional[str] = None
         self._turn_index: int = 0
@@ -167,13 +172,26 @@ class RagClient:
             project_id: Filter by project ID.
         
         Returns:
-            List of related turns with similarity scores.
+            List of related turns with similarity scores (shared with any
+            concurrent identical search; do not mutate).
         """
+        project_id = project_id or self.project_id
+        return await self._search_flights.do(
+            (query, limit, project_id),
+            lambda: self._search(query, limit, project_id),
+        )
+    
+    async def _search(
+        self,
+        query: str,
+        limit: int,
+        project_id: Optional[str],
+    ) -> List[RelatedTurn]:
         client = await self._get_client()
         
         params = {"query": query, "limit": limit}
-        if project_id or self.project_id:
-            params["project_id"] = project_id or self.project_id
+        if project_id:
+            params["project_id"] = project_id
         
         try:
             response = await client.get(
@@ -486,6 +486,7 @@ async def save_to_supabase(entries: List[DictionaryEntry]) -> int:
         except Exception as e:
             print(f"  Error saving batch: {e}")
     
+    await client.close()
     return saved
 
 
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Frame Hash Benchmark
+
+Measures how well each PerceptualHashFilter algorithm deduplicates a
+folder of extracted frames, and how fast it hashes them.
+
+For every algorithm (sampled bytes, dHash, pHash) it reports:
+- Duplicate-removal rate when the frames are fed through process()
+  in filename order, exactly as SmartFrameExtractor does
+- Re-encode recall: the share of frames whose JPEG re-encode at a
+  different quality is still recognised as a duplicate (ground truth
+  for "same slide, different bytes")
+- Hashing throughput in frames/second and MB/second
+
+Usage:
+    python benchmark_frame_hash.py ./data/temp/VIDEO_ID/frames
+    python benchmark_frame_hash.py ./frames --threshold 10 --reencode-quality 60
+    python benchmark_frame_hash.py ./frames --json results.json
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from frame_filter import PerceptualHashFilter, HAS_IMAGING
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def load_frames(frames_dir: str, limit: int = 0) -> List[bytes]:
+    """Load encoded frame images from a folder (sorted by name)."""
+    paths = sorted(
+        p for p in Path(frames_dir).iterdir()
+        if p.suffix.lower() in (".jpg", ".jpeg", ".png")
+    )
+    if limit:
+        paths = paths[:limit]
+    return [p.read_bytes() for p in paths]
+
+
+def reencode(data: bytes, quality: int) -> bytes:
+    """Re-encode an image as JPEG at a different quality."""
+    buffer = io.BytesIO()
+    Image.open(io.BytesIO(data)).convert("RGB").save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def benchmark_algorithm(
+    algorithm: str,
+    frames: List[bytes],
+    reencoded: List[bytes],
+    threshold: int,
+    history_size: int,
+) -> Dict[str, Any]:
+    """Run dedup, recall and throughput measurements for one algorithm."""
+    hash_filter = PerceptualHashFilter(
+        similarity_threshold=threshold,
+        history_size=history_size,
+        algorithm=algorithm,
+    )
+    compute = hash_filter.compute_hash
+
+    # Throughput: hash every frame once
+    total_bytes = sum(len(f) for f in frames)
+    start = time.perf_counter()
+    hashes = [compute(f) for f in frames]
+    elapsed = time.perf_counter() - start
+
+    # Dedup: run through process() in order
+    for frame in frames:
+        hash_filter.process(frame)
+    removed = hash_filter.stats["filtered"]
+
+    # Recall on known duplicates (same image, different JPEG bytes)
+    recall = None
+    if reencoded:
+        matched = sum(
+            1 for original, copy in zip(hashes, reencoded)
+            if PerceptualHashFilter.hamming_distance(original, compute(copy)) <= threshold
+        )
+        recall = matched / len(reencoded)
+
+    return {
+        "algorithm": algorithm,
+        "frames": len(frames),
+        "duplicates_removed": removed,
+        "removal_rate": removed / len(frames) if frames else 0.0,
+        "reencode_recall": recall,
+        "hash_seconds": elapsed,
+        "frames_per_second": len(frames) / elapsed if elapsed > 0 else float("inf"),
+        "mb_per_second": total_bytes / 1e6 / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark perceptual frame hashing")
+    parser.add_argument("frames_dir", help="Folder of extracted frames (.jpg/.png)")
+    parser.add_argument("--threshold", type=int, default=8, help="Hamming distance threshold (default: 8)")
+    parser.add_argument("--history", type=int, default=20, help="Recent-hash history size (default: 20)")
+    parser.add_argument("--reencode-quality", type=int, default=75,
+                        help="JPEG quality for re-encode recall test (0 to skip)")
+    parser.add_argument("--limit", type=int, default=0, help="Only use the first N frames")
+    parser.add_argument("--json", type=str, help="Write results to JSON file")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames_dir, args.limit)
+    if not frames:
+        print(f"No frames found in {args.frames_dir}")
+        sys.exit(1)
+
+    algorithms = ["sampled"]
+    if HAS_IMAGING:
+        algorithms = list(PerceptualHashFilter.ALGORITHMS)
+    else:
+        print("Warning: numpy/Pillow not installed, only benchmarking byte sampling")
+
+    reencoded = []
+    if HAS_IMAGING and args.reencode_quality > 0:
+        reencoded = [reencode(f, args.reencode_quality) for f in frames]
+
+    print("=" * 72)
+    print(f"Frame Hash Benchmark: {len(frames)} frames from {args.frames_dir}")
+    print(f"Threshold: {args.threshold}  History: {args.history}  "
+          f"Re-encode quality: {args.reencode_quality or 'skipped'}")
+    print("=" * 72)
+    print(f"{'algorithm':<10} {'removed':>8} {'rate':>7} {'recall':>7} {'frames/s':>10} {'MB/s':>8}")
+
+    results = []
+    for algorithm in algorithms:
+        r = benchmark_algorithm(algorithm, frames, reencoded, args.threshold, args.history)
+        results.append(r)
+        recall = f"{r['reencode_recall'] * 100:.1f}%" if r["reencode_recall"] is not None else "n/a"
+        print(
+            f"{r['algorithm']:<10} {r['duplicates_removed']:>8} {r['removal_rate'] * 100:>6.1f}% "
+            f"{recall:>7} {r['frames_per_second']:>10.1f} {r['mb_per_second']:>8.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"frames_dir": args.frames_dir, "threshold": args.threshold, "results": results}, f, indent=2)
+        print(f"\nResults saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Local Stub Server for the Gemini generateContent API
+
+Answers world-generation prompts (single-world and combined) with
+deterministic JSON, so WorldGenerator and Pass 3 can run without network
+access or API spend.
+
+- Single-world prompts get one world object ({"world", "variants", ...})
+- Combined prompts (one "### world_x" section per world) get one object
+  keyed by world ID
+
+Usage:
+    python gemini_stub_server.py --port 8766
+
+    GEMINI_BASE_URL=http://127.0.0.1:8766 GEMINI_API_KEY=stub \\
+    python run_worlds.py --limit 20 --combined
+
+Failure injection, to exercise the fallbacks:
+    --drop-worlds world_proverbs   Leave these worlds out of combined answers
+    --garble-every N               Every Nth combined answer is invalid JSON
+    --rate-limit-every N           Every Nth request gets a 429
+
+GET /stats returns request and token counts.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+
+_WORLD_SECTION = re.compile(r"^### (world_\w+)\s*$", re.MULTILINE)
+_WORLD_NAME = re.compile(r'"world":\s*"(\w+)"')
+_NKO_LINE = re.compile(r"^N'Ko:\s*(.*)$", re.MULTILINE)
+
+
+class GeminiStubState:
+    """Request counters and failure injection settings."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        drop_worlds: Optional[List[str]] = None,
+        garble_every: int = 0,
+        rate_limit_every: int = 0,
+    ):
+        self.latency = latency
+        self.drop_worlds = set(drop_worlds or [])
+        self.garble_every = garble_every
+        self.rate_limit_every = rate_limit_every
+        self.stats = {
+            "requests": 0,
+            "single_requests": 0,
+            "combined_requests": 0,
+            "rate_limited": 0,
+            "garbled": 0,
+            "prompt_tokens": 0,
+        }
+
+
+def _world_object(world_name: str, nko_text: str) -> Dict[str, Any]:
+    """Deterministic answer for one world."""
+    return {
+        "world": world_name,
+        "variants": [
+            {
+                "nko_text": f"{nko_text} ({world_name} {i})",
+                "latin_text": f"stub {world_name} {i}",
+                "english": f"[stub] {world_name} variant {i}",
+                "context": f"stub {world_name} context",
+            }
+            for i in (1, 2)
+        ],
+        "cultural_note": f"[stub] {world_name}",
+    }
+
+
+async def generate_content(request: web.Request) -> web.Response:
+    state: GeminiStubState = request.app["state"]
+    body = await request.json()
+    state.stats["requests"] += 1
+
+    if state.rate_limit_every and state.stats["requests"] % state.rate_limit_every == 0:
+        state.stats["rate_limited"] += 1
+        return web.json_response({"error": {"code": 429, "message": "stub rate limit"}}, status=429)
+
+    if state.latency:
+        await asyncio.sleep(state.latency)
+
+    prompt = "".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+    nko_match = _NKO_LINE.search(prompt)
+    nko_text = nko_match.group(1).strip() if nko_match else ""
+
+    world_ids = _WORLD_SECTION.findall(prompt)
+    if world_ids:
+        state.stats["combined_requests"] += 1
+        answer = {
+            world_id: _world_object(world_id.replace("world_", ""), nko_text)
+            for world_id in world_ids
+            if world_id not in state.drop_worlds
+        }
+        text = json.dumps(answer, ensure_ascii=False)
+        if state.garble_every and state.stats["combined_requests"] % state.garble_every == 0:
+            state.stats["garbled"] += 1
+            text = text[: len(text) // 2]
+    else:
+        state.stats["single_requests"] += 1
+        name_match = _WORLD_NAME.search(prompt)
+        text = json.dumps(
+            _world_object(name_match.group(1) if name_match else "unknown", nko_text),
+            ensure_ascii=False,
+        )
+        # Single-world answers come fenced, as the model often does
+        if not body.get("generationConfig", {}).get("responseMimeType"):
+            text = f"```json\n{text}\n```"
+
+    prompt_tokens = max(1, len(prompt) // 4)
+    state.stats["prompt_tokens"] += prompt_tokens
+    return web.json_response({
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": max(1, len(text) // 4),
+        },
+    })
+
+
+async def get_stats(request: web.Request) -> web.Response:
+    return web.json_response(request.app["state"].stats)
+
+
+def create_app(
+    latency: float = 0.0,
+    drop_worlds: Optional[List[str]] = None,
+    garble_every: int = 0,
+    rate_limit_every: int = 0,
+) -> web.Application:
+    """Build the stub application."""
+    app = web.Application(client_max_size=16 * 1024 * 1024)
+    app["state"] = GeminiStubState(
+        latency=latency,
+        drop_worlds=drop_worlds,
+        garble_every=garble_every,
+        rate_limit_every=rate_limit_every,
+    )
+    # Matches /v1beta/models/<model>:generateContent
+    app.router.add_post("/v1beta/models/{model_method}", generate_content)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+async def start_stub_server(port: int = 8766, host: str = "127.0.0.1", **kwargs) -> web.AppRunner:
+    """
+    Start the stub inside the running event loop.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind
+        **kwargs: create_app options (latency, drop_worlds, ...)
+
+    Returns:
+        The runner; call `await runner.cleanup()` to stop it
+    """
+    runner = web.AppRunner(create_app(**kwargs))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Stub Gemini generateContent server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    parser.add_argument("--drop-worlds", default="",
+                        help="Comma-separated world IDs left out of combined answers")
+    parser.add_argument("--garble-every", type=int, default=0,
+                        help="Make every Nth combined answer invalid JSON (0 = never)")
+    parser.add_argument("--rate-limit-every", type=int, default=0,
+                        help="Answer every Nth request with 429 (0 = never)")
+    args = parser.parse_args(argv)
+
+    print(f"Gemini stub listening on http://{args.host}:{args.port}")
+    print(f"  GEMINI_BASE_URL=http://{args.host}:{args.port}")
+    web.run_app(
+        create_app(
+            latency=args.latency,
+            drop_worlds=[w for w in args.drop_worlds.split(",") if w],
+            garble_every=args.garble_every,
+            rate_limit_every=args.rate_limit_every,
+        ),
+        host=args.host,
+        port=args.port,
+        print=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -32,8 +32,9 @@ import sys
 import base64
 import yaml
 import logging
+import uuid
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 import re
@@ -56,6 +57,7 @@ from supabase_client import (
 )
 from frame_filter import SmartFrameExtractor, FrameInfo
 from retry_utils import retry_with_backoff, RetryConfig, RetryError
+from write_buffer import SupabaseWriteBuffer, DEFAULT_JOURNAL_PATH
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -95,7 +97,13 @@ DEFAULT_CONFIG = {
         }
     },
     "storage": {
-        "supabase": {"enabled": True},
+        "supabase": {
+            "enabled": True,
+            "write_behind": False,
+            "flush_rows": 500,
+            "flush_interval": 2.0,
+            "journal_path": DEFAULT_JOURNAL_PATH,
+        },
         "local": {"temp_dir": "./data/temp", "keep_frames": False},
     },
     "worlds": {
@@ -209,6 +217,7 @@ class NkoAnalyzer:
         worlds: Optional[List[str]] = None,
         config: Optional[Dict[str, Any]] = None,
         config_path: Optional[str] = None,
+        write_behind: Optional[bool] = None,
     ):
         """
         Initialize the analyzer.
@@ -220,6 +229,8 @@ class NkoAnalyzer:
             worlds: Which worlds to generate (defaults to all 5)
             config: Configuration dictionary (overrides config_path)
             config_path: Path to YAML config file
+            write_behind: Queue Supabase writes in a SupabaseWriteBuffer
+                          instead of waiting on them (defaults to config)
         """
         # Load configuration
         if config is not None:
@@ -241,7 +252,9 @@ class NkoAnalyzer:
         )
         
         # Feature flags
-        self.store_supabase = store_supabase or self.config.get("storage", {}).get("supabase", {}).get("enabled", False)
+        supabase_config = self.config.get("storage", {}).get("supabase", {})
+        self.store_supabase = store_supabase or supabase_config.get("enabled", False)
+        self.write_behind = write_behind if write_behind is not None else supabase_config.get("write_behind", False)
         self.generate_worlds = generate_worlds if generate_worlds is not None else self.config.get("worlds", {}).get("enabled", True)
         self.worlds = worlds or self.config.get("worlds", {}).get("selected", DEFAULT_WORLDS)
         
@@ -252,6 +265,7 @@ class NkoAnalyzer:
         # Initialize sub-components
         self.world_generator: Optional[WorldGenerator] = None
         self.supabase: Optional[SupabaseClient] = None
+        self.write_buffer: Optional[SupabaseWriteBuffer] = None
         
         if self.generate_worlds:
             self.world_generator = WorldGenerator(api_key=self.api_key)
@@ -262,18 +276,40 @@ class NkoAnalyzer:
             except ValueError as e:
                 logger.warning(f"Supabase not configured: {e}")
                 self.store_supabase = False
+        
+        if self.supabase is not None and self.write_behind:
+            self.write_buffer = SupabaseWriteBuffer(
+                self.supabase,
+                max_batch_rows=supabase_config.get("flush_rows", 500),
+                flush_interval=supabase_config.get("flush_interval", 2.0),
+                journal_path=supabase_config.get("journal_path", DEFAULT_JOURNAL_PATH),
+            )
+            self.write_buffer.add_flush_callback(self._complete_flushed_sources)
+        # source_id -> {table: row IDs} queued for sources not yet marked completed
+        self._pending_sources: Dict[str, Dict[str, Set[str]]] = {}
     
     async def __aenter__(self) -> 'NkoAnalyzer':
-        """Enter async context - create shared session."""
+        """Enter async context - create shared session and start the write buffer."""
         if self._session is None:
             self._session = aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=self.api_timeout)
             )
             self._owns_session = True
+        if self.write_buffer is not None:
+            await self.write_buffer.start()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Exit async context - close session if we own it."""
+        """Exit async context - flush queued writes and close sessions we own."""
+        if self.write_buffer is not None:
+            await self.write_buffer.close()
+            stats = self.write_buffer.get_stats()
+            print(f"  Supabase write buffer: {stats['rows_flushed']} rows in {stats['batches_flushed']} batches, "
+                  f"{stats['rows_spilled']} spilled, avg flush {stats['flush_seconds_avg'] * 1000:.0f}ms")
+            if self._pending_sources:
+                print(f"  {len(self._pending_sources)} sources have unwritten rows, left as processing")
+        if self.supabase is not None:
+            await self.supabase.close()
         if self._session and self._owns_session:
             await self._session.close()
             self._session = None
@@ -602,9 +638,14 @@ Focus on clear, visible text. Ignore blurry or partial text."""
         
         # Step 5: Store in Supabase
         if self.store_supabase and self.supabase:
-            print("  Storing in Supabase...")
-            await self._store_in_supabase(analysis)
-            print(f"    Source ID: {analysis.source_id}")
+            if self.write_buffer is not None:
+                await self._buffer_in_supabase(analysis)
+                print(f"  Queued for Supabase (source {analysis.source_id}, "
+                      f"{self.write_buffer.queue_depth} rows pending)")
+            else:
+                print("  Storing in Supabase...")
+                await self._store_in_supabase(analysis)
+                print(f"    Source ID: {analysis.source_id}")
         
         analysis.status = "completed"
         analysis.processing_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -948,6 +989,146 @@ Focus on clear, visible text. Ignore blurry or partial text."""
                 total_detections=analysis.frames_with_nko,
                 session=session,
             )
+    
+    async def _buffer_in_supabase(self, analysis: VideoAnalysis) -> None:
+        """
+        Queue all analysis results in the write buffer.
+        
+        Row IDs are generated here so frames, detections and trajectories
+        can reference their parents before anything reaches Supabase.
+        The source is queued as "processing" and only marked completed
+        once a flush has written every row queued for it (see
+        _complete_flushed_sources).
+        """
+        buffer = self.write_buffer
+        
+        # The existence check still goes to Supabase (cheap, and avoids duplicates)
+        existing = await self.supabase.get_source_by_external_id(analysis.video_id)
+        if existing and existing.get("status") == "completed":
+            analysis.source_id = existing["id"]
+            print(f"    Source already exists: {analysis.source_id}")
+            return
+        
+        if existing:
+            # Left incomplete by an earlier run: replace its partial content
+            source_id = existing["id"]
+            print(f"    Source {source_id} was incomplete, storing again")
+            await self.supabase.clear_source_content(source_id)
+        else:
+            source_id = str(uuid.uuid4())
+        analysis.source_id = source_id
+        row_ids: Dict[str, Set[str]] = {"nko_sources": {source_id}}
+        
+        source = asdict(SourceData(
+            source_type="youtube",
+            url=analysis.youtube_url,
+            external_id=analysis.video_id,
+            title=analysis.title,
+            channel_name=analysis.channel_name,
+            status="processing",
+            metadata={
+                "frames_analyzed": analysis.frames_analyzed,
+                "frames_with_nko": analysis.frames_with_nko,
+                "total_world_variants": analysis.total_world_variants,
+            },
+        ))
+        source.update({
+            "id": source_id,
+            "frame_count": analysis.frames_analyzed,
+            "nko_frame_count": analysis.frames_with_nko,
+            "total_detections": analysis.frames_with_nko,
+        })
+        await buffer.add("nko_sources", source)
+        
+        for frame in analysis.frames:
+            frame.frame_id = str(uuid.uuid4())
+            row_ids.setdefault("nko_frames", set()).add(frame.frame_id)
+            await buffer.add("nko_frames", {
+                "id": frame.frame_id,
+                **asdict(FrameData(
+                    source_id=source_id,
+                    frame_index=frame.frame_index,
+                    timestamp_ms=int(frame.timestamp * 1000),
+                    has_nko=frame.has_nko,
+                    confidence=frame.confidence,
+                )),
+            })
+            
+            if not frame.nko_text:
+                continue
+            
+            frame.detection_id = str(uuid.uuid4())
+            row_ids.setdefault("nko_detections", set()).add(frame.detection_id)
+            await buffer.add("nko_detections", {
+                "id": frame.detection_id,
+                **asdict(DetectionData(
+                    frame_id=frame.frame_id,
+                    nko_text=frame.nko_text,
+                    latin_text=frame.latin_transliteration,
+                    english_text=frame.english_translation,
+                    char_count=len(frame.nko_text),
+                    confidence=frame.confidence,
+                    gemini_model=GEMINI_MODEL,
+                    raw_response={"raw": frame.raw_response} if frame.raw_response else None,
+                )),
+            })
+            
+            for world in frame.worlds:
+                if not world.variants:
+                    continue
+                trajectory_id = str(uuid.uuid4())
+                node_ids = [str(uuid.uuid4()) for _ in world.variants]
+                row_ids.setdefault("nko_trajectories", set()).add(trajectory_id)
+                row_ids.setdefault("nko_trajectory_nodes", set()).update(node_ids)
+                await buffer.add("nko_trajectories", {
+                    "id": trajectory_id,
+                    **asdict(TrajectoryData(
+                        name=f"world_{world.world_name}",
+                        description=f"World exploration: {world.world_name}",
+                        trajectory_type="content_flow",
+                        total_nodes=len(world.variants),
+                        dominant_phase="exploration",
+                        is_complete=True,
+                        is_successful=not bool(world.error),
+                    )),
+                })
+                await buffer.add_many("nko_trajectory_nodes", [
+                    {"id": node_ids[i], **asdict(TrajectoryNodeData(
+                        trajectory_id=trajectory_id,
+                        detection_id=frame.detection_id,
+                        node_index=i,
+                        trajectory_depth=1,
+                        trajectory_sibling_order=i,
+                        trajectory_phase="exploration",
+                        content_preview=variant.get("nko_text", "")[:100],
+                        content_type=world.world_name,
+                        outcome="success",
+                        is_terminal=(i == len(world.variants) - 1),
+                    ))}
+                    for i, variant in enumerate(world.variants)
+                ])
+        
+        # Marked completed by _complete_flushed_sources once a flush has
+        # written every row
+        self._pending_sources[source_id] = row_ids
+    
+    async def _complete_flushed_sources(self) -> None:
+        """
+        Write-buffer flush callback: mark queued sources completed once
+        every row queued for them is in Supabase.
+        
+        Sources with spilled or rejected rows stay pending (and
+        "processing" in Supabase), so a later run stores them again.
+        """
+        if not self._pending_sources:
+            return
+        tables = {table for row_ids in self._pending_sources.values() for table in row_ids}
+        unwritten = {table: self.write_buffer.unwritten_ids(table) for table in tables}
+        for source_id, row_ids in list(self._pending_sources.items()):
+            if any(unwritten[table] & ids for table, ids in row_ids.items()):
+                continue
+            await self.supabase.update_source_status(source_id, status="completed")
+            self._pending_sources.pop(source_id, None)
 
 
 def get_channel_videos(limit: Optional[int] = None) -> List[Dict[str, str]]:
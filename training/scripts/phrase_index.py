@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Phrase Index (MinHash + LSH)
+
+Finds near-duplicate N'Ko phrases without comparing every pair:
+
+1. Each phrase is cut into overlapping character n-grams (shingles).
+   Unlike a set of single characters, shingles keep letter order, so
+   two long phrases built from the same ~60-letter alphabet no longer
+   look alike.
+2. A MinHash signature (num_perm minimum hashes) estimates the shingle
+   Jaccard similarity of any two phrases.
+3. Signatures are split into bands; phrases sharing any band land in
+   the same bucket and become candidate pairs (LSH). Candidates are
+   then verified with an edit-distance similarity.
+
+Shingling, hashing and bucketing are vectorized with numpy over the
+whole corpus, so indexing hundreds of thousands of phrases takes
+seconds. Candidate verification uses rapidfuzz when installed and a
+bit-parallel pure-Python Levenshtein otherwise.
+
+The LSH bands are tuned from the edit-similarity threshold: a pair with
+edit similarity s differs by at most (1 - s) * len edits, and each edit
+changes at most `shingle_size` shingles, which bounds how low their
+shingle Jaccard can be.
+
+Usage:
+    from phrase_index import PhraseLSHIndex, edit_similarity
+
+    index = PhraseLSHIndex(similarity_threshold=0.85)
+    index.add_many(phrases)
+    for i, j in index.candidate_pairs().tolist():
+        if edit_similarity(phrases[i], phrases[j], 0.85) >= 0.85:
+            ...
+
+    # Later: fold in new phrases against a saved index
+    index.save(path)
+    index = PhraseLSHIndex.load(path)
+    candidates = index.query_many(new_phrases)
+    index.add_many(new_phrases)
+"""
+
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    from rapidfuzz.distance import Levenshtein as _rf_levenshtein
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+
+# Largest prime below 2**32 (shingle hashes are reduced mod P)
+_PRIME = np.uint64(4294967291)
+# Code points are < 2**21
+_BASE = np.uint64(1 << 21)
+_SHIFT = np.uint64(32)
+# Above any 32-bit MinHash value
+_EMPTY = 1 << 32
+
+# Shingles per chunk when computing signatures (bounds memory)
+_SIGNATURE_CHUNK = 200_000
+
+# Buckets up to this size are paired with vectorized offsets; larger
+# ones (rare) get their own pass
+_DENSE_BUCKET = 16
+
+
+# ==================== Edit distance ====================
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Levenshtein distance, or None once it must exceed max_distance.
+
+    Uses the bit-parallel algorithm of Myers (Hyyrö's formulation for
+    edit distance): one column of the DP matrix per character of `b`,
+    held in Python int bit-vectors, so a pair costs O(len(b)) word
+    operations. Stops early once the distance can't come back under
+    max_distance.
+    """
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    m, n = len(a), len(b)
+    if n - m > max_distance:
+        return None
+    if m == 0:
+        return n
+
+    match_masks: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        match_masks[char] = match_masks.get(char, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    positive, negative = mask, 0
+    score = m
+    for j, char in enumerate(b):
+        eq = match_masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        h_positive = negative | (~(xh | positive) & mask)
+        h_negative = positive & xh
+        if h_positive & last:
+            score += 1
+        elif h_negative & last:
+            score -= 1
+        # The remaining n - j - 1 characters can lower the score by at most one each
+        if score - (n - j - 1) > max_distance:
+            return None
+        h_positive = ((h_positive << 1) | 1) & mask
+        h_negative = (h_negative << 1) & mask
+        positive = h_negative | (~(xv | h_positive) & mask)
+        negative = h_positive & xv
+
+    return score if score <= max_distance else None
+
+
+def edit_similarity(text1: str, text2: str, threshold: float = 0.0) -> float:
+    """
+    Edit-distance similarity: 1 - levenshtein / max(len).
+
+    Args:
+        text1: First text
+        text2: Second text
+        threshold: Pairs that cannot reach this similarity return 0.0
+                   early (cheaper than the exact score)
+
+    Returns:
+        Similarity score 0.0 to 1.0
+    """
+    if not text1 or not text2:
+        return 0.0
+    longest = max(len(text1), len(text2))
+    max_distance = int((1.0 - threshold) * longest + 1e-9)
+    if HAS_RAPIDFUZZ:
+        # Same distance, computed in C; returns max_distance + 1 past the cutoff
+        distance = _rf_levenshtein.distance(text1, text2, score_cutoff=max_distance)
+        if distance > max_distance:
+            return 0.0
+        return 1.0 - distance / longest
+    distance = bounded_levenshtein(text1, text2, max_distance)
+    if distance is None:
+        return 0.0
+    return 1.0 - distance / longest
+
+
+# ==================== LSH tuning ====================
+
+def min_shingle_jaccard(similarity_threshold: float, shingle_size: int) -> float:
+    """Lowest shingle Jaccard a pair at the edit-similarity threshold can have."""
+    changed = shingle_size * (1.0 - similarity_threshold)
+    return max(0.05, (1.0 - changed) / (1.0 + changed))
+
+
+def _collision_probability(jaccard: float, bands: int, rows: int) -> float:
+    return 1.0 - (1.0 - jaccard ** rows) ** bands
+
+
+def optimal_bands(jaccard_threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Choose (bands, rows) for an LSH threshold.
+
+    Minimizes missed pairs at or above the threshold (weighted double,
+    since a missed duplicate survives consolidation) plus candidates
+    below it, integrated over the Jaccard range.
+    """
+    steps = 100
+    best, best_cost = (num_perm, 1), float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if bands < 1:
+            break
+        cost = 0.0
+        for step in range(steps):
+            j = (step + 0.5) / steps
+            p = _collision_probability(j, bands, rows)
+            cost += (1.0 - p) * 2.0 if j >= jaccard_threshold else p
+        if cost < best_cost:
+            best, best_cost = (bands, rows), cost
+    return best
+
+
+# ==================== Index ====================
+
+class PhraseLSHIndex:
+    """
+    MinHash/LSH index of phrases over character shingles.
+
+    Phrases get consecutive integer IDs in the order they are added.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.85,
+        num_perm: int = 64,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        """
+        Args:
+            similarity_threshold: Edit similarity that counts as a duplicate
+                                  (used to tune the LSH bands)
+            num_perm: MinHash permutations per signature
+            shingle_size: Characters per shingle
+            seed: Seed for the hash permutations
+        """
+        self.similarity_threshold = similarity_threshold
+        self.seed = seed
+        self.num_perm = num_perm
+        self.shingle_size = max(1, shingle_size)
+        self.jaccard_threshold = min_shingle_jaccard(similarity_threshold, self.shingle_size)
+        self.bands, self.rows = optimal_bands(self.jaccard_threshold, num_perm)
+
+        rng = np.random.RandomState(seed)
+        # Multiply-add-shift hash family: ((a * x + b) mod 2**64) >> 32
+        self._a = rng.randint(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.randint(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._band_mix = rng.randint(1, 2 ** 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self.texts: List[str] = []
+        self._band_keys = np.zeros((0, self.bands), dtype=np.uint64)
+        self._buckets: Optional[List[Dict[int, List[int]]]] = None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    # ==================== Signatures ====================
+
+    def _shingle_hashes(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hash every shingle of every text.
+
+        Returns:
+            (hashes, owner): shingle hashes and the index of the text each
+            belongs to, grouped by text in order. Texts shorter than a
+            shingle contribute one shingle (the whole text).
+        """
+        k = self.shingle_size
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        codes = np.frombuffer(
+            "".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+        ).astype(np.uint64)
+        owner_of_char = np.repeat(np.arange(len(texts)), lengths)
+
+        # Rolling polynomial hash of each k-character window
+        windows = max(0, len(codes) - k + 1)
+        hashes = np.zeros(windows, dtype=np.uint64)
+        for offset in range(k):
+            hashes = (hashes * _BASE + codes[offset:offset + windows]) % _PRIME
+        # Keep windows that don't cross into the next text
+        valid = owner_of_char[:windows] == owner_of_char[k - 1:k - 1 + windows]
+        hashes, owner = hashes[valid], owner_of_char[:windows][valid]
+
+        short = np.nonzero((lengths < k) & (lengths > 0))[0]
+        if len(short):
+            extra = np.zeros(len(short), dtype=np.uint64)
+            for n, i in enumerate(short):
+                h = 0
+                for char in texts[i]:
+                    h = (h * int(_BASE) + ord(char)) % int(_PRIME)
+                extra[n] = h
+            hashes = np.concatenate([hashes, extra])
+            owner = np.concatenate([owner, short])
+            order = np.argsort(owner, kind="stable")
+            hashes, owner = hashes[order], owner[order]
+
+        return hashes, owner
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """MinHash signatures, shape (len(texts), num_perm)."""
+        signatures = np.full((len(texts), self.num_perm), _EMPTY, dtype=np.uint64)
+        if not texts:
+            return signatures
+
+        hashes, owner = self._shingle_hashes(texts)
+        if not len(hashes):
+            return signatures
+
+        for start in range(0, len(hashes), _SIGNATURE_CHUNK):
+            chunk_hashes = hashes[start:start + _SIGNATURE_CHUNK]
+            chunk_owner = owner[start:start + _SIGNATURE_CHUNK]
+            permuted = (chunk_hashes[:, None] * self._a + self._b) >> _SHIFT
+
+            # Minimum per text (texts are contiguous runs of owner)
+            starts = np.concatenate([[0], np.nonzero(np.diff(chunk_owner))[0] + 1])
+            minima = np.minimum.reduceat(permuted, starts, axis=0)
+            rows = chunk_owner[starts]
+            # A text split across chunks keeps the smaller of both minima
+            signatures[rows] = np.minimum(signatures[rows], minima)
+
+        return signatures
+
+    def _band_hashes(self, signatures: np.ndarray) -> np.ndarray:
+        """One 64-bit key per band, shape (n, bands)."""
+        n = len(signatures)
+        banded = signatures[:, :self.bands * self.rows].reshape(n, self.bands, self.rows)
+        # Wrapping multiply-add mix of the band's rows
+        return (banded * self._band_mix).sum(axis=2, dtype=np.uint64)
+
+    # ==================== Index ====================
+
+    def add_many(self, texts: Iterable[str]) -> List[int]:
+        """
+        Index phrases.
+
+        Returns:
+            Their IDs
+        """
+        texts = list(texts)
+        first = len(self.texts)
+        keys = self._band_hashes(self.signatures(texts))
+        self.texts.extend(texts)
+        self._band_keys = np.concatenate([self._band_keys, keys])
+
+        if self._buckets is not None:
+            for offset, row in enumerate(keys.tolist()):
+                for band, key in enumerate(row):
+                    self._buckets[band].setdefault(key, []).append(first + offset)
+
+        return list(range(first, first + len(texts)))
+
+    def add(self, text: str) -> int:
+        """Index one phrase; returns its ID."""
+        return self.add_many([text])[0]
+
+    def candidate_pairs(self) -> np.ndarray:
+        """
+        Every (i, j), i < j, that shares at least one LSH bucket.
+
+        Computed by sorting each band's keys, so only bucket members are
+        ever paired.
+
+        Returns:
+            int64 array of shape (pairs, 2), sorted by i then j
+        """
+        n = len(self.texts)
+        found = []
+        if n >= 2:
+            for band in range(self.bands):
+                keys = self._band_keys[:, band]
+                order = np.argsort(keys, kind="stable")
+                sorted_keys = keys[order]
+                # Bucket number of each sorted position; a bucket is a run of equal keys
+                bucket = np.concatenate([[0], np.cumsum(sorted_keys[1:] != sorted_keys[:-1])])
+                sizes = np.bincount(bucket)
+                largest = int(sizes.max())
+                dense = sizes[bucket] <= _DENSE_BUCKET
+
+                # Pair each position with the one `gap` places later in the same bucket
+                for gap in range(1, min(largest, _DENSE_BUCKET)):
+                    left = np.nonzero(
+                        (bucket[:-gap] == bucket[gap:]) & dense[:-gap]
+                    )[0]
+                    if not len(left):
+                        break
+                    found.append(order[left] * n + order[left + gap])
+
+                # The few oversized buckets pair up directly
+                for big in np.nonzero(sizes > _DENSE_BUCKET)[0]:
+                    members = order[bucket == big]
+                    i, j = np.triu_indices(len(members), k=1)
+                    found.append(members[i] * n + members[j])
+
+        if not found:
+            return np.zeros((0, 2), dtype=np.int64)
+        codes = np.concatenate(found).astype(np.int64)
+        # Encode (i, j) as min * n + max; one row per pair, however many bands it collided in
+        i, j = np.divmod(codes, n)
+        codes = np.unique(np.minimum(i, j) * n + np.maximum(i, j))
+        return np.stack(np.divmod(codes, n), axis=1)
+
+    def _build_buckets(self):
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        for i, row in enumerate(self._band_keys.tolist()):
+            for band, key in enumerate(row):
+                self._buckets[band][key].append(i)
+
+    def query(self, text: str) -> List[int]:
+        """IDs of indexed phrases sharing a bucket with `text`."""
+        return self.query_many([text])[0]
+
+    def query_many(self, texts: List[str]) -> List[List[int]]:
+        """IDs of indexed phrases sharing a bucket with each text (signatures computed together)."""
+        if self._buckets is None:
+            self._build_buckets()
+
+        results = []
+        for keys in self._band_hashes(self.signatures(list(texts))).tolist():
+            found: Set[int] = set()
+            for band, key in enumerate(keys):
+                found.update(self._buckets[band].get(key, ()))
+            results.append(sorted(found))
+        return results
+
+    # ==================== Snapshot ====================
+
+    def save(self, path: Path):
+        """Write the index (texts and band keys) to an .npz snapshot."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        params = {
+            "similarity_threshold": self.similarity_threshold,
+            "num_perm": self.num_perm,
+            "shingle_size": self.shingle_size,
+            "seed": self.seed,
+        }
+        # Write to a temp file and rename, so a crash never leaves half a snapshot
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                params=np.frombuffer(json.dumps(params).encode("utf-8"), dtype=np.uint8),
+                texts=np.frombuffer(json.dumps(self.texts, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+                band_keys=self._band_keys,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "PhraseLSHIndex":
+        """Read an index written by save(); new phrases can be added to it."""
+        with np.load(Path(path)) as data:
+            params = json.loads(data["params"].tobytes().decode("utf-8"))
+            index = cls(**params)
+            index.texts = json.loads(data["texts"].tobytes().decode("utf-8"))
+            index._band_keys = data["band_keys"].astype(np.uint64)
+        if index._band_keys.shape != (len(index.texts), index.bands):
+            raise ValueError(f"Corrupt index snapshot: {path}")
+        return index
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get index statistics."""
+        return {
+            "phrases": len(self.texts),
+            "num_perm": self.num_perm,
+            "shingle_size": self.shingle_size,
+            "bands": self.bands,
+            "rows": self.rows,
+            "jaccard_threshold": round(self.jaccard_threshold, 3),
+        }
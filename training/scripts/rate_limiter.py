@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting Utilities for N'Ko Pipeline
+
+Provides an async token-bucket rate limiter that can be shared by many
+concurrent callers of the same upstream API (Gemini, Supabase, Ankataa).
+
+Unlike a fixed sleep between calls, a token bucket allows short bursts
+up to its capacity while holding the long-run request rate at the
+configured budget, no matter how many coroutines draw from it.
+
+Usage:
+    from rate_limiter import TokenBucket
+
+    limiter = TokenBucket(rate=2.0, capacity=4)
+
+    async def call_api():
+        await limiter.acquire()
+        ...
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Each `acquire()` consumes one token, waiting until one is available.
+    Waiters are served in FIFO order. A rate of 0 disables limiting.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+    ):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second (requests/second budget)
+            capacity: Maximum burst size (defaults to max(1, rate))
+        """
+        self.rate = max(0.0, rate)
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0}
+
+    @classmethod
+    def from_interval(cls, min_interval: float, capacity: Optional[float] = None) -> 'TokenBucket':
+        """Create a bucket from a minimum delay between requests (seconds)."""
+        rate = 1.0 / min_interval if min_interval > 0 else 0.0
+        return cls(rate=rate, capacity=capacity)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether this bucket actually limits anything."""
+        return self.rate > 0
+
+    def _refill(self) -> None:
+        """Add tokens accrued since the last update."""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens without waiting. Returns False if not enough are available."""
+        if not self.enabled:
+            self.stats["acquired"] += 1
+            return True
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            self.stats["acquired"] += 1
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available, then consume them."""
+        if not self.enabled:
+            self.stats["acquired"] += 1
+            return
+
+        async with self._lock:
+            waited = 0.0
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    break
+                delay = (tokens - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+            self.stats["acquired"] += 1
+            if waited > 0:
+                self.stats["waited"] += 1
+                self.stats["wait_seconds"] += waited
+
+    async def __aenter__(self) -> 'TokenBucket':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics."""
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "acquired": self.stats["acquired"],
+            "waited": self.stats["waited"],
+            "wait_seconds": round(self.stats["wait_seconds"], 3),
+        }
+
+
+# Test
+if __name__ == "__main__":
+    async def test_bucket():
+        limiter = TokenBucket(rate=5.0, capacity=2)
+        start = time.monotonic()
+
+        async def worker(i: int):
+            await limiter.acquire()
+            print(f"  request {i} at {time.monotonic() - start:.2f}s")
+
+        await asyncio.gather(*(worker(i) for i in range(10)))
+        print(f"Stats: {limiter.get_stats()}")
+
+    asyncio.run(test_bucket())
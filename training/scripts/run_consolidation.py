@@ -2,11 +2,20 @@
 """
 Pass 2: Consolidation + Deduplication
 
-Queries all detections from Supabase, deduplicates N'Ko phrases,
-and creates vocabulary entries for unique phrases.
+Streams all detections from Supabase (keyset-paginated, concurrent
+key-range scans), deduplicates N'Ko phrases, and creates vocabulary
+entries for unique phrases.
+
+Detection IDs per phrase are streamed to data/phrase_detections.jsonl
+as pages are read, rather than held in memory.
+
+Incremental mode folds only detections created since the last run into
+the saved vocabulary (data/vocabulary.json) and dedup index snapshot,
+and writes the changed rows to data/vocabulary_delta.json.
 
 Usage:
     python run_consolidation.py                 # Run consolidation
+    python run_consolidation.py --incremental   # Only new detections since the last run
     python run_consolidation.py --dry-run       # Show stats without writing
     python run_consolidation.py --threshold 0.8 # Custom similarity threshold
 """
@@ -15,10 +24,11 @@ import asyncio
 import argparse
 import json
 import os
+import shutil
 import sys
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any, Set, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Dict, Any, Optional, Set, Tuple
 from collections import defaultdict
 import re
 import aiohttp
@@ -27,10 +37,28 @@ import aiohttp
 sys.path.insert(0, str(Path(__file__).parent))
 
 from nko_analyzer import load_config
+from phrase_index import PhraseLSHIndex, edit_similarity
 
 # Output file for Pass 3
 VOCABULARY_FILE = Path(__file__).parent.parent / "data" / "vocabulary.json"
 CONSOLIDATION_STATS = Path(__file__).parent.parent / "data" / "consolidation_stats.json"
+# Detection IDs per normalized text, one {"text", "ids"} line per text per
+# page. Append-only: incremental runs add their lines, full runs replace it.
+PHRASE_DETECTIONS_FILE = Path(__file__).parent.parent / "data" / "phrase_detections.jsonl"
+# Incremental mode: dedup index snapshot and the rows changed by the last run
+INDEX_SNAPSHOT = Path(__file__).parent.parent / "data" / "consolidation_index.npz"
+VOCABULARY_DELTA_FILE = Path(__file__).parent.parent / "data" / "vocabulary_delta.json"
+
+# Incremental runs re-read this far behind the high-water mark, for rows
+# that committed after a newer one was already read
+WATERMARK_OVERLAP = timedelta(minutes=10)
+
+# Detection columns consolidation reads (not select=*)
+DETECTION_COLUMNS = "id,frame_id,nko_text,latin_text,english_text,confidence,created_at"
+DETECTION_PAGE_SIZE = 1000
+# Concurrent key-range scans, and pages buffered ahead of deduplication
+FETCH_PARTITIONS = 4
+PREFETCH_PAGES = 8
 
 
 def normalize_nko_text(text: str) -> str:
@@ -53,27 +81,88 @@ def normalize_nko_text(text: str) -> str:
     return text.strip()
 
 
-def compute_similarity(text1: str, text2: str) -> float:
+def compute_similarity(text1: str, text2: str, threshold: float = 0.0) -> float:
     """
-    Compute similarity between two N'Ko texts using character-level Jaccard.
+    Compute similarity between two N'Ko texts using edit distance.
     
-    Returns:
-        Similarity score 0.0 to 1.0
-    """
-    if not text1 or not text2:
-        return 0.0
+    A set-of-characters Jaccard rated unrelated long phrases as
+    duplicates (N'Ko has ~60 letters, so long phrases share most of
+    them); edit distance respects letter order.
     
-    # Character-level comparison (better for N'Ko)
-    chars1 = set(text1)
-    chars2 = set(text2)
-    
-    intersection = len(chars1 & chars2)
-    union = len(chars1 | chars2)
+    Args:
+        text1: First text
+        text2: Second text
+        threshold: Pairs below this may return 0.0 early
     
-    if union == 0:
-        return 0.0
+    Returns:
+        Similarity score 0.0 to 1.0 (1 - levenshtein / max length)
+    """
+    return edit_similarity(text1, text2, threshold)
+
+
+class DetectionGroups:
+    """
+    Detections grouped by normalized N'Ko text, folded in page by page.
+
+    Per group only the count, the highest-confidence metadata and the
+    source frame IDs are kept. Detection IDs are not held: with
+    `ids_path` set, each page's IDs are appended there as
+    {"text": normalized text, "ids": [...]} lines.
+    """
     
-    return intersection / union
+    def __init__(self, ids_path: Optional[Path] = None):
+        self.groups: Dict[str, Dict[str, Any]] = {}  # normalized text -> group
+        self.total = 0  # Detections seen
+        self.ids_path = ids_path
+    
+    def add(self, detections: List[Dict[str, Any]]):
+        """Fold a page of detections into the groups."""
+        page_ids = defaultdict(list)  # normalized text -> detection IDs
+        for det in detections:
+            self.total += 1
+            nko_text = det.get("nko_text", "")
+            if not nko_text:
+                continue
+            
+            normalized = normalize_nko_text(nko_text)
+            if not normalized:
+                continue
+            
+            group = self.groups.get(normalized)
+            if group is None:
+                group = self.groups[normalized] = {
+                    "count": 0, "best": None, "sources": set(),
+                }
+            group["count"] += 1
+            group["sources"].add(det.get("frame_id", ""))
+            if det.get("id"):
+                page_ids[normalized].append(det["id"])
+            # First detection with the highest confidence wins, as max() does
+            if group["best"] is None or det.get("confidence", 0) > group["best"]["confidence"]:
+                group["best"] = {
+                    "latin_text": det.get("latin_text"),
+                    "english_text": det.get("english_text"),
+                    "confidence": det.get("confidence", 0),
+                }
+        
+        if self.ids_path is not None and page_ids:
+            self.ids_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.ids_path, "a", encoding="utf-8") as f:
+                for text, ids in page_ids.items():
+                    f.write(json.dumps({"text": text, "ids": ids}, ensure_ascii=False) + "\n")
+    
+    def __len__(self) -> int:
+        return len(self.groups)
+
+
+def canonical_by_text(vocabulary: Dict[str, Dict]) -> Dict[str, str]:
+    """Map every text merged into a vocabulary entry (canonical and variants) to its canonical text."""
+    text_to_canonical = {}
+    for canonical, entry in vocabulary.items():
+        text_to_canonical[canonical] = canonical
+        for variant in entry.get("variants") or []:
+            text_to_canonical[variant] = canonical
+    return text_to_canonical
 
 
 def deduplicate_phrases(
@@ -92,101 +181,451 @@ def deduplicate_phrases(
         - vocabulary: Dict mapping canonical text to metadata
         - phrase_to_detections: Dict mapping canonical text to detection IDs
     """
-    print(f"Deduplicating {len(detections)} detections...")
-    
-    vocabulary = {}  # canonical_text -> {latin, english, confidence, count, sources}
-    phrase_to_detections = defaultdict(list)  # canonical_text -> [detection_ids]
+    groups = DetectionGroups()
+    groups.add(detections)
+    vocabulary = deduplicate_groups(groups, similarity_threshold)
     
-    # Group by normalized text first (exact matches)
-    normalized_groups = defaultdict(list)
+    text_to_canonical = canonical_by_text(vocabulary)
+    phrase_to_detections = defaultdict(list)
     for det in detections:
-        nko_text = det.get("nko_text", "")
-        if not nko_text:
-            continue
+        canonical = text_to_canonical.get(normalize_nko_text(det.get("nko_text", "")))
+        if canonical is not None and det.get("id"):
+            phrase_to_detections[canonical].append(det["id"])
+    return vocabulary, dict(phrase_to_detections)
+
+
+def deduplicate_groups(
+    groups: DetectionGroups,
+    similarity_threshold: float = 0.85,
+    index: Optional[PhraseLSHIndex] = None,
+) -> Dict[str, Dict]:
+    """
+    Merge near-duplicate exact-match groups into vocabulary entries.
+    
+    Groups are taken in sorted text order, so the result does not depend
+    on the order pages arrived in. Each entry lists the texts merged into
+    it under "variants" (detection IDs are looked up by those texts).
+    
+    Args:
+        groups: Detections grouped by normalized text
+        similarity_threshold: Minimum similarity to consider as duplicate
+        index: Empty index to fill with the group texts (kept by the
+               caller as the snapshot for incremental runs); must not
+               hold other phrases, since candidate IDs index the groups
         
-        normalized = normalize_nko_text(nko_text)
-        if normalized:
-            normalized_groups[normalized].append(det)
+    Returns:
+        Dict mapping canonical text to metadata
+    """
+    print(f"Deduplicating {groups.total} detections...")
+    
+    vocabulary = {}  # canonical_text -> {latin, english, confidence, count, sources}
+    normalized_groups = groups.groups
     
     print(f"  Exact match groups: {len(normalized_groups)}")
     
-    # Now find similar groups (fuzzy matching)
-    canonical_texts = list(normalized_groups.keys())
-    merged = set()  # Texts that have been merged into another
+    # Now find similar groups (fuzzy matching). Only pairs sharing a
+    # MinHash/LSH bucket are compared, instead of every pair.
+    canonical_texts = sorted(normalized_groups)
+    if index is None:
+        index = PhraseLSHIndex(similarity_threshold=similarity_threshold)
+    index.add_many(canonical_texts)
+    
+    later_candidates = defaultdict(list)  # i -> [j > i]
+    for i, j in index.candidate_pairs().tolist():
+        later_candidates[i].append(j)
+    print(f"  Candidate pairs: {sum(len(c) for c in later_candidates.values())} "
+          f"(LSH {index.bands}x{index.rows}, shingles of {index.shingle_size})")
+    
+    merged = set()  # Indices of texts that have been merged into another
     
     for i, text1 in enumerate(canonical_texts):
-        if text1 in merged:
+        if i in merged:
             continue
         
-        # Find similar texts
+        # Find similar texts (in sorted order)
         similar_texts = [text1]
-        for j, text2 in enumerate(canonical_texts[i+1:], i+1):
-            if text2 in merged:
+        for j in sorted(later_candidates.get(i, ())):
+            if j in merged:
                 continue
             
-            if compute_similarity(text1, text2) >= similarity_threshold:
+            text2 = canonical_texts[j]
+            if compute_similarity(text1, text2, similarity_threshold) >= similarity_threshold:
                 similar_texts.append(text2)
-                merged.add(text2)
+                merged.add(j)
         
         # Merge all similar texts into the longest one (canonical)
         canonical = max(similar_texts, key=len)
-        
-        # Collect all detections for this group
-        all_dets = []
-        for text in similar_texts:
-            all_dets.extend(normalized_groups[text])
+        members = [normalized_groups[text] for text in similar_texts]
         
         # Find best metadata (highest confidence)
-        best_det = max(all_dets, key=lambda d: d.get("confidence", 0))
+        best = max((group["best"] for group in members), key=lambda b: b["confidence"])
         
         # Build vocabulary entry
         vocabulary[canonical] = {
             "nko_text": canonical,
-            "latin_text": best_det.get("latin_text"),
-            "english_text": best_det.get("english_text"),
-            "confidence": best_det.get("confidence", 0),
-            "count": len(all_dets),
-            "sources": list(set(d.get("frame_id", "") for d in all_dets)),
+            "latin_text": best["latin_text"],
+            "english_text": best["english_text"],
+            "confidence": best["confidence"],
+            "count": sum(group["count"] for group in members),
+            "sources": list(set().union(*(group["sources"] for group in members))),
             "variants": similar_texts if len(similar_texts) > 1 else [],
         }
-        
-        # Map to detection IDs
-        phrase_to_detections[canonical] = [d.get("id") for d in all_dets if d.get("id")]
     
     print(f"  Unique phrases after dedup: {len(vocabulary)}")
-    print(f"  Dedup ratio: {len(detections) / len(vocabulary):.1f}x")
+    if vocabulary:
+        print(f"  Dedup ratio: {groups.total / len(vocabulary):.1f}x")
     
-    return vocabulary, dict(phrase_to_detections)
+    return vocabulary
 
 
-async def fetch_all_detections(supabase_url: str, supabase_key: str) -> List[Dict]:
-    """Fetch all detections from Supabase."""
-    print("Fetching detections from Supabase...")
+def _merge_group_into(entry: Dict[str, Any], text: str, group: Dict[str, Any]):
+    """Fold an exact-match group into an existing vocabulary entry (canonical text unchanged)."""
+    entry["count"] += group["count"]
+    entry["sources"] = list(set(entry["sources"]) | group["sources"])
+    if group["best"]["confidence"] > entry["confidence"]:
+        entry["latin_text"] = group["best"]["latin_text"]
+        entry["english_text"] = group["best"]["english_text"]
+        entry["confidence"] = group["best"]["confidence"]
+    if text != entry["nko_text"] and text not in entry["variants"]:
+        if not entry["variants"]:
+            entry["variants"] = [entry["nko_text"]]
+        entry["variants"].append(text)
+
+
+def merge_new_groups(
+    vocabulary: Dict[str, Dict],
+    index: PhraseLSHIndex,
+    groups: DetectionGroups,
+    similarity_threshold: float = 0.85,
+) -> List[str]:
+    """
+    Fold new detections into an existing vocabulary, in place.
+    
+    A new text joins the entry that already holds it, else the entry of
+    its most similar indexed text (found through the LSH index). Texts
+    matching nothing are deduplicated among themselves into new entries.
+    Existing canonical texts are kept, so upserts stay keyed on them.
+    
+    Args:
+        vocabulary: Existing entries (canonical text -> entry)
+        index: Dedup index over every text already in the vocabulary;
+               new texts are added to it
+        groups: The new detections
+        similarity_threshold: Minimum similarity to consider as duplicate
+        
+    Returns:
+        Canonical texts of the new and changed entries
+    """
+    text_to_canonical = canonical_by_text(vocabulary)
+    
+    new_texts = sorted(text for text in groups.groups if text not in text_to_canonical)
+    candidates = dict(zip(new_texts, index.query_many(new_texts)))
+    
+    changed = set()
+    unmatched = DetectionGroups()
+    matched_texts = []
+    for text, group in sorted(groups.groups.items()):
+        canonical = text_to_canonical.get(text)
+        if canonical is None:
+            best_similarity = 0.0
+            for i in candidates[text]:
+                owner = text_to_canonical.get(index.texts[i])
+                if owner is None:
+                    continue
+                similarity = compute_similarity(text, index.texts[i], similarity_threshold)
+                if similarity >= similarity_threshold and similarity > best_similarity:
+                    best_similarity, canonical = similarity, owner
+            if canonical is None:
+                unmatched.groups[text] = group
+                unmatched.total += group["count"]
+                continue
+            matched_texts.append(text)
+        
+        _merge_group_into(vocabulary[canonical], text, group)
+        changed.add(canonical)
+    
+    print(f"  New detections: {groups.total} in {len(groups)} distinct phrases")
+    print(f"  Merged into existing entries: {len(groups) - len(unmatched)} phrases "
+          f"({len(changed)} entries)")
+    
+    if unmatched.groups:
+        new_vocabulary = deduplicate_groups(unmatched, similarity_threshold)
+        vocabulary.update(new_vocabulary)
+        changed.update(new_vocabulary)
+    index.add_many(matched_texts + list(unmatched.groups))
     
+    return sorted(changed)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class DetectionWatermark:
+    """
+    High-water mark over detection created_at, for incremental runs.
+    
+    The next run reads from WATERMARK_OVERLAP before the mark and skips
+    the detection IDs already folded in within that window.
+    """
+    
+    def __init__(self, high_water_mark: Optional[str] = None, recent_ids: Optional[Dict[str, str]] = None):
+        self.high_water_mark = _parse_timestamp(high_water_mark)
+        # id -> created_at of detections inside the overlap window
+        self.recent_ids: Dict[str, datetime] = {
+            det_id: _parse_timestamp(created_at) for det_id, created_at in (recent_ids or {}).items()
+        }
+        self.skipped = 0
+        self._prune_at = 10000
+    
+    def since(self) -> Optional[str]:
+        """Lower created_at bound for the next fetch (None = everything)."""
+        if self.high_water_mark is None:
+            return None
+        since = (self.high_water_mark - WATERMARK_OVERLAP).astimezone(timezone.utc)
+        return since.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    
+    def accept(self, detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop already-seen detections from a page and advance the mark."""
+        fresh = []
+        for det in detections:
+            det_id = det.get("id")
+            if det_id in self.recent_ids:
+                self.skipped += 1
+                continue
+            created_at = _parse_timestamp(det.get("created_at"))
+            if created_at is not None:
+                if self.high_water_mark is None or created_at > self.high_water_mark:
+                    self.high_water_mark = created_at
+                if det_id:
+                    self.recent_ids[det_id] = created_at
+            fresh.append(det)
+        
+        # The mark only moves forward, so IDs behind its window can go now
+        if len(self.recent_ids) > self._prune_at:
+            self._prune()
+            self._prune_at = 2 * len(self.recent_ids) + 10000
+        return fresh
+    
+    def _prune(self):
+        cutoff = self.high_water_mark - WATERMARK_OVERLAP
+        self.recent_ids = {
+            det_id: created_at for det_id, created_at in self.recent_ids.items()
+            if created_at >= cutoff
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """State to save with the vocabulary."""
+        if self.high_water_mark is None:
+            return {"high_water_mark": None, "recent_ids": {}}
+        self._prune()
+        return {
+            "high_water_mark": self.high_water_mark.isoformat(),
+            "recent_ids": {
+                det_id: created_at.isoformat() for det_id, created_at in self.recent_ids.items()
+            },
+        }
+
+
+def load_snapshot(similarity_threshold: float) -> Optional[Tuple[Dict[str, Any], PhraseLSHIndex]]:
+    """
+    Load the previous run's vocabulary and dedup index.
+    
+    The index is rebuilt from the vocabulary texts when its snapshot is
+    missing or out of step with the vocabulary.
+    
+    Returns:
+        (vocabulary file contents, index), or None if there is no usable
+        snapshot (no previous run, or a different threshold)
+    """
+    if not VOCABULARY_FILE.exists():
+        return None
+    with open(VOCABULARY_FILE, encoding="utf-8") as f:
+        vocab_data = json.load(f)
+    
+    if "watermark" not in vocab_data:
+        print("  Vocabulary has no high-water mark (written before incremental mode)")
+        return None
+    if vocab_data.get("similarity_threshold") != similarity_threshold:
+        print(f"  Vocabulary was built with threshold {vocab_data.get('similarity_threshold')}")
+        return None
+    
+    # Vocabularies written before PHRASE_DETECTIONS_FILE carried the whole
+    # mapping; move it out once, so this run does not rewrite it
+    legacy_mapping = vocab_data.pop("phrase_to_detections", None)
+    if legacy_mapping and not PHRASE_DETECTIONS_FILE.exists():
+        print(f"  Moving detection IDs to {PHRASE_DETECTIONS_FILE.name}")
+        legacy_path = PHRASE_DETECTIONS_FILE.with_name(PHRASE_DETECTIONS_FILE.name + ".tmp")
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            for text, ids in legacy_mapping.items():
+                f.write(json.dumps({"text": text, "ids": ids}, ensure_ascii=False) + "\n")
+        os.replace(legacy_path, PHRASE_DETECTIONS_FILE)
+    
+    texts = []
+    for entry in vocab_data["vocabulary"]:
+        texts.append(entry["nko_text"])
+        texts.extend(v for v in entry.get("variants") or [] if v != entry["nko_text"])
+    
+    index = None
+    if INDEX_SNAPSHOT.exists():
+        try:
+            index = PhraseLSHIndex.load(INDEX_SNAPSHOT)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  Could not load index snapshot: {e}")
+    if index is None or index.similarity_threshold != similarity_threshold or len(index) != len(texts):
+        print(f"  Rebuilding dedup index from {len(texts)} vocabulary texts...")
+        index = PhraseLSHIndex(similarity_threshold=similarity_threshold)
+        index.add_many(texts)
+    
+    return vocab_data, index
+
+
+def _write_json_atomic(path: Path, data: Any, indent: Optional[int] = 2):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def _discard(path: Path):
+    if path.exists():
+        path.unlink()
+
+
+def _commit_phrase_detections(ids_path: Path, append: bool):
+    """Replace PHRASE_DETECTIONS_FILE with this run's ID lines, or append them to it."""
+    if not ids_path.exists():
+        ids_path.touch()
+    if not append or not PHRASE_DETECTIONS_FILE.exists():
+        os.replace(ids_path, PHRASE_DETECTIONS_FILE)
+        return
+    with open(ids_path, "rb") as src, open(PHRASE_DETECTIONS_FILE, "ab") as dst:
+        shutil.copyfileobj(src, dst)
+    ids_path.unlink()
+
+
+def _id_partitions(partitions: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Split the UUID key space into contiguous [lower, upper) ranges.
+
+    Detection IDs are random (gen_random_uuid), so equal ranges hold
+    roughly equal numbers of rows.
+    """
+    partitions = max(1, partitions)
+    bounds = [
+        f"{(k << 32) // partitions:08x}-0000-0000-0000-000000000000"
+        for k in range(1, partitions)
+    ]
+    lowers = [None] + bounds
+    uppers = bounds + [None]
+    return list(zip(lowers, uppers))
+
+
+async def iter_detections(
+    supabase_url: str,
+    supabase_key: str,
+    page_size: int = DETECTION_PAGE_SIZE,
+    partitions: int = FETCH_PARTITIONS,
+    prefetch: int = PREFETCH_PAGES,
+    since: Optional[str] = None,
+) -> AsyncIterator[List[Dict]]:
+    """
+    Stream detections from Supabase, one page at a time.
+    
+    Each page is read with keyset pagination (`id > last seen id`,
+    ordered by the primary key), which costs the same however deep into
+    the table it is, unlike a growing OFFSET. The ID space is split into
+    `partitions` ranges scanned concurrently, and up to `prefetch` pages
+    are buffered ahead of the consumer.
+    
+    Args:
+        supabase_url: Supabase project URL
+        supabase_key: Service or anon key
+        page_size: Rows per request
+        partitions: Concurrent key-range scans
+        prefetch: Pages buffered ahead of the consumer
+        since: Only detections with created_at at or after this
+               timestamp (incremental runs)
+        
+    Yields:
+        Lists of detections with DETECTION_COLUMNS only (pages arrive
+        in no particular order across partitions)
+    """
     headers = {
         "apikey": supabase_key,
         "Authorization": f"Bearer {supabase_key}",
     }
-    
-    all_detections = []
-    offset = 0
-    limit = 1000
-    
-    async with aiohttp.ClientSession() as session:
-        while True:
-            url = f"{supabase_url}/rest/v1/nko_detections?select=*&offset={offset}&limit={limit}"
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    error = await resp.text()
-                    raise Exception(f"Supabase error: {error}")
+    url = f"{supabase_url}/rest/v1/nko_detections"
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch))
+    finished = object()
+    
+    async def scan(session: aiohttp.ClientSession, lower: Optional[str], upper: Optional[str]):
+        cursor = None
+        try:
+            while True:
+                params = [
+                    ("select", DETECTION_COLUMNS),
+                    ("order", "id.asc"),
+                    ("limit", str(page_size)),
+                ]
+                if cursor:
+                    params.append(("id", f"gt.{cursor}"))
+                elif lower:
+                    params.append(("id", f"gte.{lower}"))
+                if upper:
+                    params.append(("id", f"lt.{upper}"))
+                if since:
+                    params.append(("created_at", f"gte.{since}"))
                 
-                detections = await resp.json()
-                if not detections:
-                    break
+                async with session.get(url, params=params, headers=headers) as resp:
+                    if resp.status != 200:
+                        error = await resp.text()
+                        raise Exception(f"Supabase error: {error}")
+                    page = await resp.json()
                 
-                all_detections.extend(detections)
-                offset += limit
-                print(f"  Fetched {len(all_detections)} detections...")
+                if page:
+                    await queue.put(page)
+                if len(page) < page_size:
+                    break
+                cursor = page[-1]["id"]
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(finished)
+    
+    async with aiohttp.ClientSession() as session:
+        tasks = [
+            asyncio.create_task(scan(session, lower, upper))
+            for lower, upper in _id_partitions(partitions)
+        ]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if item is finished:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def fetch_all_detections(supabase_url: str, supabase_key: str) -> List[Dict]:
+    """Fetch all detections from Supabase (see iter_detections to stream them)."""
+    print("Fetching detections from Supabase...")
+    
+    all_detections = []
+    async for page in iter_detections(supabase_url, supabase_key):
+        all_detections.extend(page)
+        print(f"  Fetched {len(all_detections)} detections...")
     
     return all_detections
 
@@ -195,10 +634,19 @@ async def run_consolidation(
     config: Dict[str, Any],
     similarity_threshold: float = 0.85,
     dry_run: bool = False,
+    incremental: bool = False,
 ) -> Dict[str, Any]:
     """
     Run Pass 2: Consolidation + Deduplication.
     
+    Args:
+        config: Pipeline config
+        similarity_threshold: Minimum similarity to consider as duplicate
+        dry_run: Show stats without writing
+        incremental: Fold only detections created since the last run into
+                     the saved vocabulary (falls back to a full run if
+                     there is no usable snapshot)
+    
     Returns:
         Consolidation statistics
     """
@@ -212,42 +660,99 @@ async def run_consolidation(
     print(f"PASS 2: CONSOLIDATION + DEDUPLICATION")
     print(f"{'='*60}")
     print(f"Similarity threshold: {similarity_threshold}")
+    print(f"Mode: {'incremental' if incremental else 'full'}")
     print(f"{'='*60}\n")
     
-    # Fetch all detections
-    detections = await fetch_all_detections(supabase_url, supabase_key)
-    
-    if not detections:
-        print("No detections found! Run Pass 1 first.")
-        return {"error": "No detections"}
-    
-    print(f"\nTotal detections: {len(detections)}")
+    snapshot = None
+    if incremental:
+        snapshot = load_snapshot(similarity_threshold)
+        if snapshot is None:
+            print("No usable snapshot from a previous run, running a full consolidation\n")
+            incremental = False
+    
+    if incremental:
+        vocab_data, index = snapshot
+        watermark = DetectionWatermark(**vocab_data["watermark"])
+        print(f"High-water mark: {watermark.high_water_mark.isoformat() if watermark.high_water_mark else 'none'}")
+    else:
+        index = PhraseLSHIndex(similarity_threshold=similarity_threshold)
+        watermark = DetectionWatermark()
+    
+    # Stream detections into exact-match groups as pages arrive; their IDs
+    # go to a scratch file that replaces (full) or is appended to
+    # (incremental) PHRASE_DETECTIONS_FILE once the run is saved
+    ids_path = PHRASE_DETECTIONS_FILE.with_name(PHRASE_DETECTIONS_FILE.name + ".new")
+    if ids_path.exists():
+        ids_path.unlink()
+    print("Fetching detections from Supabase...")
+    groups = DetectionGroups(ids_path=ids_path)
+    async for page in iter_detections(supabase_url, supabase_key, since=watermark.since()):
+        groups.add(watermark.accept(page))
+        if groups.total % 10000 < len(page):
+            print(f"  Fetched {groups.total} detections ({len(groups)} distinct phrases)...")
+    
+    if incremental:
+        if watermark.skipped:
+            print(f"  Skipped {watermark.skipped} detections already consolidated")
+        if not groups.total:
+            print("No new detections since the last run.")
+            _discard(ids_path)
+            return {
+                "timestamp": datetime.now().isoformat(),
+                "mode": "incremental",
+                "new_detections": 0,
+                "unique_phrases": len(vocab_data["vocabulary"]),
+                "delta_rows": 0,
+            }
+        
+        print(f"\nNew detections: {groups.total}")
+        vocabulary = {entry["nko_text"]: entry for entry in vocab_data["vocabulary"]}
+        changed = merge_new_groups(
+            vocabulary, index, groups,
+            similarity_threshold=similarity_threshold,
+        )
+    else:
+        if not groups.total:
+            print("No detections found! Run Pass 1 first.")
+            _discard(ids_path)
+            return {"error": "No detections"}
+        
+        print(f"\nTotal detections: {groups.total}")
+        
+        # Deduplicate
+        vocabulary = deduplicate_groups(
+            groups,
+            similarity_threshold=similarity_threshold,
+            index=index,
+        )
+        changed = list(vocabulary)
     
-    # Deduplicate
-    vocabulary, phrase_to_detections = deduplicate_phrases(
-        detections,
-        similarity_threshold=similarity_threshold,
-    )
+    total_detections = sum(entry["count"] for entry in vocabulary.values())
     
     # Statistics
     stats = {
         "timestamp": datetime.now().isoformat(),
-        "total_detections": len(detections),
+        "mode": "incremental" if incremental else "full",
+        "total_detections": total_detections,
+        "new_detections": groups.total,
         "unique_phrases": len(vocabulary),
-        "dedup_ratio": len(detections) / len(vocabulary) if vocabulary else 0,
-        "top_phrases": sorted(
-            vocabulary.values(),
-            key=lambda x: x["count"],
-            reverse=True
-        )[:20],
-        "phrase_to_detections": phrase_to_detections,
+        "delta_rows": len(changed),
+        "dedup_ratio": total_detections / len(vocabulary) if vocabulary else 0,
+        # Without their frame ID lists, which grow with the detections
+        "top_phrases": [
+            {**{k: v for k, v in entry.items() if k != "sources"}, "source_count": len(entry["sources"])}
+            for entry in sorted(vocabulary.values(), key=lambda x: x["count"], reverse=True)[:20]
+        ],
     }
     
     print(f"\n{'='*60}")
     print(f"CONSOLIDATION RESULTS")
     print(f"{'='*60}")
     print(f"Total detections: {stats['total_detections']}")
+    if incremental:
+        print(f"New detections: {stats['new_detections']}")
     print(f"Unique phrases: {stats['unique_phrases']}")
+    print(f"New or changed phrases: {stats['delta_rows']}")
     print(f"Dedup ratio: {stats['dedup_ratio']:.1f}x")
     print(f"\nTop 10 phrases by frequency:")
     for i, phrase in enumerate(stats["top_phrases"][:10], 1):
@@ -256,18 +761,37 @@ async def run_consolidation(
         print(f"  {i}. ({phrase['count']}x) {nko}... → {latin}...")
     
     if dry_run:
-        print(f"\n[DRY RUN] Would save {len(vocabulary)} vocabulary entries")
+        _discard(ids_path)
+        print(f"\n[DRY RUN] Would save {len(vocabulary)} vocabulary entries ({len(changed)} new or changed)")
         return stats
     
-    # Save vocabulary for Pass 3
-    VOCABULARY_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(VOCABULARY_FILE, "w", encoding="utf-8") as f:
-        json.dump({
-            "vocabulary": list(vocabulary.values()),
-            "phrase_to_detections": phrase_to_detections,
-        }, f, ensure_ascii=False, indent=2)
+    # Index first: if the run stops before the vocabulary is written, the
+    # next run sees an index out of step with it and rebuilds it
+    index.save(INDEX_SNAPSHOT)
+    
+    # Detection IDs before the vocabulary: if the run stops in between, the
+    # next incremental run appends the same lines again, and readers
+    # skip repeated IDs
+    _commit_phrase_detections(ids_path, append=incremental)
+    print(f"\nDetection IDs saved to: {PHRASE_DETECTIONS_FILE}")
+    
+    # Save vocabulary for Pass 3, with the high-water mark it covers
+    _write_json_atomic(VOCABULARY_FILE, {
+        "vocabulary": list(vocabulary.values()),
+        "similarity_threshold": similarity_threshold,
+        "watermark": watermark.to_dict(),
+    })
+    
+    print(f"Vocabulary saved to: {VOCABULARY_FILE}")
+    
+    # Rows to upsert downstream: new and changed entries only
+    _write_json_atomic(VOCABULARY_DELTA_FILE, {
+        "timestamp": stats["timestamp"],
+        "mode": stats["mode"],
+        "upserts": [vocabulary[canonical] for canonical in changed],
+    })
     
-    print(f"\nVocabulary saved to: {VOCABULARY_FILE}")
+    print(f"Vocabulary delta ({len(changed)} rows) saved to: {VOCABULARY_DELTA_FILE}")
     
     # Save stats
     with open(CONSOLIDATION_STATS, "w", encoding="utf-8") as f:
@@ -275,9 +799,9 @@ async def run_consolidation(
     
     print(f"Stats saved to: {CONSOLIDATION_STATS}")
     
-    # Estimate Pass 3 cost
-    world_cost = len(vocabulary) * 5 * 0.0001
-    print(f"\nEstimated Pass 3 cost: ${world_cost:.2f} ({len(vocabulary)} phrases × 5 worlds)")
+    # Estimate Pass 3 cost (only new and changed phrases need worlds)
+    world_cost = len(changed) * 5 * 0.0001
+    print(f"\nEstimated Pass 3 cost: ${world_cost:.2f} ({len(changed)} phrases × 5 worlds)")
     
     return stats
 
@@ -287,6 +811,8 @@ def main():
     parser.add_argument("--dry-run", action="store_true", help="Show stats without writing")
     parser.add_argument("--threshold", type=float, default=0.85, help="Similarity threshold (0.0-1.0)")
     parser.add_argument("--config", type=str, help="Path to config file")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fold in detections created since the last run")
     args = parser.parse_args()
     
     # Load environment
@@ -303,6 +829,7 @@ def main():
         config=config,
         similarity_threshold=args.threshold,
         dry_run=args.dry_run,
+        incremental=args.incremental,
     ))
     
     print(f"\n{'='*60}")
@@ -212,98 +212,100 @@ async def run_transcription(
         print("Set SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables")
         sys.exit(1)
     
-    # Get pending segments
-    print("Fetching segments needing transcription...")
-    segments = await supabase.get_untranscribed_segments(limit=limit)
-    
-    if not segments:
-        print("No segments need transcription!")
-        return {"status": "no_pending", "count": 0}
-    
-    print(f"Found {len(segments)} segments to transcribe")
-    
-    if dry_run:
-        print("\n=== DRY RUN: Segments to process ===")
-        for i, seg in enumerate(segments[:20], 1):  # Show first 20
-            print(f"  {i}. Segment {seg['segment_index']} ({seg['start_ms']}-{seg['end_ms']}ms)")
-            print(f"     Audio: {seg.get('audio_path', 'N/A')}")
-        if len(segments) > 20:
-            print(f"  ... and {len(segments) - 20} more")
-        return {"dry_run": True, "count": len(segments)}
-    
-    # Initialize transcriber
-    try:
-        transcriber = WhisperTranscriber(
-            use_local=use_local,
-            local_model=local_model,
-        )
-    except (ImportError, ValueError) as e:
-        print(f"Error initializing transcriber: {e}")
-        sys.exit(1)
-    
-    # Progress tracking
-    progress = {
-        "start_time": datetime.now().isoformat(),
-        "total_segments": len(segments),
-        "completed": 0,
-        "failed": 0,
-        "skipped": 0,
-        "use_local": use_local,
-        "model": local_model if use_local else "whisper-1",
-    }
-    
-    print(f"\n{'='*60}")
-    print(f"PASS 4: ASR TRANSCRIPTION")
-    print(f"{'='*60}")
-    print(f"Segments to process: {len(segments)}")
-    print(f"Mode: {'Local Whisper' if use_local else 'OpenAI API'}")
-    if not use_local:
-        estimated_cost = len(segments) * 1 * 0.006  # ~1 min avg @ $0.006/min
-        print(f"Estimated cost: ${estimated_cost:.2f} (assuming ~1 min per segment)")
-    print(f"{'='*60}\n")
-    
-    # Process segments
-    for i, segment in enumerate(segments, 1):
-        segment_id = segment["id"]
-        audio_path = segment.get("audio_path")
+    # Closes the client on every return and exit path
+    async with supabase:
+        # Get pending segments
+        print("Fetching segments needing transcription...")
+        segments = await supabase.get_untranscribed_segments(limit=limit)
         
-        print(f"[{i}/{len(segments)}] Segment {segment['segment_index']}: ", end="")
+        if not segments:
+            print("No segments need transcription!")
+            return {"status": "no_pending", "count": 0}
         
-        if not audio_path or not os.path.exists(audio_path):
-            print(f"⚠ Audio file missing: {audio_path}")
-            progress["skipped"] += 1
-            continue
+        print(f"Found {len(segments)} segments to transcribe")
         
-        # Transcribe
-        result = transcriber.transcribe(audio_path)
+        if dry_run:
+            print("\n=== DRY RUN: Segments to process ===")
+            for i, seg in enumerate(segments[:20], 1):  # Show first 20
+                print(f"  {i}. Segment {seg['segment_index']} ({seg['start_ms']}-{seg['end_ms']}ms)")
+                print(f"     Audio: {seg.get('audio_path', 'N/A')}")
+            if len(segments) > 20:
+                print(f"  ... and {len(segments) - 20} more")
+            return {"dry_run": True, "count": len(segments)}
         
-        if result.get("transcription"):
-            # Store in Supabase
-            try:
-                await supabase.update_audio_segment_transcription(
-                    segment_id=segment_id,
-                    transcription=result["transcription"],
-                    language=result.get("language", "unknown"),
-                    confidence=result.get("confidence", 0.0),
-                    model=result.get("model", "whisper"),
-                )
-                
-                preview = result["transcription"][:50] + "..." if len(result["transcription"]) > 50 else result["transcription"]
-                print(f"✓ \"{preview}\"")
-                progress["completed"] += 1
-            except Exception as e:
-                print(f"✗ DB error: {e}")
-                progress["failed"] += 1
-        else:
-            print(f"✗ {result.get('error', 'Unknown error')}")
-            progress["failed"] += 1
+        # Initialize transcriber
+        try:
+            transcriber = WhisperTranscriber(
+                use_local=use_local,
+                local_model=local_model,
+            )
+        except (ImportError, ValueError) as e:
+            print(f"Error initializing transcriber: {e}")
+            sys.exit(1)
         
-        # Rate limiting for API
+        # Progress tracking
+        progress = {
+            "start_time": datetime.now().isoformat(),
+            "total_segments": len(segments),
+            "completed": 0,
+            "failed": 0,
+            "skipped": 0,
+            "use_local": use_local,
+            "model": local_model if use_local else "whisper-1",
+        }
+        
+        print(f"\n{'='*60}")
+        print(f"PASS 4: ASR TRANSCRIPTION")
+        print(f"{'='*60}")
+        print(f"Segments to process: {len(segments)}")
+        print(f"Mode: {'Local Whisper' if use_local else 'OpenAI API'}")
         if not use_local:
-            await asyncio.sleep(0.5)
-    
-    progress["end_time"] = datetime.now().isoformat()
-    save_progress(progress)
+            estimated_cost = len(segments) * 1 * 0.006  # ~1 min avg @ $0.006/min
+            print(f"Estimated cost: ${estimated_cost:.2f} (assuming ~1 min per segment)")
+        print(f"{'='*60}\n")
+        
+        # Process segments
+        for i, segment in enumerate(segments, 1):
+            segment_id = segment["id"]
+            audio_path = segment.get("audio_path")
+            
+            print(f"[{i}/{len(segments)}] Segment {segment['segment_index']}: ", end="")
+            
+            if not audio_path or not os.path.exists(audio_path):
+                print(f"⚠ Audio file missing: {audio_path}")
+                progress["skipped"] += 1
+                continue
+            
+            # Transcribe
+            result = transcriber.transcribe(audio_path)
+            
+            if result.get("transcription"):
+                # Store in Supabase
+                try:
+                    await supabase.update_audio_segment_transcription(
+                        segment_id=segment_id,
+                        transcription=result["transcription"],
+                        language=result.get("language", "unknown"),
+                        confidence=result.get("confidence", 0.0),
+                        model=result.get("model", "whisper"),
+                    )
+                    
+                    preview = result["transcription"][:50] + "..." if len(result["transcription"]) > 50 else result["transcription"]
+                    print(f"✓ \"{preview}\"")
+                    progress["completed"] += 1
+                except Exception as e:
+                    print(f"✗ DB error: {e}")
+                    progress["failed"] += 1
+            else:
+                print(f"✗ {result.get('error', 'Unknown error')}")
+                progress["failed"] += 1
+            
+            # Rate limiting for API
+            if not use_local:
+                await asyncio.sleep(0.5)
+        
+        progress["end_time"] = datetime.now().isoformat()
+        save_progress(progress)
     
     print(f"\n{'='*60}")
     print(f"PASS 4 COMPLETE")
@@ -9,7 +9,9 @@ Usage:
     python run_worlds.py                    # Generate worlds for all phrases
     python run_worlds.py --limit 100        # Limit to first 100 phrases
     python run_worlds.py --resume           # Resume from checkpoint
-    python run_worlds.py --batch-size 10    # Process in batches of 10
+    python run_worlds.py --batch-size 10    # Checkpoint every 10 phrases
+    python run_worlds.py --concurrency 16   # Phrases in flight (shared Gemini budget)
+    python run_worlds.py --combined         # One request per phrase for all 5 worlds
 """
 
 import asyncio
@@ -17,10 +19,11 @@ import argparse
 import json
 import os
 import sys
+import uuid
+import aiohttp
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-import aiohttp
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -28,9 +31,12 @@ sys.path.insert(0, str(Path(__file__).parent))
 from nko_analyzer import load_config
 from world_generator import WorldGenerator
 from retry_utils import retry_with_backoff, RetryError
+from supabase_client import SupabaseClient
+from write_buffer import SupabaseWriteBuffer, DEFAULT_JOURNAL_PATH
 
 # Input/output files
 VOCABULARY_FILE = Path(__file__).parent.parent / "data" / "vocabulary.json"
+PHRASE_DETECTIONS_FILE = Path(__file__).parent.parent / "data" / "phrase_detections.jsonl"
 CHECKPOINT_FILE = Path(__file__).parent.parent / "data" / "worlds_checkpoint.json"
 PROGRESS_FILE = Path(__file__).parent.parent / "data" / "worlds_progress.json"
 
@@ -44,6 +50,43 @@ def load_vocabulary() -> Dict[str, Any]:
         return json.load(f)
 
 
+def load_phrase_detections(
+    vocabulary: List[Dict[str, Any]],
+    per_phrase: int = 10,
+) -> Dict[str, List[str]]:
+    """
+    Detection IDs per vocabulary phrase, from Pass 2's phrase_detections.jsonl.
+    
+    Lines are keyed by normalized text, so a phrase collects the IDs of
+    its variants too. Only the first `per_phrase` distinct IDs are kept,
+    which is all a trajectory records.
+    """
+    if not PHRASE_DETECTIONS_FILE.exists():
+        return {}
+    
+    text_to_canonical = {}
+    for entry in vocabulary:
+        text_to_canonical[entry["nko_text"]] = entry["nko_text"]
+        for variant in entry.get("variants") or []:
+            text_to_canonical.setdefault(variant, entry["nko_text"])
+    
+    found: Dict[str, Dict[str, None]] = {}  # canonical -> ordered ID set
+    with open(PHRASE_DETECTIONS_FILE, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            canonical = text_to_canonical.get(record["text"])
+            if canonical is None:
+                continue
+            ids = found.setdefault(canonical, {})
+            for det_id in record["ids"]:
+                if len(ids) >= per_phrase:
+                    break
+                ids[det_id] = None
+    return {canonical: list(ids) for canonical, ids in found.items()}
+
+
 def load_checkpoint() -> Dict[str, Any]:
     """Load checkpoint for resumability."""
     if CHECKPOINT_FILE.exists():
@@ -52,39 +95,38 @@ def load_checkpoint() -> Dict[str, Any]:
     return {"completed_phrases": [], "failed_phrases": [], "last_updated": None}
 
 
+def _write_json_atomic(path: Path, data: Dict[str, Any]):
+    """Write JSON to a temp file and rename it over `path` (never half-written)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
 def save_checkpoint(checkpoint: Dict[str, Any]):
     """Save checkpoint."""
-    CHECKPOINT_FILE.parent.mkdir(parents=True, exist_ok=True)
     checkpoint["last_updated"] = datetime.now().isoformat()
-    with open(CHECKPOINT_FILE, "w") as f:
-        json.dump(checkpoint, f, indent=2)
+    _write_json_atomic(CHECKPOINT_FILE, checkpoint)
 
 
 def save_progress(progress: Dict[str, Any]):
     """Save progress statistics."""
-    PROGRESS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(PROGRESS_FILE, "w") as f:
-        json.dump(progress, f, indent=2)
+    _write_json_atomic(PROGRESS_FILE, progress)
 
 
-async def store_trajectory_in_supabase(
-    session: aiohttp.ClientSession,
-    supabase_url: str,
-    supabase_key: str,
+async def queue_trajectory(
+    buffer: SupabaseWriteBuffer,
     phrase: Dict[str, Any],
     worlds: List[Dict[str, Any]],
     detection_ids: List[str],
-) -> Optional[str]:
-    """Store world trajectory in Supabase."""
-    headers = {
-        "apikey": supabase_key,
-        "Authorization": f"Bearer {supabase_key}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation",
-    }
+) -> str:
+    """Queue a world trajectory and its nodes in the write buffer."""
+    trajectory_id = str(uuid.uuid4())
     
     # Create trajectory
-    trajectory_data = {
+    await buffer.add("nko_trajectories", {
+        "id": trajectory_id,
         "name": f"Worlds for: {phrase['nko_text'][:50]}",
         "description": f"5 world variants for '{phrase.get('latin_text', '')}'",
         "trajectory_type": "world_exploration",
@@ -99,27 +141,11 @@ async def store_trajectory_in_supabase(
             "detection_count": phrase.get("count", 0),
             "detection_ids": detection_ids[:10],  # Store first 10 for reference
         },
-    }
-    
-    async with session.post(
-        f"{supabase_url}/rest/v1/nko_trajectories",
-        json=trajectory_data,
-        headers=headers,
-    ) as resp:
-        if resp.status not in (200, 201):
-            error = await resp.text()
-            print(f"    Warning: Failed to create trajectory: {error[:100]}")
-            return None
-        
-        result = await resp.json()
-        trajectory_id = result[0]["id"] if result else None
-    
-    if not trajectory_id:
-        return None
+    })
     
     # Create trajectory nodes for each world
-    for i, world in enumerate(worlds):
-        node_data = {
+    await buffer.add_many("nko_trajectory_nodes", [
+        {
             "trajectory_id": trajectory_id,
             "node_index": i,
             "trajectory_depth": 1,
@@ -131,15 +157,8 @@ async def store_trajectory_in_supabase(
             "timestamp_ms": int(datetime.now().timestamp() * 1000),
             "metadata": world,
         }
-        
-        async with session.post(
-            f"{supabase_url}/rest/v1/nko_trajectory_nodes",
-            json=node_data,
-            headers=headers,
-        ) as resp:
-            if resp.status not in (200, 201):
-                error = await resp.text()
-                print(f"    Warning: Failed to create node {i}: {error[:50]}")
+        for i, world in enumerate(worlds)
+    ])
     
     return trajectory_id
 
@@ -150,17 +169,34 @@ async def run_world_generation(
     resume: bool = False,
     batch_size: int = 10,
     dry_run: bool = False,
+    concurrency: Optional[int] = None,
+    combined: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """
     Run Pass 3: World Generation for all unique phrases.
     
+    Phrases are pulled from a work queue by `concurrency` workers that
+    share one HTTP session and one WorldGenerator, whose token bucket
+    and semaphore hold every Gemini call to a single global budget.
+    
+    Args:
+        config: Pipeline config
+        limit: Max phrases to process
+        resume: Skip phrases completed in the checkpoint
+        batch_size: Checkpoint every N finished phrases
+        dry_run: Show stats without processing
+        concurrency: Phrases in flight (defaults to worlds.concurrent_phrases)
+        combined: One request for all worlds of a phrase (defaults to
+                  worlds.combined_prompt)
+    
     Returns:
         Progress statistics
     """
     # Load vocabulary from Pass 2
     vocab_data = load_vocabulary()
     vocabulary = vocab_data.get("vocabulary", [])
-    phrase_to_detections = vocab_data.get("phrase_to_detections", {})
+    # Vocabularies from before phrase_detections.jsonl carry the mapping
+    phrase_to_detections = vocab_data.get("phrase_to_detections") or load_phrase_detections(vocabulary)
     
     if not vocabulary:
         raise ValueError("Empty vocabulary! Run Pass 2 first.")
@@ -186,6 +222,11 @@ async def run_world_generation(
     # Supabase config
     supabase_url = os.getenv("SUPABASE_URL")
     supabase_key = os.getenv("SUPABASE_SERVICE_KEY") or os.getenv("SUPABASE_ANON_KEY")
+    supabase_config = config.get("storage", {}).get("supabase", {})
+    worlds_config = config.get("worlds", {})
+    concurrency = max(1, concurrency or worlds_config.get("concurrent_phrases", 8))
+    if combined is None:
+        combined = worlds_config.get("combined_prompt", False)
     
     # Progress tracking
     progress = {
@@ -203,77 +244,115 @@ async def run_world_generation(
     print(f"{'='*60}")
     print(f"Phrases to process: {len(vocabulary)}")
     print(f"Worlds per phrase: 5")
-    print(f"Batch size: {batch_size}")
+    print(f"Concurrent phrases: {concurrency}")
+    print(f"Requests per phrase: {'1 (combined)' if combined else 5}")
+    print(f"Checkpoint every: {batch_size} phrases")
     print(f"Estimated cost: ${len(vocabulary) * 5 * 0.0001:.2f}")
     print(f"{'='*60}\n")
     
-    # Initialize world generator
+    # One generator for all phrases: its limiter is the global Gemini budget
     api_key = os.getenv("GEMINI_API_KEY")
-    generator = WorldGenerator(api_key=api_key)
-    
-    # Process in batches
-    async with aiohttp.ClientSession() as session:
-        for batch_start in range(0, len(vocabulary), batch_size):
-            batch = vocabulary[batch_start:batch_start + batch_size]
-            batch_num = batch_start // batch_size + 1
-            total_batches = (len(vocabulary) + batch_size - 1) // batch_size
-            
-            print(f"\n--- Batch {batch_num}/{total_batches} ({len(batch)} phrases) ---")
+    generator = WorldGenerator(
+        api_key=api_key,
+        max_concurrent=worlds_config.get("max_concurrent_requests", 16),
+        requests_per_second=worlds_config.get("requests_per_second", 10.0),
+        burst=worlds_config.get("rate_limit_burst"),
+        combined=combined,
+    )
+    
+    # Supabase writes are queued and bulk-upserted in the background
+    client = SupabaseClient(supabase_url, supabase_key)
+    buffer = SupabaseWriteBuffer(
+        client,
+        max_batch_rows=supabase_config.get("flush_rows", 500),
+        flush_interval=supabase_config.get("flush_interval", 2.0),
+        journal_path=supabase_config.get("journal_path", DEFAULT_JOURNAL_PATH),
+    )
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    for phrase in vocabulary:
+        queue.put_nowait(phrase)
+    
+    # Finished phrases waiting for their rows to be durable before they
+    # enter the checkpoint
+    finished: Dict[str, List[str]] = {"completed_phrases": [], "failed_phrases": []}
+    checkpoint_lock = asyncio.Lock()
+    
+    async def write_checkpoint():
+        async with checkpoint_lock:
+            done = {key: list(texts) for key, texts in finished.items()}
+            for texts in finished.values():
+                texts.clear()
+            # Make the phrases durable (written or journaled) before checkpointing them
+            await buffer.flush()
+            for key, texts in done.items():
+                checkpoint[key].extend(texts)
+            save_checkpoint(checkpoint)
+            save_progress(progress)
+    
+    async def process_phrase(phrase: Dict[str, Any], session: aiohttp.ClientSession):
+        nko_text = phrase["nko_text"]
+        latin_text = phrase.get("latin_text", "")
+        english_text = phrase.get("english_text", "")
+        
+        try:
+            # Generate worlds
+            result = await generator.generate_worlds(
+                nko_text=nko_text,
+                latin_text=latin_text,
+                translation=english_text,
+                session=session,
+            )
             
-            for phrase in batch:
-                nko_text = phrase["nko_text"]
-                latin_text = phrase.get("latin_text", "")
-                english_text = phrase.get("english_text", "")
+            if result.worlds:
+                # Store in Supabase
+                detection_ids = phrase_to_detections.get(nko_text, [])
                 
-                try:
-                    # Generate worlds
-                    result = await generator.generate_worlds(
-                        nko_text=nko_text,
-                        latin_text=latin_text,
-                        translation=english_text,
-                    )
-                    
-                    if result.worlds:
-                        # Store in Supabase
-                        detection_ids = phrase_to_detections.get(nko_text, [])
-                        
-                        trajectory_id = await store_trajectory_in_supabase(
-                            session=session,
-                            supabase_url=supabase_url,
-                            supabase_key=supabase_key,
-                            phrase=phrase,
-                            worlds=[w.__dict__ for w in result.worlds],
-                            detection_ids=detection_ids,
-                        )
-                        
-                        checkpoint["completed_phrases"].append(nko_text)
-                        progress["completed"] += 1
-                        progress["total_worlds"] += len(result.worlds)
-                        progress["total_variants"] += sum(len(w.variants) for w in result.worlds)
-                        progress["estimated_cost"] += len(result.worlds) * 0.0001
-                        
-                        print(f"  ✓ {nko_text[:30]}... → {len(result.worlds)} worlds, {sum(len(w.variants) for w in result.worlds)} variants")
-                    else:
-                        checkpoint["failed_phrases"].append(nko_text)
-                        progress["failed"] += 1
-                        print(f"  ✗ {nko_text[:30]}... → No worlds generated")
-                        
-                except Exception as e:
-                    checkpoint["failed_phrases"].append(nko_text)
-                    progress["failed"] += 1
-                    print(f"  ✗ {nko_text[:30]}... → Error: {e}")
+                await queue_trajectory(
+                    buffer=buffer,
+                    phrase=phrase,
+                    worlds=[w.__dict__ for w in result.worlds],
+                    detection_ids=detection_ids,
+                )
                 
-                # Rate limiting
-                await asyncio.sleep(0.2)
-            
-            # Save checkpoint after each batch
-            save_checkpoint(checkpoint)
-            save_progress(progress)
+                finished["completed_phrases"].append(nko_text)
+                progress["completed"] += 1
+                progress["total_worlds"] += len(result.worlds)
+                progress["total_variants"] += sum(len(w.variants) for w in result.worlds)
+                progress["estimated_cost"] += len(result.worlds) * 0.0001
+                
+                print(f"  ✓ {nko_text[:30]}... → {len(result.worlds)} worlds, {sum(len(w.variants) for w in result.worlds)} variants")
+            else:
+                finished["failed_phrases"].append(nko_text)
+                progress["failed"] += 1
+                print(f"  ✗ {nko_text[:30]}... → No worlds generated")
+                
+        except Exception as e:
+            finished["failed_phrases"].append(nko_text)
+            progress["failed"] += 1
+            print(f"  ✗ {nko_text[:30]}... → Error: {e}")
+    
+    async def worker(session: aiohttp.ClientSession):
+        while True:
+            try:
+                phrase = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await process_phrase(phrase, session)
             
-            # Batch rate limiting
-            await asyncio.sleep(1)
+            pending = sum(len(texts) for texts in finished.values())
+            if pending >= batch_size and not checkpoint_lock.locked():
+                await write_checkpoint()
+                done = progress["completed"] + progress["failed"]
+                print(f"\n--- Checkpoint: {done}/{progress['total_phrases']} phrases ---\n")
+    
+    async with client, buffer, aiohttp.ClientSession() as session:
+        await asyncio.gather(*(worker(session) for _ in range(min(concurrency, max(1, len(vocabulary))))))
+        await write_checkpoint()
     
     progress["end_time"] = datetime.now().isoformat()
+    progress["write_buffer"] = buffer.get_stats()
+    progress["generator"] = generator.get_stats()
     save_progress(progress)
     
     print(f"\n{'='*60}")
@@ -284,6 +363,17 @@ async def run_world_generation(
     print(f"Total worlds: {progress['total_worlds']}")
     print(f"Total variants: {progress['total_variants']}")
     print(f"Estimated cost: ${progress['estimated_cost']:.2f}")
+    generator_stats = progress["generator"]
+    limiter = generator_stats["rate_limiter"]
+    print(f"Gemini requests: {limiter['acquired']} ({limiter['rate']:.1f}/s budget, "
+          f"{limiter['wait_seconds']:.1f}s waiting on it), "
+          f"{generator_stats['prompt_tokens']} input tokens")
+    if combined:
+        print(f"Combined requests: {generator_stats['combined_requests']} "
+              f"({generator_stats['combined_worlds']} worlds, "
+              f"{generator_stats['fallback_worlds']} regenerated individually)")
+    print(f"Supabase rows written: {buffer.stats['rows_flushed']} "
+          f"({buffer.stats['batches_flushed']} batches, {buffer.stats['rows_spilled']} spilled to journal)")
     print(f"{'='*60}\n")
     
     return progress
@@ -293,7 +383,10 @@ def main():
     parser = argparse.ArgumentParser(description="Pass 3: World Generation")
     parser.add_argument("--limit", type=int, help="Limit number of phrases to process")
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoint")
-    parser.add_argument("--batch-size", type=int, default=10, help="Batch size for processing")
+    parser.add_argument("--batch-size", type=int, default=10, help="Checkpoint every N finished phrases")
+    parser.add_argument("--concurrency", type=int, help="Phrases generated concurrently (default: config worlds.concurrent_phrases)")
+    parser.add_argument("--combined", action="store_true", default=None,
+                        help="One Gemini request per phrase for all worlds")
     parser.add_argument("--dry-run", action="store_true", help="Show stats without processing")
     parser.add_argument("--config", type=str, help="Path to config file")
     args = parser.parse_args()
@@ -314,6 +407,8 @@ def main():
         resume=args.resume,
         batch_size=args.batch_size,
         dry_run=args.dry_run,
+        concurrency=args.concurrency,
+        combined=args.combined,
     ))
     
     print(f"\nProgress saved to: {PROGRESS_FILE}")
@@ -9,13 +9,21 @@ Background process that continuously enriches vocabulary through:
 
 Run modes:
 - Once: Process a batch and exit
-- Continuous: Run indefinitely, processing batches on interval
+- Continuous: Run indefinitely; drains the queue batch after batch, then
+  waits for the interval once it is empty
 - Daemon: Run as a background service
 
+Words are processed by concurrent workers. Requests to Supabase, Ankataa
+and Gemini are held to per-upstream budgets (token buckets shared by all
+workers), so adding workers speeds up draining without exceeding them.
+
 Usage:
-    # Process one batch (10 words) and exit
+    # Process one batch (100 words, 8 workers) and exit
     python scheduled_exploration.py --once
     
+    # Drain faster, with a higher Supabase budget
+    python scheduled_exploration.py --once --batch-size 1000 --workers 16 --supabase-rps 40
+    
     # Run continuously (default: every 5 minutes)
     python scheduled_exploration.py --interval 300
     
@@ -34,12 +42,13 @@ import signal
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
 from expansion_engine import ExpansionEngine, EnrichmentResult
+from write_buffer import SupabaseWriteBuffer
 
 # Setup logging
 logging.basicConfig(
@@ -57,30 +66,40 @@ class ExplorationScheduler:
     
     def __init__(
         self,
-        batch_size: int = 10,
-        delay_between_words: float = 2.0,
+        batch_size: int = 100,
+        delay_between_words: float = 0.0,
         interval_seconds: int = 300,
         enable_ai: bool = False,
         dry_run: bool = False,
+        workers: int = 8,
+        item_timeout: float = 120.0,
+        rate_limits: Optional[Dict[str, float]] = None,
     ):
         """
         Initialize the scheduler.
         
         Args:
             batch_size: Words to process per batch
-            delay_between_words: Seconds between word enrichments
-            interval_seconds: Seconds between batches (for continuous mode)
+            delay_between_words: Seconds between word enrichments, per worker
+            interval_seconds: Seconds to wait once the queue is empty (continuous mode)
             enable_ai: Enable Gemini AI enrichment (costs ~$0.0001/word)
             dry_run: Don't actually process, just show what would happen
+            workers: Concurrent enrichment workers
+            item_timeout: Seconds before a word is failed
+            rate_limits: Requests/second per upstream ("supabase", "ankataa", "gemini")
         """
         self.batch_size = batch_size
         self.delay_between_words = delay_between_words
         self.interval_seconds = interval_seconds
         self.enable_ai = enable_ai
         self.dry_run = dry_run
+        self.workers = workers
+        self.item_timeout = item_timeout
+        self.rate_limits = rate_limits
         
         self._running = True
         self._engine: Optional[ExpansionEngine] = None
+        self._write_buffer: Optional[SupabaseWriteBuffer] = None
         
         # Stats
         self.total_processed = 0
@@ -103,9 +122,28 @@ class ExplorationScheduler:
             self._engine = ExpansionEngine(
                 enable_ai_enrichment=self.enable_ai,
                 enable_queue_expansion=True,
+                rate_limits=self.rate_limits,
             )
+            if not self.dry_run:
+                # Vocabulary upserts are queued and flushed once per batch
+                self._write_buffer = SupabaseWriteBuffer(self._engine.supabase)
+                await self._write_buffer.start()
+                self._engine.write_buffer = self._write_buffer
         return self._engine
     
+    async def close(self):
+        """Flush queued writes and release connections."""
+        if self._write_buffer is not None:
+            await self._write_buffer.close()
+            stats = self._write_buffer.get_stats()
+            logger.info(
+                f"Write buffer: {stats['rows_flushed']} rows flushed, "
+                f"{stats['rows_spilled']} spilled, avg flush {stats['flush_seconds_avg'] * 1000:.0f}ms"
+            )
+            self._write_buffer = None
+        if self._engine is not None:
+            await self._engine.close()
+    
     async def run_once(self) -> dict:
         """
         Run a single batch and return results.
@@ -115,7 +153,7 @@ class ExplorationScheduler:
         """
         engine = await self._init_engine()
         
-        logger.info(f"Processing batch of {self.batch_size} words...")
+        logger.info(f"Processing batch of {self.batch_size} words ({self.workers} workers)...")
         
         if self.dry_run:
             # Just show queue status
@@ -133,6 +171,8 @@ class ExplorationScheduler:
         result = await engine.process_queue_batch(
             limit=self.batch_size,
             delay_seconds=self.delay_between_words,
+            workers=self.workers,
+            item_timeout=self.item_timeout,
         )
         
         self.total_processed += result.get("processed", 0)
@@ -142,6 +182,8 @@ class ExplorationScheduler:
         logger.info(
             f"Batch complete: {result['processed']} processed, "
             f"{result['enriched']} enriched, {result['failed']} failed"
+            + (f" ({result['timed_out']} timed out)" if result.get("timed_out") else "")
+            + (f" in {result['elapsed_ms'] / 1000:.1f}s" if result.get("elapsed_ms") else "")
         )
         
         if result.get("queued_words", 0) > 0:
@@ -159,6 +201,7 @@ class ExplorationScheduler:
         logger.info("Vocabulary Exploration Scheduler")
         logger.info("=" * 60)
         logger.info(f"  Batch size: {self.batch_size}")
+        logger.info(f"  Workers: {self.workers}")
         logger.info(f"  Interval: {self.interval_seconds}s")
         logger.info(f"  AI enrichment: {'Enabled' if self.enable_ai else 'Disabled'}")
         logger.info(f"  Delay between words: {self.delay_between_words}s")
@@ -171,13 +214,11 @@ class ExplorationScheduler:
         
         while self._running:
             try:
-                # Check if there's work to do
-                items = await engine.get_pending_items(1)
-                
-                if items:
-                    await self.run_once()
-                else:
-                    logger.debug("Queue empty, waiting...")
+                # Keep draining while batches come back full
+                result = await self.run_once()
+                if result.get("processed", 0) >= self.batch_size:
+                    continue
+                logger.debug("Queue empty, waiting...")
                 
                 # Wait for next interval (check _running flag periodically)
                 for _ in range(self.interval_seconds):
@@ -242,12 +283,22 @@ async def main():
                         help="Show queue status and exit")
     parser.add_argument("--dry-run", action="store_true",
                         help="Show what would be processed without doing it")
-    parser.add_argument("--batch-size", type=int, default=10,
-                        help="Words to process per batch (default: 10)")
+    parser.add_argument("--batch-size", type=int, default=100,
+                        help="Words to process per batch (default: 100)")
     parser.add_argument("--interval", type=int, default=300,
-                        help="Seconds between batches (default: 300)")
-    parser.add_argument("--delay", type=float, default=2.0,
-                        help="Seconds between words (default: 2.0)")
+                        help="Seconds to wait once the queue is empty (default: 300)")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="Seconds between words, per worker (default: 0, rate limits apply)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Concurrent enrichment workers (default: 8)")
+    parser.add_argument("--item-timeout", type=float, default=120.0,
+                        help="Seconds before a word is failed (default: 120)")
+    parser.add_argument("--supabase-rps", type=float, default=20.0,
+                        help="Supabase requests/second across workers (default: 20)")
+    parser.add_argument("--ankataa-rps", type=float, default=1.0,
+                        help="Ankataa requests/second across workers (default: 1)")
+    parser.add_argument("--gemini-rps", type=float, default=5.0,
+                        help="Gemini requests/second across workers (default: 5)")
     parser.add_argument("--enable-ai", action="store_true",
                         help="Enable AI enrichment (costs ~$0.0001/word)")
     parser.add_argument("--verbose", "-v", action="store_true",
@@ -269,16 +320,26 @@ async def main():
         interval_seconds=args.interval,
         enable_ai=args.enable_ai,
         dry_run=args.dry_run,
+        workers=args.workers,
+        item_timeout=args.item_timeout,
+        rate_limits={
+            "supabase": args.supabase_rps,
+            "ankataa": args.ankataa_rps,
+            "gemini": args.gemini_rps,
+        },
     )
     
-    if args.status:
-        await scheduler.show_status()
-    elif args.once:
-        result = await scheduler.run_once()
-        if not args.dry_run:
-            print(f"\n✓ Processed {result.get('processed', 0)} words")
-    else:
-        await scheduler.run_continuous()
+    try:
+        if args.status:
+            await scheduler.show_status()
+        elif args.once:
+            result = await scheduler.run_once()
+            if not args.dry_run:
+                print(f"\n✓ Processed {result.get('processed', 0)} words")
+        else:
+            await scheduler.run_continuous()
+    finally:
+        await scheduler.close()
 
 
 if __name__ == "__main__":
@@ -12,9 +12,12 @@ Handles all database operations for storing analysis results:
 Usage:
     from supabase_client import SupabaseClient
     
-    client = SupabaseClient()
-    source_id = await client.insert_source(video_data)
-    frame_id = await client.insert_frame(source_id, frame_data)
+    async with SupabaseClient() as client:
+        source_id = await client.insert_source(video_data)
+        frame_id = await client.insert_frame(source_id, frame_data)
+
+The client owns a pooled keep-alive HTTP session that is reused across
+calls; close it with `await client.close()` or use `async with`.
 """
 
 import asyncio
@@ -24,13 +27,24 @@ import os
 import uuid
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Tuple
 
 
 # Configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY") or os.getenv("SUPABASE_ANON_KEY")
 
+# IDs per `in.(...)` filter, to keep request URLs short
+IN_FILTER_CHUNK_SIZE = 100
+
+
+class SupabaseError(Exception):
+    """Error response from the Supabase REST API."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Supabase error {status}: {message}")
+        self.status = status
+
 
 @dataclass
 class SourceData:
@@ -181,12 +195,26 @@ class SupabaseClient:
     Async Supabase client for N'Ko pipeline.
     
     Uses PostgREST API directly for better async support.
+    
+    Owns one long-lived pooled aiohttp session (keep-alive connections,
+    DNS cache) shared by every call that doesn't pass its own session,
+    so repeated inserts skip the TCP+TLS handshake. Usable as an async
+    context manager:
+    
+        async with SupabaseClient() as client:
+            await client.insert_source(...)
     """
     
     def __init__(
         self,
         url: Optional[str] = None,
         key: Optional[str] = None,
+        max_connections: int = 20,
+        max_connections_per_host: int = 10,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        request_timeout: float = 30.0,
+        batch_chunk_size: int = 500,
     ):
         """
         Initialize the Supabase client.
@@ -194,6 +222,12 @@ class SupabaseClient:
         Args:
             url: Supabase URL (defaults to SUPABASE_URL env var)
             key: Supabase service key (defaults to SUPABASE_SERVICE_KEY env var)
+            max_connections: Total pooled connections
+            max_connections_per_host: Pooled connections to the Supabase host
+            keepalive_timeout: Seconds to keep idle connections open
+            dns_cache_ttl: Seconds to cache DNS lookups
+            request_timeout: Per-request timeout in seconds
+            batch_chunk_size: Default rows per bulk insert request
         """
         self.url = url or SUPABASE_URL
         self.key = key or SUPABASE_KEY
@@ -211,6 +245,57 @@ class SupabaseClient:
             "Content-Type": "application/json",
             "Prefer": "return=representation",
         }
+        
+        # Connection pool settings (session created lazily inside the event loop)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.request_timeout = request_timeout
+        self.batch_chunk_size = batch_chunk_size
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def __aenter__(self) -> 'SupabaseClient':
+        """Enter async context - open the pooled session."""
+        self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Exit async context - close the pooled session."""
+        await self.close()
+        return False
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session, creating it on first use.
+        
+        A session is bound to the event loop it was created in, so a new
+        one is made if the previous loop has gone away (e.g. a script
+        calling asyncio.run() more than once with the same client).
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the pooled session (safe to call more than once)."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
     
     async def _request(
         self,
@@ -219,6 +304,7 @@ class SupabaseClient:
         data: Optional[Union[Dict, List[Dict]]] = None,
         params: Optional[Dict[str, str]] = None,
         session: Optional[aiohttp.ClientSession] = None,
+        headers: Optional[Dict[str, str]] = None,
     ) -> List[Dict]:
         """
         Make a request to Supabase REST API.
@@ -228,38 +314,35 @@ class SupabaseClient:
             table: Table name
             data: Request body
             params: Query parameters
-            session: Optional aiohttp session
+            session: Optional aiohttp session (defaults to the pooled session)
+            headers: Extra headers (override defaults, e.g. Prefer)
             
         Returns:
             Response data as list of dicts
         """
         url = f"{self.rest_url}/{table}"
         
-        close_session = False
         if session is None:
-            session = aiohttp.ClientSession()
-            close_session = True
-        
-        try:
-            async with session.request(
-                method=method,
-                url=url,
-                headers=self._headers,
-                json=data,
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
-                    raise Exception(f"Supabase error {response.status}: {error_text}")
-                
-                if response.status == 204:
-                    return []
-                
-                return await response.json()
-        finally:
-            if close_session:
-                await session.close()
+            session = self._get_session()
+        
+        async with session.request(
+            method=method,
+            url=url,
+            headers={**self._headers, **headers} if headers else self._headers,
+            json=data,
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+        ) as response:
+            if response.status >= 400:
+                error_text = await response.text()
+                raise SupabaseError(response.status, error_text)
+            
+            if response.status == 204:
+                return []
+            
+            # return=minimal writes answer 201 with an empty body
+            body = await response.read()
+            return json.loads(body) if body else []
     
     def _clean_data(self, data: Dict) -> Dict:
         """Remove None values and convert special types."""
@@ -273,6 +356,81 @@ class SupabaseClient:
                 result[key] = value
         return result
     
+    async def _insert_chunked(
+        self,
+        table: str,
+        rows: List[Dict],
+        key_field: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> Tuple[List[Optional[str]], List[Dict[str, Any]]]:
+        """
+        Bulk-insert rows in chunks, one POST per chunk.
+        
+        Rows may carry different keys (_clean_data drops None values), so
+        each chunk sends the union of its keys as PostgREST `columns` and
+        lets missing ones take column defaults. Only the id (and key_field)
+        is returned per row. A failed chunk is recorded and skipped so the
+        remaining chunks still go through.
+        
+        Args:
+            table: Table name
+            rows: Cleaned row dicts
+            key_field: Unique-per-row field used to map returned IDs back
+                       (falls back to response order if absent/not unique)
+            chunk_size: Rows per request (defaults to batch_chunk_size)
+            session: Optional aiohttp session
+            
+        Returns:
+            Tuple of (ids aligned with rows, None where the insert failed;
+            list of chunk error dicts)
+        """
+        chunk_size = chunk_size or self.batch_chunk_size
+        ids: List[Optional[str]] = [None] * len(rows)
+        errors: List[Dict[str, Any]] = []
+        select = f"id,{key_field}" if key_field else "id"
+        
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            columns = sorted({key for row in chunk for key in row})
+            
+            try:
+                result = await self._request(
+                    "POST",
+                    table,
+                    chunk,
+                    params={"columns": ",".join(columns), "select": select},
+                    headers={"Prefer": "return=representation,missing=default"},
+                    session=session,
+                )
+            except Exception as e:
+                errors.append({
+                    "table": table,
+                    "start": start,
+                    "count": len(chunk),
+                    "error": str(e),
+                })
+                continue
+            
+            keys = [row.get(key_field) for row in chunk] if key_field else []
+            if key_field and None not in keys and len(set(keys)) == len(keys):
+                returned = {r.get(key_field): r["id"] for r in result}
+                for offset, key in enumerate(keys):
+                    ids[start + offset] = returned.get(key)
+            else:
+                for offset, r in enumerate(result[:len(chunk)]):
+                    ids[start + offset] = r["id"]
+            
+            if len(result) != len(chunk):
+                errors.append({
+                    "table": table,
+                    "start": start,
+                    "count": len(chunk),
+                    "error": f"Expected {len(chunk)} rows back, got {len(result)}",
+                })
+        
+        return ids, errors
+    
     # ==================== Sources ====================
     
     async def insert_source(
@@ -346,6 +504,79 @@ class SupabaseClient:
         )
         return result[0] if result else None
     
+    async def clear_source_content(
+        self,
+        source_id: str,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> Dict[str, int]:
+        """
+        Delete everything stored for a source, keeping the source row.
+        
+        Used before storing a source again after a run left it incomplete.
+        Deleting frames cascades to detections, but trajectory nodes only
+        lose their detection_id, so the trajectories built on the source's
+        detections are found and deleted first (their nodes cascade).
+        
+        Args:
+            source_id: Source UUID
+            session: Optional aiohttp session
+            
+        Returns:
+            Dict with frames and trajectories deleted
+        """
+        frames = await self._request(
+            "GET",
+            "nko_frames",
+            params={"source_id": f"eq.{source_id}", "select": "id"},
+            session=session,
+        )
+        frame_ids = [row["id"] for row in frames]
+        detection_ids = await self._select_in(
+            "nko_detections", "frame_id", frame_ids, "id", session=session
+        )
+        trajectory_ids = sorted(set(await self._select_in(
+            "nko_trajectory_nodes", "detection_id", detection_ids, "trajectory_id", session=session
+        )))
+        
+        for start in range(0, len(trajectory_ids), IN_FILTER_CHUNK_SIZE):
+            chunk = trajectory_ids[start:start + IN_FILTER_CHUNK_SIZE]
+            await self._request(
+                "DELETE",
+                "nko_trajectories",
+                params={"id": f"in.({','.join(chunk)})"},
+                session=session,
+            )
+        if frame_ids:
+            await self._request(
+                "DELETE",
+                "nko_frames",
+                params={"source_id": f"eq.{source_id}"},
+                session=session,
+            )
+        
+        return {"frames": len(frame_ids), "trajectories": len(trajectory_ids)}
+    
+    async def _select_in(
+        self,
+        table: str,
+        column: str,
+        values: List[str],
+        select: str,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> List[Any]:
+        """Select one column of the rows whose `column` is in `values`, in chunks."""
+        selected = []
+        for start in range(0, len(values), IN_FILTER_CHUNK_SIZE):
+            chunk = values[start:start + IN_FILTER_CHUNK_SIZE]
+            rows = await self._request(
+                "GET",
+                table,
+                params={column: f"in.({','.join(chunk)})", "select": select},
+                session=session,
+            )
+            selected.extend(row[select] for row in rows if row.get(select))
+        return selected
+    
     # ==================== Frames ====================
     
     async def insert_frame(
@@ -374,16 +605,18 @@ class SupabaseClient:
         self,
         frames: List[Union[FrameData, Dict]],
         session: Optional[aiohttp.ClientSession] = None,
+        chunk_size: Optional[int] = None,
     ) -> List[str]:
         """
-        Insert multiple frames in a batch.
+        Insert multiple frames in chunked bulk requests.
         
         Args:
             frames: List of FrameData or dicts
             session: Optional aiohttp session
+            chunk_size: Rows per request (defaults to batch_chunk_size)
             
         Returns:
-            List of inserted frame UUIDs
+            List of inserted frame UUIDs (same order as frames)
         """
         data_list = []
         for frame in frames:
@@ -391,8 +624,13 @@ class SupabaseClient:
                 frame = asdict(frame)
             data_list.append(self._clean_data(frame))
         
-        result = await self._request("POST", "nko_frames", data_list, session=session)
-        return [r["id"] for r in result]
+        ids, errors = await self._insert_chunked(
+            "nko_frames", data_list, key_field="frame_index",
+            chunk_size=chunk_size, session=session,
+        )
+        if errors:
+            raise Exception(f"Batch frame insert failed: {errors}")
+        return ids
     
     # ==================== Detections ====================
     
@@ -426,8 +664,9 @@ class SupabaseClient:
         self,
         detections: List[Union[DetectionData, Dict]],
         session: Optional[aiohttp.ClientSession] = None,
+        chunk_size: Optional[int] = None,
     ) -> List[str]:
-        """Insert multiple detections in a batch."""
+        """Insert multiple detections in chunked bulk requests."""
         data_list = []
         for det in detections:
             if isinstance(det, DetectionData):
@@ -436,8 +675,12 @@ class SupabaseClient:
                 det["char_count"] = len(det["nko_text"])
             data_list.append(self._clean_data(det))
         
-        result = await self._request("POST", "nko_detections", data_list, session=session)
-        return [r["id"] for r in result]
+        ids, errors = await self._insert_chunked(
+            "nko_detections", data_list, chunk_size=chunk_size, session=session,
+        )
+        if errors:
+            raise Exception(f"Batch detection insert failed: {errors}")
+        return ids
     
     # ==================== Trajectories ====================
     
@@ -603,6 +846,108 @@ class SupabaseClient:
     
     # ==================== Convenience Methods ====================
     
+    async def store_frames_with_detections(
+        self,
+        source_id: str,
+        frames: List[Dict],
+        gemini_model: str = "gemini-2.0-flash",
+        chunk_size: Optional[int] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> Dict[str, Any]:
+        """
+        Bulk-insert a video's frames, then its detections.
+        
+        Frames go up in chunked bulk POSTs; returned frame IDs are mapped
+        back to frame indices and used to bulk-insert the detections of
+        frames with N'Ko text. Failed chunks are reported, not raised.
+        
+        Args:
+            source_id: UUID of the parent source
+            frames: Frame analysis dicts (frame_index, timestamp, nko_text,
+                    latin_transliteration, english_translation, confidence,
+                    optional has_nko and raw_response)
+            gemini_model: Model name recorded on detections
+            chunk_size: Rows per request (defaults to batch_chunk_size)
+            session: Optional aiohttp session
+            
+        Returns:
+            Dict with frame_ids/detection_ids (by frame_index), counts,
+            failed frame indices and per-chunk errors
+        """
+        frame_rows = []
+        for frame in frames:
+            has_nko = frame.get("has_nko", bool(frame.get("nko_text")))
+            frame_rows.append(self._clean_data(asdict(FrameData(
+                source_id=source_id,
+                frame_index=frame.get("frame_index", 0),
+                timestamp_ms=int(frame.get("timestamp", 0) * 1000),
+                has_nko=has_nko,
+                confidence=frame.get("confidence", 0.0),
+            ))))
+        
+        frame_ids, errors = await self._insert_chunked(
+            "nko_frames", frame_rows, key_field="frame_index",
+            chunk_size=chunk_size, session=session,
+        )
+        
+        # Detections for frames that were stored and have N'Ko text
+        detection_frames = []
+        detection_rows = []
+        failed_detections = []
+        for frame, frame_id in zip(frames, frame_ids):
+            if not frame.get("nko_text"):
+                continue
+            if frame_id is None:
+                failed_detections.append(frame.get("frame_index", 0))
+                continue
+            raw_response = frame.get("raw_response")
+            detection = asdict(DetectionData(
+                frame_id=frame_id,
+                nko_text=frame["nko_text"],
+                latin_text=frame.get("latin_transliteration"),
+                english_text=frame.get("english_translation"),
+                confidence=frame.get("confidence", 0.0),
+                gemini_model=gemini_model,
+                raw_response={"raw": raw_response} if raw_response else None,
+            ))
+            detection["char_count"] = len(detection["nko_text"])
+            detection_frames.append(frame)
+            detection_rows.append(self._clean_data(detection))
+        
+        detection_ids, detection_errors = await self._insert_chunked(
+            "nko_detections", detection_rows, key_field="frame_id",
+            chunk_size=chunk_size, session=session,
+        )
+        errors.extend(detection_errors)
+        
+        frame_id_map = {}
+        failed_frames = []
+        for frame, frame_id in zip(frames, frame_ids):
+            if frame_id is None:
+                failed_frames.append(frame.get("frame_index", 0))
+            else:
+                frame_id_map[frame.get("frame_index", 0)] = frame_id
+        
+        detection_id_map = {}
+        for frame, detection_id in zip(detection_frames, detection_ids):
+            if detection_id is None:
+                failed_detections.append(frame.get("frame_index", 0))
+            else:
+                detection_id_map[frame.get("frame_index", 0)] = detection_id
+        
+        stored_rows = [row for row, frame_id in zip(frame_rows, frame_ids) if frame_id]
+        
+        return {
+            "frame_ids": frame_id_map,
+            "detection_ids": detection_id_map,
+            "frame_count": len(frame_id_map),
+            "nko_frame_count": sum(1 for row in stored_rows if row.get("has_nko")),
+            "detection_count": len(detection_id_map),
+            "failed_frames": failed_frames,
+            "failed_detections": failed_detections,
+            "errors": errors,
+        }
+    
     async def store_video_analysis(
         self,
         video_id: str,
@@ -610,31 +955,42 @@ class SupabaseClient:
         title: str,
         frames: List[Dict],
         channel_name: Optional[str] = None,
+        chunk_size: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Store complete video analysis results.
         
+        Frames and detections are written with chunked bulk inserts
+        (a handful of requests per video instead of ~2 per frame).
+        
         Args:
             video_id: YouTube video ID
             video_url: Full video URL
             title: Video title
             frames: List of frame analysis results
             channel_name: YouTube channel name
+            chunk_size: Rows per bulk request (defaults to batch_chunk_size)
             
         Returns:
-            Dict with source_id and counts
+            Dict with source_id, counts and any partial-failure details
+            (failed_frames, failed_detections, errors)
         """
-        async with aiohttp.ClientSession() as session:
-            # Check if already exists
-            existing = await self.get_source_by_external_id(video_id, session=session)
-            if existing:
-                return {
-                    "source_id": existing["id"],
-                    "status": "already_exists",
-                    "frame_count": existing.get("frame_count", 0),
-                }
-            
-            # Insert source
+        session = self._get_session()
+        
+        # Check if already exists
+        existing = await self.get_source_by_external_id(video_id, session=session)
+        if existing and existing.get("status") != "processing":
+            return {
+                "source_id": existing["id"],
+                "status": "already_exists",
+                "frame_count": existing.get("frame_count", 0),
+            }
+        
+        if existing:
+            # Left partial by an earlier run: store its content again
+            source_id = existing["id"]
+            await self.clear_source_content(source_id, session=session)
+        else:
             source_id = await self.insert_source(
                 SourceData(
                     source_type="youtube",
@@ -646,59 +1002,50 @@ class SupabaseClient:
                 ),
                 session=session,
             )
-            
-            frame_count = 0
-            nko_frame_count = 0
-            detection_count = 0
-            
-            # Insert frames and detections
-            for frame in frames:
-                has_nko = bool(frame.get("nko_text"))
-                
-                frame_id = await self.insert_frame(
-                    FrameData(
-                        source_id=source_id,
-                        frame_index=frame.get("frame_index", 0),
-                        timestamp_ms=int(frame.get("timestamp", 0) * 1000),
-                        has_nko=has_nko,
-                        confidence=frame.get("confidence", 0.0),
-                    ),
-                    session=session,
-                )
-                frame_count += 1
-                
-                if has_nko:
-                    nko_frame_count += 1
-                    await self.insert_detection(
-                        DetectionData(
-                            frame_id=frame_id,
-                            nko_text=frame["nko_text"],
-                            latin_text=frame.get("latin_transliteration"),
-                            english_text=frame.get("english_translation"),
-                            confidence=frame.get("confidence", 0.0),
-                            gemini_model="gemini-2.0-flash",
-                        ),
-                        session=session,
-                    )
-                    detection_count += 1
-            
-            # Update source status
-            await self.update_source_status(
-                source_id,
-                status="completed",
-                frame_count=frame_count,
-                nko_frame_count=nko_frame_count,
-                total_detections=detection_count,
-                session=session,
+        
+        # Insert frames and detections in bulk
+        stored = await self.store_frames_with_detections(
+            source_id,
+            [{**frame, "has_nko": bool(frame.get("nko_text"))} for frame in frames],
+            chunk_size=chunk_size,
+            session=session,
+        )
+        
+        error_message = None
+        if stored["errors"]:
+            error_message = (
+                f"Partial insert: {len(stored['failed_frames'])} frames, "
+                f"{len(stored['failed_detections'])} detections failed"
             )
-            
-            return {
-                "source_id": source_id,
-                "status": "created",
-                "frame_count": frame_count,
-                "nko_frame_count": nko_frame_count,
-                "detection_count": detection_count,
-            }
+        
+        # Update source status; a partial insert stays "processing" so the
+        # source is not mistaken for a complete one
+        if frames and not stored["frame_count"]:
+            status = "failed"
+        elif stored["errors"]:
+            status = "processing"
+        else:
+            status = "completed"
+        await self.update_source_status(
+            source_id,
+            status=status,
+            error_message=error_message,
+            frame_count=stored["frame_count"],
+            nko_frame_count=stored["nko_frame_count"],
+            total_detections=stored["detection_count"],
+            session=session,
+        )
+        
+        return {
+            "source_id": source_id,
+            "status": "partial" if stored["errors"] else "created",
+            "frame_count": stored["frame_count"],
+            "nko_frame_count": stored["nko_frame_count"],
+            "detection_count": stored["detection_count"],
+            "failed_frames": stored["failed_frames"],
+            "failed_detections": stored["failed_detections"],
+            "errors": stored["errors"],
+        }
     
     async def store_world_trajectories(
         self,
@@ -717,65 +1064,59 @@ class SupabaseClient:
         Returns:
             Dict with trajectory_ids and node counts
         """
-        close_session = False
         if session is None:
-            session = aiohttp.ClientSession()
-            close_session = True
+            session = self._get_session()
+        
+        trajectory_ids = []
+        total_nodes = 0
         
-        try:
-            trajectory_ids = []
-            total_nodes = 0
+        for world in worlds:
+            world_name = world.get("world_name", "unknown")
+            variants = world.get("variants", [])
             
-            for world in worlds:
-                world_name = world.get("world_name", "unknown")
-                variants = world.get("variants", [])
-                
-                if not variants and world.get("error"):
-                    continue
-                
-                # Create trajectory for this world
-                trajectory_id = await self.insert_trajectory(
-                    TrajectoryData(
-                        name=f"world_{world_name}",
-                        description=f"World exploration: {world_name}",
-                        trajectory_type="content_flow",
-                        total_nodes=len(variants),
-                        dominant_phase="exploration",
-                        is_complete=True,
-                        is_successful=not bool(world.get("error")),
-                    ),
-                    session=session,
-                )
-                trajectory_ids.append(trajectory_id)
-                
-                # Create nodes for each variant
-                nodes = []
-                for i, variant in enumerate(variants):
-                    nodes.append(TrajectoryNodeData(
-                        trajectory_id=trajectory_id,
-                        detection_id=detection_id,
-                        node_index=i,
-                        trajectory_depth=1,
-                        trajectory_sibling_order=i,
-                        trajectory_phase="exploration",
-                        content_preview=variant.get("nko_text", "")[:100],
-                        content_type=world_name,
-                        outcome="success",
-                        is_terminal=(i == len(variants) - 1),
-                    ))
-                
-                if nodes:
-                    await self.insert_trajectory_nodes_batch(nodes, session=session)
-                    total_nodes += len(nodes)
+            if not variants and world.get("error"):
+                continue
             
-            return {
-                "trajectory_ids": trajectory_ids,
-                "trajectory_count": len(trajectory_ids),
-                "total_nodes": total_nodes,
-            }
-        finally:
-            if close_session:
-                await session.close()
+            # Create trajectory for this world
+            trajectory_id = await self.insert_trajectory(
+                TrajectoryData(
+                    name=f"world_{world_name}",
+                    description=f"World exploration: {world_name}",
+                    trajectory_type="content_flow",
+                    total_nodes=len(variants),
+                    dominant_phase="exploration",
+                    is_complete=True,
+                    is_successful=not bool(world.get("error")),
+                ),
+                session=session,
+            )
+            trajectory_ids.append(trajectory_id)
+            
+            # Create nodes for each variant
+            nodes = []
+            for i, variant in enumerate(variants):
+                nodes.append(TrajectoryNodeData(
+                    trajectory_id=trajectory_id,
+                    detection_id=detection_id,
+                    node_index=i,
+                    trajectory_depth=1,
+                    trajectory_sibling_order=i,
+                    trajectory_phase="exploration",
+                    content_preview=variant.get("nko_text", "")[:100],
+                    content_type=world_name,
+                    outcome="success",
+                    is_terminal=(i == len(variants) - 1),
+                ))
+            
+            if nodes:
+                await self.insert_trajectory_nodes_batch(nodes, session=session)
+                total_nodes += len(nodes)
+        
+        return {
+            "trajectory_ids": trajectory_ids,
+            "trajectory_count": len(trajectory_ids),
+            "total_nodes": total_nodes,
+        }
 
 
 async def test_supabase_client():
@@ -785,46 +1126,46 @@ async def test_supabase_client():
     print("=" * 60)
     
     try:
-        client = SupabaseClient()
-        print(f"Connected to: {client.url}")
-        
-        # Test insert source
-        source_id = await client.insert_source(
-            SourceData(
-                source_type="youtube",
-                url="https://www.youtube.com/watch?v=test123",
-                external_id="test123",
-                title="Test Video",
-                status="pending",
+        async with SupabaseClient() as client:
+            print(f"Connected to: {client.url}")
+        
+            # Test insert source
+            source_id = await client.insert_source(
+                SourceData(
+                    source_type="youtube",
+                    url="https://www.youtube.com/watch?v=test123",
+                    external_id="test123",
+                    title="Test Video",
+                    status="pending",
+                )
             )
-        )
-        print(f"Inserted source: {source_id}")
+            print(f"Inserted source: {source_id}")
         
-        # Test insert frame
-        frame_id = await client.insert_frame(
-            FrameData(
-                source_id=source_id,
-                frame_index=0,
-                timestamp_ms=0,
-                has_nko=True,
-                confidence=0.95,
+            # Test insert frame
+            frame_id = await client.insert_frame(
+                FrameData(
+                    source_id=source_id,
+                    frame_index=0,
+                    timestamp_ms=0,
+                    has_nko=True,
+                    confidence=0.95,
+                )
             )
-        )
-        print(f"Inserted frame: {frame_id}")
+            print(f"Inserted frame: {frame_id}")
         
-        # Test insert detection
-        detection_id = await client.insert_detection(
-            DetectionData(
-                frame_id=frame_id,
-                nko_text="ߒߞߏ",
-                latin_text="N'Ko",
-                english_text="I declare",
-                confidence=0.95,
+            # Test insert detection
+            detection_id = await client.insert_detection(
+                DetectionData(
+                    frame_id=frame_id,
+                    nko_text="ߒߞߏ",
+                    latin_text="N'Ko",
+                    english_text="I declare",
+                    confidence=0.95,
+                )
             )
-        )
-        print(f"Inserted detection: {detection_id}")
+            print(f"Inserted detection: {detection_id}")
         
-        print("\n✓ All tests passed!")
+            print("\n✓ All tests passed!")
         
     except Exception as e:
         print(f"\n✗ Error: {e}")
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Buffer for Supabase Pipeline Writes
+
+Decouples pipeline work from Supabase round-trips. Rows for any table
+are queued in memory, grouped by table, and flushed as bulk upserts
+(one POST per table per chunk) when a size or time threshold is hit.
+
+Features:
+- Size and time flush thresholds, plus explicit flush()/close()
+- Tables flush in first-seen order, so parents (sources, frames,
+  trajectories) always land before the children that reference them
+- Failed batches are retried with retry_utils backoff
+- If Supabase stays unreachable, batches spill to a local JSONL journal
+  and are replayed, in order, on a later flush or the next run
+- Rows Supabase rejects outright (4xx such as a unique conflict) are
+  isolated and set aside in a dead-letter file next to the journal, so
+  one bad batch cannot hold up the journal
+- Post-flush callbacks, so callers can act once their rows have landed
+- Metrics for queue depth and flush latency
+
+Rows are fire-and-forget, so callers that need an ID (e.g. to link
+children) should generate the UUID client-side and include it as "id".
+Rows are upserted whole (columns a row leaves out take their defaults),
+so queue complete rows; partial updates of existing rows should stay
+PATCH requests.
+
+Usage:
+    from write_buffer import SupabaseWriteBuffer
+
+    async with SupabaseWriteBuffer(SupabaseClient()) as buffer:
+        frame_id = str(uuid.uuid4())
+        await buffer.add("nko_frames", {"id": frame_id, ...})
+        await buffer.add("nko_detections", {"frame_id": frame_id, ...})
+    # close() flushes everything still queued
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Set, Callable, Awaitable
+
+# Support both relative and absolute imports
+try:
+    from .supabase_client import SupabaseClient
+    from .retry_utils import RetryConfig, RetryError, SUPABASE_RETRY
+except ImportError:
+    from supabase_client import SupabaseClient
+    from retry_utils import RetryConfig, RetryError, SUPABASE_RETRY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_PATH = "./data/cache/supabase_journal.jsonl"
+
+# 4xx responses that say nothing about the rows themselves (auth, timeouts,
+# throttling); those batches are retried and journaled like any outage
+TRANSIENT_CLIENT_ERRORS = {401, 403, 408, 429}
+
+
+class RejectedBatchError(Exception):
+    """Supabase refused a batch for its content; retrying it unchanged cannot succeed."""
+
+    def __init__(self, table: str, error: Exception):
+        super().__init__(f"{table} batch rejected: {error}")
+        self.table = table
+        self.error = error
+
+
+def _row_ids(rows: List[Dict]) -> Set[str]:
+    return {row["id"] for row in rows if "id" in row}
+
+
+def _is_rejection(error: Exception) -> bool:
+    status = getattr(error, "status", None)
+    return status is not None and 400 <= status < 500 and status not in TRANSIENT_CLIENT_ERRORS
+
+
+class SupabaseWriteBuffer:
+    """
+    Buffered, write-behind sink over SupabaseClient.
+
+    add() only touches memory (and may trigger a flush when a table
+    reaches max_batch_rows); a background task flushes every
+    flush_interval seconds.
+    """
+
+    def __init__(
+        self,
+        client: SupabaseClient,
+        max_batch_rows: int = 500,
+        flush_interval: float = 2.0,
+        journal_path: Optional[str] = DEFAULT_JOURNAL_PATH,
+        retry_config: Optional[RetryConfig] = None,
+        journal_retry_interval: float = 60.0,
+        on_conflict: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            client: SupabaseClient used for the bulk requests
+            max_batch_rows: Flush once any table has this many rows queued
+                            (also the rows-per-request chunk size)
+            flush_interval: Seconds between background flushes (0 = only
+                            size-triggered and explicit flushes)
+            journal_path: JSONL file for spilled batches (None = keep
+                          failed batches in memory and re-queue them).
+                          Rejected rows go to <journal>.rejected.jsonl
+                          (None = log and drop them)
+            retry_config: Retry policy per batch (defaults to SUPABASE_RETRY)
+            journal_retry_interval: Min seconds between journal replay attempts
+            on_conflict: Per-table conflict columns for upserts
+                         (defaults to the primary key)
+        """
+        self.client = client
+        self.max_batch_rows = max(1, max_batch_rows)
+        self.flush_interval = flush_interval
+        self.journal_path = Path(journal_path) if journal_path else None
+        self.dead_letter_path = (
+            self.journal_path.with_suffix(".rejected.jsonl") if self.journal_path else None
+        )
+        self.retry_config = retry_config or SUPABASE_RETRY
+        self.journal_retry_interval = journal_retry_interval
+        self.on_conflict = dict(on_conflict or {})
+
+        # table -> queued rows, flushed in first-seen order over the
+        # buffer's whole lifetime (not per flush, or a child table could
+        # overtake its parent after a flush)
+        self._queues: Dict[str, List[Dict]] = {}
+        self._table_order: List[str] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._last_spill = 0.0
+        # table -> IDs of rows spilled (until replayed) or rejected by this buffer
+        self._journaled_ids: Dict[str, Set[str]] = {}
+        self._rejected_ids: Dict[str, Set[str]] = {}
+        self._flush_callbacks: List[Callable[[], Awaitable[None]]] = []
+
+        self.stats = {
+            "rows_added": 0,
+            "rows_flushed": 0,
+            "batches_flushed": 0,
+            "batches_retried": 0,
+            "rows_spilled": 0,
+            "batches_spilled": 0,
+            "rows_replayed": 0,
+            "rows_rejected": 0,
+            "batches_rejected": 0,
+            "flushes": 0,
+            "flush_seconds_total": 0.0,
+            "flush_seconds_max": 0.0,
+            "flush_seconds_last": 0.0,
+        }
+
+    # ==================== Lifecycle ====================
+
+    async def __aenter__(self) -> 'SupabaseWriteBuffer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    async def start(self) -> None:
+        """Start the background flusher and replay any journal left from a previous run."""
+        self._closed = False
+        self._wakeup.clear()
+        if self.journal_pending:
+            await self.replay_journal()
+        if self.flush_interval > 0 and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Stop the background flusher and flush everything still queued."""
+        self._closed = True
+        if self._flush_task is not None:
+            # Wake the loop and let it exit on its own: cancelling it could
+            # interrupt a flush halfway through
+            self._wakeup.set()
+            await self._flush_task
+            self._flush_task = None
+        await self.flush()
+        if self.queue_depth:
+            logger.error(f"SupabaseWriteBuffer closed with {self.queue_depth} unwritten rows")
+
+    async def _flush_loop(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._closed:
+                return
+            try:
+                await self.flush()
+            except Exception as e:
+                # Never let the background task die; the next tick retries
+                logger.error(f"Background flush failed: {e}")
+
+    # ==================== Writes ====================
+
+    async def add(self, table: str, row: Dict[str, Any]) -> None:
+        """Queue one row for a bulk upsert into `table`."""
+        await self.add_many(table, [row])
+
+    async def add_many(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        """Queue rows for a bulk upsert into `table`."""
+        if not rows:
+            return
+        if self._closed:
+            raise RuntimeError("SupabaseWriteBuffer is closed")
+
+        if table not in self._table_order:
+            self._table_order.append(table)
+        queue = self._queues.setdefault(table, [])
+        queue.extend(self.client._clean_data(row) for row in rows)
+        self.stats["rows_added"] += len(rows)
+
+        if len(queue) >= self.max_batch_rows:
+            await self.flush()
+
+    def add_flush_callback(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        Register a coroutine function to await after every flush.
+
+        Callbacks run outside the flush lock (they may add rows, which the
+        next flush picks up) and check unwritten_ids() for the rows they
+        care about. Their errors are logged, not raised.
+        """
+        self._flush_callbacks.append(callback)
+
+    async def flush(self) -> None:
+        """
+        Flush every queued row, table by table in first-seen order, then
+        run the flush callbacks.
+
+        Parent tables go first so foreign keys resolve. Once a batch has
+        to be spilled, the rest of this flush is spilled after it (the
+        children would fail anyway, and journal order is preserved).
+        """
+        async with self._flush_lock:
+            await self._flush_locked()
+        for callback in list(self._flush_callbacks):
+            try:
+                await callback()
+            except Exception as e:
+                logger.error(f"Flush callback failed: {e}")
+
+    async def _flush_locked(self) -> None:
+        if self.journal_pending and time.monotonic() - self._last_spill >= self.journal_retry_interval:
+            await self._replay_journal_locked()
+
+        pending = [
+            (table, self._queues[table])
+            for table in self._table_order
+            if self._queues.get(table)
+        ]
+        if not pending:
+            return
+        self._queues = {}
+
+        chunks = [
+            (table, rows[offset:offset + self.max_batch_rows])
+            for table, rows in pending
+            for offset in range(0, len(rows), self.max_batch_rows)
+        ]
+
+        start = time.monotonic()
+        # While older batches sit in the journal, new ones queue behind them
+        spilling = self.journal_pending
+        requeue: Dict[str, List[Dict]] = {}
+        handled = 0
+        try:
+            for table, chunk in chunks:
+                if not spilling:
+                    try:
+                        await self._send_or_reject(table, chunk)
+                    except RetryError as e:
+                        logger.error(
+                            f"Supabase write to {table} failed after {e.attempts} attempts: "
+                            f"{e.last_exception}"
+                        )
+                        spilling = True
+                if spilling:
+                    if self.journal_path is None:
+                        requeue.setdefault(table, []).extend(chunk)
+                    self._spill(table, chunk)
+                handled += 1
+        except BaseException:
+            # Interrupted (e.g. cancelled): rows not yet sent or spilled
+            # are queued again; upserts make re-sending a chunk harmless
+            for table, chunk in chunks[handled:]:
+                requeue.setdefault(table, []).extend(chunk)
+            raise
+        finally:
+            # Unwritten rows go back to the front of their queue
+            for table, rows in requeue.items():
+                self._queues[table] = rows + self._queues.get(table, [])
+
+        elapsed = time.monotonic() - start
+        self.stats["flushes"] += 1
+        self.stats["flush_seconds_last"] = elapsed
+        self.stats["flush_seconds_total"] += elapsed
+        self.stats["flush_seconds_max"] = max(self.stats["flush_seconds_max"], elapsed)
+
+    async def _send_or_reject(self, table: str, rows: List[Dict]) -> None:
+        """
+        Send a chunk; if Supabase rejects it, bisect down to the offending
+        rows and dead-letter those, sending the rest.
+
+        Raises:
+            RetryError: The chunk could not be sent (transient failure)
+        """
+        try:
+            await self._send(table, rows)
+        except RejectedBatchError as e:
+            if len(rows) == 1:
+                self._dead_letter(table, rows, e.error)
+                return
+            middle = len(rows) // 2
+            await self._send_or_reject(table, rows[:middle])
+            await self._send_or_reject(table, rows[middle:])
+
+    async def _send(self, table: str, rows: List[Dict]) -> None:
+        """
+        Bulk-upsert one chunk, retrying transient failures with backoff.
+
+        Raises:
+            RejectedBatchError: Supabase refused the rows (not retried)
+            RetryError: Retries exhausted
+        """
+        columns = sorted({key for row in rows for key in row})
+        params = {"columns": ",".join(columns)}
+        if table in self.on_conflict:
+            params["on_conflict"] = self.on_conflict[table]
+
+        attempts = 0
+        rejection: Optional[Exception] = None
+
+        async def do_upsert():
+            nonlocal attempts, rejection
+            attempts += 1
+            try:
+                await self.client._request(
+                    "POST",
+                    table,
+                    rows,
+                    params=params,
+                    headers={"Prefer": "resolution=merge-duplicates,return=minimal,missing=default"},
+                )
+            except Exception as e:
+                if not _is_rejection(e):
+                    raise
+                rejection = e  # Returning stops the retries
+
+        await self.retry_config.execute(do_upsert)
+        if rejection is not None:
+            raise RejectedBatchError(table, rejection)
+
+        if attempts > 1:
+            self.stats["batches_retried"] += 1
+        self.stats["batches_flushed"] += 1
+        self.stats["rows_flushed"] += len(rows)
+
+    # ==================== Journal ====================
+
+    @property
+    def journal_pending(self) -> bool:
+        """Whether spilled batches are waiting in the journal."""
+        return (
+            self.journal_path is not None
+            and self.journal_path.exists()
+            and self.journal_path.stat().st_size > 0
+        )
+
+    def _spill(self, table: str, rows: List[Dict]) -> None:
+        """Append a batch to the journal (flush() re-queues it if there is no journal)."""
+        self._last_spill = time.monotonic()
+        self.stats["batches_spilled"] += 1
+        self.stats["rows_spilled"] += len(rows)
+
+        if self.journal_path is None:
+            return
+
+        self._journaled_ids.setdefault(table, set()).update(_row_ids(rows))
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "table": table,
+                "rows": rows,
+                "spilled_at": datetime.now().isoformat(),
+            }, ensure_ascii=False) + "\n")
+        logger.warning(f"Spilled {len(rows)} {table} rows to {self.journal_path}")
+
+    def _dead_letter(self, table: str, rows: List[Dict], error: Exception) -> None:
+        """Set rejected rows aside for inspection; they are never replayed."""
+        self.stats["batches_rejected"] += 1
+        self.stats["rows_rejected"] += len(rows)
+        self._rejected_ids.setdefault(table, set()).update(_row_ids(rows))
+
+        if self.dead_letter_path is None:
+            logger.error(f"Dropped {len(rows)} {table} rows rejected by Supabase: {error}")
+            return
+
+        self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "table": table,
+                "rows": rows,
+                "error": str(error),
+                "rejected_at": datetime.now().isoformat(),
+            }, ensure_ascii=False) + "\n")
+        logger.error(f"Supabase rejected {len(rows)} {table} rows, moved to {self.dead_letter_path}: {error}")
+
+    async def replay_journal(self) -> int:
+        """
+        Re-send spilled batches in their original order.
+
+        Stops at the first batch that still fails; it and everything after
+        it stay in the journal. Rejected rows are dead-lettered, not retried.
+
+        Returns:
+            Number of rows replayed
+        """
+        async with self._flush_lock:
+            return await self._replay_journal_locked()
+
+    async def _replay_journal_locked(self) -> int:
+        if not self.journal_pending:
+            return 0
+
+        with open(self.journal_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+
+        replayed = 0
+        done = 0
+        for entry in entries:
+            try:
+                await self._send_or_reject(entry["table"], entry["rows"])
+            except RetryError as e:
+                logger.error(f"Journal replay stopped at {entry['table']}: {e.last_exception}")
+                self._last_spill = time.monotonic()
+                break
+            replayed += len(entry["rows"])
+            done += 1
+            self._journaled_ids.get(entry["table"], set()).difference_update(_row_ids(entry["rows"]))
+
+        # Rewrite the journal with whatever is left (atomically)
+        remaining = entries[done:]
+        if remaining:
+            tmp_path = self.journal_path.with_suffix(self.journal_path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in remaining:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.journal_path)
+        else:
+            self.journal_path.unlink()
+
+        self.stats["rows_replayed"] += replayed
+        if replayed:
+            logger.info(f"Replayed {replayed} journaled rows ({len(remaining)} batches left)")
+        return replayed
+
+    # ==================== Metrics ====================
+
+    def unwritten_ids(self, table: str) -> Set[str]:
+        """
+        IDs of `table` rows added to this buffer that are not in Supabase:
+        still queued, waiting in the journal, or rejected.
+
+        Callers check the rows they care about after a flush (see
+        add_flush_callback).
+        """
+        return (
+            _row_ids(self._queues.get(table, []))
+            | self._journaled_ids.get(table, set())
+            | self._rejected_ids.get(table, set())
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Rows currently queued in memory."""
+        return sum(len(rows) for rows in self._queues.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer statistics."""
+        flushes = self.stats["flushes"]
+        return {
+            **self.stats,
+            "queue_depth": self.queue_depth,
+            "queue_depth_by_table": {t: len(r) for t, r in self._queues.items() if r},
+            "journal_pending": self.journal_pending,
+            "flush_seconds_avg": self.stats["flush_seconds_total"] / flushes if flushes else 0.0,
+        }
+
+
+# Test
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python write_buffer.py <journal.jsonl>  (replays a spill journal)")
+        sys.exit(1)
+
+    async def replay():
+        async with SupabaseClient() as client:
+            buffer = SupabaseWriteBuffer(client, journal_path=sys.argv[1], flush_interval=0)
+            rows = await buffer.replay_journal()
+            print(f"Replayed {rows} rows")
+            for key, value in buffer.get_stats().items():
+                print(f"  {key}: {value}")
+
+    asyncio.run(replay())